@@ -0,0 +1,33 @@
+"""
+Response / service cache configuration.
+
+These settings size the shared in-memory cache used by `app.utils.cache`
+(see `AsyncCache` and `cache_response`).
+"""
+
+from pydantic_settings import BaseSettings
+
+
+class CacheSettings(BaseSettings):
+    """Capacity and freshness defaults for the in-process cache."""
+
+    # Set to False to bypass caching entirely (every call hits the loader)
+    enabled: bool = True
+
+    # LRU capacity, in entries
+    max_entries: int = 10_000
+
+    # Seconds an entry is served as fresh
+    default_ttl: float = 60.0
+
+    # Extra seconds an expired entry may still be served while it is refreshed
+    # in the background (stale-while-revalidate)
+    stale_while_revalidate: float = 30.0
+
+    class Config:
+        env_prefix = "CACHE_"
+        case_sensitive = False
+
+
+# Global cache settings instance
+cache_settings = CacheSettings()
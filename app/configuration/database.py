@@ -2,13 +2,34 @@
 Database configuration for SQLAlchemy with SQLite.
 
 This module handles database connection settings and engine creation.
+Both a sync engine (`engine`/`SessionLocal`) and an asyncio engine backed by
+aiosqlite (`async_engine`/`AsyncSessionLocal`) are built from the same settings.
+
+Every new SQLite connection is tuned with the pragmas of the selected profile
+(`DB_SQLITE_PROFILE`), optionally overridden one by one via `DB_SQLITE_*`.
+
+Nothing is built at import time: settings, engines and the async session
+factory are created on first use through `get_db_settings`, `get_engine`,
+`get_async_engine` and `get_async_session_factory`, and `SessionLocal` binds
+itself to the engine the first time a session is opened. The historical module
+attributes (`db_settings`, `engine`, `async_engine`, `AsyncSessionLocal`) still
+work and resolve lazily, but `from ... import engine` forces creation at the
+importer's import time, so prefer the accessors.
 """
 
-from sqlalchemy import create_engine
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
+from app.utils.metrics import install_query_metrics
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
 
 class DatabaseSettings(BaseSettings):
     """Database configuration settings."""
@@ -20,24 +41,221 @@ class DatabaseSettings(BaseSettings):
     echo_sql: bool = False  # Set to True for SQL query logging
     pool_pre_ping: bool = True
 
+    # Async engine URL; derived from database_url (sqlite -> sqlite+aiosqlite) when unset
+    async_database_url: Optional[str] = None
+
+    # SQLite connection tuning: one of SQLITE_PROFILES
+    sqlite_profile: str = "read_heavy"
+
+    # Per-pragma overrides of the selected profile (None keeps the profile value)
+    sqlite_journal_mode: Optional[str] = None  # WAL lets readers proceed while a writer commits
+    sqlite_synchronous: Optional[str] = None  # OFF / NORMAL / FULL
+    sqlite_cache_size_kib: Optional[int] = None  # Page cache per connection
+    sqlite_mmap_size: Optional[int] = None  # Bytes of the DB file memory-mapped for reads
+    sqlite_temp_store: Optional[str] = None  # DEFAULT / FILE / MEMORY
+    sqlite_busy_timeout_ms: Optional[int] = None  # Wait for locks instead of failing immediately
+    sqlite_foreign_keys: Optional[bool] = None  # Enforce FKs so ON DELETE CASCADE works
+
     class Config:
         env_prefix = "DB_"
         case_sensitive = False
 
+    @property
+    def is_sqlite(self) -> bool:
+        return self.database_url.startswith("sqlite")
+
+
+# Pragma presets; "default" leaves SQLite's built-in behaviour untouched
+SQLITE_PROFILES: Dict[str, Dict[str, str]] = {
+    "default": {},
+    "read_heavy": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": "-65536",  # 64 MiB (negative values are KiB)
+        "mmap_size": "268435456",  # 256 MiB
+        "temp_store": "MEMORY",
+        "busy_timeout": "5000",
+        "foreign_keys": "ON",
+    },
+    "ingest_heavy": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": "-262144",  # 256 MiB
+        "mmap_size": "268435456",
+        "temp_store": "MEMORY",
+        "busy_timeout": "30000",
+        "foreign_keys": "ON",
+    },
+}
+
+
+def sqlite_pragmas(settings: DatabaseSettings) -> Dict[str, str]:
+    """Resolve the pragmas for the configured profile plus any per-pragma overrides."""
+    if settings.sqlite_profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown sqlite_profile {settings.sqlite_profile!r}; "
+            f"expected one of {', '.join(SQLITE_PROFILES)}"
+        )
+    pragmas = dict(SQLITE_PROFILES[settings.sqlite_profile])
+    overrides = {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "cache_size": None if settings.sqlite_cache_size_kib is None else str(-settings.sqlite_cache_size_kib),
+        "mmap_size": settings.sqlite_mmap_size,
+        "temp_store": settings.sqlite_temp_store,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "foreign_keys": None if settings.sqlite_foreign_keys is None else ("ON" if settings.sqlite_foreign_keys else "OFF"),
+    }
+    pragmas.update({name: str(value) for name, value in overrides.items() if value is not None})
+    return pragmas
+
+
+def install_sqlite_pragmas(sync_engine: Engine, pragmas: Dict[str, str]) -> None:
+    """Apply `pragmas` to every new DBAPI connection opened by `sync_engine`."""
+    if not pragmas:
+        return
+
+    statements = [f"PRAGMA {name} = {value}" for name, value in pragmas.items()]
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def build_engine(settings: DatabaseSettings) -> Engine:
+    """Create a sync engine for `settings`, tuned with its SQLite profile."""
+    new_engine = create_engine(
+        settings.database_url,
+        echo=settings.echo_sql,
+        # A SQLite connection is a local file handle, so a liveness ping is pure overhead
+        pool_pre_ping=settings.pool_pre_ping and not settings.is_sqlite,
+        connect_args={"check_same_thread": False} if settings.is_sqlite else {},  # Required for SQLite with FastAPI
+    )
+    if settings.is_sqlite:
+        install_sqlite_pragmas(new_engine, sqlite_pragmas(settings))
+    install_query_metrics(new_engine)
+    return new_engine
+
+
+def get_async_database_url(settings: DatabaseSettings) -> str:
+    """Return the asyncio driver URL for the configured database."""
+    if settings.async_database_url:
+        return settings.async_database_url
+    if settings.database_url.startswith("sqlite://"):
+        return settings.database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    raise ValueError("Set DB_ASYNC_DATABASE_URL for non-SQLite databases")
+
+
+def build_async_engine(settings: DatabaseSettings) -> "AsyncEngine":
+    """Create an asyncio engine for `settings`, tuned with its SQLite profile."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    new_engine = create_async_engine(
+        get_async_database_url(settings),
+        echo=settings.echo_sql,
+        pool_pre_ping=settings.pool_pre_ping and not settings.is_sqlite,
+    )
+    if settings.is_sqlite:
+        install_sqlite_pragmas(new_engine.sync_engine, sqlite_pragmas(settings))
+    install_query_metrics(new_engine.sync_engine)
+    return new_engine
 
-# Global database settings instance
-db_settings = DatabaseSettings()
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    db_settings.database_url,
-    echo=db_settings.echo_sql,
-    pool_pre_ping=db_settings.pool_pre_ping,
-    connect_args={"check_same_thread": False}  # Required for SQLite with FastAPI
-)
+_db_settings: Optional[DatabaseSettings] = None
+_engine: Optional[Engine] = None
+_async_engine: Optional["AsyncEngine"] = None
+_async_session_factory: Optional["async_sessionmaker"] = None
+_init_lock = threading.Lock()
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_db_settings() -> DatabaseSettings:
+    """Return the global database settings, read from the environment on first call."""
+    global _db_settings
+    if _db_settings is None:
+        with _init_lock:
+            if _db_settings is None:
+                _db_settings = DatabaseSettings()
+    return _db_settings
+
+
+def get_engine() -> Engine:
+    """Return the global sync engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        settings = get_db_settings()
+        with _init_lock:
+            if _engine is None:
+                _engine = build_engine(settings)
+    return _engine
+
+
+def get_async_engine() -> "AsyncEngine":
+    """Return the global asyncio engine (aiosqlite), creating it on first call."""
+    global _async_engine
+    if _async_engine is None:
+        settings = get_db_settings()
+        with _init_lock:
+            if _async_engine is None:
+                _async_engine = build_async_engine(settings)
+    return _async_engine
+
+
+def get_async_session_factory() -> "async_sessionmaker":
+    """Return the global async session factory, creating it on first call."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+        async_engine = get_async_engine()
+        with _init_lock:
+            if _async_session_factory is None:
+                # Objects stay usable after commit without a reload
+                _async_session_factory = async_sessionmaker(
+                    bind=async_engine,
+                    class_=AsyncSession,
+                    autoflush=False,
+                    expire_on_commit=False,
+                )
+    return _async_session_factory
+
+
+async def dispose_engines() -> None:
+    """Dispose whichever engines were created; used at application shutdown."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+class LazySessionMaker(sessionmaker):
+    """`sessionmaker` that binds to `get_engine()` the first time a session is opened."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None and "bind" not in local_kw:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+# Session factory; creating it does not touch the database
+SessionLocal = LazySessionMaker(autocommit=False, autoflush=False)
+
+
+def __getattr__(name: str):
+    # Lazy module attributes kept for existing `database.engine`-style access
+    if name == "db_settings":
+        return get_db_settings()
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    if name == "AsyncSessionLocal":
+        return get_async_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_database_session():
@@ -52,10 +270,20 @@ def get_database_session():
         db.close()
 
 
+async def get_async_database_session():
+    """
+    Dependency function to get an async database session.
+    Use this in `async def` FastAPI endpoints so queries don't block the event loop.
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+
 def get_database_path() -> Path:
     """Get the path to the SQLite database file."""
-    if db_settings.database_url.startswith("sqlite:///"):
-        db_path = db_settings.database_url.replace("sqlite:///", "")
+    settings = get_db_settings()
+    if settings.database_url.startswith("sqlite:///"):
+        db_path = settings.database_url.replace("sqlite:///", "")
         return Path(db_path).resolve()
     else:
         raise ValueError("Only SQLite databases are supported for path extraction")
@@ -0,0 +1,48 @@
+"""
+HTTP transport configuration for outbound API clients.
+
+These settings drive the shared, long-lived `httpx.AsyncClient` owned by the
+application lifespan (see `BaseAPIClient.startup`).
+"""
+
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class HttpClientSettings(BaseSettings):
+    """Connection pool, protocol and timeout settings for upstream APIs."""
+
+    # Connection pool
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+
+    # Maximum number of in-flight requests per upstream host
+    per_host_concurrency: int = 10
+
+    # Token-bucket rate limit per upstream host for batch fetches (None = unlimited)
+    rate_limit_per_second: Optional[float] = None
+    rate_limit_burst: Optional[int] = None
+
+    # Retries of transient failures (timeouts, connection errors, 429/5xx)
+    retry_max_attempts: int = 4
+    retry_base_delay: float = 0.25  # Seconds; doubled per attempt, fully jittered
+    retry_max_delay: float = 10.0
+
+    # Requires the optional `h2` package (pip install "httpx[http2]")
+    http2: bool = False
+
+    # Timeouts in seconds
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+
+    class Config:
+        env_prefix = "HTTP_"
+        case_sensitive = False
+
+
+# Global HTTP client settings instance
+http_client_settings = HttpClientSettings()
@@ -0,0 +1,44 @@
+"""
+Instrumentation configuration.
+
+These settings drive the request metrics, query/upstream timing hooks and the
+on-demand profiler (see `app.setup.instrumentation` and `app.utils.metrics`).
+Everything is off unless `METRICS_ENABLED` is set.
+"""
+
+from typing import List, Optional
+
+from pydantic_settings import BaseSettings
+
+
+class MetricsSettings(BaseSettings):
+    """Switches and limits for metrics collection and request profiling."""
+
+    # Master switch: middleware, SQL and upstream hooks and the /metrics endpoints
+    enabled: bool = False
+
+    # Serve /metrics and honour profiling requests from non-loopback clients too
+    # (put it behind a proxy first)
+    allow_remote: bool = False
+
+    # Histogram buckets for request, query and upstream latencies, in seconds
+    latency_buckets: List[float] = [
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+    ]
+
+    # Log statements slower than this many seconds (None = never)
+    slow_query_seconds: Optional[float] = None
+
+    # Sampling profiler, triggered per request by the `X-Profile: 1` header or `_profile=1`
+    profiling_enabled: bool = False
+    profile_interval_ms: float = 5.0  # Stack sampling period
+    profile_max_seconds: float = 30.0  # Sampling stops after this, even if the request continues
+    profiles_kept: int = 20  # Most recent profiles served by /metrics/profiles
+
+    class Config:
+        env_prefix = "METRICS_"
+        case_sensitive = False
+
+
+# Global metrics settings instance
+metrics_settings = MetricsSettings()
@@ -9,6 +9,7 @@ Usage:
     from app.dal.api_clients.some_client import SomeAPIClient
 """
 
+from app.dal.api_clients.fetch_orchestrator import FetchOrchestrator, FetchResult, RetryPolicy
 from app.dal.api_clients.price.mandi_commodities_price_client import MandiPriceClient
 
-__all__ = [MandiPriceClient]
+__all__ = [FetchOrchestrator, FetchResult, MandiPriceClient, RetryPolicy]
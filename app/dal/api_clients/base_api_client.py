@@ -1,11 +1,239 @@
+import asyncio
+import importlib.util
+import inspect
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Sequence, Union
+
 import httpx
+from loguru import logger
+
+from app.configuration.http_client import HttpClientSettings, http_client_settings
+from app.helpers.csv_parser import DEFAULT_BATCH_SIZE, DEFAULT_CHUNK_SIZE, CsvBatch, CsvColumn, CsvStreamParser
+from app.utils import metrics
+
+BatchSink = Callable[[CsvBatch], Union[Awaitable[Any], Any]]
+
+_END_OF_STREAM = object()
+
+
+class _LoopResources:
+    """The pooled transport and host semaphores of one event loop."""
+
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
 
 
 class BaseAPIClient:
+    """
+    Base class for upstream API clients.
+
+    All clients share one pooled `httpx.AsyncClient` so repeated calls reuse
+    keep-alive connections instead of paying a TCP/TLS handshake each time.
+    Connections and semaphores are bound to the event loop that created them,
+    so the transport and the per-host semaphores are kept per running loop.
+    The application lifespan calls `startup`/`shutdown`; if a client is used
+    outside the app (CLI, scripts) the transport is created lazily, and the
+    caller should `await BaseAPIClient.shutdown()` before its loop ends.
+    """
+
+    _settings: HttpClientSettings = http_client_settings
+    _loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources]" = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _build_client(settings: HttpClientSettings) -> httpx.AsyncClient:
+        http2 = settings.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.connect_timeout,
+                read=settings.read_timeout,
+                write=settings.write_timeout,
+                pool=settings.pool_timeout,
+            ),
+        )
+
+    @staticmethod
+    def _loop_resources() -> _LoopResources:
+        loop = asyncio.get_running_loop()
+        resources = BaseAPIClient._loops.get(loop)
+        if resources is None:
+            resources = BaseAPIClient._loops[loop] = _LoopResources()
+        return resources
+
+    @classmethod
+    async def startup(cls, settings: Optional[HttpClientSettings] = None) -> None:
+        """Create the shared transport. Called from the application lifespan."""
+        await cls.shutdown()
+        BaseAPIClient._settings = settings or http_client_settings
+        cls._loop_resources().client = cls._build_client(BaseAPIClient._settings)
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """
+        Close the running loop's transport, including one created lazily,
+        and release its pooled connections and host semaphores.
+        """
+        resources = BaseAPIClient._loops.pop(asyncio.get_running_loop(), None)
+        if resources is not None and resources.client is not None:
+            await resources.client.aclose()
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """Return the running loop's shared transport, creating it on first use."""
+        resources = cls._loop_resources()
+        if resources.client is None or resources.client.is_closed:
+            resources.client = cls._build_client(BaseAPIClient._settings)
+        return resources.client
+
+    @classmethod
+    def host_semaphore(cls, url: str) -> asyncio.Semaphore:
+        """Return the semaphore bounding concurrent requests to the host of `url`."""
+        host = httpx.URL(url).host
+        semaphores = cls._loop_resources().host_semaphores
+        semaphore = semaphores.get(host)
+        if semaphore is None:
+            semaphore = semaphores[host] = asyncio.Semaphore(BaseAPIClient._settings.per_host_concurrency)
+        return semaphore
 
     @staticmethod
-    async def fetch_csv(url: str) -> str:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.text
+    def _observe_upstream(url: str, response: Optional[httpx.Response], started: float) -> None:
+        """Record an upstream call's latency when metrics are enabled (`response` None = failed)."""
+        if metrics.registry.enabled:
+            status = None if response is None else response.status_code
+            metrics.observe_upstream(httpx.URL(url).host, status, time.perf_counter() - started)
+
+    @classmethod
+    async def fetch_csv(cls, url: str) -> str:
+        async with cls.host_semaphore(url):
+            started = time.perf_counter()
+            try:
+                response = await cls.get_client().get(url)
+            except httpx.HTTPError:
+                cls._observe_upstream(url, None, started)
+                raise
+            cls._observe_upstream(url, response, started)
+        response.raise_for_status()
+        return response.text
+
+    @classmethod
+    @asynccontextmanager
+    async def open_stream(cls, url: str, headers: Optional[Dict[str, str]] = None) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streamed GET whose body has not been read yet.
+
+        Pass `If-None-Match` / `If-Modified-Since` in `headers` for a conditional
+        request; a `304 Not Modified` response is returned as-is, any other
+        non-2xx status raises `httpx.HTTPStatusError`.
+        """
+        async with cls.host_semaphore(url):
+            started = time.perf_counter()
+            response = None
+            try:
+                async with cls.get_client().stream("GET", url, headers=headers) as response:
+                    cls._observe_upstream(url, response, started)
+                    if response.status_code != httpx.codes.NOT_MODIFIED:
+                        response.raise_for_status()
+                    yield response
+            except httpx.HTTPError:
+                # Only failures before the response arrived; later ones were already recorded
+                if response is None:
+                    cls._observe_upstream(url, None, started)
+                raise
+
+    @classmethod
+    async def stream_csv_batches(
+        cls,
+        url: str,
+        schema: Optional[Sequence[CsvColumn]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[CsvBatch]:
+        """
+        Download a CSV and yield typed batches while the body is still arriving.
+
+        The response is never buffered as a whole; each received chunk is fed to
+        an incremental `CsvStreamParser`, so the first rows are available as soon
+        as the first chunk lands.
+        """
+        parser = CsvStreamParser(schema, batch_size=batch_size)
+        async with cls.open_stream(url) as response:
+            async for chunk in response.aiter_bytes(chunk_size):
+                for batch in parser.feed(chunk):
+                    yield batch
+        for batch in parser.close():
+            yield batch
+
+    @classmethod
+    async def stream_csv(
+        cls,
+        url: str,
+        sink: BatchSink,
+        schema: Optional[Sequence[CsvColumn]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_pending_batches: int = 4,
+    ) -> int:
+        """
+        Download, parse and persist a CSV as overlapping stages.
+
+        A producer task downloads and parses into a bounded queue while the
+        caller's `sink` consumes batches (e.g. a DB writer). When the sink falls
+        behind, the full queue pauses the download, so memory stays bounded by
+        `max_pending_batches` batches. Synchronous sinks run in a worker thread.
+
+        Args:
+            url: CSV endpoint to download.
+            sink: Callable receiving each `CsvBatch`; may be sync or async.
+            schema: Columns to extract and convert.
+            batch_size: Rows per batch handed to the sink.
+            max_pending_batches: Parsed batches allowed to queue ahead of the sink.
+
+        Returns:
+            Total number of rows delivered to the sink.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+        is_async_sink = inspect.iscoroutinefunction(sink) or inspect.iscoroutinefunction(
+            getattr(sink, "__call__", None)
+        )
+
+        async def produce() -> None:
+            try:
+                async for batch in cls.stream_csv_batches(url, schema, batch_size):
+                    await queue.put(batch)
+            finally:
+                # When cancelled, the consumer is gone and the queue may be full
+                if not asyncio.current_task().cancelling():
+                    await queue.put(_END_OF_STREAM)
+
+        producer = asyncio.create_task(produce())
+        rows = 0
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is _END_OF_STREAM:
+                    break
+                if is_async_sink:
+                    await sink(batch)
+                else:
+                    await asyncio.to_thread(sink, batch)
+                rows += len(batch)
+        except BaseException:
+            producer.cancel()
+            # Let the download close its stream; the sink's error is the one raised
+            await asyncio.gather(producer, return_exceptions=True)
+            raise
+
+        # Re-raises any download or parse error from the producer
+        await producer
+        return rows
@@ -0,0 +1,285 @@
+"""
+Parallel fetching of many upstream URLs.
+
+A full mandi refresh touches thousands of per-state / per-commodity URLs.
+`FetchOrchestrator` runs such a batch on the shared `BaseAPIClient` transport:
+
+- bounded overall concurrency, on top of the per-host semaphores of the client;
+- an optional token-bucket rate limit per host;
+- retries of transient failures (timeouts, connection errors, 429 and 5xx)
+  with fully jittered exponential backoff, honouring `Retry-After`;
+- results streamed in completion order as soon as each URL finishes;
+- per-host counters (requests, retries, failures, bytes, throughput).
+
+Usage:
+    orchestrator = FetchOrchestrator(concurrency=64)
+    async for result in orchestrator.fetch_all(urls):
+        if result.ok:
+            handle(result.url, result.text)
+    print(orchestrator.host_report())
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, NamedTuple, Optional
+
+import httpx
+
+from app.configuration.http_client import HttpClientSettings, http_client_settings
+from app.dal.api_clients.base_api_client import BaseAPIClient
+
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+# Any other failure of a single URL (bad URL, unsupported scheme, redirect loop,
+# undecodable body); returned as a failed result without retrying
+PERMANENT_ERRORS = (httpx.HTTPError, httpx.InvalidURL)
+
+_WORKER_DONE = object()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Args:
+        max_attempts: Total attempts per URL, including the first.
+        base_delay: Backoff cap for the first retry, in seconds.
+        max_delay: Upper bound of any single backoff.
+        retry_statuses: HTTP statuses treated as transient.
+    """
+    max_attempts: int = 4
+    base_delay: float = 0.25
+    max_delay: float = 10.0
+    retry_statuses: FrozenSet[int] = frozenset({408, 429, 500, 502, 503, 504})
+
+    @classmethod
+    def from_settings(cls, settings: HttpClientSettings) -> "RetryPolicy":
+        return cls(settings.retry_max_attempts, settings.retry_base_delay, settings.retry_max_delay)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # "Full jitter": uniform over [0, capped exponential]
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class TokenBucket:
+    """
+    Async token bucket: at most `rate` acquisitions per second on average,
+    with bursts of up to `burst`. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class FetchResult(NamedTuple):
+    url: str
+    status_code: Optional[int]
+    text: Optional[str]
+    attempts: int
+    elapsed: float
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class HostStats:
+    """Counters for one upstream host."""
+    __slots__ = ("requests", "successes", "failures", "retries", "bytes", "started", "finished")
+
+    def __init__(self):
+        self.requests = self.successes = self.failures = self.retries = self.bytes = 0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    def as_dict(self) -> Dict[str, float]:
+        elapsed = self.elapsed
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "elapsed_seconds": round(elapsed, 3),
+            "urls_per_second": round(self.successes / elapsed, 2) if elapsed else 0.0,
+            "bytes_per_second": round(self.bytes / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None  # HTTP-date form; fall back to jittered backoff
+
+
+class FetchOrchestrator:
+    """
+    Fetch batches of URLs concurrently through the shared API client.
+
+    Args:
+        concurrency: Maximum URLs in flight across all hosts. Per-host
+            concurrency is further bounded by `BaseAPIClient.host_semaphore`.
+        rate_per_second: Token-bucket rate per host; from settings when omitted,
+            unlimited when that is None as well.
+        burst: Token-bucket capacity per host.
+        retry: Retry policy; from settings when omitted.
+        client: API client class providing the transport.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 50,
+        rate_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        retry: Optional[RetryPolicy] = None,
+        client: type = BaseAPIClient,
+        settings: HttpClientSettings = http_client_settings,
+    ):
+        self.concurrency = concurrency
+        self.rate_per_second = settings.rate_limit_per_second if rate_per_second is None else rate_per_second
+        self.burst = settings.rate_limit_burst if burst is None else burst
+        self.retry = retry or RetryPolicy.from_settings(settings)
+        self.client = client
+        self.stats: Dict[str, HostStats] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _host_stats(self, host: str) -> HostStats:
+        stats = self.stats.get(host)
+        if stats is None:
+            stats = self.stats[host] = HostStats()
+        return stats
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        if not self.rate_per_second:
+            return None
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate_per_second, self.burst)
+        return bucket
+
+    async def fetch(self, url: str) -> FetchResult:
+        """
+        Fetch one URL, retrying transient failures. Never raises for invalid
+        URLs, HTTP or transport errors; they are returned in `FetchResult.error`.
+        """
+        try:
+            host = httpx.URL(url).host
+        except httpx.InvalidURL as error:
+            return FetchResult(url, None, None, 0, 0.0, error)
+        stats = self._host_stats(host)
+        bucket = self._bucket(host)
+        started = time.monotonic()
+        if stats.started is None:
+            stats.started = started
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if bucket is not None:
+                await bucket.acquire()
+            stats.requests += 1
+            status_code = retry_after = None
+            try:
+                async with self.client.host_semaphore(url):
+                    attempt_started = time.perf_counter()
+                    try:
+                        response = await self.client.get_client().get(url)
+                    except PERMANENT_ERRORS:
+                        BaseAPIClient._observe_upstream(url, None, attempt_started)
+                        raise
+                    BaseAPIClient._observe_upstream(url, response, attempt_started)
+                status_code = response.status_code
+                response.raise_for_status()
+            except TRANSIENT_ERRORS as error:
+                failure, transient = error, True
+            except httpx.HTTPStatusError as error:
+                failure, transient = error, status_code in self.retry.retry_statuses
+                retry_after = _retry_after_seconds(error.response)
+            except PERMANENT_ERRORS as error:
+                failure, transient = error, False
+            else:
+                stats.successes += 1
+                stats.bytes += len(response.content)
+                stats.finished = time.monotonic()
+                return FetchResult(url, status_code, response.text, attempt, stats.finished - started)
+
+            if not transient or attempt >= self.retry.max_attempts:
+                stats.failures += 1
+                stats.finished = time.monotonic()
+                return FetchResult(url, status_code, None, attempt, stats.finished - started, failure)
+            stats.retries += 1
+            await asyncio.sleep(self.retry.backoff(attempt, retry_after))
+
+    async def fetch_all(self, urls: Iterable[str]) -> AsyncIterator[FetchResult]:
+        """
+        Fetch every URL and yield results in completion order.
+
+        URLs are pulled lazily from `urls`, so generators of any length are
+        fine; at most `concurrency` requests and `2 * concurrency` finished
+        results are held at once. Closing the iterator early cancels the
+        remaining work.
+        """
+        pending = iter(urls)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.concurrency)
+
+        async def worker() -> None:
+            try:
+                for url in pending:
+                    await queue.put(await self.fetch(url))
+            except asyncio.CancelledError:
+                raise
+            except BaseException as error:  # Surface unexpected bugs to the consumer
+                await queue.put(error)
+            await queue.put(_WORKER_DONE)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        running = len(workers)
+        try:
+            while running:
+                item = await queue.get()
+                if item is _WORKER_DONE:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def host_report(self) -> Dict[str, Dict[str, float]]:
+        """Per-host counters and throughput for everything fetched so far."""
+        return {host: stats.as_dict() for host, stats in self.stats.items()}
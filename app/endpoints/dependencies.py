@@ -0,0 +1,27 @@
+"""
+FastAPI dependencies shared by the routers.
+
+Routers are imported when the application starts, so they take the database
+session from here: `app.configuration.database` (and SQLAlchemy with it) is
+only imported when the first request needs a session.
+"""
+
+
+def get_database_session():
+    """`app.configuration.database.get_database_session`, imported on first use."""
+    from app.configuration.database import get_database_session as database_session
+
+    yield from database_session()
+
+
+def get_session_factory():
+    """
+    The application's session factory, for endpoints that open their own sessions.
+
+    Endpoints wrapped in `cache_response` may be re-run by a stale-while-revalidate
+    refresh after their request has finished, when a request-scoped session from
+    `get_database_session` is already closed.
+    """
+    from app.configuration.database import SessionLocal
+
+    return SessionLocal
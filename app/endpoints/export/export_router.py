@@ -0,0 +1,49 @@
+"""
+Endpoints for streaming bulk exports of region and price data.
+
+The export service is imported on first use, so starting the app does not
+load SQLAlchemy.
+"""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.models.enums import ExportFormat
+
+export_router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@export_router.get("/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: ExportFormat = ExportFormat.NDJSON,
+    state_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    commodity_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Stream a whole dataset (`states`, `districts`, `subdistricts`, `cities` or
+    `prices`) as NDJSON, CSV or compact binary columnar data.
+
+    The body is sent in chunks as rows are read, so memory use does not depend
+    on the size of the export. Date bounds and `commodity_id` apply to `prices` only.
+    """
+    from app.services.export import DATASETS, BulkExport, ExportFilters
+
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}'")
+    filters = ExportFilters(state_id, district_id, commodity_id, start_date, end_date)
+    try:
+        export = BulkExport(dataset, format, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        export,
+        media_type=export.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{export.filename}"'},
+    )
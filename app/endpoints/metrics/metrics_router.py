@@ -0,0 +1,55 @@
+"""
+Endpoints exposing process metrics and captured request profiles.
+
+Only included when `METRICS_ENABLED` is set (see `install_instrumentation`),
+and only answered for loopback clients unless `METRICS_ALLOW_REMOTE` is set.
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response
+
+from app.utils.fast_json import FastJSONResponse
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, is_local_client, registry
+from app.utils.profiling import profile_store
+
+metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+def _check_local(request: Request) -> None:
+    if registry.settings.allow_remote:
+        return
+    if not is_local_client(request.client.host if request.client else None):
+        raise HTTPException(status_code=403, detail="Metrics are only served to local clients")
+
+
+@metrics_router.get("", response_class=PlainTextResponse)
+def metrics(request: Request):
+    """
+    Request, SQL, upstream API and cache metrics in the Prometheus text format.
+    """
+    _check_local(request)
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@metrics_router.get("/profiles")
+def list_profiles(request: Request):
+    """
+    Recently captured request profiles, newest first, with their top functions.
+
+    Send a request with the `X-Profile: 1` header (or `_profile=1` in the query
+    string) to capture one; its id is returned in the `X-Profile-Id` header.
+    """
+    _check_local(request)
+    return FastJSONResponse([profile.summary() for profile in profile_store.list()])
+
+
+@metrics_router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(request: Request, profile_id: int):
+    """
+    One profile as collapsed stacks, for flamegraph.pl or speedscope.
+    """
+    _check_local(request)
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return PlainTextResponse(profile.collapsed())
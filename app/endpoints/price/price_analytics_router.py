@@ -0,0 +1,79 @@
+"""
+Endpoints for price analytics: anomalies, moving averages and volatility.
+
+The analytics service pulls in NumPy and SQLAlchemy, so it is imported on
+first use rather than at application startup. Responses are served through
+`cache_response`, so each endpoint opens its own session from
+`get_session_factory`.
+"""
+
+from datetime import date
+from typing import TYPE_CHECKING, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.endpoints.dependencies import get_session_factory
+from app.models.schema.response.price_response import DistrictDayPriceResponse, PriceAnomalyResponse
+from app.utils.cache import cache_response
+from app.utils.fast_json import FastJSONResponse, project_rows
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import sessionmaker
+
+price_analytics_router = APIRouter(prefix="/prices/analytics", tags=["prices"])
+
+
+def _check_range(start: date, end: date) -> None:
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+
+@price_analytics_router.get("/districts/{district_id}/anomalies", response_model=List[PriceAnomalyResponse])
+@cache_response()
+def get_district_anomalies(
+    district_id: int,
+    commodity_id: int,
+    start: date,
+    end: date,
+    window: int = Query(30, ge=2, le=365),
+    threshold: float = Query(3.0, gt=0),
+    spike_ratio: float = Query(0.25, gt=0),
+    sessions: "sessionmaker" = Depends(get_session_factory),
+):
+    """
+    Market prices in a district whose z-score against the last `window`
+    prices of the same variety at the market reaches `threshold`, or that
+    differ by `spike_ratio` or more from that variety at the district's other
+    markets that day.
+    """
+    from app.services.price.price_analytics import district_price_anomalies
+
+    _check_range(start, end)
+    with sessions() as db:
+        anomalies = district_price_anomalies(
+            db, commodity_id, district_id, start, end, window=window, threshold=threshold, spike_ratio=spike_ratio
+        )
+    return FastJSONResponse(project_rows(anomalies))
+
+
+@price_analytics_router.get("/states/{state_id}/districts", response_model=List[DistrictDayPriceResponse])
+@cache_response()
+def get_state_district_prices(
+    state_id: int,
+    commodity_id: int,
+    start: date,
+    end: date,
+    window: int = Query(7, ge=1, le=365),
+    sessions: "sessionmaker" = Depends(get_session_factory),
+):
+    """
+    Daily mean, min and max price of a commodity in every district of a state,
+    with the moving average and volatility of the daily mean over `window`
+    trading days.
+    """
+    from app.services.price.price_analytics import state_district_prices
+
+    _check_range(start, end)
+    with sessions() as db:
+        rows = state_district_prices(db, commodity_id, state_id, start, end, window=window)
+    return FastJSONResponse(project_rows(rows))
@@ -0,0 +1,47 @@
+"""
+Endpoints for stored mandi price history.
+
+The repository is imported on first use (see `app.endpoints.dependencies`),
+so starting the app does not load SQLAlchemy.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.endpoints.dependencies import get_database_session
+from app.models.schema.response.price_response import PriceResponse
+from app.utils.fast_json import page_response
+from app.utils.pagination import InvalidCursor, PageParams, PageResponse, page_params
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+price_history_router = APIRouter(prefix="/prices", tags=["prices"])
+
+
+@price_history_router.get("/history", response_model=PageResponse[PriceResponse])
+def list_price_history(
+    commodity_id: int,
+    district_id: Optional[int] = None,
+    market_id: Optional[int] = None,
+    page: PageParams = Depends(page_params),
+    db: "Session" = Depends(get_database_session),
+):
+    """
+    A commodity's price history at one market or across one district, oldest
+    first (keyset paginated). Exactly one of `market_id` / `district_id` is required.
+    """
+    from app.repositories.price import MandiPriceRepository
+
+    if (district_id is None) == (market_id is None):
+        raise HTTPException(status_code=400, detail="Pass exactly one of district_id or market_id")
+    repository = MandiPriceRepository(db)
+    try:
+        if market_id is not None:
+            result = repository.market_prices_page(commodity_id, market_id, page.cursor, page.limit)
+        else:
+            result = repository.district_prices_page(commodity_id, district_id, page.cursor, page.limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_response(result)
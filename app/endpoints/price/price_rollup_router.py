@@ -0,0 +1,79 @@
+"""
+Endpoints for pre-aggregated mandi price rollups.
+
+The repository is imported on first use (see `app.endpoints.dependencies`),
+so starting the app does not load SQLAlchemy. Responses are served through
+`cache_response`, so each endpoint opens its own session from
+`get_session_factory`.
+"""
+
+from datetime import date
+from typing import TYPE_CHECKING, List
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.endpoints.dependencies import get_session_factory
+from app.models.enums import RollupGrain, RollupLevel
+from app.models.schema.response.price_response import PriceRollupResponse, PriceSummaryResponse
+from app.utils.cache import cache_response
+from app.utils.fast_json import FastJSONResponse, project_rows
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import sessionmaker
+
+price_rollup_router = APIRouter(prefix="/prices/rollups", tags=["prices"])
+
+
+def _check_range(start: date, end: date) -> None:
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+
+@price_rollup_router.get("/{level}/{region_id}/series", response_model=List[PriceRollupResponse])
+@cache_response()
+def get_rollup_series(
+    level: RollupLevel,
+    region_id: int,
+    commodity_id: int,
+    start: date,
+    end: date,
+    grain: RollupGrain = RollupGrain.WEEK,
+    sessions: "sessionmaker" = Depends(get_session_factory),
+):
+    """
+    Daily, weekly or monthly average modal price and min/max spread of a
+    commodity in a district or state, for every period overlapping the range.
+    """
+    from app.repositories.price import PriceRollupRepository
+
+    _check_range(start, end)
+    with sessions() as db:
+        rows = PriceRollupRepository(db).series(commodity_id, level, region_id, grain, start, end)
+    return FastJSONResponse(project_rows(rows))
+
+
+@price_rollup_router.get("/{level}/{region_id}/summary", response_model=PriceSummaryResponse)
+@cache_response()
+def get_rollup_summary(
+    level: RollupLevel,
+    region_id: int,
+    commodity_id: int,
+    start: date,
+    end: date,
+    sessions: "sessionmaker" = Depends(get_session_factory),
+):
+    """
+    Average modal price and min/max spread of a commodity in a district or
+    state over exactly `start`..`end`, read from the coarsest rollups covering it.
+    """
+    from app.repositories.price import PriceRollupRepository
+
+    _check_range(start, end)
+    with sessions() as db:
+        summary = PriceRollupRepository(db).summary(commodity_id, level, region_id, start, end)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No prices in the requested range")
+    return PriceSummaryResponse(
+        start=start, end=end, row_count=summary.row_count, avg_modal_price=summary.avg_modal_price,
+        min_price=summary.min_price, max_price=summary.max_price,
+    )
@@ -0,0 +1,79 @@
+"""
+Endpoints for the region hierarchy.
+
+Repositories and services are imported on first use (see
+`app.endpoints.dependencies`), so starting the app does not load SQLAlchemy.
+State trees are served through `cache_response`, so the endpoint opens its own
+session from `get_session_factory`.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.endpoints.dependencies import get_database_session, get_session_factory
+from app.models.schema.response.region_response import CityDetailResponse, DistrictResponse, StateTreeResponse
+from app.utils.cache import cache_response
+from app.utils.fast_json import FastJSONResponse, page_response
+from app.utils.pagination import InvalidCursor, PageParams, PageResponse, page_params
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session, sessionmaker
+
+region_router = APIRouter(prefix="/regions", tags=["regions"])
+
+
+@region_router.get("/states/{state_id}/tree", response_model=StateTreeResponse)
+@cache_response()
+def get_state_tree(
+    state_id: int, include_cities: bool = True, sessions: "sessionmaker" = Depends(get_session_factory)
+):
+    """
+    A state with its capital, districts, subdistricts and cities.
+
+    Served in a fixed number of queries (`STATE_TREE_QUERIES`) however large
+    the state is, and cached. The tree is built from trusted rows, so it is
+    encoded directly rather than validated against `StateTreeResponse`.
+    """
+    from app.services.region.state_tree import build_state_tree
+
+    with sessions() as db:
+        tree = build_state_tree(db, state_id, include_cities=include_cities)
+    if tree is None:
+        raise HTTPException(status_code=404, detail=f"State {state_id} not found")
+    return FastJSONResponse(tree)
+
+
+@region_router.get("/districts", response_model=PageResponse[DistrictResponse])
+def list_districts(
+    state_id: Optional[int] = None,
+    page: PageParams = Depends(page_params),
+    db: "Session" = Depends(get_database_session),
+):
+    """Districts by name within a state, or by id across all states (keyset paginated)."""
+    from app.repositories.region import RegionRepository
+
+    try:
+        return page_response(RegionRepository(db).districts_page(page.cursor, page.limit, state_id=state_id))
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@region_router.get("/cities", response_model=PageResponse[CityDetailResponse])
+def list_cities(
+    state_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    subdistrict_id: Optional[int] = None,
+    page: PageParams = Depends(page_params),
+    db: "Session" = Depends(get_database_session),
+):
+    """Cities filtered by at most one parent id (keyset paginated)."""
+    from app.repositories.region import RegionRepository
+
+    try:
+        result = RegionRepository(db).cities_page(
+            page.cursor, page.limit, state_id=state_id, district_id=district_id, subdistrict_id=subdistrict_id
+        )
+    except ValueError as e:  # Includes InvalidCursor
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_response(result)
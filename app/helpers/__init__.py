@@ -8,6 +8,24 @@ Usage:
     from app.helpers.date_utils import parse_date
 """
 
-from app.helpers.csv_parser import parse_csv
+from app.helpers.csv_parser import (
+    CsvBatch,
+    CsvColumn,
+    CsvStreamParser,
+    date_converter,
+    enum_converter,
+    iter_csv_batches,
+    iter_csv_file,
+    parse_csv,
+)
 
-__all__ = [parse_csv]
+__all__ = [
+    CsvBatch,
+    CsvColumn,
+    CsvStreamParser,
+    date_converter,
+    enum_converter,
+    iter_csv_batches,
+    iter_csv_file,
+    parse_csv,
+]
@@ -1,8 +1,379 @@
+"""
+CSV parsing helpers.
+
+`parse_csv` is the original convenience helper that turns a whole CSV body into
+a list of dicts. For large feeds use `CsvStreamParser` / `iter_csv_batches`,
+which decode byte chunks incrementally, convert typed columns a batch at a time
+and emit fixed-size columnar `CsvBatch` objects instead of one dict per row.
+
+`shard_csv_file` splits a large file into byte ranges of whole records that
+can be parsed independently (e.g. in worker processes) with `iter_csv_shard`.
+"""
+
+import codecs
 import csv
-from typing import List, Dict
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
 from io import StringIO
+from pathlib import Path
+from typing import Any, AnyStr, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Type
+
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+DEFAULT_SHARD_SIZE = 16 << 20  # 16 MiB
 
 
 def parse_csv(csv_data: str) -> List[Dict[str, str]]:
     reader = csv.DictReader(StringIO(csv_data))
     return [row for row in reader]
+
+
+@dataclass(frozen=True)
+class CsvColumn:
+    """
+    Describes one column to extract from a CSV stream.
+
+    Args:
+        name: Name of the column in the emitted batches.
+        converter: Callable applied to every non-empty cell. Empty cells become None.
+            When omitted the raw string is kept.
+        source: Header label in the file, if it differs from `name`.
+    """
+    name: str
+    converter: Optional[Callable[[str], Any]] = None
+    source: Optional[str] = None
+
+    @property
+    def header(self) -> str:
+        return self.source or self.name
+
+
+def date_converter(fmt: str = "%d/%m/%Y") -> Callable[[str], date]:
+    """
+    Build a converter for date columns.
+
+    Price feeds repeat the same handful of dates across millions of rows, so
+    parsed values are memoized per distinct string.
+    """
+    cache: Dict[str, date] = {}
+
+    def convert(value: str) -> date:
+        parsed = cache.get(value)
+        if parsed is None:
+            parsed = datetime.strptime(value.strip(), fmt).date()
+            cache[value] = parsed
+        return parsed
+
+    return convert
+
+
+def enum_converter(enum_cls: Type[Enum]) -> Callable[[str], Enum]:
+    """Build a converter mapping cell values (case-insensitive) to enum members."""
+    lookup = {str(member.value).lower(): member for member in enum_cls}
+    lookup.update({member.name.lower(): member for member in enum_cls})
+
+    def convert(value: str) -> Enum:
+        try:
+            return lookup[value.strip().lower()]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a valid {enum_cls.__name__}") from None
+
+    return convert
+
+
+class CsvBatch:
+    """
+    A fixed-size block of parsed CSV rows stored column by column.
+
+    Columns are plain lists aligned by position; use `rows()` to iterate tuples
+    (e.g. for `executemany`) without materializing per-row dicts.
+    """
+    __slots__ = ("names", "columns")
+
+    def __init__(self, names: Sequence[str], columns: List[List[Any]]):
+        self.names = tuple(names)
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, name: str) -> List[Any]:
+        return self.columns[self.names.index(name)]
+
+    def rows(self) -> Iterator[tuple]:
+        return zip(*self.columns)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        names = self.names
+        return [dict(zip(names, row)) for row in self.rows()]
+
+
+def _convert_column(values: Sequence[str], converter: Optional[Callable[[str], Any]]) -> List[Any]:
+    if converter is None:
+        return list(values)
+    return [converter(value) if value != "" else None for value in values]
+
+
+def _record_boundary(text: AnyStr, quotechar: Optional[str] = '"') -> int:
+    """
+    Return the offset just past the last complete CSV record in `text` (str or bytes).
+
+    A newline only ends a record when it is outside a quoted field, i.e. when
+    the number of quote characters before it is even ("" escapes keep parity).
+    With `quotechar` None (`csv.QUOTE_NONE`) every newline ends a record.
+    """
+    if isinstance(text, str):
+        newline, quote = "\n", quotechar
+    else:
+        newline, quote = b"\n", quotechar and quotechar.encode("ascii")
+    end = text.rfind(newline)
+    if end < 0 or quote is None:
+        return end + 1
+    quotes = text.count(quote, 0, end)
+    while quotes % 2:
+        previous = text.rfind(newline, 0, end)
+        if previous < 0:
+            return 0
+        quotes -= text.count(quote, previous, end)
+        end = previous
+    return end + 1
+
+
+def _dialect_quotechar(fmtparams: Dict[str, Any]) -> Optional[str]:
+    """Quote character of the `csv.reader` dialect `fmtparams` describe, or None when quoting is off."""
+    dialect = csv.reader(StringIO(), **fmtparams).dialect
+    if dialect.escapechar is not None:
+        raise ValueError("escapechar is not supported by the streaming CSV parser")
+    return None if dialect.quoting == csv.QUOTE_NONE else dialect.quotechar
+
+
+class CsvStreamParser:
+    """
+    Push-based, incremental CSV parser for byte streams.
+
+    Feed raw byte chunks as they arrive (from a file or an HTTP response); each
+    call returns the batches that became complete. Multi-byte characters and
+    quoted fields split across chunk boundaries are carried over to the next call,
+    so memory stays bounded by `batch_size` rows plus one chunk.
+
+    Args:
+        schema: Columns to extract and convert. When omitted every column is kept as str.
+        batch_size: Number of rows per emitted batch.
+        encoding: Text encoding of the byte stream. A UTF-8 BOM is stripped.
+        fmtparams: Extra keyword arguments passed to `csv.reader`. Records are
+            cut at newlines outside the dialect's `quotechar`, so an
+            `escapechar` (which can hide a quote or newline) is rejected.
+    """
+
+    def __init__(
+        self,
+        schema: Optional[Sequence[CsvColumn]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        encoding: str = "utf-8-sig",
+        **fmtparams: Any,
+    ):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.schema = list(schema) if schema else None
+        self.batch_size = batch_size
+        self.fmtparams = fmtparams
+        self.quotechar = _dialect_quotechar(fmtparams)
+        self.names: Optional[List[str]] = None
+        self.rows_parsed = 0
+
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ""
+        self._indexes: Optional[List[int]] = None
+        self._converters: List[Optional[Callable[[str], Any]]] = []
+        self._pending: List[List[str]] = []
+
+    def feed(self, chunk: bytes) -> List[CsvBatch]:
+        """Consume a chunk of bytes and return any batches that are now complete."""
+        return self._consume(self._decoder.decode(chunk), final=False)
+
+    def close(self) -> List[CsvBatch]:
+        """Flush buffered input at end of stream and return the remaining batches."""
+        batches = self._consume(self._decoder.decode(b"", final=True), final=True)
+        if self._pending:
+            batches.append(self._build_batch(self._pending))
+            self._pending = []
+        return batches
+
+    def _consume(self, text: str, final: bool) -> List[CsvBatch]:
+        text = self._buffer + text
+        cut = len(text) if final else _record_boundary(text, self.quotechar)
+        ready, self._buffer = text[:cut], text[cut:]
+        if not ready:
+            return []
+
+        reader = csv.reader(StringIO(ready, newline=""), **self.fmtparams)
+        if self._indexes is None:
+            header = next(reader, None)
+            if header is None:
+                return []
+            self._bind_header(header)
+
+        batches = []
+        pending = self._pending
+        room = self.batch_size - len(pending)
+        for row in reader:
+            if not row:
+                continue
+            pending.append(row)
+            room -= 1
+            if not room:
+                batches.append(self._build_batch(pending))
+                pending = []
+                room = self.batch_size
+        self._pending = pending
+        return batches
+
+    def _bind_header(self, header: List[str]) -> None:
+        header = [label.strip() for label in header]
+        if self.schema is None:
+            self.names = header
+            self._indexes = list(range(len(header)))
+            self._converters = [None] * len(header)
+            return
+
+        positions = {label: index for index, label in enumerate(header)}
+        missing = [column.header for column in self.schema if column.header not in positions]
+        if missing:
+            raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+        self.names = [column.name for column in self.schema]
+        self._indexes = [positions[column.header] for column in self.schema]
+        self._converters = [column.converter for column in self.schema]
+
+    def _build_batch(self, rows: List[List[str]]) -> CsvBatch:
+        self.rows_parsed += len(rows)
+        width = max(self._indexes) + 1 if self._indexes else 0
+        # Short rows are padded so zip(*rows) keeps every column aligned
+        for row in rows:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+        raw_columns = list(zip(*rows))
+        columns = [
+            _convert_column(raw_columns[index], converter)
+            for index, converter in zip(self._indexes, self._converters)
+        ]
+        return CsvBatch(self.names, columns)
+
+
+def iter_csv_batches(
+    chunks: Iterable[bytes],
+    schema: Optional[Sequence[CsvColumn]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    encoding: str = "utf-8-sig",
+    **fmtparams: Any,
+) -> Iterator[CsvBatch]:
+    """
+    Lazily parse an iterable of byte chunks into typed, fixed-size batches.
+
+    Args:
+        chunks: Byte chunks, e.g. from `iter_file_chunks` or a streamed HTTP body.
+        schema: Columns to extract and convert. When omitted every column is kept as str.
+        batch_size: Number of rows per emitted batch.
+        encoding: Text encoding of the byte stream.
+
+    Yields:
+        CsvBatch objects holding at most `batch_size` rows.
+    """
+    parser = CsvStreamParser(schema, batch_size=batch_size, encoding=encoding, **fmtparams)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def iter_file_chunks(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a file as a sequence of byte chunks."""
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_csv_file(
+    path: Path,
+    schema: Optional[Sequence[CsvColumn]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: Any,
+) -> Iterator[CsvBatch]:
+    """Stream a CSV file from disk as typed batches with flat memory usage."""
+    return iter_csv_batches(iter_file_chunks(path, chunk_size), schema, batch_size, **kwargs)
+
+
+class CsvFileShard(NamedTuple):
+    """Byte range `start`..`end` of whole records of a CSV file whose header record ends at `header_end`."""
+    path: Path
+    header_end: int
+    start: int
+    end: int
+
+
+def shard_csv_file(
+    path: Path, shard_size: int = DEFAULT_SHARD_SIZE, **fmtparams: Any
+) -> List[CsvFileShard]:
+    """
+    Split a CSV file into shards of roughly `shard_size` bytes.
+
+    Shards start and end on record boundaries (quoted newlines included), so
+    each can be parsed on its own with `iter_csv_shard`. Only quote characters
+    are counted here; nothing is decoded, so the quote character must be ASCII.
+    Pass the same `csv.reader` format parameters as to `iter_csv_shard`.
+    """
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    quotechar = _dialect_quotechar(fmtparams)
+    if quotechar is not None and not quotechar.isascii():
+        raise ValueError(f"quotechar {quotechar!r} is not ASCII")
+    quote = quotechar.encode("ascii") if quotechar is not None else None
+    size = path.stat().st_size
+    shards = []
+    with open(path, "rb") as file:
+        header = b""
+        while True:
+            line = file.readline()
+            header += line
+            if not line or quote is None or header.count(quote) % 2 == 0:
+                break
+        header_end = start = len(header)
+        while start < size:
+            block = file.read(shard_size)
+            cut = len(block) if start + len(block) >= size else _record_boundary(block, quotechar)
+            while not cut:
+                # A single record longer than the shard size
+                more = file.read(shard_size)
+                block += more
+                cut = len(block) if not more else _record_boundary(block, quotechar)
+            shards.append(CsvFileShard(path, header_end, start, start + cut))
+            start += cut
+            file.seek(start)
+    return shards
+
+
+def iter_csv_shard(
+    shard: CsvFileShard,
+    schema: Optional[Sequence[CsvColumn]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: Any,
+) -> Iterator[CsvBatch]:
+    """Parse one shard of a CSV file (see `shard_csv_file`) as typed batches."""
+
+    def chunks() -> Iterator[bytes]:
+        with open(shard.path, "rb") as file:
+            yield file.read(shard.header_end)
+            file.seek(shard.start)
+            remaining = shard.end - shard.start
+            while remaining > 0:
+                chunk = file.read(min(chunk_size, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+    return iter_csv_batches(chunks(), schema, batch_size, **kwargs)
@@ -0,0 +1,95 @@
+"""
+Place-name normalization helpers.
+
+Mandi, census and user input spell the same place differently: diacritics,
+case, punctuation, administrative suffixes ("Haveli Tehsil", "Pune (Rural)")
+and transliteration variants ("Shimoga"/"Shivamogga", "Vadodara"/"Wadodara").
+`normalize_place_name` removes the noise, `phonetic_key` additionally folds
+common transliteration variants, and `trigrams` feeds the n-gram index.
+"""
+
+import re
+import unicodedata
+from typing import Dict, FrozenSet, List, Tuple
+
+# Whole words that describe the kind of unit rather than its name
+ADMINISTRATIVE_WORDS = frozenset({
+    "tehsil", "tahsil", "taluka", "taluk", "tq", "block", "mandal", "circle", "subdivision",
+    "district", "dist", "distt", "city", "town", "village", "rural", "urban",
+    "municipal", "corporation", "mc", "cb", "ct",
+})
+
+# Transliteration variants folded onto one spelling, applied in order
+PHONETIC_FOLDS: Tuple[Tuple[str, str], ...] = (
+    ("aa", "a"), ("ee", "i"), ("oo", "u"), ("ou", "u"),
+    ("ph", "f"), ("sh", "s"), ("kh", "k"), ("gh", "g"), ("bh", "b"),
+    ("dh", "d"), ("th", "t"), ("ck", "k"), ("q", "k"), ("z", "j"), ("w", "v"), ("y", "i"),
+)
+
+# Well-known renamings and exonyms; either side resolves to whichever exists in the data
+KNOWN_ALIASES: Tuple[Tuple[str, str], ...] = (
+    ("Bengaluru", "Bangalore"),
+    ("Gurugram", "Gurgaon"),
+    ("Mumbai", "Bombay"),
+    ("Chennai", "Madras"),
+    ("Kolkata", "Calcutta"),
+    ("Prayagraj", "Allahabad"),
+    ("Mysuru", "Mysore"),
+    ("Belagavi", "Belgaum"),
+    ("Kalaburagi", "Gulbarga"),
+    ("Shivamogga", "Shimoga"),
+    ("Thiruvananthapuram", "Trivandrum"),
+    ("Puducherry", "Pondicherry"),
+    ("Vadodara", "Baroda"),
+    ("Kochi", "Cochin"),
+    ("Ayodhya", "Faizabad"),
+    ("Nuh", "Mewat"),
+    ("Chhatrapati Sambhajinagar", "Aurangabad"),
+    ("Dharashiv", "Osmanabad"),
+)
+
+_PARENTHESIZED = re.compile(r"\([^)]*\)")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_REPEATED = re.compile(r"([a-z])\1+")  # Letters only; "11" and "1" must stay distinct
+
+
+def strip_diacritics(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def normalize_place_name(name: str) -> str:
+    """
+    Canonical form of a place name for exact comparisons.
+
+    Lower-cases, strips diacritics, parenthesized qualifiers, punctuation and
+    administrative words. Falls back to the un-stripped words if nothing remains.
+    """
+    value = strip_diacritics(name).casefold()
+    value = _PARENTHESIZED.sub(" ", value)
+    words = _NON_ALNUM.sub(" ", value).split()
+    kept = [word for word in words if word not in ADMINISTRATIVE_WORDS]
+    return " ".join(kept or words)
+
+
+def phonetic_key(name: str) -> str:
+    """Normalized name with transliteration variants and doubled letters folded."""
+    value = normalize_place_name(name).replace(" ", "")
+    for source, target in PHONETIC_FOLDS:
+        value = value.replace(source, target)
+    return _REPEATED.sub(r"\1", value)
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    """Character trigrams of a phonetic key, padded so short names still match."""
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def known_alias_groups() -> Dict[str, List[str]]:
+    """Map the phonetic key of every known name to all names in its alias group."""
+    groups: Dict[str, List[str]] = {}
+    for names in KNOWN_ALIASES:
+        for name in names:
+            groups[phonetic_key(name)] = list(names)
+    return groups
@@ -0,0 +1,425 @@
+"""
+Vectorized analytics over mandi price series.
+
+`PriceFrame` holds price points column by column as typed NumPy arrays instead
+of one Python object per row: commodity and market ids and variety names are
+dictionary-encoded to dense int32 codes (`frame.commodities[frame.commodity_code]`
+gives the ids back), dates are `datetime64[D]` and prices float64 with NaN for
+missing values. Rows are sorted by (commodity, market, variety, date), so the
+series of one variety of a commodity at one market is a contiguous run;
+varieties of one commodity trade at different prices and are never mixed.
+
+Everything below is computed for all series at once with array operations:
+
+- `trailing_stats`: mean / standard deviation over the last `window`
+  observations of each series (moving averages, volatility);
+- `zscore_anomalies`: modal prices far outside their own recent history;
+- `district_day_aggregates`: count / mean / min / max per commodity, district
+  and day;
+- `neighbour_deviation`: a market's modal price relative to the same variety
+  at the other markets of its district on the same day (spikes versus
+  neighbouring mandis).
+
+Windows count observations, not calendar days: markets do not report every
+day, and a 30-observation window is a market's last 30 reported prices.
+"""
+
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Relative noise floor for standard deviations: a price that sat flat for a
+# whole window must not turn every small move into an anomaly
+MIN_RELATIVE_STD = 0.01
+
+
+def _series_starts(*keys: np.ndarray) -> np.ndarray:
+    """Indices where any of the sorted `keys` changes, starting with 0."""
+    if not len(keys[0]):
+        return np.zeros(0, dtype=np.int64)
+    changed = np.zeros(len(keys[0]), dtype=bool)
+    changed[0] = True
+    for key in keys:
+        changed[1:] |= key[1:] != key[:-1]
+    return np.flatnonzero(changed)
+
+
+def _series_index(starts: np.ndarray, size: int) -> np.ndarray:
+    """Series number of every row, given the series start indices."""
+    marks = np.zeros(size, dtype=np.int64)
+    marks[starts[1:]] = 1
+    return np.cumsum(marks)
+
+
+def _encode(ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Dictionary-encode integer ids: (distinct ids ascending, int32 code of every row)."""
+    if not len(ids):
+        return ids[:0], np.zeros(0, dtype=np.int32)
+    low, high = int(ids.min()), int(ids.max())
+    # A lookup table over the id range is linear; sort only for sparse ids
+    if high - low <= 4 * len(ids) + (1 << 20):
+        present = np.zeros(high - low + 1, dtype=bool)
+        present[ids - low] = True
+        codes = np.cumsum(present, dtype=np.int32) - 1
+        return np.flatnonzero(present) + low, codes[ids - low]
+    distinct, codes = np.unique(ids, return_inverse=True)
+    return distinct, codes.astype(np.int32)
+
+
+def _encode_labels(labels: Iterable[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Dictionary-encode strings (None as ""): (distinct labels ascending, int32 code of every row)."""
+    first_codes: dict = {}
+    codes = np.fromiter(
+        (first_codes.setdefault(label or "", len(first_codes)) for label in labels), dtype=np.int32
+    )
+    distinct = sorted(first_codes)
+    # Renumber from first-seen to sorted order, so codes sort like the labels
+    remap = np.empty(len(distinct), dtype=np.int32)
+    remap[[first_codes[label] for label in distinct]] = np.arange(len(distinct), dtype=np.int32)
+    return np.array(distinct, dtype=object), remap[codes]
+
+
+def _sort_order(*keys: np.ndarray) -> np.ndarray:
+    """
+    Stable row order sorting by `keys`, most significant first.
+
+    Keys are non-negative integer codes; they are packed into one int64 so a
+    single sort replaces a multi-key `lexsort`.
+    """
+    widths = [int(key.max()) + 1 if len(key) else 1 for key in keys]
+    if np.prod(widths, dtype=float) >= 2 ** 62:
+        return np.lexsort(keys[::-1])
+    packed = keys[0].astype(np.int64)
+    for key, width in zip(keys[1:], widths[1:]):
+        packed *= width
+        packed += key
+    return np.argsort(packed, kind="stable")
+
+
+def _day_offsets(price_date: np.ndarray) -> np.ndarray:
+    days = price_date.astype(np.int64)
+    return days - days.min() if len(days) else days
+
+
+class PriceFrame:
+    """
+    Price points of any number of commodities, markets and varieties as NumPy
+    columns.
+
+    Build it with `from_columns`; the constructor expects already encoded and
+    sorted arrays.
+    """
+    __slots__ = (
+        "commodities", "commodity_code", "markets", "market_code", "varieties", "variety_code",
+        "district_id", "price_date", "min_price", "max_price", "modal_price", "series_starts", "series_index",
+    )
+
+    def __init__(
+        self,
+        commodities: np.ndarray,
+        commodity_code: np.ndarray,
+        markets: np.ndarray,
+        market_code: np.ndarray,
+        varieties: np.ndarray,
+        variety_code: np.ndarray,
+        district_id: np.ndarray,
+        price_date: np.ndarray,
+        min_price: np.ndarray,
+        max_price: np.ndarray,
+        modal_price: np.ndarray,
+    ):
+        self.commodities = commodities
+        self.commodity_code = commodity_code
+        self.markets = markets
+        self.market_code = market_code
+        self.varieties = varieties
+        self.variety_code = variety_code
+        self.district_id = district_id
+        self.price_date = price_date
+        self.min_price = min_price
+        self.max_price = max_price
+        self.modal_price = modal_price
+        # One series per (commodity, market, variety)
+        self.series_starts = _series_starts(commodity_code, market_code, variety_code)
+        self.series_index = _series_index(self.series_starts, len(modal_price))
+
+    @classmethod
+    def from_columns(
+        cls, commodity_id, district_id, market_id, price_date, min_price, max_price, modal_price, variety=None
+    ) -> "PriceFrame":
+        """
+        Encode and sort aligned columns.
+
+        Args:
+            commodity_id, district_id, market_id: Integer ids.
+            price_date: `date` objects, ISO strings, `datetime64` values or
+                integer days since 1970-01-01.
+            min_price, max_price, modal_price: Prices; None becomes NaN.
+            variety: Variety names; None (the default) puts every row in
+                the unnamed variety "".
+
+        Returns:
+            The frame, sorted by (commodity, market, variety, date).
+        """
+        commodities, commodity_code = _encode(np.asarray(commodity_id, dtype=np.int64))
+        markets, market_code = _encode(np.asarray(market_id, dtype=np.int64))
+        if variety is None:
+            varieties, variety_code = np.array([""], dtype=object), np.zeros(len(market_code), dtype=np.int32)
+        else:
+            varieties, variety_code = _encode_labels(variety)
+        price_date = np.asarray(price_date)
+        if price_date.dtype.kind in "iuf":
+            price_date = price_date.astype(np.int64).astype("datetime64[D]")
+        else:
+            price_date = price_date.astype("datetime64[D]")
+        order = _sort_order(commodity_code, market_code, variety_code, _day_offsets(price_date))
+        return cls(
+            commodities, commodity_code[order], markets, market_code[order], varieties, variety_code[order],
+            np.asarray(district_id, dtype=np.int64)[order], price_date[order],
+            *(np.asarray(column, dtype=np.float64)[order] for column in (min_price, max_price, modal_price)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.modal_price)
+
+    @property
+    def commodity_id(self) -> np.ndarray:
+        return self.commodities[self.commodity_code]
+
+    @property
+    def market_id(self) -> np.ndarray:
+        return self.markets[self.market_code]
+
+    @property
+    def variety(self) -> np.ndarray:
+        return self.varieties[self.variety_code]
+
+
+class TrailingStats(NamedTuple):
+    """Per-row statistics of a trailing window; NaN where the window is too short."""
+    count: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+
+
+def _window_sums(
+    columns: np.ndarray, starts: np.ndarray, series: np.ndarray, begin: np.ndarray, lag: int
+) -> np.ndarray:
+    """
+    Sums of `columns[begin[i] : i + 1 - lag]` for every row `i`, column-wise.
+    Windows never cross a series start.
+    """
+    # Prefix sums that restart at each series, so rounding error stays at the
+    # scale of one series rather than of the whole frame
+    adjusted = columns.copy()
+    if len(starts) > 1:
+        adjusted[starts[1:]] -= np.add.reduceat(columns, starts, axis=0)[:-1]
+    prefix = np.cumsum(adjusted, axis=0)
+    if lag:
+        upper = np.empty_like(prefix)
+        upper[:lag] = 0.0
+        upper[lag:] = prefix[:-lag]
+    else:
+        upper = prefix
+    lower = np.take(prefix, np.maximum(begin - 1, 0), axis=0)
+    # Windows opening at their series start subtract the rounding residue
+    # carried over from earlier series instead of an earlier prefix sum
+    restarted = np.flatnonzero(begin == starts[series])
+    carry = prefix[starts] - columns[starts]
+    lower[restarted] = carry[series[restarted]]
+    sums = upper - lower
+    if lag:
+        sums[starts] = 0.0
+    return sums
+
+
+def trailing_stats(
+    values: np.ndarray,
+    series_starts: np.ndarray,
+    window: int,
+    include_current: bool = True,
+    min_periods: int = 1,
+    series_index: Optional[np.ndarray] = None,
+) -> TrailingStats:
+    """
+    Mean and sample standard deviation over the last `window` observations
+    of each series, for every row. NaN values count towards the window but
+    not towards the statistics.
+
+    Args:
+        values: Series values, sorted so each series is a contiguous run.
+        series_starts: Start index of every series (ascending, first is 0).
+        window: Observations per window.
+        include_current: Whether a row's own value is part of its window; pass
+            False to compare each value against its history only.
+        min_periods: Minimum non-NaN observations for a mean (the standard
+            deviation needs at least two).
+        series_index: Series number of every row, if already known.
+
+    Returns:
+        `TrailingStats` arrays aligned with `values`.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    size = len(values)
+    series = _series_index(series_starts, size) if series_index is None else series_index
+    lag = 0 if include_current else 1
+    begin = np.maximum(np.arange(1 - lag - window, size + 1 - lag - window), series_starts[series])
+
+    # Count, sum and sum of squares in one pass, each series centered on its
+    # own mean so the squares stay small
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    series_count = np.bincount(series, weights=valid, minlength=len(series_starts))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        series_mean = np.bincount(series, weights=filled, minlength=len(series_starts)) / series_count
+    series_mean = np.nan_to_num(series_mean)[series]
+    columns = np.empty((size, 3))
+    columns[:, 0] = valid
+    columns[:, 1] = filled - series_mean
+    columns[~valid, 1] = 0.0
+    np.multiply(columns[:, 1], columns[:, 1], out=columns[:, 2])
+    sums = _window_sums(columns, series_starts, series, begin, lag)
+
+    count = np.rint(sums[:, 0]).astype(np.int64)
+    total, squares = sums[:, 1], sums[:, 2]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        variance = np.maximum(squares - total * mean, 0.0) / (count - 1)
+    mean += series_mean
+    mean[count < max(min_periods, 1)] = np.nan
+    std = np.sqrt(variance)
+    std[(count < 2) | np.isnan(mean)] = np.nan
+    return TrailingStats(count, mean, std)
+
+
+def frame_trailing_stats(frame: PriceFrame, window: int, **kwargs) -> TrailingStats:
+    """`trailing_stats` of the modal price of every (commodity, market, variety) series in `frame`."""
+    return trailing_stats(frame.modal_price, frame.series_starts, window, series_index=frame.series_index, **kwargs)
+
+
+class AnomalyScores(NamedTuple):
+    """Per-row result of `zscore_anomalies`."""
+    history: TrailingStats  # statistics of the preceding window, excluding the row
+    zscore: np.ndarray  # NaN where the row was not scored
+    flagged: np.ndarray
+
+
+def zscore_anomalies(
+    frame: PriceFrame,
+    window: int = 30,
+    threshold: float = 3.0,
+    min_periods: int = 7,
+    min_relative_std: float = MIN_RELATIVE_STD,
+) -> "AnomalyScores":
+    """
+    Score every modal price against the preceding `window` prices of its series.
+
+    Args:
+        frame: Prices to score.
+        window: Observations of history per score.
+        threshold: Absolute z-score from which a price is flagged.
+        min_periods: History needed before a price is scored at all.
+        min_relative_std: Floor for the history's standard deviation, as a
+            fraction of its mean.
+
+    Returns:
+        `AnomalyScores` aligned with the frame's rows.
+    """
+    history = frame_trailing_stats(frame, window, include_current=False, min_periods=max(min_periods, 2))
+    std = np.fmax(history.std, np.abs(history.mean) * min_relative_std)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        zscore = (frame.modal_price - history.mean) / std
+    zscore[~np.isfinite(zscore)] = np.nan
+    flagged = np.abs(np.nan_to_num(zscore)) >= threshold
+    return AnomalyScores(history, zscore, flagged)
+
+
+class DistrictDayAggregates(NamedTuple):
+    """
+    Prices per (commodity, district, day), sorted in that order.
+
+    `row_group` maps every row of the source frame to its aggregate.
+    """
+    commodity_id: np.ndarray
+    district_id: np.ndarray
+    price_date: np.ndarray
+    price_count: np.ndarray
+    modal_sum: np.ndarray
+    mean_modal_price: np.ndarray
+    min_price: np.ndarray
+    max_price: np.ndarray
+    row_group: np.ndarray
+
+    @property
+    def series_starts(self) -> np.ndarray:
+        """Start index of each (commodity, district) run, for `trailing_stats`."""
+        return _series_starts(self.commodity_id, self.district_id)
+
+
+def _day_groups(frame: PriceFrame, by_variety: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Group rows per (commodity, district[, variety], day).
+
+    Returns:
+        (row order sorting the groups, group start indices in that order,
+        group number of every row of `frame`).
+    """
+    size = len(frame)
+    keys = [frame.commodity_code, _encode(frame.district_id)[1]]
+    if by_variety:
+        keys.append(frame.variety_code)
+    keys.append(_day_offsets(frame.price_date))
+    order = _sort_order(*keys)
+    starts = _series_starts(*(key[order] for key in keys))
+    row_group = np.empty(size, dtype=np.int64)
+    row_group[order] = _series_index(starts, size)
+    return order, starts, row_group
+
+
+def district_day_aggregates(frame: PriceFrame) -> DistrictDayAggregates:
+    """Aggregate `frame` per commodity, district and day, over all varieties; NaN prices are ignored."""
+    size = len(frame)
+    order, starts, row_group = _day_groups(frame, by_variety=False)
+    commodity, district, day = frame.commodity_code[order], frame.district_id[order], frame.price_date[order]
+
+    modal = frame.modal_price[order]
+    valid = ~np.isnan(modal)
+    if size:
+        price_count = np.add.reduceat(valid.astype(np.int64), starts)
+        modal_sum = np.add.reduceat(np.where(valid, modal, 0.0), starts)
+        min_price = np.fmin.reduceat(frame.min_price[order], starts)
+        max_price = np.fmax.reduceat(frame.max_price[order], starts)
+    else:
+        price_count = np.zeros(0, dtype=np.int64)
+        modal_sum = min_price = max_price = np.zeros(0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_modal_price = np.where(price_count > 0, modal_sum / price_count, np.nan)
+    return DistrictDayAggregates(
+        frame.commodities[commodity[starts]], district[starts], day[starts],
+        price_count, modal_sum, mean_modal_price, min_price, max_price, row_group,
+    )
+
+
+def neighbour_deviation(frame: PriceFrame) -> np.ndarray:
+    """
+    Relative deviation of every modal price from the mean price of the same
+    commodity and variety at the district's other markets that day (0.25 =
+    25% above its neighbours). A market reports a variety at most once a day,
+    so the other prices of its (commodity, district, variety, day) group are
+    all from other markets.
+
+    NaN where the price is missing or has no neighbour that day.
+    """
+    _, starts, group = _day_groups(frame, by_variety=True)
+    modal = frame.modal_price
+    valid = ~np.isnan(modal)
+    filled = np.where(valid, modal, 0.0)
+    price_count = np.bincount(group, weights=valid, minlength=len(starts))
+    modal_sum = np.bincount(group, weights=filled, minlength=len(starts))
+    others = price_count[group] - valid
+    with np.errstate(invalid="ignore", divide="ignore"):
+        neighbour_mean = (modal_sum[group] - filled) / others
+        deviation = modal / neighbour_mean - 1.0
+    deviation[(others < 1) | ~valid | ~np.isfinite(deviation)] = np.nan
+    return deviation
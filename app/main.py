@@ -1,6 +1,19 @@
 from fastapi import FastAPI
+from app.endpoints.export.export_router import export_router
 from app.endpoints.price.mandi_price_router import mandi_price_router
+from app.endpoints.price.price_analytics_router import price_analytics_router
+from app.endpoints.price.price_history_router import price_history_router
+from app.endpoints.price.price_rollup_router import price_rollup_router
+from app.endpoints.region.region_router import region_router
+from app.setup.instrumentation import install_instrumentation
+from app.setup.lifespan import lifespan
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.include_router(export_router)
 app.include_router(mandi_price_router)
+app.include_router(price_analytics_router)
+app.include_router(price_history_router)
+app.include_router(price_rollup_router)
+app.include_router(region_router)
+install_instrumentation(app)
@@ -9,8 +9,6 @@ Usage:
     from app.models.models import Crop
 """
 
-from app.models.region import Base, State, District, Subdistrict, City, StateType
-
 # Export all models
 __all__ = [
     "Base",
@@ -18,5 +16,25 @@ __all__ = [
     "District",
     "Subdistrict",
     "City",
-    "StateType"
+    "StateType",
+    "RegionAlias",
+    "RegionLoad",
+    "Commodity",
+    "MandiPrice",
+    "PriceRollup",
+    "RollupGrain",
+    "RollupLevel",
+    "FeedSyncState",
+    "FeedRowHash",
+    "MODELS"
 ]
+
+
+def __getattr__(name: str):
+    # The ORM (and with it SQLAlchemy) is only imported on first use, so that
+    # importing `app.models.enums` or the API schemas in `app.models.schema`
+    # stays cheap at application startup
+    if name in __all__:
+        from app.models import registry
+        return getattr(registry, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,34 @@
+"""
+Enumerations shared by the ORM models, services and API endpoints.
+
+Kept free of SQLAlchemy so that endpoint signatures and response schemas can
+use them without loading the ORM at application startup.
+"""
+
+from enum import Enum
+
+
+class StateType(Enum):
+    """Enumeration for different types of states in India."""
+    STATE = "state"
+    UNION_TERRITORY = "union territory"
+
+
+class RollupLevel(Enum):
+    """Region level a price rollup aggregates over."""
+    DISTRICT = "district"
+    STATE = "state"
+
+
+class RollupGrain(Enum):
+    """Period length of a price rollup; weeks start on Monday."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class ExportFormat(str, Enum):
+    """Output format of a bulk export (see `app.services.export`)."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+    COLUMNAR = "columnar"
@@ -0,0 +1,75 @@
+"""
+SQLAlchemy ORM models for incremental upstream feed synchronization.
+
+`FeedSyncState` remembers the HTTP validators (ETag / Last-Modified) of the
+last successful download of each feed URL. `FeedRowHash` keeps a 64-bit digest
+of every row seen, keyed by a digest of the row's natural key, so a refresh can
+tell which rows actually changed without reading them back.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.region import Base
+
+
+class FeedSyncState(Base):
+    """
+    Represents the last successful synchronization of one upstream feed URL.
+    """
+    __tablename__ = "feed_sync_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    url: Mapped[str] = mapped_column(String(2048), nullable=False, unique=True)
+
+    # HTTP validators echoed back as If-None-Match / If-Modified-Since
+    etag: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+    row_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Timestamp fields
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<FeedSyncState(id={self.id}, url='{self.url}', etag='{self.etag}')>"
+
+
+class FeedRowHash(Base):
+    """
+    Represents the content digest of one row of a feed, keyed by its natural key.
+    """
+    __tablename__ = "feed_row_hashes"
+
+    feed_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("feed_sync_state.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    row_key: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    row_hash: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        {"sqlite_with_rowid": False},
+    )
+
+    def __repr__(self) -> str:
+        return f"<FeedRowHash(feed_id={self.feed_id}, row_key={self.row_key}, row_hash={self.row_hash})>"
+
+
+# Export all models for easy importing
+__all__ = ["FeedSyncState", "FeedRowHash"]
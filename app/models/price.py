@@ -0,0 +1,160 @@
+"""
+SQLAlchemy ORM models for mandi commodity price history.
+
+Prices are stored append-optimized in a clustered (WITHOUT ROWID) table whose
+primary key starts with (commodity, district, date). Rows for one commodity in
+one district are therefore physically contiguous and ordered by date, so range
+scans like "last 90 days of onion prices in Nashik district" read a single
+narrow slice of the B-tree, just as a per-commodity partition would.
+Commodity names are dictionary-encoded through the `commodities` table.
+
+`price_rollups` holds pre-aggregated prices per commodity, region (district or
+state) and period (day, week or month); see
+`app.repositories.price.price_rollup_repository`.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.enums import RollupGrain, RollupLevel
+from app.models.region import Base
+
+
+class Commodity(Base):
+    """
+    Represents a traded commodity (e.g. Onion, Wheat).
+
+    Price rows refer to commodities by a small integer id to keep them compact.
+    """
+    __tablename__ = "commodities"
+
+    # Integer (not BigInteger) so SQLite assigns ids as a rowid alias
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+
+    # Timestamp fields
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<Commodity(id={self.id}, name='{self.name}')>"
+
+
+class MandiPrice(Base):
+    """
+    Represents the daily price of a commodity variety at one market.
+
+    `market_id` points at the `cities` row of the mandi town and `district_id`
+    is stored alongside it so district-level series need no join.
+    """
+    __tablename__ = "mandi_prices"
+
+    commodity_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("commodities.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    district_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("districts.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    price_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    market_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("cities.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    variety: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+
+    # Prices in rupees per quintal
+    min_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    max_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    modal_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # Indexes
+    __table_args__ = (
+        # Market-level lookups. Not covering: market queries read every price
+        # column, so each match is one primary-key lookup (a single one for the
+        # latest price); covering min/max/modal would grow the table by a fifth
+        Index("ix_mandi_prices_market_commodity_date", "market_id", "commodity_id", "price_date"),
+        {"sqlite_with_rowid": False},
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<MandiPrice(commodity_id={self.commodity_id}, market_id={self.market_id}, "
+            f"price_date={self.price_date}, modal_price={self.modal_price})>"
+        )
+
+
+class PriceRollup(Base):
+    """
+    Aggregated prices of a commodity in one district or state over one period.
+
+    Stores sums and counts rather than averages so that cells combine exactly:
+    the average modal price over any set of cells is
+    `sum(modal_sum) / sum(modal_count)`. District rows carry their state's id
+    in `state_id` so state cells are rebuilt from them without a join.
+    """
+    __tablename__ = "price_rollups"
+
+    commodity_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("commodities.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    level: Mapped[RollupLevel] = mapped_column(Enum(RollupLevel), primary_key=True)
+    grain: Mapped[RollupGrain] = mapped_column(Enum(RollupGrain), primary_key=True)
+    # District id or state id, depending on `level`
+    region_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    state_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    # Price rows aggregated, and the modal prices among them
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    modal_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    modal_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Lowest min_price and highest max_price in the period
+    min_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    max_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # Indexes
+    __table_args__ = (
+        # District cells of a state, for rebuilding state cells
+        Index("ix_price_rollups_state", "commodity_id", "level", "grain", "state_id", "period_start"),
+        {"sqlite_with_rowid": False},
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<PriceRollup(commodity_id={self.commodity_id}, level={self.level.value}, "
+            f"region_id={self.region_id}, grain={self.grain.value}, period_start={self.period_start})>"
+        )
+
+
+# Export all models for easy importing
+__all__ = ["Commodity", "MandiPrice", "PriceRollup", "RollupGrain", "RollupLevel"]
@@ -6,36 +6,42 @@ State -> District -> Subdistrict -> City
 
 Each model includes proper relationships, indexes for performance, and automatic
 timestamp management for tracking creation and updates.
+
+Subdistricts and cities also carry a denormalized `state_id` so subtree queries
+("all cities in state X", villages per district) are single indexed range scans
+instead of joins through districts. SQLite triggers created alongside the tables
+keep it consistent on insert, update and district moves; deletes follow the
+ON DELETE CASCADE foreign keys.
 """
 
 from datetime import datetime
-from enum import Enum as PyEnum
 from typing import List, Optional
 
 from sqlalchemy import (
+    DDL,
     BigInteger,
+    CheckConstraint,
     DateTime,
     Enum,
+    FetchedValue,
     Float,
     ForeignKey,
     Index,
+    Integer,
     String,
+    event,
     func,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from app.models.enums import StateType
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
     pass
 
 
-class StateType(PyEnum):
-    """Enumeration for different types of states in India."""
-    STATE = "state"
-    UNION_TERRITORY = "union territory"
-
-
 class State(Base):
     """
     Represents a state or union territory in India.
@@ -141,7 +147,7 @@ class District(Base):
     __table_args__ = (
         Index("ix_districts_name", "name"),
         Index("ix_districts_state_id", "state_id"),
-        Index("ix_districts_state_name", "state_id", "name"),  # Composite index for unique constraint
+        Index("ix_districts_state_name", "state_id", "name", "id"),  # Name lookups and keyset listings by state
     )
 
     def __repr__(self) -> str:
@@ -164,6 +170,14 @@ class Subdistrict(Base):
         ForeignKey("districts.id", ondelete="CASCADE"),
         nullable=False
     )
+    state_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("states.id", ondelete="CASCADE"),
+        nullable=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        comment="Denormalized from districts.state_id; maintained by triggers"
+    )
 
     # Timestamp fields
     created_at: Mapped[datetime] = mapped_column(
@@ -192,6 +206,7 @@ class Subdistrict(Base):
         Index("ix_subdistricts_name", "name"),
         Index("ix_subdistricts_district_id", "district_id"),
         Index("ix_subdistricts_district_name", "district_id", "name"),  # Composite index
+        Index("ix_subdistricts_state_district", "state_id", "district_id"),  # Subtree scans by state
     )
 
     def __repr__(self) -> str:
@@ -221,6 +236,14 @@ class City(Base):
         nullable=True,
         comment="Optional reference to subdistrict - some cities are directly under district"
     )
+    state_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("states.id", ondelete="CASCADE"),
+        nullable=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        comment="Denormalized from districts.state_id; maintained by triggers"
+    )
     lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="Latitude coordinate")
     lng: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="Longitude coordinate")
 
@@ -250,8 +273,9 @@ class City(Base):
         Index("ix_cities_district_id", "district_id"),
         Index("ix_cities_subdistrict_id", "subdistrict_id"),
         Index("ix_cities_coordinates", "lat", "lng"),
-        Index("ix_cities_district_name", "district_id", "name"),  # Composite index
-        Index("ix_cities_subdistrict_name", "subdistrict_id", "name"),  # Composite index
+        Index("ix_cities_district_name", "district_id", "name", "id"),  # Keyset listings by district
+        Index("ix_cities_subdistrict_name", "subdistrict_id", "name", "id"),  # Keyset listings by subdistrict
+        Index("ix_cities_state_district", "state_id", "district_id", "name", "id"),  # Subtree scans and listings by state
     )
 
     def __repr__(self) -> str:
@@ -259,5 +283,129 @@ class City(Base):
         return f"<City(id={self.id}, name='{self.name}', district_id={self.district_id}{subdistrict_info})>"
 
 
+# Values of `RegionAlias.level`
+REGION_ALIAS_LEVELS = ("state", "district", "subdistrict", "city")
+
+
+class RegionAlias(Base):
+    """
+    Represents an alternative spelling or former name of a region.
+
+    Aliases feed place-name resolution (e.g. "Gurgaon" for Gurugram, or a
+    mandi-specific spelling of a village). `level` names the table the alias
+    points into: one of `REGION_ALIAS_LEVELS`.
+    """
+    __tablename__ = "region_aliases"
+
+    # Integer, not BigInteger: only an INTEGER PRIMARY KEY is a rowid alias that SQLite fills in
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    level: Mapped[str] = mapped_column(String(20), nullable=False)
+    region_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    alias: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    # Timestamp fields
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    # Indexes
+    __table_args__ = (
+        Index("ix_region_aliases_level_alias", "level", "alias"),
+        Index("ix_region_aliases_level_region", "level", "region_id"),
+        CheckConstraint(
+            "level IN (" + ", ".join(f"'{level}'" for level in REGION_ALIAS_LEVELS) + ")",
+            name="ck_region_aliases_level",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<RegionAlias(id={self.id}, level='{self.level}', region_id={self.region_id}, alias='{self.alias}')>"
+
+
+class RegionLoad(Base):
+    """
+    Represents the progress of a bulk region load from one CSV file.
+
+    Written by `app.setup.region_loader` in the same transaction as each chunk,
+    so `chunks_done` always matches the rows in the database. A load with
+    `completed_at` set is not repeated unless explicitly restarted.
+    """
+    __tablename__ = "region_loads"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    source: Mapped[str] = mapped_column(String(1024), nullable=False, unique=True)
+
+    # Chunk boundaries depend on the batch size, so a resumed load reuses it
+    batch_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    chunks_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cities_loaded: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Timestamp fields
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<RegionLoad(id={self.id}, source='{self.source}', chunks_done={self.chunks_done})>"
+
+
+# Triggers keeping the denormalized state_id columns in sync with districts.state_id.
+# Rows inserted with the correct state_id (e.g. by the bulk loader) skip the fix-up.
+REGION_HIERARCHY_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_state_id_insert
+    AFTER INSERT ON {table}
+    WHEN NEW.state_id IS NOT (SELECT state_id FROM districts WHERE id = NEW.district_id)
+    BEGIN
+        UPDATE {table} SET state_id = (SELECT state_id FROM districts WHERE id = NEW.district_id)
+        WHERE id = NEW.id;
+    END
+    """
+    for table in ("subdistricts", "cities")
+] + [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_state_id_update
+    AFTER UPDATE OF district_id, state_id ON {table}
+    WHEN NEW.state_id IS NOT (SELECT state_id FROM districts WHERE id = NEW.district_id)
+    BEGIN
+        UPDATE {table} SET state_id = (SELECT state_id FROM districts WHERE id = NEW.district_id)
+        WHERE id = NEW.id;
+    END
+    """
+    for table in ("subdistricts", "cities")
+] + [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_districts_state_id_update
+    AFTER UPDATE OF state_id ON districts
+    WHEN NEW.state_id IS NOT OLD.state_id
+    BEGIN
+        UPDATE subdistricts SET state_id = NEW.state_id WHERE district_id = NEW.id;
+        UPDATE cities SET state_id = NEW.state_id WHERE district_id = NEW.id;
+    END
+    """
+]
+
+# Created once every table exists, since the district trigger touches three tables
+for _trigger in REGION_HIERARCHY_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_trigger).execute_if(dialect="sqlite"))
+
+
 # Export all models for easy importing
-__all__ = ["Base", "State", "District", "Subdistrict", "City", "StateType"]
+__all__ = ["Base", "State", "District", "Subdistrict", "City", "StateType", "RegionAlias", "RegionLoad"]
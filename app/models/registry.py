@@ -0,0 +1,26 @@
+"""
+Static registry of the ORM models.
+
+Importing this module imports every model module, so `Base.metadata` holds
+every table. `app.models` loads it on first attribute access.
+"""
+
+from app.models.region import Base, State, District, Subdistrict, City, StateType, RegionAlias, RegionLoad
+from app.models.price import Commodity, MandiPrice, PriceRollup, RollupGrain, RollupLevel
+from app.models.feed_sync import FeedSyncState, FeedRowHash
+
+# Static registry of table models, used instead of scanning this package at
+# startup. Add new models here (`manage_db.py discover` reports any missing).
+MODELS = (
+    State,
+    District,
+    Subdistrict,
+    City,
+    RegionAlias,
+    RegionLoad,
+    Commodity,
+    MandiPrice,
+    PriceRollup,
+    FeedSyncState,
+    FeedRowHash,
+)
@@ -0,0 +1,72 @@
+"""
+Response schemas for mandi price history, rollups and analytics.
+"""
+
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PriceResponse(BaseModel):
+    """One price point of a commodity at a market."""
+    model_config = ConfigDict(from_attributes=True)
+
+    commodity_id: int
+    district_id: int
+    price_date: date
+    market_id: int
+    variety: str
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    modal_price: Optional[float] = None
+
+
+class PriceRollupResponse(BaseModel):
+    """Aggregated prices of one day, week or month."""
+    model_config = ConfigDict(from_attributes=True)
+
+    period_start: date
+    row_count: int
+    avg_modal_price: Optional[float] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class PriceSummaryResponse(BaseModel):
+    """Aggregated prices over a date range."""
+    model_config = ConfigDict(from_attributes=True)
+
+    start: date
+    end: date
+    row_count: int
+    avg_modal_price: Optional[float] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class PriceAnomalyResponse(BaseModel):
+    """A market price flagged against its own history or its neighbouring markets."""
+    model_config = ConfigDict(from_attributes=True)
+
+    market_id: int
+    variety: str
+    price_date: date
+    modal_price: float
+    trailing_mean: Optional[float] = None
+    zscore: Optional[float] = None
+    neighbour_deviation: Optional[float] = None
+
+
+class DistrictDayPriceResponse(BaseModel):
+    """Prices of one district on one day, with a moving average and volatility."""
+    model_config = ConfigDict(from_attributes=True)
+
+    district_id: int
+    price_date: date
+    price_count: int
+    mean_modal_price: Optional[float] = None
+    moving_average: Optional[float] = None
+    volatility: Optional[float] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
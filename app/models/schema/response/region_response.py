@@ -0,0 +1,61 @@
+"""
+Response schemas for the region hierarchy.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.enums import StateType
+
+
+class CityResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    subdistrict_id: Optional[int] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+
+
+class CityDetailResponse(CityResponse):
+    """A city with its parent ids, for flat listings."""
+    district_id: int
+    state_id: Optional[int] = None
+
+
+class DistrictResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    state_id: int
+
+
+class SubdistrictResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+
+
+class DistrictTreeResponse(BaseModel):
+    """A district with its subdistricts and (optionally) all of its cities."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    subdistricts: List[SubdistrictResponse]
+    cities: List[CityResponse] = []
+
+
+class StateTreeResponse(BaseModel):
+    """A state with its capital and full district hierarchy."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    type: StateType
+    capital: Optional[CityResponse] = None
+    districts: List[DistrictTreeResponse]
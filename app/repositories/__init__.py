@@ -4,6 +4,8 @@ This package contains repository classes for database operations.
 - Write code here to interact with the local database (CRUD operations).
 - Each repository abstracts the data persistence logic for a specific entity.
 - Example: CropRepository for storing/retrieving crop data.
+- Repositories extend `BaseRepository` (base_repository.py): read statements
+  are prepared once with bind parameters and return NamedTuple rows.
 
 Usage:
     from app.repositories.crop_repository import CropRepository
@@ -0,0 +1,77 @@
+"""
+Common base for repositories.
+
+Hot read paths should not rebuild their `select()` on every call: building the
+statement and computing its cache key costs far more than the query itself
+(~10x for a primary-key lookup on SQLite). Repositories therefore declare their
+read statements once, at module level, with `bindparam()` placeholders:
+
+    CITY_BY_ID = select(*CITY_COLUMNS).where(City.id == bindparam("city_id"))
+
+and execute them through `fetch_one` / `fetch_all` / `fetch_scalars` with the
+values of the call. The statement object is reused, so its cache key is
+memoized and the compiled SQL comes straight from the engine's compiled cache.
+
+Listings are paginated with `fetch_page` over a `KeysetQuery`
+(`app.utils.pagination`), which is prepared the same way.
+
+Read paths return `NamedTuple` rows built from Core result rows rather than
+ORM entities, so no identity map, attribute instrumentation or lazy loaders
+are involved. Use ORM entities only where the caller needs to modify them.
+"""
+
+from typing import Any, List, Optional, Type, TypeVar
+
+from sqlalchemy import Connection, Executable
+from sqlalchemy.orm import Session
+
+from app.utils.pagination import KeysetQuery, Page
+
+RowT = TypeVar("RowT", bound=tuple)
+
+
+class BaseRepository:
+    """Holds the session and executes prepared statements on its connection."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    @property
+    def connection(self) -> Connection:
+        return self.session.connection()
+
+    def fetch_all(self, statement: Executable, row_type: Type[RowT], **params: Any) -> List[RowT]:
+        """Execute `statement` and return every row as `row_type`."""
+        return list(map(row_type._make, self.connection.execute(statement, params)))
+
+    def fetch_one(self, statement: Executable, row_type: Type[RowT], **params: Any) -> Optional[RowT]:
+        """Execute `statement` and return the first row as `row_type`, or None."""
+        row = self.connection.execute(statement, params).first()
+        return None if row is None else row_type._make(row)
+
+    def fetch_scalars(self, statement: Executable, **params: Any) -> List[Any]:
+        """Execute `statement` and return the first column of every row."""
+        return list(self.connection.execute(statement, params).scalars())
+
+    def fetch_page(
+        self, query: KeysetQuery, row_type: Type[RowT], cursor: Optional[str], limit: int, **params: Any
+    ) -> Page:
+        """
+        Execute one page of a keyset listing.
+
+        Args:
+            query: The paginated listing.
+            row_type: Row class; must expose the key columns as attributes.
+            cursor: `next_cursor` of the previous page, or None for the first page.
+            limit: Page size.
+            **params: Values for the listing's filter parameters.
+
+        Returns:
+            The page of `row_type` rows and the cursor of the next page.
+
+        Raises:
+            InvalidCursor: If `cursor` is malformed or from another listing.
+        """
+        statement, after = query.statement_for(cursor)
+        rows = self.fetch_all(statement, row_type, limit=limit + 1, **after, **params)
+        return query.page(rows, limit)
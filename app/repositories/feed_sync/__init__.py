@@ -0,0 +1,10 @@
+"""
+Repositories for upstream feed synchronization state.
+
+Usage:
+    from app.repositories.feed_sync import FeedSyncRepository
+"""
+
+from app.repositories.feed_sync.feed_sync_repository import FeedSyncRepository
+
+__all__ = [FeedSyncRepository]
@@ -0,0 +1,68 @@
+"""
+Database access for feed validators and per-row content digests.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.feed_sync import FeedRowHash, FeedSyncState
+from app.repositories.base_repository import BaseRepository
+
+UPSERT_ROW_HASHES_SQL = (
+    f"INSERT INTO {FeedRowHash.__tablename__} (feed_id, row_key, row_hash) VALUES (?, ?, ?) "
+    "ON CONFLICT (feed_id, row_key) DO UPDATE SET row_hash = excluded.row_hash"
+)
+
+ROW_HASHES = select(FeedRowHash.row_key, FeedRowHash.row_hash).where(FeedRowHash.feed_id == bindparam("feed_id"))
+
+
+class FeedSyncRepository(BaseRepository):
+    """Read and write `feed_sync_state` and `feed_row_hashes`."""
+
+    def get_or_create_state(self, url: str) -> FeedSyncState:
+        """Return the sync state row for `url`, inserting an empty one if needed."""
+        self.session.execute(
+            sqlite_insert(FeedSyncState).values(url=url).on_conflict_do_nothing(index_elements=["url"])
+        )
+        return self.session.scalars(select(FeedSyncState).where(FeedSyncState.url == url)).one()
+
+    def save_validators(
+        self,
+        state: FeedSyncState,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        row_count: int,
+    ) -> None:
+        """Record the validators of a completed download."""
+        state.etag = etag
+        state.last_modified = last_modified
+        state.row_count = row_count
+        state.synced_at = datetime.now(timezone.utc)
+
+    def touch(self, state: FeedSyncState) -> None:
+        """Record a check that found nothing new."""
+        state.synced_at = datetime.now(timezone.utc)
+
+    def row_hashes(self, feed_id: int) -> Dict[int, int]:
+        """Return row_key -> row_hash for every row recorded for the feed."""
+        return dict(self.connection.execute(ROW_HASHES, {"feed_id": feed_id}).all())
+
+    def upsert_row_hashes(self, feed_id: int, hashes: Sequence[Tuple[int, int]]) -> None:
+        """Store (row_key, row_hash) pairs for the feed."""
+        if hashes:
+            self.connection.exec_driver_sql(
+                UPSERT_ROW_HASHES_SQL, [(feed_id, key, value) for key, value in hashes]
+            )
+
+    def delete_row_hashes(self, feed_id: int, row_keys: Iterable[int]) -> int:
+        """Forget rows that disappeared from the feed. Returns the number removed."""
+        keys = list(row_keys)
+        for start in range(0, len(keys), 500):
+            self.session.execute(
+                delete(FeedRowHash).where(
+                    FeedRowHash.feed_id == feed_id, FeedRowHash.row_key.in_(keys[start:start + 500])
+                )
+            )
+        return len(keys)
@@ -0,0 +1,16 @@
+"""
+Repositories for mandi commodity price history.
+
+Usage:
+    from app.repositories.price import MandiPriceRepository, PriceRollupRepository
+"""
+
+from app.repositories.price.mandi_price_repository import MandiPriceRepository, PriceRow
+from app.repositories.price.price_rollup_repository import (
+    PriceRollupRepository,
+    PriceSummary,
+    RollupRow,
+    cover_range,
+)
+
+__all__ = [MandiPriceRepository, PriceRow, PriceRollupRepository, PriceSummary, RollupRow, cover_range]
@@ -0,0 +1,239 @@
+"""
+Database access for mandi price history.
+
+Writes go through one pre-built `INSERT ... ON CONFLICT DO UPDATE` executed with
+`executemany` over plain tuples, which keeps ingest cost close to raw sqlite3.
+Reads are range scans over the clustered (commodity, district, date) key or the
+(market, commodity, date) index, using statements prepared once at
+import (see `BaseRepository`). `analytics_columns` returns a range column by
+column, ready to load into NumPy (`app.helpers.price_analytics`).
+
+Every write also refreshes the affected `price_rollups` cells in the same
+transaction (see `PriceRollupRepository`).
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import Integer, bindparam, cast, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.price import Commodity, MandiPrice
+from app.models.region import District
+from app.repositories.base_repository import BaseRepository
+from app.repositories.price.price_rollup_repository import PriceRollupRepository
+from app.utils.pagination import KeysetQuery, Page
+
+# Column order of the tuples accepted by `upsert_prices`
+PRICE_COLUMNS = (
+    "commodity_id", "district_id", "price_date", "market_id", "variety",
+    "min_price", "max_price", "modal_price",
+)
+_KEY_COLUMNS = PRICE_COLUMNS[:5]
+_VALUE_COLUMNS = PRICE_COLUMNS[5:]
+
+UPSERT_PRICES_SQL = (
+    f"INSERT INTO {MandiPrice.__tablename__} ({', '.join(PRICE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in PRICE_COLUMNS)}) "
+    f"ON CONFLICT ({', '.join(_KEY_COLUMNS)}) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _VALUE_COLUMNS)
+)
+
+
+_PRICE_SELECT = select(*(getattr(MandiPrice, column) for column in PRICE_COLUMNS))
+
+DISTRICT_SERIES = (
+    _PRICE_SELECT
+    .where(
+        MandiPrice.commodity_id == bindparam("commodity_id"),
+        MandiPrice.district_id == bindparam("district_id"),
+        MandiPrice.price_date.between(bindparam("start"), bindparam("end")),
+    )
+    .order_by(MandiPrice.price_date)
+)
+
+MARKET_SERIES = (
+    _PRICE_SELECT
+    .where(
+        MandiPrice.market_id == bindparam("market_id"),
+        MandiPrice.commodity_id == bindparam("commodity_id"),
+        MandiPrice.price_date.between(bindparam("start"), bindparam("end")),
+    )
+    .order_by(MandiPrice.price_date)
+)
+
+LATEST_MARKET_PRICE = (
+    _PRICE_SELECT
+    .where(MandiPrice.market_id == bindparam("market_id"), MandiPrice.commodity_id == bindparam("commodity_id"))
+    .order_by(MandiPrice.price_date.desc())
+    .limit(1)
+)
+
+# Keyset listings of full price histories
+DISTRICT_PRICES = KeysetQuery(  # Clustered primary key
+    "district_prices",
+    _PRICE_SELECT.where(
+        MandiPrice.commodity_id == bindparam("commodity_id"), MandiPrice.district_id == bindparam("district_id")
+    ),
+    MandiPrice.price_date, MandiPrice.market_id, MandiPrice.variety,
+)
+MARKET_PRICES = KeysetQuery(  # ix_mandi_prices_market_commodity_date
+    "market_prices",
+    _PRICE_SELECT.where(
+        MandiPrice.market_id == bindparam("market_id"), MandiPrice.commodity_id == bindparam("commodity_id")
+    ),
+    MandiPrice.price_date, MandiPrice.district_id, MandiPrice.variety,
+)
+
+
+# Column order of `analytics_columns`. Dates come back as days since 1970-01-01
+# (julianday of 1970-01-01 is 2440587.5), which skips building a `date` per row.
+ANALYTICS_COLUMNS = (
+    "commodity_id", "district_id", "market_id", "price_date", "min_price", "max_price", "modal_price", "variety",
+)
+_ANALYTICS_SELECT = select(
+    MandiPrice.commodity_id, MandiPrice.district_id, MandiPrice.market_id,
+    cast(func.julianday(MandiPrice.price_date) - 2440587.5, Integer),
+    MandiPrice.min_price, MandiPrice.max_price, MandiPrice.modal_price, MandiPrice.variety,
+)
+
+DISTRICT_ANALYTICS_ROWS = _ANALYTICS_SELECT.where(
+    MandiPrice.commodity_id == bindparam("commodity_id"),
+    MandiPrice.district_id == bindparam("district_id"),
+    MandiPrice.price_date.between(bindparam("start"), bindparam("end")),
+)
+
+STATE_ANALYTICS_ROWS = (
+    _ANALYTICS_SELECT
+    .join(District, District.id == MandiPrice.district_id)
+    .where(
+        MandiPrice.commodity_id == bindparam("commodity_id"),
+        District.state_id == bindparam("state_id"),
+        MandiPrice.price_date.between(bindparam("start"), bindparam("end")),
+    )
+)
+
+
+class PriceRow(NamedTuple):
+    """One stored price point, in `PRICE_COLUMNS` order."""
+    commodity_id: int
+    district_id: int
+    price_date: date
+    market_id: int
+    variety: str
+    min_price: Optional[float]
+    max_price: Optional[float]
+    modal_price: Optional[float]
+
+
+class MandiPriceRepository(BaseRepository):
+    """Append and range-query operations on `mandi_prices`."""
+
+    def commodity_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Return name -> id for `names`, creating missing commodities."""
+        wanted = {name for name in names if name}
+        if not wanted:
+            return {}
+        self.connection.execute(
+            sqlite_insert(Commodity).on_conflict_do_nothing(index_elements=["name"]),
+            [{"name": name} for name in sorted(wanted)],
+        )
+        rows = self.connection.execute(select(Commodity.name, Commodity.id).where(Commodity.name.in_(wanted)))
+        return dict(rows.all())
+
+    def upsert_prices(self, rows: Sequence[Sequence], refresh_rollups: bool = True) -> int:
+        """
+        Insert or overwrite price rows.
+
+        Args:
+            rows: Tuples in `PRICE_COLUMNS` order. `price_date` may be a `date`
+                or an ISO-formatted string.
+            refresh_rollups: Recompute the affected rollup cells. Bulk loads may
+                pass False and call `PriceRollupRepository.rebuild` once at the end.
+
+        Returns:
+            Number of rows written.
+        """
+        if not rows:
+            return 0
+        prepared = [
+            (row[0], row[1], row[2].isoformat() if isinstance(row[2], date) else row[2], *row[3:])
+            for row in rows
+        ]
+        self.connection.exec_driver_sql(UPSERT_PRICES_SQL, prepared)
+        if refresh_rollups:
+            PriceRollupRepository(self.session).refresh(prepared)
+        return len(prepared)
+
+    def district_series(
+        self, commodity_id: int, district_id: int, start: date, end: date
+    ) -> List[PriceRow]:
+        """All market prices of a commodity in a district between `start` and `end`, by date."""
+        return self.fetch_all(
+            DISTRICT_SERIES, PriceRow, commodity_id=commodity_id, district_id=district_id, start=start, end=end
+        )
+
+    def market_series(self, commodity_id: int, market_id: int, start: date, end: date) -> List[PriceRow]:
+        """Prices of a commodity at one market between `start` and `end`, by date."""
+        return self.fetch_all(
+            MARKET_SERIES, PriceRow, commodity_id=commodity_id, market_id=market_id, start=start, end=end
+        )
+
+    def latest_modal_price(self, commodity_id: int, market_id: int) -> Optional[PriceRow]:
+        """Most recent price of a commodity at a market."""
+        return self.fetch_one(LATEST_MARKET_PRICE, PriceRow, commodity_id=commodity_id, market_id=market_id)
+
+    def district_prices_page(self, commodity_id: int, district_id: int, cursor: Optional[str], limit: int) -> Page:
+        """
+        One page of a commodity's price history in a district, oldest first.
+
+        Raises:
+            InvalidCursor: If `cursor` is malformed or from another listing.
+        """
+        return self.fetch_page(
+            DISTRICT_PRICES, PriceRow, cursor, limit, commodity_id=commodity_id, district_id=district_id
+        )
+
+    def market_prices_page(self, commodity_id: int, market_id: int, cursor: Optional[str], limit: int) -> Page:
+        """
+        One page of a commodity's price history at a market, oldest first.
+
+        Raises:
+            InvalidCursor: If `cursor` is malformed or from another listing.
+        """
+        return self.fetch_page(MARKET_PRICES, PriceRow, cursor, limit, commodity_id=commodity_id, market_id=market_id)
+
+    def analytics_columns(
+        self,
+        commodity_id: int,
+        start: date,
+        end: date,
+        district_id: Optional[int] = None,
+        state_id: Optional[int] = None,
+    ) -> List[tuple]:
+        """
+        Prices of a commodity in a district or a state between `start` and `end`,
+        column by column.
+
+        Args:
+            commodity_id: Commodity to read.
+            start: First day, inclusive.
+            end: Last day, inclusive.
+            district_id: District to read; pass this or `state_id`.
+            state_id: State to read, across all its districts.
+
+        Returns:
+            One tuple per `ANALYTICS_COLUMNS` entry, aligned by position, in no
+            particular row order.
+        """
+        if (district_id is None) == (state_id is None):
+            raise ValueError("Pass exactly one of district_id or state_id")
+        if district_id is not None:
+            result = self.connection.execute(
+                DISTRICT_ANALYTICS_ROWS,
+                {"commodity_id": commodity_id, "district_id": district_id, "start": start, "end": end},
+            )
+        else:
+            result = self.connection.execute(
+                STATE_ANALYTICS_ROWS, {"commodity_id": commodity_id, "state_id": state_id, "start": start, "end": end}
+            )
+        return list(zip(*result)) or [()] * len(ANALYTICS_COLUMNS)
@@ -0,0 +1,340 @@
+"""
+Pre-aggregated price rollups (`price_rollups`).
+
+Dashboards ask for things like "weekly average modal price of onion in
+Maharashtra over the last year". Answering that from `mandi_prices` scans every
+market row of every district in the state; the rollup table answers it by
+reading 52 rows.
+
+Cells are kept per commodity x (district | state) x (day | week | month):
+
+- district-day cells are aggregated from `mandi_prices`;
+- district-week and district-month cells from district-day cells;
+- state cells of every grain from the district cells of the same grain.
+
+Maintenance is incremental: `refresh` lists the cells covering the
+(commodity, district, date) keys of a written batch in a temp table, then
+recomputes them level by level with one grouped `INSERT ... SELECT ... ON
+CONFLICT DO UPDATE` joined to that table. Cells are recomputed from their sources rather than adjusted
+by deltas, so overwritten prices (which can lower a max or raise a min) stay
+exact. `MandiPriceRepository.upsert_prices` calls it in the same transaction
+as the write; `rebuild` recomputes the whole table after bulk loads.
+
+Reads are routed to the coarsest cells that fit: `summary` covers a date range
+with whole months, then whole weeks, then single days, so a year-long summary
+reads about a dozen cells.
+"""
+
+import calendar
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, case, select
+
+from app.models.price import MandiPrice, PriceRollup, RollupGrain, RollupLevel
+from app.models.region import District
+from app.repositories.base_repository import BaseRepository
+
+_TABLE = PriceRollup.__tablename__
+_PRICES = MandiPrice.__tablename__
+_DISTRICTS = District.__tablename__
+
+# Enum columns store member names
+_DISTRICT, _STATE = RollupLevel.DISTRICT.name, RollupLevel.STATE.name
+_DAY, _WEEK, _MONTH = RollupGrain.DAY.name, RollupGrain.WEEK.name, RollupGrain.MONTH.name
+
+# SQLite expressions for the period containing a date
+_PERIOD_OF = {
+    RollupGrain.WEEK: "date(r.period_start, 'weekday 0', '-6 days')",
+    RollupGrain.MONTH: "date(r.period_start, 'start of month')",
+}
+
+_ROLLUP_COLUMNS = (
+    "commodity_id, level, grain, region_id, period_start, state_id, "
+    "row_count, modal_sum, modal_count, min_price, max_price"
+)
+_UPSERT = (
+    " ON CONFLICT (commodity_id, level, grain, region_id, period_start) DO UPDATE SET "
+    "state_id = excluded.state_id, row_count = excluded.row_count, modal_sum = excluded.modal_sum, "
+    "modal_count = excluded.modal_count, min_price = excluded.min_price, max_price = excluded.max_price"
+)
+_COMBINE = "sum(r.row_count), sum(r.modal_sum), sum(r.modal_count), min(r.min_price), max(r.max_price)"
+
+
+# Per-connection scratch tables of the cells a refresh recomputes
+_DIRTY_DISTRICTS = "temp.price_rollup_dirty_districts"
+_DIRTY_STATES = "temp.price_rollup_dirty_states"
+CREATE_DIRTY_TABLES_SQL = tuple(
+    f"CREATE TABLE IF NOT EXISTS {table} "
+    f"(commodity_id INTEGER, {region} INTEGER, grain TEXT, first TEXT, last TEXT)"
+    for table, region in ((_DIRTY_DISTRICTS, "district_id"), (_DIRTY_STATES, "state_id"))
+)
+INSERT_DIRTY_DISTRICTS_SQL = f"INSERT INTO {_DIRTY_DISTRICTS} VALUES (?, ?, ?, ?, ?)"
+CLEAR_DIRTY_TABLES_SQL = (f"DELETE FROM {_DIRTY_DISTRICTS}", f"DELETE FROM {_DIRTY_STATES}")
+
+
+def _district_days_sql(source: str, where: str) -> str:
+    return (
+        f"INSERT INTO {_TABLE} ({_ROLLUP_COLUMNS}) "
+        f"SELECT p.commodity_id, '{_DISTRICT}', '{_DAY}', p.district_id, p.price_date, d.state_id, "
+        "count(*), total(p.modal_price), count(p.modal_price), min(p.min_price), max(p.max_price) "
+        f"FROM {source} JOIN {_DISTRICTS} d ON d.id = p.district_id "
+        f"WHERE {where} GROUP BY p.commodity_id, p.district_id, p.price_date"
+    )
+
+
+def _district_periods_sql(grain: RollupGrain, source: str, where: str) -> str:
+    return (
+        f"INSERT INTO {_TABLE} ({_ROLLUP_COLUMNS}) "
+        f"SELECT r.commodity_id, '{_DISTRICT}', '{grain.name}', r.region_id, {_PERIOD_OF[grain]} AS period, "
+        f"min(r.state_id), {_COMBINE} FROM {source} "
+        f"WHERE r.level = '{_DISTRICT}' AND r.grain = '{_DAY}' AND {where} "
+        "GROUP BY r.commodity_id, r.region_id, period"
+    )
+
+
+def _state_cells_sql(source: str, where: str) -> str:
+    return (
+        f"INSERT INTO {_TABLE} ({_ROLLUP_COLUMNS}) "
+        f"SELECT r.commodity_id, '{_STATE}', r.grain, r.state_id, r.period_start, r.state_id, {_COMBINE} "
+        f"FROM {source} WHERE r.level = '{_DISTRICT}' AND {where} "
+        "GROUP BY r.commodity_id, r.grain, r.state_id, r.period_start"
+    )
+
+
+# Incremental refresh of the cells listed in the dirty tables. CROSS JOIN makes
+# SQLite walk the dirty rows first and range-scan the primary key for each.
+REFRESH_SQL = (
+    _district_days_sql(
+        f"{_DIRTY_DISTRICTS} k CROSS JOIN {_PRICES} p",
+        f"k.grain = '{_DAY}' AND p.commodity_id = k.commodity_id AND p.district_id = k.district_id "
+        "AND p.price_date BETWEEN k.first AND k.last",
+    ) + _UPSERT,
+    *(
+        _district_periods_sql(
+            grain,
+            f"{_DIRTY_DISTRICTS} k CROSS JOIN {_TABLE} r",
+            f"k.grain = '{grain.name}' AND r.commodity_id = k.commodity_id AND r.region_id = k.district_id "
+            "AND r.period_start BETWEEN k.first AND k.last",
+        ) + _UPSERT
+        for grain in _PERIOD_OF
+    ),
+    # A state's dirty range per grain spans those of its dirty districts
+    f"INSERT INTO {_DIRTY_STATES} SELECT k.commodity_id, d.state_id, k.grain, min(k.first), max(k.last) "
+    f"FROM {_DIRTY_DISTRICTS} k JOIN {_DISTRICTS} d ON d.id = k.district_id "
+    "GROUP BY k.commodity_id, d.state_id, k.grain",
+    _state_cells_sql(
+        f"{_DIRTY_STATES} k CROSS JOIN {_TABLE} r",
+        "r.commodity_id = k.commodity_id AND r.grain = k.grain AND r.state_id = k.state_id "
+        "AND r.period_start BETWEEN k.first AND k.last",
+    ) + _UPSERT,
+)
+
+# Full rebuild, in dependency order
+REBUILD_SQL = (
+    f"DELETE FROM {_TABLE}",
+    _district_days_sql(f"{_PRICES} p", "true"),
+    *(_district_periods_sql(grain, f"{_TABLE} r", "true") for grain in _PERIOD_OF),
+    _state_cells_sql(f"{_TABLE} r", "true"),
+)
+
+_avg_modal = case((PriceRollup.modal_count > 0, PriceRollup.modal_sum / PriceRollup.modal_count))
+ROLLUP_SERIES = (
+    select(PriceRollup.period_start, PriceRollup.row_count, _avg_modal, PriceRollup.min_price, PriceRollup.max_price)
+    .where(
+        PriceRollup.commodity_id == bindparam("commodity_id"),
+        PriceRollup.level == bindparam("level"),
+        PriceRollup.grain == bindparam("grain"),
+        PriceRollup.region_id == bindparam("region_id"),
+        PriceRollup.period_start.between(bindparam("first"), bindparam("last")),
+    )
+    .order_by(PriceRollup.period_start)
+)
+ROLLUP_CELLS = (
+    select(PriceRollup.row_count, PriceRollup.modal_sum, PriceRollup.modal_count,
+           PriceRollup.min_price, PriceRollup.max_price)
+    .where(
+        PriceRollup.commodity_id == bindparam("commodity_id"),
+        PriceRollup.level == bindparam("level"),
+        PriceRollup.grain == bindparam("grain"),
+        PriceRollup.region_id == bindparam("region_id"),
+        PriceRollup.period_start.between(bindparam("first"), bindparam("last")),
+    )
+)
+
+
+class RollupRow(NamedTuple):
+    """Aggregates of one period."""
+    period_start: date
+    row_count: int
+    avg_modal_price: Optional[float]
+    min_price: Optional[float]
+    max_price: Optional[float]
+
+
+class RollupCell(NamedTuple):
+    row_count: int
+    modal_sum: float
+    modal_count: int
+    min_price: Optional[float]
+    max_price: Optional[float]
+
+
+class PriceSummary(NamedTuple):
+    """Aggregates over a date range; `cells` is the number of rollup rows read."""
+    row_count: int
+    avg_modal_price: Optional[float]
+    min_price: Optional[float]
+    max_price: Optional[float]
+    cells: int
+
+
+def period_start(grain: RollupGrain, day: date) -> date:
+    """First day of the `grain` period containing `day`."""
+    if grain is RollupGrain.WEEK:
+        return day - timedelta(days=day.weekday())
+    if grain is RollupGrain.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def period_end(grain: RollupGrain, day: date) -> date:
+    """Last day of the `grain` period containing `day`."""
+    if grain is RollupGrain.WEEK:
+        return day + timedelta(days=6 - day.weekday())
+    if grain is RollupGrain.MONTH:
+        return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+    return day
+
+
+def cover_range(start: date, end: date) -> List[Tuple[RollupGrain, date, date]]:
+    """
+    Cover `start`..`end` with the fewest whole periods, coarsest first.
+
+    Whole months are used where they fit, then whole Monday-to-Sunday weeks
+    (never one that would split a month usable whole), then single days.
+
+    Returns:
+        `(grain, first_period_start, last_period_start)` runs of consecutive
+        periods, in date order.
+    """
+    runs: List[List] = []
+    day = start
+    while day <= end:
+        month_end = period_end(RollupGrain.MONTH, day)
+        next_month = month_end + timedelta(days=1)
+        week_end = day + timedelta(days=6)
+        if day.day == 1 and month_end <= end:
+            grain, next_day = RollupGrain.MONTH, next_month
+        elif (day.weekday() == 0 and week_end <= end
+              and not (week_end >= next_month and period_end(RollupGrain.MONTH, next_month) <= end)):
+            grain, next_day = RollupGrain.WEEK, week_end + timedelta(days=1)
+        else:
+            grain, next_day = RollupGrain.DAY, day + timedelta(days=1)
+
+        if runs and runs[-1][0] is grain:
+            runs[-1][2] = day
+        else:
+            runs.append([grain, day, day])
+        day = next_day
+    return [tuple(run) for run in runs]
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class PriceRollupRepository(BaseRepository):
+    """Maintenance and range queries of `price_rollups`."""
+
+    def refresh(self, rows: Iterable[Sequence]) -> int:
+        """
+        Recompute the rollup cells covering newly written price rows.
+
+        Args:
+            rows: Written rows in `PRICE_COLUMNS` order (commodity, district and
+                date are read); dates may be `date`s or ISO strings.
+
+        Returns:
+            Number of (commodity, district) series refreshed.
+        """
+        ranges: Dict[Tuple[int, int], List[date]] = {}
+        for row in rows:
+            day = _as_date(row[2])
+            key = (row[0], row[1])
+            bounds = ranges.get(key)
+            if bounds is None:
+                ranges[key] = [day, day]
+            elif day < bounds[0]:
+                bounds[0] = day
+            elif day > bounds[1]:
+                bounds[1] = day
+        if not ranges:
+            return 0
+
+        connection = self.connection
+        for sql in CREATE_DIRTY_TABLES_SQL:
+            connection.exec_driver_sql(sql)
+        connection.exec_driver_sql(INSERT_DIRTY_DISTRICTS_SQL, [
+            (commodity_id, district_id, grain.name,
+             period_start(grain, first).isoformat(), period_end(grain, last).isoformat())
+            for (commodity_id, district_id), (first, last) in ranges.items()
+            for grain in RollupGrain
+        ])
+        try:
+            for sql in REFRESH_SQL:
+                connection.exec_driver_sql(sql)
+        finally:
+            for sql in CLEAR_DIRTY_TABLES_SQL:
+                connection.exec_driver_sql(sql)
+        return len(ranges)
+
+    def rebuild(self) -> int:
+        """Recompute every rollup cell from `mandi_prices`; returns the number of cells."""
+        for sql in REBUILD_SQL:
+            self.connection.exec_driver_sql(sql)
+        return self.connection.exec_driver_sql(f"SELECT count(*) FROM {_TABLE}").scalar_one()
+
+    def series(
+        self, commodity_id: int, level: RollupLevel, region_id: int, grain: RollupGrain, start: date, end: date
+    ) -> List[RollupRow]:
+        """
+        Per-period aggregates of a commodity in a district or state.
+
+        Returns every `grain` period overlapping `start`..`end` that has prices,
+        so the first and last periods may extend beyond the range.
+        """
+        return self.fetch_all(
+            ROLLUP_SERIES, RollupRow, commodity_id=commodity_id, level=level, grain=grain,
+            region_id=region_id, first=period_start(grain, start), last=end,
+        )
+
+    def summary(
+        self, commodity_id: int, level: RollupLevel, region_id: int, start: date, end: date
+    ) -> Optional[PriceSummary]:
+        """
+        Aggregates of a commodity in a district or state over exactly `start`..`end`.
+
+        Reads the coarsest rollup cells covering the range (see `cover_range`).
+
+        Returns:
+            The summary, or None if there are no prices in the range.
+        """
+        cells: List[RollupCell] = []
+        for grain, first, last in cover_range(start, end):
+            cells.extend(self.fetch_all(
+                ROLLUP_CELLS, RollupCell, commodity_id=commodity_id, level=level, grain=grain,
+                region_id=region_id, first=first, last=last,
+            ))
+        if not cells:
+            return None
+        modal_count = sum(cell.modal_count for cell in cells)
+        minimums = [cell.min_price for cell in cells if cell.min_price is not None]
+        maximums = [cell.max_price for cell in cells if cell.max_price is not None]
+        return PriceSummary(
+            row_count=sum(cell.row_count for cell in cells),
+            avg_modal_price=sum(cell.modal_sum for cell in cells) / modal_count if modal_count else None,
+            min_price=min(minimums) if minimums else None,
+            max_price=max(maximums) if maximums else None,
+            cells=len(cells),
+        )
@@ -0,0 +1,16 @@
+"""
+Repositories for the region hierarchy (State -> District -> Subdistrict -> City).
+
+Usage:
+    from app.repositories.region import RegionRepository
+"""
+
+from app.repositories.region.region_repository import (
+    CityRow,
+    DistrictRow,
+    RegionRepository,
+    StateRow,
+    SubdistrictRow,
+)
+
+__all__ = [RegionRepository, CityRow, DistrictRow, StateRow, SubdistrictRow]
@@ -0,0 +1,258 @@
+"""
+Database access for the region hierarchy.
+
+Subtree queries and rollups use the denormalized `state_id` columns on cities
+and subdistricts, so they are answered by range scans over
+`ix_cities_state_district` / `ix_subdistricts_state_district` without joining
+through districts.
+
+All statements are prepared once at import (see `BaseRepository`).
+
+The relationships on the models load lazily, so walking a state's districts
+and cities object by object issues one query per parent. Whole subtrees are
+instead fetched one level per query, so the number of queries does not grow
+with the size of the state:
+
+- `state_tree` returns ORM entities with every level loaded by `selectinload`
+  (chunked by SQLAlchemy at 500 parent keys), for callers that need entities;
+- `districts_in_state` / `subdistricts_in_state` / `cities_in_state` return
+  flat rows per level. Skipping ORM hydration makes these several times faster
+  for read-only use such as serialization.
+
+Listings (`districts_page`, `cities_page`) use keyset pagination over the
+composite indexes, so deep pages cost the same as the first one.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import joinedload, noload, selectinload
+
+from app.models.region import City, District, State, StateType, Subdistrict
+from app.repositories.base_repository import BaseRepository
+from app.utils.pagination import KeysetQuery, Page
+
+
+class CityRow(NamedTuple):
+    id: int
+    name: str
+    district_id: int
+    subdistrict_id: Optional[int]
+    state_id: Optional[int]
+    lat: Optional[float]
+    lng: Optional[float]
+
+
+class DistrictRow(NamedTuple):
+    id: int
+    name: str
+    state_id: int
+
+
+class SubdistrictRow(NamedTuple):
+    id: int
+    name: str
+    district_id: int
+
+
+class StateRow(NamedTuple):
+    id: int
+    name: str
+    type: StateType
+    capital_id: Optional[int]
+
+
+_CITY_COLUMNS = (City.id, City.name, City.district_id, City.subdistrict_id, City.state_id, City.lat, City.lng)
+_DISTRICT_COLUMNS = (District.id, District.name, District.state_id)
+
+CITY_BY_ID = select(*_CITY_COLUMNS).where(City.id == bindparam("city_id"))
+
+DISTRICT_BY_ID = select(*_DISTRICT_COLUMNS).where(District.id == bindparam("district_id"))
+
+DISTRICT_BY_NAME = select(*_DISTRICT_COLUMNS).where(
+    District.state_id == bindparam("state_id"), District.name == bindparam("name")
+)
+
+CITY_IDS_IN_STATE = select(City.id).where(City.state_id == bindparam("state_id"))
+
+CITY_IDS_IN_DISTRICT = CITY_IDS_IN_STATE.where(City.district_id == bindparam("district_id"))
+
+STATE_BY_ID = select(State.id, State.name, State.type, State.capital_id).where(State.id == bindparam("state_id"))
+
+DISTRICTS_IN_STATE = (
+    select(*_DISTRICT_COLUMNS).where(District.state_id == bindparam("state_id")).order_by(District.id)
+)
+
+SUBDISTRICTS_IN_STATE = (
+    select(Subdistrict.id, Subdistrict.name, Subdistrict.district_id)
+    .where(Subdistrict.state_id == bindparam("state_id"))
+    .order_by(Subdistrict.district_id, Subdistrict.id)
+)
+
+CITIES_IN_STATE = (
+    select(*_CITY_COLUMNS).where(City.state_id == bindparam("state_id")).order_by(City.district_id, City.id)
+)
+
+COUNT_CITIES_BY_DISTRICT = (
+    select(City.district_id, func.count())
+    .where(City.state_id == bindparam("state_id"))
+    .group_by(City.district_id)
+)
+
+COUNT_CITIES_BY_STATE = select(City.state_id, func.count()).group_by(City.state_id)
+
+COUNT_SUBDISTRICTS_BY_DISTRICT = (
+    select(Subdistrict.district_id, func.count())
+    .where(Subdistrict.state_id == bindparam("state_id"))
+    .group_by(Subdistrict.district_id)
+)
+
+# Keyset listings. The index named alongside each one holds its filter column
+# and then its whole sort key, id included: `id` is a BIGINT primary key rather
+# than a rowid alias, so SQLite does not append it to indexes by itself, and
+# without it every page would sort all of the filtered rows in a temp B-tree
+DISTRICTS = KeysetQuery("districts", select(*_DISTRICT_COLUMNS), District.id)
+DISTRICTS_BY_STATE = KeysetQuery(  # ix_districts_state_name
+    "districts_by_state",
+    select(*_DISTRICT_COLUMNS).where(District.state_id == bindparam("state_id")),
+    District.name, District.id,
+)
+CITIES = KeysetQuery("cities", select(*_CITY_COLUMNS), City.id)
+CITIES_BY_STATE = KeysetQuery(  # ix_cities_state_district
+    "cities_by_state",
+    select(*_CITY_COLUMNS).where(City.state_id == bindparam("state_id")),
+    City.district_id, City.name, City.id,
+)
+CITIES_BY_DISTRICT = KeysetQuery(  # ix_cities_district_name
+    "cities_by_district",
+    select(*_CITY_COLUMNS).where(City.district_id == bindparam("district_id")),
+    City.name, City.id,
+)
+CITIES_BY_SUBDISTRICT = KeysetQuery(  # ix_cities_subdistrict_name
+    "cities_by_subdistrict",
+    select(*_CITY_COLUMNS).where(City.subdistrict_id == bindparam("subdistrict_id")),
+    City.name, City.id,
+)
+
+_STATE_BY_ID = select(State).where(State.id == bindparam("state_id"))
+
+# State + capital (joined), districts, subdistricts, cities: four queries
+STATE_TREE = _STATE_BY_ID.options(
+    joinedload(State.capital),
+    selectinload(State.districts).options(selectinload(District.subdistricts), selectinload(District.cities)),
+)
+
+# Same without cities; `noload` leaves `District.cities` empty instead of lazy loading it
+STATE_TREE_WITHOUT_CITIES = _STATE_BY_ID.options(
+    joinedload(State.capital),
+    selectinload(State.districts).options(selectinload(District.subdistricts), noload(District.cities)),
+)
+
+
+class RegionRepository(BaseRepository):
+    """Read queries over states, districts, subdistricts and cities."""
+
+    def city(self, city_id: int) -> Optional[CityRow]:
+        """One city by primary key."""
+        return self.fetch_one(CITY_BY_ID, CityRow, city_id=city_id)
+
+    def district(self, district_id: int) -> Optional[DistrictRow]:
+        """One district by primary key."""
+        return self.fetch_one(DISTRICT_BY_ID, DistrictRow, district_id=district_id)
+
+    def district_by_name(self, state_id: int, name: str) -> Optional[DistrictRow]:
+        """A district by its exact name within a state (`ix_districts_state_name`)."""
+        return self.fetch_one(DISTRICT_BY_NAME, DistrictRow, state_id=state_id, name=name)
+
+    def state(self, state_id: int) -> Optional[StateRow]:
+        """One state by primary key."""
+        return self.fetch_one(STATE_BY_ID, StateRow, state_id=state_id)
+
+    def districts_in_state(self, state_id: int) -> List[DistrictRow]:
+        """Every district of a state, by id."""
+        return self.fetch_all(DISTRICTS_IN_STATE, DistrictRow, state_id=state_id)
+
+    def subdistricts_in_state(self, state_id: int) -> List[SubdistrictRow]:
+        """Every subdistrict of a state, grouped by district."""
+        return self.fetch_all(SUBDISTRICTS_IN_STATE, SubdistrictRow, state_id=state_id)
+
+    def cities_in_state(self, state_id: int) -> List[CityRow]:
+        """Every city of a state, grouped by district."""
+        return self.fetch_all(CITIES_IN_STATE, CityRow, state_id=state_id)
+
+    def districts_page(self, cursor: Optional[str], limit: int, state_id: Optional[int] = None) -> Page:
+        """
+        One page of districts: by name within a state, or by id across all states.
+
+        Raises:
+            InvalidCursor: If `cursor` is malformed or from another listing.
+        """
+        if state_id is None:
+            return self.fetch_page(DISTRICTS, DistrictRow, cursor, limit)
+        return self.fetch_page(DISTRICTS_BY_STATE, DistrictRow, cursor, limit, state_id=state_id)
+
+    def cities_page(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        state_id: Optional[int] = None,
+        district_id: Optional[int] = None,
+        subdistrict_id: Optional[int] = None,
+    ) -> Page:
+        """
+        One page of cities, filtered by at most one parent.
+
+        Cities of a district or subdistrict are listed by name, cities of a
+        state by district then name, and all cities by id.
+
+        Raises:
+            ValueError: If more than one parent filter is given.
+            InvalidCursor: If `cursor` is malformed or from another listing.
+        """
+        filters = {
+            name: value
+            for name, value in (("state_id", state_id), ("district_id", district_id), ("subdistrict_id", subdistrict_id))
+            if value is not None
+        }
+        if len(filters) > 1:
+            raise ValueError("Filter cities by one of state_id, district_id or subdistrict_id")
+        query = {
+            "state_id": CITIES_BY_STATE,
+            "district_id": CITIES_BY_DISTRICT,
+            "subdistrict_id": CITIES_BY_SUBDISTRICT,
+        }.get(next(iter(filters), None), CITIES)
+        return self.fetch_page(query, CityRow, cursor, limit, **filters)
+
+    def state_tree(self, state_id: int, include_cities: bool = True) -> Optional[State]:
+        """
+        A state with its capital, districts, subdistricts and cities loaded.
+
+        Args:
+            state_id: State to load.
+            include_cities: Also load every city of every district. When False,
+                `District.cities` is left empty.
+
+        Returns:
+            The `State` entity, or None if it does not exist. Walking the
+            returned hierarchy issues no further queries.
+        """
+        statement = STATE_TREE if include_cities else STATE_TREE_WITHOUT_CITIES
+        return self.session.scalars(statement, {"state_id": state_id}).first()
+
+    def city_ids_in_state(self, state_id: int, district_id: Optional[int] = None) -> List[int]:
+        """Ids of every city in a state, optionally narrowed to one district."""
+        if district_id is None:
+            return self.fetch_scalars(CITY_IDS_IN_STATE, state_id=state_id)
+        return self.fetch_scalars(CITY_IDS_IN_DISTRICT, state_id=state_id, district_id=district_id)
+
+    def count_cities_by_district(self, state_id: int) -> Dict[int, int]:
+        """Number of cities per district within a state."""
+        return dict(self.connection.execute(COUNT_CITIES_BY_DISTRICT, {"state_id": state_id}).all())
+
+    def count_cities_by_state(self) -> Dict[int, int]:
+        """Number of cities per state across the country."""
+        return dict(self.connection.execute(COUNT_CITIES_BY_STATE).all())
+
+    def count_subdistricts_by_district(self, state_id: int) -> Dict[int, int]:
+        """Number of subdistricts per district within a state."""
+        return dict(self.connection.execute(COUNT_SUBDISTRICTS_BY_DISTRICT, {"state_id": state_id}).all())
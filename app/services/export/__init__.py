@@ -0,0 +1,28 @@
+"""
+Export services: streaming bulk exports of region and price tables.
+
+Usage:
+    from app.services.export import BulkExport, ExportFilters, ExportFormat
+"""
+
+from app.services.export.bulk_export import (
+    DATASETS,
+    EXPORT_CHUNK_SIZE,
+    FILE_SUFFIXES,
+    MEDIA_TYPES,
+    BulkExport,
+    ExportDataset,
+    ExportFilters,
+    ExportFormat,
+)
+
+__all__ = [
+    BulkExport,
+    DATASETS,
+    EXPORT_CHUNK_SIZE,
+    ExportDataset,
+    ExportFilters,
+    ExportFormat,
+    FILE_SUFFIXES,
+    MEDIA_TYPES,
+]
@@ -0,0 +1,228 @@
+"""
+Streaming bulk export of region and price tables.
+
+An export runs one query and streams its result with `yield_per`: rows are
+fetched from the database cursor `chunk_size` at a time, each chunk is encoded
+and handed on before the next is read, so memory stays flat however large the
+table is. Output formats:
+
+- `ndjson`: one JSON object per line (`app.utils.fast_json`);
+- `csv`: header row plus one line per row;
+- `columnar`: the compact binary format of `app.utils.columnar`, zlib-compressed
+  per chunk.
+
+Rows come out in primary key order. Filters (`ExportFilters`) apply where the
+dataset has the column; asking a dataset for a filter it does not support is an
+error rather than a silently unfiltered export.
+
+An export holds its own database connection (not a request-scoped session), so
+it can outlive the endpoint call that returned it as a streaming body.
+
+Usage:
+    export = BulkExport("prices", ExportFormat.CSV, ExportFilters(state_id=27, start_date=date(2024, 1, 1)))
+    for chunk in export:
+        out.write(chunk)
+    export.rows  # rows written
+"""
+
+import csv
+import io
+from datetime import date
+from enum import Enum
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, Engine, Select, select
+
+from app.configuration.database import get_engine
+from app.models.enums import ExportFormat
+from app.models.price import MandiPrice
+from app.models.region import City, District, State, Subdistrict
+from app.utils import columnar, fast_json
+
+# Rows fetched from the cursor and encoded per chunk
+EXPORT_CHUNK_SIZE = 10_000
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: fast_json.NDJSON_MEDIA_TYPE,
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.COLUMNAR: columnar.MEDIA_TYPE,
+}
+
+FILE_SUFFIXES = {
+    ExportFormat.NDJSON: ".ndjson",
+    ExportFormat.CSV: ".csv",
+    ExportFormat.COLUMNAR: ".adhc",
+}
+
+
+class ExportFilters(NamedTuple):
+    """Optional filters; dates bound `price_date` inclusively."""
+    state_id: Optional[int] = None
+    district_id: Optional[int] = None
+    commodity_id: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class ExportDataset(NamedTuple):
+    name: str
+    columns: Tuple[ColumnElement, ...]
+    order_by: Tuple[ColumnElement, ...]
+    # Filter name -> clause for a filter value
+    filters: Dict[str, Callable[..., ColumnElement]]
+
+
+_PRICE_COLUMNS = (
+    MandiPrice.commodity_id, MandiPrice.district_id, MandiPrice.price_date, MandiPrice.market_id,
+    MandiPrice.variety, MandiPrice.min_price, MandiPrice.max_price, MandiPrice.modal_price,
+)
+
+DATASETS: Dict[str, ExportDataset] = {
+    dataset.name: dataset for dataset in (
+        ExportDataset(
+            "states",
+            (State.id, State.name, State.type, State.capital_id),
+            (State.id,),
+            {"state_id": lambda value: State.id == value},
+        ),
+        ExportDataset(
+            "districts",
+            (District.id, District.name, District.state_id),
+            (District.id,),
+            {"state_id": lambda value: District.state_id == value, "district_id": lambda value: District.id == value},
+        ),
+        ExportDataset(
+            "subdistricts",
+            (Subdistrict.id, Subdistrict.name, Subdistrict.district_id, Subdistrict.state_id),
+            (Subdistrict.id,),
+            {"state_id": lambda value: Subdistrict.state_id == value,
+             "district_id": lambda value: Subdistrict.district_id == value},
+        ),
+        ExportDataset(
+            "cities",
+            (City.id, City.name, City.district_id, City.subdistrict_id, City.state_id, City.lat, City.lng),
+            (City.id,),
+            {"state_id": lambda value: City.state_id == value, "district_id": lambda value: City.district_id == value},
+        ),
+        ExportDataset(
+            "prices",
+            _PRICE_COLUMNS,
+            # Clustered primary key order, so the export is a sequential scan
+            _PRICE_COLUMNS[:5],
+            {
+                "state_id": lambda value: MandiPrice.district_id.in_(
+                    select(District.id).where(District.state_id == value).scalar_subquery()
+                ),
+                "district_id": lambda value: MandiPrice.district_id == value,
+                "commodity_id": lambda value: MandiPrice.commodity_id == value,
+                "start_date": lambda value: MandiPrice.price_date >= value,
+                "end_date": lambda value: MandiPrice.price_date <= value,
+            },
+        ),
+    )
+}
+
+
+def export_statement(dataset: ExportDataset, filters: ExportFilters) -> Select:
+    """
+    Build the export query of `dataset` restricted by `filters`.
+
+    Raises:
+        ValueError: If a filter is set that `dataset` does not support.
+    """
+    statement = select(*dataset.columns).order_by(*dataset.order_by)
+    for name, value in filters._asdict().items():
+        if value is None:
+            continue
+        if name not in dataset.filters:
+            supported = ", ".join(dataset.filters) or "none"
+            raise ValueError(f"Dataset '{dataset.name}' cannot be filtered by {name} (supported: {supported})")
+        statement = statement.where(dataset.filters[name](value))
+    return statement
+
+
+def _csv_chunks(names: Sequence[str], chunks: Iterator[Sequence], enum_positions: List[int]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(names)
+    for rows in chunks:
+        if enum_positions:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for position in enum_positions:
+                    if row[position] is not None:
+                        row[position] = row[position].value
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+class BulkExport:
+    """
+    One export of a dataset, iterated as encoded byte chunks.
+
+    Args:
+        dataset: Name of a dataset in `DATASETS`.
+        export_format: Output format.
+        filters: Row filters.
+        chunk_size: Rows fetched and encoded per chunk.
+        engine: Engine to read from (the application engine by default).
+
+    Raises:
+        ValueError: If the dataset is unknown or a filter does not apply to it.
+            Raised on construction, before anything is streamed.
+    """
+
+    def __init__(
+        self,
+        dataset: str,
+        export_format: ExportFormat = ExportFormat.NDJSON,
+        filters: ExportFilters = ExportFilters(),
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        engine: Optional[Engine] = None,
+    ):
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset '{dataset}' (available: {', '.join(DATASETS)})")
+        self.dataset = DATASETS[dataset]
+        self.format = ExportFormat(export_format)
+        self.statement = export_statement(self.dataset, filters)
+        self.chunk_size = chunk_size
+        self.engine = engine
+        self.rows = 0
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.format]
+
+    @property
+    def filename(self) -> str:
+        return self.dataset.name + FILE_SUFFIXES[self.format]
+
+    def _row_chunks(self) -> Iterator[Sequence]:
+        engine = self.engine if self.engine is not None else get_engine()
+        with engine.connect() as connection:
+            result = connection.execution_options(yield_per=self.chunk_size).execute(self.statement)
+            for rows in result.partitions():
+                self.rows += len(rows)
+                yield rows
+
+    def __iter__(self) -> Iterator[bytes]:
+        names = [column.key for column in self.dataset.columns]
+        chunks = self._row_chunks()
+
+        if self.format is ExportFormat.NDJSON:
+            for rows in chunks:
+                yield from fast_json.ndjson_chunks(rows, names, rows_per_chunk=len(rows))
+        elif self.format is ExportFormat.CSV:
+            enum_positions = [position for position, column in enumerate(self.dataset.columns)
+                              if issubclass(column.type.python_type, Enum)]
+            yield from _csv_chunks(names, chunks, enum_positions)
+        else:
+            writer = columnar.ColumnarWriter([(name, column.type.python_type)
+                                              for name, column in zip(names, self.dataset.columns)])
+            yield writer.header()
+            for rows in chunks:
+                yield writer.chunk(rows)
+            yield writer.footer()
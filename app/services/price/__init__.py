@@ -0,0 +1,3 @@
+"""
+Services for mandi commodity prices.
+"""
@@ -0,0 +1,145 @@
+"""
+Incremental synchronization of the upstream mandi price feed into `mandi_prices`.
+
+The feed is the daily commodity price CSV (one row per state, district, market,
+commodity, variety and arrival date). `MandiPriceWriter` resolves place names
+to region ids and commodity names to commodity ids, then upserts only the rows
+that `IncrementalCsvSync` found to be new or changed.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.helpers.csv_parser import CsvBatch, CsvColumn, date_converter
+from app.repositories.price import MandiPriceRepository
+from app.services.region import PlaceNameResolver, get_place_name_resolver
+from app.services.sync import IncrementalCsvSync
+
+MANDI_PRICE_CSV_SCHEMA = [
+    CsvColumn("state", source="State"),
+    CsvColumn("district", source="District"),
+    CsvColumn("market", source="Market"),
+    CsvColumn("commodity", source="Commodity"),
+    CsvColumn("variety", source="Variety"),
+    CsvColumn("arrival_date", date_converter(), source="Arrival_Date"),
+    CsvColumn("min_price", float, source="Min_x0020_Price"),
+    CsvColumn("max_price", float, source="Max_x0020_Price"),
+    CsvColumn("modal_price", float, source="Modal_x0020_Price"),
+]
+
+# Identity of a feed row across snapshots; prices are the mutable part
+MANDI_PRICE_KEY_COLUMNS = ("state", "district", "market", "commodity", "variety", "arrival_date")
+
+
+# Lowest resolution score a row is written with. 1.0 means every level matched
+# exactly or through an alias: a fuzzy match between two real places ("Rampur"
+# and "Rajpur" score 0.57) would otherwise file the prices under the wrong city.
+MIN_WRITE_SCORE = 1.0
+
+
+class ResolvedPriceRows(NamedTuple):
+    """Price rows of a batch and how many feed rows were dropped, by reason."""
+    rows: List[tuple]
+    positions: List[int]
+    unresolved: int
+    low_confidence: int
+
+
+def resolve_price_rows(
+    resolver: PlaceNameResolver,
+    batch: CsvBatch,
+    memo: Optional[Dict] = None,
+    min_score: float = MIN_WRITE_SCORE,
+) -> ResolvedPriceRows:
+    """
+    Resolve the places of a batch of feed rows.
+
+    Args:
+        resolver: Place-name resolver.
+        batch: Feed rows parsed with `MANDI_PRICE_CSV_SCHEMA`.
+        memo: Resolved places to reuse across batches
+            (see `PlaceNameResolver.resolve_hierarchy_batch`).
+        min_score: Lowest `ResolvedPlace.score` a row is kept with.
+
+    Returns:
+        The kept rows with their positions in `batch`. Rows are tuples in
+        `PRICE_COLUMNS` order, except that the first field is the commodity
+        *name* (ids are assigned by the writer). Rows whose district or market
+        cannot be resolved, or that name no commodity, are counted as
+        unresolved; rows whose places only matched below `min_score` are
+        counted as low-confidence.
+    """
+    places = resolver.resolve_hierarchy_batch(
+        zip(batch.column("state"), batch.column("district"), batch.column("market")), memo
+    )
+    values = zip(
+        batch.column("commodity"), batch.column("variety"), batch.column("arrival_date"),
+        batch.column("min_price"), batch.column("max_price"), batch.column("modal_price"),
+    )
+    rows: List[tuple] = []
+    positions: List[int] = []
+    unresolved = low_confidence = 0
+    for position, (place, (commodity, variety, arrival_date, min_price, max_price, modal_price)) in enumerate(
+        zip(places, values)
+    ):
+        if place.district_id is None or place.city_id is None or not commodity:
+            unresolved += 1
+            continue
+        if place.score < min_score:
+            low_confidence += 1
+            continue
+        positions.append(position)
+        rows.append((
+            commodity, place.district_id, arrival_date, place.city_id,
+            variety or "", min_price, max_price, modal_price,
+        ))
+    return ResolvedPriceRows(rows, positions, unresolved, low_confidence)
+
+
+class MandiPriceWriter:
+    """
+    `ChangeWriter` that stores changed feed rows in `mandi_prices`.
+
+    Rows whose district or market cannot be resolved, or only resolves below
+    `min_score`, are skipped and logged; only the positions of the stored rows
+    are returned, so the sync does not record the skipped ones as synced and
+    offers them again on the next run (for example after an alias is added).
+
+    Args:
+        resolver: Place-name resolver; the shared one is used when omitted.
+        min_score: Lowest resolution score a row is written with.
+    """
+
+    def __init__(self, resolver: Optional[PlaceNameResolver] = None, min_score: float = MIN_WRITE_SCORE):
+        self._resolver = resolver
+        self._min_score = min_score
+
+    def __call__(self, session: Session, batch: CsvBatch) -> List[int]:
+        resolved = resolve_price_rows(
+            self._resolver or get_place_name_resolver(), batch, min_score=self._min_score
+        )
+        repository = MandiPriceRepository(session)
+        commodity_ids = repository.commodity_ids(row[0] for row in resolved.rows)
+        repository.upsert_prices([(commodity_ids[row[0]], *row[1:]) for row in resolved.rows])
+
+        if resolved.unresolved:
+            logger.warning(f"Skipped {resolved.unresolved} mandi price rows with unresolved market or district")
+        if resolved.low_confidence:
+            logger.warning(
+                f"Skipped {resolved.low_confidence} mandi price rows whose market or district "
+                f"only matched a differently spelled place"
+            )
+        return resolved.positions
+
+
+def mandi_price_sync(url: str, resolver: Optional[PlaceNameResolver] = None, **kwargs) -> IncrementalCsvSync:
+    """Build an `IncrementalCsvSync` for the mandi price feed at `url`."""
+    return IncrementalCsvSync(
+        url,
+        key_columns=MANDI_PRICE_KEY_COLUMNS,
+        writer=MandiPriceWriter(resolver),
+        schema=MANDI_PRICE_CSV_SCHEMA,
+        **kwargs,
+    )
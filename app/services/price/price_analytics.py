@@ -0,0 +1,150 @@
+"""
+Price analytics for API responses, computed with `app.helpers.price_analytics`.
+
+A request loads one commodity's prices for a district or a state into a
+`PriceFrame` (one query, column by column) and runs the vectorized analytics
+over it; only the rows that make it into the response become Python objects.
+
+Trailing windows need history from before the requested range, so prices are
+loaded from `WARMUP_DAYS_PER_OBSERVATION` days per window observation earlier
+and the warm-up rows are dropped from the output.
+"""
+
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.helpers.price_analytics import (
+    PriceFrame,
+    district_day_aggregates,
+    neighbour_deviation,
+    trailing_stats,
+    zscore_anomalies,
+)
+from app.repositories.price import MandiPriceRepository
+
+# Calendar days loaded per observation of trailing history; markets report on
+# most but not all days
+WARMUP_DAYS_PER_OBSERVATION = 2
+
+
+class PriceAnomaly(NamedTuple):
+    """A market price that stands out from its own history or its neighbours."""
+    market_id: int
+    variety: str
+    price_date: date
+    modal_price: float
+    trailing_mean: Optional[float]
+    zscore: Optional[float]
+    neighbour_deviation: Optional[float]
+
+
+class DistrictDayPrice(NamedTuple):
+    """Prices of one district on one day, with trailing statistics of the daily mean."""
+    district_id: int
+    price_date: date
+    price_count: int
+    mean_modal_price: Optional[float]
+    moving_average: Optional[float]
+    volatility: Optional[float]
+    min_price: Optional[float]
+    max_price: Optional[float]
+
+
+def _optional(values: np.ndarray) -> list:
+    """Array to a list of Python floats with None for NaN."""
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+def load_price_frame(
+    session: Session,
+    commodity_id: int,
+    start: date,
+    end: date,
+    district_id: Optional[int] = None,
+    state_id: Optional[int] = None,
+) -> PriceFrame:
+    """Load a commodity's prices in a district or a state into a `PriceFrame`."""
+    columns = MandiPriceRepository(session).analytics_columns(
+        commodity_id, start, end, district_id=district_id, state_id=state_id
+    )
+    return PriceFrame.from_columns(*columns)
+
+
+def district_price_anomalies(
+    session: Session,
+    commodity_id: int,
+    district_id: int,
+    start: date,
+    end: date,
+    window: int = 30,
+    threshold: float = 3.0,
+    spike_ratio: float = 0.25,
+) -> List[PriceAnomaly]:
+    """
+    Market prices in a district between `start` and `end` that are anomalous.
+
+    A price is reported when its z-score against the previous `window` prices
+    of the same variety at the market reaches `threshold`, or when it deviates
+    by at least `spike_ratio` from the mean price of that variety at the
+    district's other markets that day.
+
+    Returns:
+        Anomalies ordered by date, then market and variety.
+    """
+    warmup = timedelta(days=window * WARMUP_DAYS_PER_OBSERVATION)
+    frame = load_price_frame(session, commodity_id, start - warmup, end, district_id=district_id)
+    scores = zscore_anomalies(frame, window=window, threshold=threshold)
+    deviation = neighbour_deviation(frame)
+    selected = (scores.flagged | (np.abs(np.nan_to_num(deviation)) >= spike_ratio)) & (
+        frame.price_date >= np.datetime64(start)
+    )
+    rows = np.flatnonzero(selected)
+    rows = rows[np.lexsort((frame.variety_code[rows], frame.market_code[rows], frame.price_date[rows]))]
+    return list(map(PriceAnomaly._make, zip(
+        frame.market_id[rows].tolist(),
+        frame.variety[rows].tolist(),
+        frame.price_date[rows].tolist(),
+        frame.modal_price[rows].tolist(),
+        _optional(scores.history.mean[rows]),
+        _optional(scores.zscore[rows]),
+        _optional(deviation[rows]),
+    )))
+
+
+def state_district_prices(
+    session: Session,
+    commodity_id: int,
+    state_id: int,
+    start: date,
+    end: date,
+    window: int = 7,
+) -> List[DistrictDayPrice]:
+    """
+    Daily prices of every district of a state between `start` and `end`.
+
+    `moving_average` and `volatility` are the mean and standard deviation of
+    the district's daily mean modal price over its last `window` trading days.
+
+    Returns:
+        Rows ordered by district, then date.
+    """
+    warmup = timedelta(days=window * WARMUP_DAYS_PER_OBSERVATION)
+    frame = load_price_frame(session, commodity_id, start - warmup, end, state_id=state_id)
+    days = district_day_aggregates(frame)
+    trailing = trailing_stats(days.mean_modal_price, days.series_starts, window)
+    rows = np.flatnonzero(days.price_date >= np.datetime64(start))
+    return list(map(DistrictDayPrice._make, zip(
+        days.district_id[rows].tolist(),
+        days.price_date[rows].tolist(),
+        days.price_count[rows].tolist(),
+        _optional(days.mean_modal_price[rows]),
+        _optional(trailing.mean[rows]),
+        _optional(trailing.std[rows]),
+        _optional(days.min_price[rows]),
+        _optional(days.max_price[rows]),
+    )))
@@ -0,0 +1,39 @@
+"""
+Region services: in-process lookups over the State -> District -> Subdistrict -> City hierarchy.
+
+Usage:
+    from app.services.region import region_index_cache, get_place_name_resolver
+"""
+
+from app.services.region.place_name_resolver import (
+    PlaceMatch,
+    PlaceNameResolver,
+    ResolvedPlace,
+    get_place_name_resolver,
+)
+from app.services.region.region_index import (
+    RegionIndex,
+    RegionIndexCache,
+    RegionLevel,
+    RegionNode,
+    region_index_cache,
+)
+from app.services.region.spatial_index import CitySpatialIndex, NearbyCity, get_city_spatial_index
+from app.services.region.state_tree import STATE_TREE_QUERIES, build_state_tree
+
+__all__ = [
+    CitySpatialIndex,
+    NearbyCity,
+    PlaceMatch,
+    PlaceNameResolver,
+    RegionIndex,
+    RegionIndexCache,
+    RegionLevel,
+    RegionNode,
+    ResolvedPlace,
+    STATE_TREE_QUERIES,
+    build_state_tree,
+    get_city_spatial_index,
+    get_place_name_resolver,
+    region_index_cache,
+]
@@ -0,0 +1,308 @@
+"""
+Place-name resolution against the region hierarchy.
+
+Feeds spell places inconsistently, so exact `ilike` matching against
+`City.name`/`District.name` misses and fuzzy scans are quadratic. The resolver
+normalizes names (see `app.helpers.place_names`), adds stored and well-known
+aliases, and answers queries from trigram indexes built per scope (all cities of
+a district, all districts of a state, ...). Scope indexes are built lazily from
+the `RegionIndex` on first use and kept in a bounded LRU, so a scoped lookup is
+a few dictionary probes and typically runs well under a millisecond.
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.configuration.database import SessionLocal
+from app.helpers.place_names import known_alias_groups, phonetic_key, trigrams
+from app.models.region import RegionAlias
+from app.services.region.region_index import RegionIndex, RegionLevel, region_index_cache
+
+DEFAULT_MIN_SCORE = 0.5
+DEFAULT_MAX_CACHED_SCOPES = 1024
+
+# Scope of a search: (level searched, level of the scoping region or None for all, scoping id)
+ScopeKey = Tuple[RegionLevel, Optional[RegionLevel], int]
+
+
+class PlaceMatch(NamedTuple):
+    """One ranked candidate; `score` is the trigram Dice coefficient (1.0 = exact)."""
+    level: RegionLevel
+    region_id: int
+    name: str
+    score: float
+
+
+class ResolvedPlace(NamedTuple):
+    """Result of resolving a (state, district, place) triple; unresolved parts are None."""
+    state_id: Optional[int]
+    district_id: Optional[int]
+    city_id: Optional[int]
+    score: float
+
+
+class _ScopeIndex:
+    """Exact-key map and trigram posting lists over the names in one scope."""
+    __slots__ = ("region_ids", "by_key", "postings", "sizes")
+
+    def __init__(self, entries: Iterable[Tuple[int, str]]):
+        self.region_ids: List[int] = []
+        self.by_key: Dict[str, List[int]] = {}
+        self.postings: Dict[str, List[int]] = {}
+        self.sizes: List[int] = []
+        for region_id, name in entries:
+            key = phonetic_key(name)
+            if not key:
+                continue
+            position = len(self.region_ids)
+            self.region_ids.append(region_id)
+            self.by_key.setdefault(key, []).append(position)
+            grams = trigrams(key)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+    def search(self, key: str, limit: int, min_score: float) -> List[Tuple[float, int]]:
+        """Return up to `limit` (score, region_id) pairs, best first, one per region."""
+        best: Dict[int, float] = {}
+        for position in self.by_key.get(key, ()):
+            best[self.region_ids[position]] = 1.0
+
+        grams = trigrams(key)
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                counts[position] = counts.get(position, 0) + 1
+
+        query_size = len(grams)
+        sizes, region_ids = self.sizes, self.region_ids
+        for position, common in counts.items():
+            score = 2.0 * common / (query_size + sizes[position])
+            if score >= min_score:
+                region_id = region_ids[position]
+                if score > best.get(region_id, 0.0):
+                    best[region_id] = score
+
+        top = heapq.nlargest(limit, best.items(), key=lambda item: item[1])
+        return [(score, region_id) for region_id, score in top]
+
+
+class PlaceNameResolver:
+    """
+    Ranked, scoped place-name lookups over a `RegionIndex` snapshot.
+
+    Args:
+        region_index: Hierarchy snapshot to resolve against.
+        aliases: Extra names per (level, region_id), e.g. loaded from `region_aliases`.
+        min_score: Minimum trigram similarity for a candidate to be returned.
+        max_cached_scopes: Number of per-scope trigram indexes kept in memory.
+    """
+
+    def __init__(
+        self,
+        region_index: RegionIndex,
+        aliases: Optional[Dict[Tuple[RegionLevel, int], List[str]]] = None,
+        min_score: float = DEFAULT_MIN_SCORE,
+        max_cached_scopes: int = DEFAULT_MAX_CACHED_SCOPES,
+    ):
+        self.region_index = region_index
+        self.aliases = aliases or {}
+        self.min_score = min_score
+        self.max_cached_scopes = max_cached_scopes
+        self._known_aliases = known_alias_groups()
+        self._scopes: "OrderedDict[ScopeKey, _ScopeIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_session(cls, session: Session, region_index: RegionIndex, **kwargs) -> "PlaceNameResolver":
+        """
+        Build a resolver with the aliases stored in the `region_aliases` table.
+
+        Rows with an unknown `level` (possible in tables created before the
+        check constraint) are skipped with a warning.
+        """
+        aliases: Dict[Tuple[RegionLevel, int], List[str]] = {}
+        skipped = 0
+        rows = session.execute(select(RegionAlias.level, RegionAlias.region_id, RegionAlias.alias))
+        for level, region_id, alias in rows:
+            region_level = RegionLevel.__members__.get((level or "").upper())
+            if region_level is None:
+                skipped += 1
+                continue
+            aliases.setdefault((region_level, region_id), []).append(alias)
+        if skipped:
+            logger.warning(f"Skipped {skipped} region aliases with an unknown level")
+        return cls(region_index, aliases, **kwargs)
+
+    # ------------------------------------------------------------------ scopes
+
+    def _scope_region_ids(self, scope: ScopeKey) -> Iterator[int]:
+        level, parent_level, parent_id = scope
+        index = self.region_index
+        if parent_level is None:
+            yield from index.ids(level)
+        elif parent_level == level - 1 or (level is RegionLevel.CITY and parent_level is RegionLevel.DISTRICT):
+            yield from index.children(level, parent_id)
+        else:
+            # Scoped by state: walk the districts of the state
+            for district_id in index.children(RegionLevel.DISTRICT, parent_id):
+                yield from index.children(level, district_id)
+
+    def _scope_entries(self, scope: ScopeKey) -> Iterator[Tuple[int, str]]:
+        level = scope[0]
+        for region_id in self._scope_region_ids(scope):
+            name = self.region_index.get(level, region_id).name
+            yield region_id, name
+            for alias in self.aliases.get((level, region_id), ()):
+                yield region_id, alias
+            for alias in self._known_aliases.get(phonetic_key(name), ()):
+                if alias != name:
+                    yield region_id, alias
+
+    def _scope(self, scope: ScopeKey) -> _ScopeIndex:
+        with self._lock:
+            scope_index = self._scopes.get(scope)
+            if scope_index is not None:
+                self._scopes.move_to_end(scope)
+                return scope_index
+
+        scope_index = _ScopeIndex(self._scope_entries(scope))
+        with self._lock:
+            self._scopes[scope] = scope_index
+            while len(self._scopes) > self.max_cached_scopes:
+                self._scopes.popitem(last=False)
+        return scope_index
+
+    @staticmethod
+    def _scope_key(level: RegionLevel, parent_id: Optional[int], state_id: Optional[int]) -> ScopeKey:
+        if parent_id is not None and level is not RegionLevel.STATE:
+            parent_level = RegionLevel.DISTRICT if level is RegionLevel.CITY else RegionLevel(level - 1)
+            return level, parent_level, parent_id
+        if state_id is not None and level > RegionLevel.DISTRICT:
+            return level, RegionLevel.STATE, state_id
+        return level, None, 0
+
+    # ------------------------------------------------------------------ queries
+
+    def candidates(
+        self,
+        name: str,
+        level: RegionLevel,
+        parent_id: Optional[int] = None,
+        state_id: Optional[int] = None,
+        limit: int = 5,
+    ) -> List[PlaceMatch]:
+        """
+        Return ranked candidates for `name` at `level`.
+
+        Args:
+            name: Place name as spelled in the source data.
+            level: Level to search.
+            parent_id: Direct parent to scope by (state for districts, district
+                for subdistricts and cities).
+            state_id: Scope by state when the direct parent is unknown.
+            limit: Maximum number of candidates.
+
+        Unscoped city searches build an index over every village and are slow
+        the first time; pass a scope whenever the source data provides one.
+        """
+        key = phonetic_key(name)
+        if not key:
+            return []
+        scope_index = self._scope(self._scope_key(level, parent_id, state_id))
+        return [
+            PlaceMatch(level, region_id, self.region_index.get(level, region_id).name, score)
+            for score, region_id in scope_index.search(key, limit, self.min_score)
+        ]
+
+    def resolve(
+        self,
+        name: str,
+        level: RegionLevel,
+        parent_id: Optional[int] = None,
+        state_id: Optional[int] = None,
+    ) -> Optional[PlaceMatch]:
+        """Return the best candidate, or None if nothing scores above `min_score`."""
+        matches = self.candidates(name, level, parent_id, state_id, limit=1)
+        return matches[0] if matches else None
+
+    def resolve_batch(
+        self,
+        names: Sequence[str],
+        level: RegionLevel,
+        parent_ids: Optional[Sequence[Optional[int]]] = None,
+    ) -> List[Optional[PlaceMatch]]:
+        """
+        Resolve many names in one pass.
+
+        Source files repeat the same few thousand place names across millions of
+        rows, so each distinct (name, parent) pair is resolved only once.
+        """
+        parent_ids = parent_ids if parent_ids is not None else [None] * len(names)
+        memo: Dict[Tuple[str, Optional[int]], Optional[PlaceMatch]] = {}
+        results = []
+        for name, parent_id in zip(names, parent_ids):
+            memo_key = (name, parent_id)
+            if memo_key not in memo:
+                memo[memo_key] = self.resolve(name, level, parent_id) if name else None
+            results.append(memo[memo_key])
+        return results
+
+    def resolve_hierarchy(self, state: str, district: str, place: Optional[str] = None) -> ResolvedPlace:
+        """Resolve a (state, district, place) triple top-down, each level scoped by its parent."""
+        state_match = self.resolve(state, RegionLevel.STATE) if state else None
+        state_id = state_match.region_id if state_match else None
+
+        district_match = self.resolve(district, RegionLevel.DISTRICT, state_id) if district else None
+        district_id = district_match.region_id if district_match else None
+
+        city_match = None
+        if place:
+            city_match = self.resolve(place, RegionLevel.CITY, district_id, state_id)
+        matches = [match for match in (state_match, district_match, city_match) if match]
+        score = min(match.score for match in matches) if matches else 0.0
+        return ResolvedPlace(state_id, district_id, city_match.region_id if city_match else None, score)
+
+    def resolve_hierarchy_batch(
+        self,
+        rows: Iterable[Tuple[str, str, Optional[str]]],
+        memo: Optional[Dict[Tuple[str, str, Optional[str]], ResolvedPlace]] = None,
+    ) -> List[ResolvedPlace]:
+        """
+        Resolve (state, district, place) rows, memoizing repeated triples.
+
+        Pass the same `memo` dict across calls to keep resolved triples between
+        batches; the caller is responsible for bounding its size.
+        """
+        memo = {} if memo is None else memo
+        results = []
+        for row in rows:
+            resolved = memo.get(row)
+            if resolved is None:
+                resolved = memo[row] = self.resolve_hierarchy(*row)
+            results.append(resolved)
+        return results
+
+
+_resolver: Optional[PlaceNameResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_place_name_resolver() -> PlaceNameResolver:
+    """Return the shared resolver, rebuilt whenever the cached `RegionIndex` is reloaded."""
+    global _resolver
+    region_index = region_index_cache.get()
+    resolver = _resolver
+    if resolver is not None and resolver.region_index is region_index:
+        return resolver
+    with _resolver_lock:
+        if _resolver is None or _resolver.region_index is not region_index:
+            with SessionLocal() as session:
+                _resolver = PlaceNameResolver.from_session(session, region_index)
+        return _resolver
@@ -0,0 +1,351 @@
+"""
+In-process cache of the region hierarchy.
+
+`RegionIndex` loads every State, District, Subdistrict and City once into
+array-backed columns and answers id -> node, (parent_id, name) -> id and
+ancestor-chain lookups in O(1) without touching the database or building ORM
+instances. `RegionIndexCache` owns the shared instance and reloads it when the
+tables change (row count or latest `updated_at`) or on explicit refresh.
+
+Memory budget: about 220 bytes per region (ids, parent ids and coordinates
+live in typed arrays; the remaining cost is the name string and its lookup-dict
+entry), so the full ~650k-village hierarchy must stay under 160 MiB.
+"""
+
+import math
+import threading
+import time
+from array import array
+from enum import IntEnum
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.configuration.database import SessionLocal
+from app.models.region import City, District, State, Subdistrict
+
+# Rows fetched per round trip while loading
+LOAD_CHUNK_SIZE = 50_000
+
+
+class RegionLevel(IntEnum):
+    """Levels of the administrative hierarchy, top-down."""
+    STATE = 0
+    DISTRICT = 1
+    SUBDISTRICT = 2
+    CITY = 3
+
+
+class RegionNode(NamedTuple):
+    """Lightweight view of one region, built on demand from the index columns."""
+    level: RegionLevel
+    id: int
+    name: str
+    parent_id: Optional[int]
+
+
+def name_key(name: str) -> str:
+    """Normalize a name for exact (case/whitespace-insensitive) lookups."""
+    return " ".join(name.split()).casefold()
+
+
+class _LevelColumns:
+    """
+    Column store for one level: positions are aligned across all arrays.
+
+    The (parent_id, name) lookup is keyed by the hash of the normalized pair and
+    maps to a position, which is verified on lookup; the rare colliding entries
+    go to a small overflow dict. This avoids keeping a tuple and a second string
+    per region alive just for the lookup table.
+    """
+    __slots__ = ("ids", "parent_ids", "names", "_positions", "_dense", "_by_name", "_collisions", "_children")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.parent_ids = array("q")  # 0 when there is no parent
+        self.names: List[str] = []
+        self._positions = array("l")
+        self._dense = True
+        self._by_name: Dict[int, int] = {}
+        self._collisions: Dict[Tuple[int, str], int] = {}
+        self._children: Optional[Dict[int, array]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, region_id: int, parent_id: Optional[int], name: str) -> None:
+        position = len(self.ids)
+        self.ids.append(region_id)
+        self.parent_ids.append(parent_id or 0)
+        self.names.append(name)
+
+        key = name_key(name)
+        hashed = hash((parent_id or 0, key))
+        existing = self._by_name.setdefault(hashed, position)
+        if existing != position and not self._matches(existing, parent_id or 0, key):
+            # Like the main map, keep the first of duplicate (parent, name) pairs
+            self._collisions.setdefault((parent_id or 0, key), position)
+
+    def _matches(self, position: int, parent_id: int, key: str) -> bool:
+        return self.parent_ids[position] == parent_id and name_key(self.names[position]) == key
+
+    def build_positions(self) -> None:
+        """Build the id -> position map: a dense array when ids are compact, else a dict."""
+        max_id = max(self.ids, default=0)
+        self._dense = max_id <= 4 * len(self.ids) + 1024
+        if self._dense:
+            positions = array("l", [-1]) * (max_id + 1)
+            for position, region_id in enumerate(self.ids):
+                positions[region_id] = position
+            self._positions = positions
+        else:
+            self._positions = {region_id: position for position, region_id in enumerate(self.ids)}
+
+    def position(self, region_id: int) -> int:
+        if self._dense:
+            if 0 <= region_id < len(self._positions):
+                return self._positions[region_id]
+            return -1
+        return self._positions.get(region_id, -1)
+
+    def children(self, parent_id: int) -> Sequence[int]:
+        """Ids of all entries under `parent_id`; grouped lazily on first use."""
+        if self._children is None:
+            children: Dict[int, array] = {}
+            for region_id, region_parent_id in zip(self.ids, self.parent_ids):
+                group = children.get(region_parent_id)
+                if group is None:
+                    group = children[region_parent_id] = array("q")
+                group.append(region_id)
+            self._children = children
+        return self._children.get(parent_id, ())
+
+    def find(self, parent_id: Optional[int], name: str) -> Optional[int]:
+        key = name_key(name)
+        position = self._by_name.get(hash((parent_id or 0, key)))
+        if position is not None and self._matches(position, parent_id or 0, key):
+            return self.ids[position]
+        position = self._collisions.get((parent_id or 0, key))
+        return None if position is None else self.ids[position]
+
+
+class RegionIndex:
+    """Immutable, array-backed snapshot of the full region hierarchy."""
+
+    def __init__(self, fingerprint: Tuple = ()):
+        self.fingerprint = fingerprint
+        self.loaded_at = time.time()
+        self._levels = {level: _LevelColumns() for level in RegionLevel}
+        # Cities hang off a district and optionally a subdistrict
+        self._city_subdistrict_ids = array("q")
+        self._city_lat = array("d")
+        self._city_lng = array("d")
+
+    # ------------------------------------------------------------------ loading
+
+    @classmethod
+    def load(cls, session: Session) -> "RegionIndex":
+        """Load the whole hierarchy from the database in streamed chunks."""
+        index = cls(fingerprint=region_fingerprint(session))
+        states = index._levels[RegionLevel.STATE]
+        for region_id, name in _stream(session, select(State.id, State.name)):
+            states.append(region_id, None, name)
+
+        streams = {
+            RegionLevel.DISTRICT: select(District.id, District.name, District.state_id),
+            RegionLevel.SUBDISTRICT: select(Subdistrict.id, Subdistrict.name, Subdistrict.district_id),
+        }
+        for level, statement in streams.items():
+            columns = index._levels[level]
+            for region_id, name, parent_id in _stream(session, statement):
+                columns.append(region_id, parent_id, name)
+
+        cities = index._levels[RegionLevel.CITY]
+        statement = select(City.id, City.name, City.district_id, City.subdistrict_id, City.lat, City.lng)
+        for region_id, name, district_id, subdistrict_id, lat, lng in _stream(session, statement):
+            cities.append(region_id, district_id, name)
+            index._city_subdistrict_ids.append(subdistrict_id or 0)
+            index._city_lat.append(math.nan if lat is None else lat)
+            index._city_lng.append(math.nan if lng is None else lng)
+
+        for columns in index._levels.values():
+            columns.build_positions()
+        return index
+
+    # ------------------------------------------------------------------ lookups
+
+    def __len__(self) -> int:
+        return sum(len(columns) for columns in self._levels.values())
+
+    def count(self, level: RegionLevel) -> int:
+        return len(self._levels[level])
+
+    def get(self, level: RegionLevel, region_id: int) -> Optional[RegionNode]:
+        """Return the node for `region_id` at `level`, or None if it does not exist."""
+        columns = self._levels[level]
+        position = columns.position(region_id)
+        if position < 0:
+            return None
+        parent_id = columns.parent_ids[position]
+        return RegionNode(level, region_id, columns.names[position], parent_id or None)
+
+    def state(self, state_id: int) -> Optional[RegionNode]:
+        return self.get(RegionLevel.STATE, state_id)
+
+    def district(self, district_id: int) -> Optional[RegionNode]:
+        return self.get(RegionLevel.DISTRICT, district_id)
+
+    def subdistrict(self, subdistrict_id: int) -> Optional[RegionNode]:
+        return self.get(RegionLevel.SUBDISTRICT, subdistrict_id)
+
+    def city(self, city_id: int) -> Optional[RegionNode]:
+        return self.get(RegionLevel.CITY, city_id)
+
+    def find_id(self, level: RegionLevel, name: str, parent_id: Optional[int] = None) -> Optional[int]:
+        """
+        Resolve a name to an id within its parent.
+
+        Args:
+            level: Level of the region being looked up.
+            name: Region name; matched case- and whitespace-insensitively.
+            parent_id: State id for districts, district id for subdistricts and
+                cities; omitted for states.
+        """
+        return self._levels[level].find(parent_id, name)
+
+    def ids(self, level: RegionLevel) -> Sequence[int]:
+        """All ids at `level`, in load order."""
+        return self._levels[level].ids
+
+    def children(self, level: RegionLevel, parent_id: int) -> Sequence[int]:
+        """
+        Ids of the regions at `level` whose direct parent is `parent_id`.
+
+        Cities are grouped by district (their subdistrict is optional).
+        """
+        return self._levels[level].children(parent_id)
+
+    def city_subdistrict_id(self, city_id: int) -> Optional[int]:
+        position = self._levels[RegionLevel.CITY].position(city_id)
+        if position < 0:
+            return None
+        return self._city_subdistrict_ids[position] or None
+
+    def city_coordinates(self, city_id: int) -> Optional[Tuple[float, float]]:
+        position = self._levels[RegionLevel.CITY].position(city_id)
+        if position < 0 or math.isnan(self._city_lat[position]):
+            return None
+        return self._city_lat[position], self._city_lng[position]
+
+    def city_points(self) -> Iterator[Tuple[int, float, float]]:
+        """Yield (city_id, lat, lng) for every city that has coordinates."""
+        ids = self._levels[RegionLevel.CITY].ids
+        for city_id, lat, lng in zip(ids, self._city_lat, self._city_lng):
+            if not math.isnan(lat):
+                yield city_id, lat, lng
+
+    def state_id_of(self, level: RegionLevel, region_id: int) -> Optional[int]:
+        """Return the id of the state containing the given region."""
+        chain = self.ancestors(level, region_id, include_self=True)
+        return chain[-1].id if chain and chain[-1].level is RegionLevel.STATE else None
+
+    def ancestors(self, level: RegionLevel, region_id: int, include_self: bool = False) -> List[RegionNode]:
+        """
+        Return the chain of ancestors from the closest parent up to the state.
+
+        Cities report their subdistrict (when set) before their district.
+        """
+        node = self.get(level, region_id)
+        if node is None:
+            return []
+        chain = [node] if include_self else []
+
+        if level is RegionLevel.CITY:
+            subdistrict_id = self.city_subdistrict_id(region_id)
+            if subdistrict_id:
+                subdistrict = self.subdistrict(subdistrict_id)
+                if subdistrict is not None:
+                    chain.append(subdistrict)
+            node = self.district(node.parent_id)
+        elif level is RegionLevel.STATE:
+            return chain
+        else:
+            node = self.get(RegionLevel(level - 1), node.parent_id)
+
+        while node is not None:
+            chain.append(node)
+            if node.level is RegionLevel.STATE:
+                break
+            node = self.get(RegionLevel(node.level - 1), node.parent_id)
+        return chain
+
+
+def _stream(session: Session, statement) -> Iterable[tuple]:
+    result = session.connection().execute(statement.execution_options(yield_per=LOAD_CHUNK_SIZE))
+    for partition in result.partitions():
+        yield from partition
+
+
+def region_fingerprint(session: Session) -> Tuple:
+    """
+    Cheap change detector: row count and latest `updated_at` of every region table.
+
+    `updated_at` has one-second resolution on SQLite, so an edit in the same
+    second as the latest earlier one goes unnoticed; call
+    `RegionIndexCache.refresh` after writing regions.
+    """
+    fingerprint = []
+    for model in (State, District, Subdistrict, City):
+        count, latest = session.execute(select(func.count(), func.max(model.updated_at)).select_from(model)).one()
+        fingerprint.append((count, str(latest)))
+    return tuple(fingerprint)
+
+
+class RegionIndexCache:
+    """
+    Process-wide holder for the current `RegionIndex`.
+
+    `get()` returns the cached index and, at most once every `check_interval`
+    seconds, compares the table fingerprint with the database to reload on change.
+
+    Args:
+        session_factory: Callable returning a new Session.
+        check_interval: Minimum seconds between staleness checks; 0 checks on every call.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, check_interval: float = 30.0):
+        self.session_factory = session_factory
+        self.check_interval = check_interval
+        self._index: Optional[RegionIndex] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> RegionIndex:
+        index = self._index
+        if index is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return index
+
+        with self._lock:
+            if self._index is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._index
+            with self.session_factory() as session:
+                if self._index is None or region_fingerprint(session) != self._index.fingerprint:
+                    self._index = RegionIndex.load(session)
+            self._checked_at = time.monotonic()
+            return self._index
+
+    def refresh(self) -> RegionIndex:
+        """Reload unconditionally (e.g. right after a bulk import)."""
+        self.invalidate()
+        return self.get()
+
+    def invalidate(self) -> None:
+        """Drop the cached index; the next `get()` reloads it."""
+        with self._lock:
+            self._index = None
+            self._checked_at = 0.0
+
+
+# Shared instance used by services and endpoints
+region_index_cache = RegionIndexCache()
@@ -0,0 +1,205 @@
+"""
+Spatial queries over city coordinates.
+
+The composite B-tree `ix_cities_coordinates` on (lat, lng) can only narrow one
+axis at a time, so "nearest mandi town" or "villages within 25 km" degrade to
+large range scans. `CitySpatialIndex` buckets points into a uniform lat/lng
+grid held in memory and answers k-nearest, radius and bounding-box queries by
+visiting only nearby cells, ranking with haversine distances. Points can be
+added one at a time or in batches while cities are being loaded.
+"""
+
+import heapq
+import math
+import threading
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.helpers.geo import EARTH_RADIUS_KM, KM_PER_DEGREE_LAT, haversine_km, km_per_degree_lng
+from app.services.region.region_index import RegionIndex, region_index_cache
+
+DEFAULT_CELL_SIZE_DEG = 0.1  # ~11 km of latitude
+
+
+class NearbyCity(NamedTuple):
+    city_id: int
+    distance_km: float
+
+
+class _Cell:
+    __slots__ = ("ids", "lats", "lngs")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.lats = array("d")
+        self.lngs = array("d")
+
+
+class CitySpatialIndex:
+    """
+    Uniform-grid spatial index of city points.
+
+    The grid does not wrap at the ±180° meridian, so it is meant for regional
+    data such as India's, not points on both sides of the antimeridian.
+
+    Args:
+        cell_size_deg: Edge length of a grid cell in degrees. Smaller cells make
+            radius queries tighter at the cost of more cells to visit for kNN.
+    """
+
+    def __init__(self, cell_size_deg: float = DEFAULT_CELL_SIZE_DEG):
+        self.cell_size_deg = cell_size_deg
+        self._cells: Dict[Tuple[int, int], _Cell] = {}
+        self._size = 0
+        self._lat_cells = (0, -1)  # Occupied cell-row range, used to bound ring searches
+        self._lng_cells = (0, -1)
+
+    @classmethod
+    def from_region_index(cls, region_index: RegionIndex, **kwargs) -> "CitySpatialIndex":
+        index = cls(**kwargs)
+        index.add_many(region_index.city_points())
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell_of(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_size_deg), math.floor(lng / self.cell_size_deg)
+
+    # ------------------------------------------------------------------ building
+
+    def add(self, city_id: int, lat: float, lng: float) -> None:
+        """Insert one point."""
+        key = self._cell_of(lat, lng)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = _Cell()
+            if self._size == 0 and len(self._cells) == 1:
+                self._lat_cells, self._lng_cells = (key[0], key[0]), (key[1], key[1])
+            else:
+                self._lat_cells = (min(self._lat_cells[0], key[0]), max(self._lat_cells[1], key[0]))
+                self._lng_cells = (min(self._lng_cells[0], key[1]), max(self._lng_cells[1], key[1]))
+        cell.ids.append(city_id)
+        cell.lats.append(lat)
+        cell.lngs.append(lng)
+        self._size += 1
+
+    def add_many(self, points: Iterable[Tuple[int, float, float]]) -> int:
+        """Insert (city_id, lat, lng) points, e.g. straight from a loader batch. Returns the count added."""
+        added = 0
+        for city_id, lat, lng in points:
+            if lat is None or lng is None:
+                continue
+            self.add(city_id, lat, lng)
+            added += 1
+        return added
+
+    # ------------------------------------------------------------------ queries
+
+    def _cells_in_range(self, lat_min: float, lng_min: float, lat_max: float, lng_max: float):
+        row_min, col_min = self._cell_of(lat_min, lng_min)
+        row_max, col_max = self._cell_of(lat_max, lng_max)
+        cells = self._cells
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(cells):
+            # Query box covers more cells than exist; filter the occupied ones instead
+            for (row, col), cell in cells.items():
+                if row_min <= row <= row_max and col_min <= col <= col_max:
+                    yield cell
+            return
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                cell = cells.get((row, col))
+                if cell is not None:
+                    yield cell
+
+    def within_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[int]:
+        """Ids of all cities inside the bounding box (inclusive)."""
+        found = []
+        for cell in self._cells_in_range(min_lat, min_lng, max_lat, max_lng):
+            for city_id, lat, lng in zip(cell.ids, cell.lats, cell.lngs):
+                if min_lat <= lat <= max_lat and min_lng <= lng <= max_lng:
+                    found.append(city_id)
+        return found
+
+    def within_radius(self, lat: float, lng: float, radius_km: float) -> List[NearbyCity]:
+        """All cities within `radius_km` of the point, nearest first."""
+        d_lat = radius_km / KM_PER_DEGREE_LAT
+        d_lng = radius_km / km_per_degree_lng(abs(lat) + d_lat)
+        found = []
+        for cell in self._cells_in_range(lat - d_lat, lng - d_lng, lat + d_lat, lng + d_lng):
+            for city_id, city_lat, city_lng in zip(cell.ids, cell.lats, cell.lngs):
+                if abs(city_lat - lat) > d_lat:
+                    continue
+                distance = haversine_km(lat, lng, city_lat, city_lng)
+                if distance <= radius_km:
+                    found.append(NearbyCity(city_id, distance))
+        found.sort(key=lambda item: item.distance_km)
+        return found
+
+    def nearest(self, lat: float, lng: float, k: int = 1, max_km: Optional[float] = None) -> List[NearbyCity]:
+        """
+        The `k` cities closest to the point, nearest first.
+
+        Searches rings of cells outward from the query cell and stops once the
+        k-th best distance is closer than anything an unvisited ring could hold.
+        """
+        if k <= 0 or not self._cells:
+            return []
+        row0, col0 = self._cell_of(lat, lng)
+        max_ring = max(
+            abs(row0 - self._lat_cells[0]), abs(row0 - self._lat_cells[1]),
+            abs(col0 - self._lng_cells[0]), abs(col0 - self._lng_cells[1]),
+        )
+        heap: List[Tuple[float, int]] = []  # max-heap of (-distance, city_id)
+        cells = self._cells
+
+        for ring in range(max_ring + 1):
+            for row in range(row0 - ring, row0 + ring + 1):
+                on_edge_row = row in (row0 - ring, row0 + ring)
+                step = 1 if on_edge_row else 2 * ring
+                for col in range(col0 - ring, col0 + ring + 1, step or 1):
+                    cell = cells.get((row, col))
+                    if cell is None:
+                        continue
+                    for city_id, city_lat, city_lng in zip(cell.ids, cell.lats, cell.lngs):
+                        distance = haversine_km(lat, lng, city_lat, city_lng)
+                        if max_km is not None and distance > max_km:
+                            continue
+                        if len(heap) < k:
+                            heapq.heappush(heap, (-distance, city_id))
+                        elif distance < -heap[0][0]:
+                            heapq.heapreplace(heap, (-distance, city_id))
+
+            # Anything outside the visited block is at least `ring` whole cells
+            # away in latitude or in longitude. A longitude offset of `reach_deg`
+            # or more is at least the distance to the meridian that far away,
+            # whatever the other point's latitude.
+            reach_deg = ring * self.cell_size_deg
+            meridian_km = EARTH_RADIUS_KM * math.asin(
+                math.cos(math.radians(lat)) * math.sin(math.radians(min(reach_deg, 90.0)))
+            )
+            bound_km = min(reach_deg * KM_PER_DEGREE_LAT, meridian_km)
+            if max_km is not None and bound_km > max_km:
+                break
+            if len(heap) == k and -heap[0][0] <= bound_km:
+                break
+
+        return [NearbyCity(city_id, -negative) for negative, city_id in sorted(heap, reverse=True)]
+
+
+_spatial_index: Optional[CitySpatialIndex] = None
+_spatial_source: Optional[RegionIndex] = None
+_spatial_lock = threading.Lock()
+
+
+def get_city_spatial_index() -> CitySpatialIndex:
+    """Return the shared spatial index, rebuilt whenever the cached `RegionIndex` is reloaded."""
+    global _spatial_index, _spatial_source
+    region_index = region_index_cache.get()
+    if _spatial_index is not None and _spatial_source is region_index:
+        return _spatial_index
+    with _spatial_lock:
+        if _spatial_index is None or _spatial_source is not region_index:
+            _spatial_index = CitySpatialIndex.from_region_index(region_index)
+            _spatial_source = region_index
+        return _spatial_index
@@ -0,0 +1,69 @@
+"""
+Assemble a state's full hierarchy for serialization.
+
+The tree is built from one flat query per level (state, capital, districts,
+subdistricts, cities) instead of walking the lazy ORM relationships, which
+would issue a query per district. Five queries serve a state of any size.
+
+Usage:
+    tree = build_state_tree(session, state_id)  # matches StateTreeResponse
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.repositories.region import CityRow, RegionRepository
+
+# Queries issued by `build_state_tree`, whatever the size of the state
+STATE_TREE_QUERIES = 5
+
+
+def _city(row: CityRow) -> Dict[str, Any]:
+    return {"id": row.id, "name": row.name, "subdistrict_id": row.subdistrict_id, "lat": row.lat, "lng": row.lng}
+
+
+def build_state_tree(session: Session, state_id: int, include_cities: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Load a state with its capital, districts, subdistricts and cities.
+
+    Args:
+        session: Database session.
+        state_id: State to load.
+        include_cities: Also list every city under its district.
+
+    Returns:
+        Nested dicts shaped like `StateTreeResponse`, or None if the state
+        does not exist.
+    """
+    repository = RegionRepository(session)
+    state = repository.state(state_id)
+    if state is None:
+        return None
+
+    capital = repository.city(state.capital_id) if state.capital_id is not None else None
+    districts: Dict[int, Dict[str, List]] = {}
+    tree_districts = []
+    for district in repository.districts_in_state(state_id):
+        node = {"id": district.id, "name": district.name, "subdistricts": [], "cities": []}
+        districts[district.id] = node
+        tree_districts.append(node)
+
+    for subdistrict in repository.subdistricts_in_state(state_id):
+        node = districts.get(subdistrict.district_id)
+        if node is not None:
+            node["subdistricts"].append({"id": subdistrict.id, "name": subdistrict.name})
+
+    if include_cities:
+        for city in repository.cities_in_state(state_id):
+            node = districts.get(city.district_id)
+            if node is not None:
+                node["cities"].append(_city(city))
+
+    return {
+        "id": state.id,
+        "name": state.name,
+        "type": state.type,
+        "capital": _city(capital) if capital is not None else None,
+        "districts": tree_districts,
+    }
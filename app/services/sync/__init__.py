@@ -0,0 +1,10 @@
+"""
+Incremental synchronization of upstream feeds into the local database.
+
+Usage:
+    from app.services.sync import IncrementalCsvSync
+"""
+
+from app.services.sync.incremental_sync import ChangeWriter, IncrementalCsvSync, SyncResult, SyncStatus, row_digest
+
+__all__ = [ChangeWriter, IncrementalCsvSync, SyncResult, SyncStatus, row_digest]
@@ -0,0 +1,61 @@
+"""
+Command-line export of region and price tables to files.
+
+Streams a `BulkExport` to disk chunk by chunk. The file is written under a
+`.part` name and renamed when complete, so an interrupted export never leaves
+a truncated file behind under the final name. With no output path the export
+goes to stdout and messages go to stderr.
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.services.export import EXPORT_CHUNK_SIZE, BulkExport, ExportFilters, ExportFormat
+
+
+def export_to_file(
+    dataset: str,
+    output: Optional[Path],
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    filters: ExportFilters = ExportFilters(),
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Optional[int]:
+    """
+    Export a dataset to a file or stdout.
+
+    Args:
+        dataset: Dataset name (see `app.services.export.DATASETS`).
+        output: Destination file, or None for stdout.
+        export_format: Output format.
+        filters: Row filters.
+        chunk_size: Rows fetched and written per chunk.
+
+    Returns:
+        Number of rows exported, or None on failure.
+    """
+    log = sys.stderr if output is None else sys.stdout
+    started = time.perf_counter()
+    part_path = None if output is None else output.with_name(output.name + ".part")
+    try:
+        export = BulkExport(dataset, export_format, filters, chunk_size)
+        if output is None:
+            written = sum(map(sys.stdout.buffer.write, export))
+            sys.stdout.buffer.flush()
+        else:
+            with open(part_path, "wb") as file:
+                written = sum(map(file.write, export))
+            part_path.replace(output)
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        destination = "stdout" if output is None else output
+        print(f"Exported {export.rows:,} {dataset} row(s) to {destination} ({written / 1e6:,.1f} MB) "
+              f"in {elapsed:.1f}s ({export.rows / elapsed:,.0f} rows/sec)", file=log)
+        return export.rows
+
+    except Exception as e:
+        if part_path is not None:
+            part_path.unlink(missing_ok=True)
+        print(f"Error exporting {dataset}: {e}", file=log)
+        return None
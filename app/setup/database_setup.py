@@ -1,26 +1,45 @@
 """
 Database setup and table creation utilities.
 
-This module provides functions to automatically discover models and create
-all database tables. It scans the models directory for SQLAlchemy models
-and creates the corresponding tables in the database.
+This module provides functions to list the registered models and create all
+database tables. Models come from the static `app.models.MODELS` registry;
+scanning the models directory is only done on request (`scan_models`), e.g. to
+check that the registry is complete.
 """
 
 import importlib
 import inspect
+import time
 from pathlib import Path
-from typing import List, Type
+from typing import List, Optional, Type
 
-from sqlalchemy import MetaData, text
+from sqlalchemy import MetaData
 from sqlalchemy.orm import DeclarativeBase
 
-from app.configuration.database import engine, get_database_path
+from app.configuration.database import get_database_path, get_engine
+from app.models import MODELS
 from app.models.region import Base
+from app.setup.sql_script import SqlScriptError, iter_sql_statements, run_sql_statements
 
 
 def discover_models(models_dir: Path = None) -> List[Type[DeclarativeBase]]:
     """
-    Automatically discover all SQLAlchemy model classes in the models directory.
+    Return the SQLAlchemy model classes.
+
+    Args:
+        models_dir: Scan this directory instead of using the static registry.
+
+    Returns:
+        List of SQLAlchemy model classes.
+    """
+    if models_dir is None:
+        return list(MODELS)
+    return scan_models(models_dir)
+
+
+def scan_models(models_dir: Path = None) -> List[Type[DeclarativeBase]]:
+    """
+    Find SQLAlchemy model classes by importing every module in the models directory.
 
     Args:
         models_dir: Path to the models directory. If None, uses default app/models.
@@ -50,7 +69,8 @@ def discover_models(models_dir: Path = None) -> List[Type[DeclarativeBase]]:
             for name, obj in inspect.getmembers(module, inspect.isclass):
                 if (hasattr(obj, "__tablename__") and
                     issubclass(obj, DeclarativeBase) and
-                    obj is not DeclarativeBase):
+                    obj is not DeclarativeBase and
+                    obj not in models):
                     models.append(obj)
                     print(f"Discovered model: {module_path}.{name}")
 
@@ -97,11 +117,11 @@ def create_all_tables(drop_existing: bool = False):
         # Drop tables if requested
         if drop_existing:
             print("Dropping existing tables...")
-            Base.metadata.drop_all(bind=engine)
+            Base.metadata.drop_all(bind=get_engine())
 
         # Create all tables
         print("Creating tables...")
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
 
         print(f"Successfully created {len(models)} table(s):")
         for model in models:
@@ -131,7 +151,7 @@ def check_database_status():
 
         # Check which tables exist
         metadata = MetaData()
-        metadata.reflect(bind=engine)
+        metadata.reflect(bind=get_engine())
 
         if metadata.tables:
             print(f"Existing tables ({len(metadata.tables)}):")
@@ -155,30 +175,66 @@ def reset_database():
     return create_all_tables(drop_existing=True)
 
 
-def execute_sql_script(script_path: Path):
+def execute_sql_script(script_path: Path, batch_size: int = 1_000, progress_every: int = 10_000) -> Optional[int]:
     """
     Execute a SQL script file against the database.
 
+    The script is streamed statement by statement (see `app.setup.sql_script`)
+    and committed every `batch_size` statements.
+
     Args:
         script_path: Path to the SQL script file.
+        batch_size: Statements per transaction; 0 runs the whole script in one.
+        progress_every: Print progress every N statements (0 to disable).
+
+    Returns:
+        Number of statements executed, or None on failure.
     """
+    started = time.perf_counter()
     try:
-        with open(script_path, 'r') as file:
-            sql_script = file.read()
+        with open(script_path, "r", encoding="utf-8") as file, get_engine().connect() as connection:
+            executed = run_sql_statements(connection, iter_sql_statements(file), batch_size, progress_every)
+
+        elapsed = time.perf_counter() - started
+        print(f"Successfully executed {executed:,} statement(s) from {script_path} in {elapsed:.1f}s")
+        return executed
+
+    except SqlScriptError as e:
+        print(f"Error executing SQL script {script_path}, {e}")
+        if e.statement:
+            print(f"  {e.statement[:200]}")
+        if batch_size:
+            print("Statements before the failing batch were committed.")
+        return None
+    except Exception as e:
+        print(f"Error executing SQL script: {e}")
+        return None
 
-        with engine.connect() as connection:
-            # Split script into individual statements
-            statements = [stmt.strip() for stmt in sql_script.split(';') if stmt.strip()]
 
-            for statement in statements:
-                print(f"Executing: {statement[:50]}...")
-                connection.execute(text(statement))
-                connection.commit()
+def rebuild_price_rollups() -> Optional[int]:
+    """
+    Recompute every price rollup cell from `mandi_prices`.
 
-        print(f"Successfully executed SQL script: {script_path}")
+    Rollups are kept up to date on each write; a rebuild is only needed after
+    loading prices with rollup refresh disabled, or after deleting prices.
 
+    Returns:
+        Number of rollup cells, or None on failure.
+    """
+    from sqlalchemy.orm import Session
+
+    from app.repositories.price import PriceRollupRepository
+
+    started = time.perf_counter()
+    try:
+        with Session(get_engine()) as session:
+            cells = PriceRollupRepository(session).rebuild()
+            session.commit()
+        print(f"Rebuilt {cells:,} price rollup cell(s) in {time.perf_counter() - started:.1f}s")
+        return cells
     except Exception as e:
-        print(f"Error executing SQL script: {e}")
+        print(f"Error rebuilding price rollups: {e}")
+        return None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,239 @@
+"""
+Parallel bulk ingestion of mandi price CSV files (`manage_db.py ingest`).
+
+Decoding, type conversion and place-name resolution are CPU-bound and would
+keep a single process busy on one core, so the work is split in three stages:
+
+1. Shard (parent): every file is cut into byte ranges of whole records
+   (`shard_csv_file`); only quote characters are counted, nothing is parsed.
+2. Parse + resolve (worker processes): each shard is parsed with
+   `MANDI_PRICE_CSV_SCHEMA` and its places resolved by a per-worker
+   `PlaceNameResolver`, yielding ready-to-write price rows. As in the feed
+   sync, only rows whose places match exactly or through an alias are kept
+   (`MIN_WRITE_SCORE`); fuzzy matches are counted and reported instead, since
+   a look-alike name is as likely another market as a misspelling. Each worker
+   remembers the place spellings it has resolved, so a name repeated on every
+   day of the file is resolved once per worker rather than once per batch.
+3. Write (parent): SQLite allows one writer, so the parent is the only process
+   that writes. It assigns commodity ids and upserts each shard's rows in one
+   transaction, in file order, so a later row for the same key wins exactly as
+   in a sequential load.
+
+At most `2 x workers` shards are in flight, which bounds memory. After each
+shard the rollup cells its rows fall in are refreshed
+(`PriceRollupRepository.refresh`), so loading a day's file costs about that
+day's cells rather than the whole history. A backfill of many years instead
+skips the per-shard refresh and rebuilds every rollup once at the end
+(`PriceRollupRepository.rebuild`), which is cheaper when most cells change.
+
+The report lists the seconds and rows/sec of every stage. Worker stages are
+CPU seconds summed over all workers. "writer waiting" is the time the writer
+sat idle waiting for the next shard: when it approaches zero, the writer is the
+bottleneck and more workers will not help.
+"""
+
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.configuration.database import build_engine, get_db_settings
+from app.helpers.csv_parser import DEFAULT_SHARD_SIZE, CsvFileShard, iter_csv_shard, shard_csv_file
+from app.repositories.price import MandiPriceRepository, PriceRollupRepository
+from app.services.price.mandi_price_sync import MANDI_PRICE_CSV_SCHEMA, resolve_price_rows
+from app.services.region import PlaceNameResolver, get_place_name_resolver
+
+PARSE_BATCH_SIZE = 10_000
+
+# Resolved (state, district, market) spellings a worker keeps across shards
+MAX_MEMOIZED_PLACES = 500_000
+
+# Resolver and place memo of the current worker process, set up by `_init_worker`
+_resolver: Optional[PlaceNameResolver] = None
+_places: Dict = {}
+
+
+class ShardResult(NamedTuple):
+    """Output of one shard: price rows with commodity names, skipped row counts and worker timings."""
+    rows: List[tuple]
+    rows_read: int
+    rows_unresolved: int
+    rows_low_confidence: int
+    parse_seconds: float
+    resolve_seconds: float
+
+
+class IngestStats(NamedTuple):
+    rows_read: int
+    rows_written: int
+    rows_unresolved: int
+    rows_low_confidence: int
+    shards: int
+    seconds: float
+
+
+def _init_worker() -> None:
+    global _resolver
+    _resolver = get_place_name_resolver()
+
+
+def _process_shard(shard: CsvFileShard) -> ShardResult:
+    """Parse and resolve one shard (runs in a worker process)."""
+    rows: List[tuple] = []
+    rows_read = unresolved = low_confidence = 0
+    parse_seconds = resolve_seconds = 0.0
+    batches = iter_csv_shard(shard, MANDI_PRICE_CSV_SCHEMA, PARSE_BATCH_SIZE)
+    while True:
+        started = time.perf_counter()
+        batch = next(batches, None)
+        parsed = time.perf_counter()
+        parse_seconds += parsed - started
+        if batch is None:
+            break
+        rows_read += len(batch)
+        if len(_places) > MAX_MEMOIZED_PLACES:
+            _places.clear()
+        resolved = resolve_price_rows(_resolver, batch, _places)
+        rows.extend(resolved.rows)
+        unresolved += resolved.unresolved
+        low_confidence += resolved.low_confidence
+        resolve_seconds += time.perf_counter() - parsed
+    return ShardResult(rows, rows_read, unresolved, low_confidence, parse_seconds, resolve_seconds)
+
+
+def _shard_results(shards: Sequence[CsvFileShard], workers: int) -> Iterator[ShardResult]:
+    """Process shards on `workers` processes (0 = in this process) and yield results in shard order."""
+    if workers == 0:
+        _init_worker()
+        yield from map(_process_shard, shards)
+        return
+
+    # Spawned workers start without the parent's open database connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+        remaining = iter(shards)
+        in_flight: Deque[Future] = deque()
+        for shard in remaining:
+            in_flight.append(pool.submit(_process_shard, shard))
+            if len(in_flight) >= 2 * workers:
+                break
+        while in_flight:
+            result = in_flight.popleft().result()
+            shard = next(remaining, None)
+            if shard is not None:
+                in_flight.append(pool.submit(_process_shard, shard))
+            yield result
+
+
+def _report(stages: Dict[str, float], rows: int) -> None:
+    print(f"{'Stage':<28} {'seconds':>9} {'rows/sec':>12}")
+    for stage, seconds in stages.items():
+        rate = f"{rows / seconds:>12,.0f}" if seconds > 0 else f"{'-':>12}"
+        print(f"{stage:<28} {seconds:>9.2f} {rate}")
+
+
+def ingest_prices(
+    paths: Sequence[Path],
+    workers: Optional[int] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    refresh_rollups: bool = True,
+    backfill: bool = False,
+) -> Optional[IngestStats]:
+    """
+    Load mandi price CSV files (feed format) into `mandi_prices` in parallel.
+
+    Args:
+        paths: CSV files, loaded in order.
+        workers: Parse/resolve processes; defaults to one per CPU but one
+            (the writer's). 0 parses in the writer process.
+        shard_size: Approximate bytes of CSV per shard.
+        refresh_rollups: Refresh the rollup cells of each shard's rows after
+            writing it. With False the rollups are left stale; run
+            `manage_db.py rebuild-rollups` later.
+        backfill: Rebuild every rollup once at the end instead of refreshing
+            per shard; for loads touching most of the price history.
+
+    Returns:
+        Load statistics, or None on failure.
+    """
+    if workers is None:
+        workers = max((os.cpu_count() or 1) - 1, 1)
+    started = time.perf_counter()
+    try:
+        shards = [shard for path in paths for shard in shard_csv_file(path, shard_size)]
+        shard_seconds = time.perf_counter() - started
+        print(f"Ingesting {len(shards)} shard(s) of {len(paths)} file(s) with {workers} worker(s)")
+
+        # The writer is the only connection writing; relax durability for the load
+        settings = get_db_settings().model_copy(update={"sqlite_profile": "ingest_heavy"})
+        engine = build_engine(settings)
+        rows_read = rows_written = rows_unresolved = rows_low_confidence = 0
+        parse_seconds = resolve_seconds = write_seconds = wait_seconds = rollup_seconds = 0.0
+        commodity_ids: Dict[str, int] = {}
+        try:
+            with Session(engine) as session:
+                repository = MandiPriceRepository(session)
+                results = _shard_results(shards, workers)
+                for number in range(1, len(shards) + 1):
+                    waited = time.perf_counter()
+                    result = next(results)
+                    writing = time.perf_counter()
+                    wait_seconds += writing - waited
+
+                    missing = {row[0] for row in result.rows} - commodity_ids.keys()
+                    if missing:
+                        commodity_ids.update(repository.commodity_ids(missing))
+                    rows = [(commodity_ids[row[0]], *row[1:]) for row in result.rows]
+                    rows_written += repository.upsert_prices(rows, refresh_rollups=False)
+                    refresh_seconds = 0.0
+                    if refresh_rollups and not backfill:
+                        refreshing = time.perf_counter()
+                        PriceRollupRepository(session).refresh(rows)
+                        refresh_seconds = time.perf_counter() - refreshing
+                    session.commit()
+                    write_seconds += time.perf_counter() - writing - refresh_seconds
+                    rollup_seconds += refresh_seconds
+
+                    rows_read += result.rows_read
+                    rows_unresolved += result.rows_unresolved
+                    rows_low_confidence += result.rows_low_confidence
+                    parse_seconds += result.parse_seconds
+                    resolve_seconds += result.resolve_seconds
+                    elapsed = time.perf_counter() - started
+                    print(f"Shard {number}/{len(shards)}: {rows_written:,} rows ({rows_written / elapsed:,.0f} rows/sec)")
+
+                if backfill:
+                    rollups_started = time.perf_counter()
+                    PriceRollupRepository(session).rebuild()
+                    session.commit()
+                    rollup_seconds = time.perf_counter() - rollups_started
+        finally:
+            engine.dispose()
+
+        elapsed = time.perf_counter() - started
+        print(f"Loaded {rows_written:,} of {rows_read:,} rows in {elapsed:.1f}s "
+              f"({rows_written / max(elapsed, 1e-9):,.0f} rows/sec); skipped {rows_unresolved:,} unresolved and "
+              f"{rows_low_confidence:,} low-confidence (fuzzy place match) rows")
+        stages = {
+            "shard": shard_seconds,
+            "parse (worker CPU)": parse_seconds,
+            "resolve (worker CPU)": resolve_seconds,
+            "write": write_seconds,
+            "writer waiting": wait_seconds,
+        }
+        if backfill:
+            stages["rebuild rollups"] = rollup_seconds
+        elif refresh_rollups:
+            stages["refresh rollups"] = rollup_seconds
+        stages["total"] = elapsed
+        _report(stages, rows_read)
+        return IngestStats(rows_read, rows_written, rows_unresolved, rows_low_confidence, len(shards), elapsed)
+
+    except Exception as e:
+        print(f"Error ingesting prices: {e}")
+        return None
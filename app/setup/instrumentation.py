@@ -0,0 +1,110 @@
+"""
+Request instrumentation: latency metrics, per-request breakdowns and profiling.
+
+`install_instrumentation` is called once by `app.main`. With `METRICS_ENABLED`
+unset it does nothing, so a default deployment runs without the middleware,
+without SQL hooks and without the /metrics routes. When enabled:
+
+- `InstrumentationMiddleware` times every HTTP request and records it under
+  its route template (`/regions/states/{state_id}`, not the raw path, so the
+  number of series stays bounded); the database, upstream and serialization
+  time the request spent are added as a `Server-Timing` response header;
+- engines built from now on time their statements (`install_query_metrics`);
+- with `METRICS_PROFILING_ENABLED` also set, requests sent with `X-Profile: 1`
+  (or `_profile=1` in the query string) are sampled by a `SamplingProfiler`;
+  the profile id comes back in `X-Profile-Id` and the profile is served by
+  `GET /metrics/profiles/{id}`. Like /metrics, this is only honoured for
+  loopback clients unless `METRICS_ALLOW_REMOTE` is set;
+- `GET /metrics` renders everything in the Prometheus text format.
+"""
+
+import time
+from typing import Optional
+
+from fastapi import FastAPI
+
+from app.configuration.metrics import MetricsSettings, metrics_settings
+from app.utils.metrics import end_request, enable_metrics, is_local_client, registry, start_request
+from app.utils.profiling import Profile, SamplingProfiler, profile_store
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_FLAG = b"_profile=1"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _wants_profile(scope, settings: MetricsSettings) -> bool:
+    if not settings.profiling_enabled:
+        return False
+    if not settings.allow_remote:
+        client = scope.get("client")
+        if not is_local_client(client[0] if client else None):
+            return False
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.strip().lower() in (b"1", b"true", b"yes")
+    return PROFILE_QUERY_FLAG in scope.get("query_string", b"").split(b"&")
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware recording request metrics and, on request, a profile."""
+
+    def __init__(self, app, settings: MetricsSettings = metrics_settings):
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler: Optional[SamplingProfiler] = None
+        profile_id = 0
+        if _wants_profile(scope, self.settings):
+            profiler = SamplingProfiler(self.settings.profile_interval_ms / 1000, self.settings.profile_max_seconds)
+            profile_id = profile_store.next_id()
+            profiler.start()
+
+        stats, token = start_request()
+        started = time.perf_counter()
+        status = 500
+
+        async def send_instrumented(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", stats.server_timing(time.perf_counter() - started).encode()))
+                if profiler is not None:
+                    headers.append((b"x-profile-id", str(profile_id).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_instrumented)
+        finally:
+            seconds = time.perf_counter() - started
+            end_request(token)
+            route = _route_template(scope)
+            registry.observe_request(scope["method"], route, status, seconds, stats)
+            if profiler is not None:
+                profile_store.add(Profile(
+                    profile_id, scope["method"], scope["path"], route, status,
+                    profiler.stop(), profiler.samples, dict(profiler.stacks),
+                ))
+
+
+def install_instrumentation(app: FastAPI, settings: MetricsSettings = metrics_settings) -> None:
+    """Enable metrics for `app` when `settings.enabled` is set."""
+    if not settings.enabled:
+        return
+    enable_metrics(settings)
+    profile_store.resize(settings.profiles_kept)
+    app.add_middleware(InstrumentationMiddleware, settings=settings)
+
+    from app.endpoints.metrics.metrics_router import metrics_router
+    app.include_router(metrics_router)
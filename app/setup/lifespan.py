@@ -0,0 +1,25 @@
+"""
+Application lifespan management.
+
+Resources that should live for the whole process (pooled HTTP transport,
+database engines, caches) are created on startup and released on shutdown here.
+"""
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from app.dal.api_clients.base_api_client import BaseAPIClient
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """FastAPI lifespan handler wiring up shared resources."""
+    await BaseAPIClient.startup()
+    try:
+        yield
+    finally:
+        await BaseAPIClient.shutdown()
+        # Imported here: routers only load SQLAlchemy on their first request
+        from app.configuration.database import dispose_engines
+        await dispose_engines()
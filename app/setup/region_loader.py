@@ -0,0 +1,230 @@
+"""
+Bulk loader for the region hierarchy (State -> District -> Subdistrict -> City).
+
+Loading hundreds of thousands of villages as ORM objects is far too slow, so
+this module streams the census CSV in chunks, resolves parent foreign keys from
+in-memory name -> id maps, assigns primary keys itself and writes each chunk
+with Core `insert()` executemany batches inside a single transaction.
+
+Expected CSV header (empty cells are allowed for the optional columns):
+
+    state,state_type,district,subdistrict,city,lat,lng
+
+While loading, SQLite is switched to fast-load pragmas and secondary indexes
+are dropped; they are rebuilt once all data is in, or when the load fails.
+Progress is kept per CSV file in the `region_loads` table and updated in the
+same transaction as each chunk, so an interrupted load resumes exactly after
+the last committed chunk and a completed load is not repeated.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Connection, Table, delete, func, insert, select, update
+
+from app.configuration.database import SQLITE_PROFILES, get_engine
+from app.helpers.csv_parser import CsvColumn, enum_converter, iter_csv_file
+from app.models.region import City, District, RegionLoad, State, StateType, Subdistrict
+
+REGION_CSV_SCHEMA = [
+    CsvColumn("state", str.strip),
+    CsvColumn("state_type", enum_converter(StateType)),
+    CsvColumn("district", str.strip),
+    CsvColumn("subdistrict", str.strip),
+    CsvColumn("city", str.strip),
+    CsvColumn("lat", float),
+    CsvColumn("lng", float),
+]
+
+FAST_LOAD_PRAGMAS = SQLITE_PROFILES["ingest_heavy"]
+
+REGION_TABLES: List[Table] = [State.__table__, District.__table__, Subdistrict.__table__, City.__table__]
+
+
+class RegionIdMaps:
+    """In-memory name -> id maps for every level of the hierarchy."""
+
+    def __init__(self):
+        self.states: Dict[str, int] = {}
+        self.districts: Dict[Tuple[int, str], int] = {}
+        self.subdistricts: Dict[Tuple[int, str], int] = {}
+        self.next_ids: Dict[str, int] = {}
+
+    @classmethod
+    def from_database(cls, connection: Connection) -> "RegionIdMaps":
+        """Rebuild the maps from rows already in the database (used when resuming)."""
+        maps = cls()
+        for row in connection.execute(select(State.id, State.name)):
+            maps.states[row.name] = row.id
+        for row in connection.execute(select(District.id, District.state_id, District.name)):
+            maps.districts[(row.state_id, row.name)] = row.id
+        for row in connection.execute(select(Subdistrict.id, Subdistrict.district_id, Subdistrict.name)):
+            maps.subdistricts[(row.district_id, row.name)] = row.id
+        for table in REGION_TABLES:
+            maps.next_ids[table.name] = (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+        return maps
+
+    def allocate(self, table: Table) -> int:
+        new_id = self.next_ids[table.name]
+        self.next_ids[table.name] = new_id + 1
+        return new_id
+
+
+def _start_load(connection: Connection, source: str, batch_size: int, restart: bool):
+    """Return the `region_loads` row of `source`, creating (or on restart, resetting) it."""
+    RegionLoad.__table__.create(connection, checkfirst=True)
+    if restart:
+        connection.execute(delete(RegionLoad).where(RegionLoad.source == source))
+    load = connection.execute(select(RegionLoad).where(RegionLoad.source == source)).one_or_none()
+    if load is None:
+        connection.execute(insert(RegionLoad).values(source=source, batch_size=batch_size))
+        load = connection.execute(select(RegionLoad).where(RegionLoad.source == source)).one()
+    connection.commit()
+    return load
+
+
+def _apply_pragmas(connection: Connection, pragmas: Dict[str, str]) -> Dict[str, str]:
+    """Apply pragmas and return their previous values so they can be restored."""
+    previous = {}
+    for name, value in pragmas.items():
+        previous[name] = str(connection.exec_driver_sql(f"PRAGMA {name}").scalar())
+        connection.exec_driver_sql(f"PRAGMA {name} = {value}")
+    return previous
+
+
+def _drop_secondary_indexes(connection: Connection) -> None:
+    for table in REGION_TABLES:
+        for index in table.indexes:
+            index.drop(connection, checkfirst=True)
+
+
+def _create_secondary_indexes(connection: Connection) -> None:
+    for table in REGION_TABLES:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _load_chunk(connection: Connection, maps: RegionIdMaps, batch) -> int:
+    """Resolve parents for one chunk and insert it. Returns the number of cities written."""
+    new_states, new_districts, new_subdistricts, cities = [], [], [], []
+
+    for state, state_type, district, subdistrict, city, lat, lng in batch.rows():
+        if not state or not district or not city:
+            continue
+
+        state_id = maps.states.get(state)
+        if state_id is None:
+            state_id = maps.states[state] = maps.allocate(State.__table__)
+            new_states.append({"id": state_id, "name": state, "type": state_type or StateType.STATE})
+
+        district_key = (state_id, district)
+        district_id = maps.districts.get(district_key)
+        if district_id is None:
+            district_id = maps.districts[district_key] = maps.allocate(District.__table__)
+            new_districts.append({"id": district_id, "name": district, "state_id": state_id})
+
+        subdistrict_id = None
+        if subdistrict:
+            subdistrict_key = (district_id, subdistrict)
+            subdistrict_id = maps.subdistricts.get(subdistrict_key)
+            if subdistrict_id is None:
+                subdistrict_id = maps.subdistricts[subdistrict_key] = maps.allocate(Subdistrict.__table__)
+                new_subdistricts.append({
+                    "id": subdistrict_id,
+                    "name": subdistrict,
+                    "district_id": district_id,
+                    "state_id": state_id,
+                })
+
+        cities.append({
+            "id": maps.allocate(City.__table__),
+            "name": city,
+            "district_id": district_id,
+            "subdistrict_id": subdistrict_id,
+            "state_id": state_id,
+            "lat": lat,
+            "lng": lng,
+        })
+
+    for table, rows in (
+        (State.__table__, new_states),
+        (District.__table__, new_districts),
+        (Subdistrict.__table__, new_subdistricts),
+        (City.__table__, cities),
+    ):
+        if rows:
+            connection.execute(insert(table), rows)
+    return len(cities)
+
+
+def load_regions(csv_path: Path, batch_size: int = 50_000, restart: bool = False) -> Optional[int]:
+    """
+    Bulk load the region hierarchy from a census CSV.
+
+    Args:
+        csv_path: Path to the CSV file (see module docstring for the header).
+        batch_size: Number of CSV rows per chunk / transaction. A resumed load
+            keeps the batch size it was started with.
+        restart: Forget the saved progress of this file and load it from the
+            first chunk, even if it was loaded completely before (its cities
+            are then inserted again).
+
+    Returns:
+        Number of cities inserted by this run (0 if the file was already
+        loaded), or None on failure.
+    """
+    source = str(csv_path.resolve())
+    started = time.perf_counter()
+    inserted = 0
+    try:
+        with get_engine().connect() as connection:
+            load = _start_load(connection, source, batch_size, restart)
+            if load.completed_at is not None:
+                print(f"{csv_path} was already loaded ({load.cities_loaded:,} cities); "
+                      f"pass --restart to load it again")
+                return 0
+            chunks_done, cities_loaded, batch_size = load.chunks_done, load.cities_loaded, load.batch_size
+            if chunks_done:
+                print(f"Resuming after {chunks_done} completed chunk(s) of {batch_size:,} rows")
+
+            previous_pragmas = _apply_pragmas(connection, FAST_LOAD_PRAGMAS)
+            _drop_secondary_indexes(connection)
+            connection.commit()
+            try:
+                maps = RegionIdMaps.from_database(connection)
+                for chunk_number, batch in enumerate(iter_csv_file(csv_path, REGION_CSV_SCHEMA, batch_size), 1):
+                    if chunk_number <= chunks_done:
+                        continue
+                    cities = _load_chunk(connection, maps, batch)
+                    inserted += cities
+                    connection.execute(
+                        update(RegionLoad)
+                        .where(RegionLoad.id == load.id)
+                        .values(chunks_done=chunk_number, cities_loaded=cities_loaded + inserted)
+                    )
+                    connection.commit()
+
+                    elapsed = time.perf_counter() - started
+                    print(f"Chunk {chunk_number}: {inserted:,} cities ({inserted / elapsed:,.0f} rows/sec)")
+
+                connection.execute(
+                    update(RegionLoad).where(RegionLoad.id == load.id).values(completed_at=func.now())
+                )
+                connection.commit()
+            finally:
+                # Also after a failure: the rows loaded so far stay, so queries need the indexes
+                connection.rollback()
+                print("Building indexes...")
+                _create_secondary_indexes(connection)
+                connection.commit()
+                _apply_pragmas(connection, previous_pragmas)
+
+        elapsed = time.perf_counter() - started
+        print(f"Loaded {inserted:,} cities in {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):,.0f} rows/sec)")
+        return inserted
+
+    except Exception as e:
+        print(f"Error loading regions: {e}")
+        print("Re-run the same command to resume after the last completed chunk")
+        return None
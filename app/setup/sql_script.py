@@ -0,0 +1,233 @@
+"""
+Streaming execution of SQL script files.
+
+Seed dumps can hold hundreds of thousands of statements, so scripts are never
+read into memory or split on ';'. `iter_sql_statements` tokenizes the file line
+by line and only ends a statement at a ';' outside of
+
+- string literals and quoted identifiers ('...', "...", `...`, [...]);
+- `--` line comments and `/* ... */` block comments;
+- the BEGIN ... END body of a CREATE TRIGGER (CASE ... END inside it included).
+
+`run_sql_statements` executes the statements in batch transactions: one
+commit per `batch_size` statements instead of one per statement. Transaction
+control statements in the script itself (BEGIN / COMMIT / END, as written by
+`sqlite3 .dump`) are skipped because the batches already provide them. A
+failing statement rolls back its batch and raises `SqlScriptError` with the
+line it starts on.
+"""
+
+import re
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import Connection
+
+# Complete one-line literals/comments first, so their contents need no further
+# scanning; then anything that changes the tokenizer state
+_TOKENS = re.compile(
+    r"""'[^']*(?:''[^']*)*'|"[^"]*(?:""[^"]*)*"|`[^`]*`|\[[^\]]*\]|/\*.*?\*/"""
+    r"""|['"`\[;]|--|/\*|\b(?:begin|end|case|trigger)\b""",
+    re.IGNORECASE,
+)
+
+_CLOSERS = {
+    "'": re.compile("'"),
+    '"': re.compile('"'),
+    "`": re.compile("`"),
+    "[": re.compile(r"\]"),
+    "/*": re.compile(r"\*/"),
+}
+
+_CREATE = re.compile(r"\s*create\b", re.IGNORECASE)
+
+TRANSACTION_CONTROL = re.compile(
+    r"(?:begin(?:\s+(?:deferred|immediate|exclusive))?|commit|end)(?:\s+transaction)?",
+    re.IGNORECASE,
+)
+
+
+class SqlStatement(NamedTuple):
+    text: str
+    line: int
+
+
+class SqlScriptError(Exception):
+    """A script could not be parsed or one of its statements failed."""
+
+    def __init__(self, message: str, line: int, statement: Optional[str] = None):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+        self.statement = statement
+
+
+def iter_sql_statements(lines: Iterable[str]) -> Iterator[SqlStatement]:
+    """
+    Split SQL text into statements without loading it all at once.
+
+    Args:
+        lines: Lines of the script, e.g. an open text file.
+
+    Yields:
+        Statements without the terminating ';' and with comments removed,
+        together with the 1-based line each statement starts on.
+
+    Raises:
+        SqlScriptError: On an unterminated string, comment or trigger body.
+    """
+    parts: List[str] = []
+    start_line: Optional[int] = None
+    closer = None           # Pattern ending the current multi-line quote/comment
+    in_comment = False
+    opened_at = 0           # Line the current quote/comment/trigger body started on
+    in_trigger = False
+    depth = 0               # BEGIN/CASE nesting inside a trigger body
+    line_number = 0
+
+    for line_number, line in enumerate(lines, 1):
+        # line[kept:] is statement text not yet copied into `parts`
+        pos, kept, end = 0, 0, len(line)
+        while pos < end:
+            if closer is not None:
+                match = closer.search(line, pos)
+                pos = end if match is None else match.end()
+                if in_comment:
+                    kept = pos
+                if match is not None:
+                    closer = None
+                continue
+
+            match = _TOKENS.search(line, pos)
+            if match is None:
+                break
+            token = match.group()
+            first = token[0]
+            pos = match.end()
+
+            if first in "-/;":
+                # Copy the text before the token; comments and ';' are not kept
+                fragment = line[kept:match.start()]
+                if start_line is None and fragment and not fragment.isspace():
+                    start_line = line_number
+                parts.append(fragment)
+                kept = match.start()
+            elif start_line is None:
+                start_line = line_number
+
+            if token == "--":
+                parts.append("\n")
+                kept = pos = end
+            elif first == "/":
+                parts.append(" ")
+                kept = pos
+                if token == "/*":
+                    closer, in_comment, opened_at = _CLOSERS[token], True, line_number
+            elif first == ";":
+                kept = pos
+                if depth:
+                    parts.append(token)
+                    continue
+                text = "".join(parts).strip()
+                if text:
+                    yield SqlStatement(text, start_line or line_number)
+                parts, start_line, in_trigger = [], None, False
+            elif token in _CLOSERS:
+                closer, in_comment, opened_at = _CLOSERS[token], False, line_number
+            elif first in "'\"`[":
+                continue
+            else:
+                keyword = token.lower()
+                if keyword == "trigger":
+                    prefix = "".join(parts) + line[kept:match.start()]
+                    in_trigger = in_trigger or (not depth and _CREATE.match(prefix) is not None)
+                elif in_trigger and keyword in ("begin", "case"):
+                    if not depth:
+                        opened_at = line_number
+                    depth += 1
+                elif in_trigger and keyword == "end" and depth:
+                    depth -= 1
+
+        if kept < end:
+            fragment = line[kept:]
+            if start_line is None and not fragment.isspace():
+                start_line = line_number
+            parts.append(fragment)
+
+    if closer is not None:
+        kind = "comment" if in_comment else "quoted string or identifier"
+        raise SqlScriptError(f"unterminated {kind}", opened_at)
+    if depth:
+        raise SqlScriptError("unterminated BEGIN ... END block in CREATE TRIGGER", opened_at)
+    text = "".join(parts).strip()
+    if text:
+        yield SqlStatement(text, start_line or line_number)
+
+
+def run_sql_statements(
+    connection: Connection,
+    statements: Iterable[SqlStatement],
+    batch_size: int = 1_000,
+    progress_every: int = 10_000,
+) -> int:
+    """
+    Execute statements in batch transactions.
+
+    Statements go straight to a DBAPI cursor of `connection`: no bind
+    parameter parsing (colons inside literals are safe) and no per-statement
+    SQLAlchemy overhead, which otherwise doubles the load time of large dumps.
+    Transactions are still begun and committed through `connection`. On SQLite
+    every batch also starts with an explicit BEGIN: pysqlite only opens a
+    transaction implicitly before INSERT / UPDATE / DELETE, so DDL would
+    otherwise run (and commit) outside the batch.
+
+    Args:
+        connection: Connection to execute on; nothing may be pending on it.
+        statements: Statements to run, e.g. from `iter_sql_statements`.
+        batch_size: Statements per transaction; 0 runs everything in one
+            transaction, so a failure leaves the database untouched.
+        progress_every: Print progress every N statements (0 to disable).
+
+    Returns:
+        Number of statements executed.
+
+    Raises:
+        SqlScriptError: When a statement fails. Its batch is rolled back;
+            earlier batches stay committed.
+    """
+    started = time.perf_counter()
+    executed = in_batch = skipped = 0
+    dbapi_error = connection.dialect.loaded_dbapi.Error
+    dbapi_connection = connection.connection.dbapi_connection
+    explicit_begin = connection.dialect.name == "sqlite"
+    cursor = connection.connection.cursor()
+    try:
+        for statement in statements:
+            if TRANSACTION_CONTROL.fullmatch(statement.text):
+                skipped += 1
+                continue
+            if not in_batch:
+                if not connection.in_transaction():
+                    connection.begin()
+                if explicit_begin and not dbapi_connection.in_transaction:
+                    cursor.execute("BEGIN")
+            try:
+                cursor.execute(statement.text)
+            except dbapi_error as e:
+                connection.rollback()
+                raise SqlScriptError(str(e), statement.line, statement.text) from e
+
+            executed += 1
+            in_batch += 1
+            if batch_size and in_batch >= batch_size:
+                connection.commit()
+                in_batch = 0
+            if progress_every and executed % progress_every == 0:
+                elapsed = time.perf_counter() - started
+                print(f"  {executed:,} statements (line {statement.line:,}, {executed / elapsed:,.0f} stmt/sec)")
+    finally:
+        cursor.close()
+
+    connection.commit()
+    if skipped:
+        print(f"Skipped {skipped} transaction control statement(s); batches are committed by the loader")
+    return executed
@@ -0,0 +1,49 @@
+"""
+Shared fixtures: a fresh SQLite database file per test, with every table created.
+"""
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.configuration.database import DatabaseSettings, build_engine
+from app.models import Base
+
+
+@pytest.fixture
+def database_url(tmp_path) -> str:
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def engine(database_url):
+    engine = build_engine(DatabaseSettings(database_url=database_url))
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine) -> sessionmaker:
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def api_client(session_factory):
+    """Test client for the API, with sessions bound to the test database and an empty response cache."""
+    from fastapi.testclient import TestClient
+
+    from app.endpoints.dependencies import get_database_session, get_session_factory
+    from app.main import app
+    from app.utils.cache import response_cache
+
+    def test_session():
+        with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_database_session] = test_session
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    response_cache.clear()
+    yield TestClient(app)
+    response_cache.clear()
+    app.dependency_overrides.pop(get_database_session, None)
+    app.dependency_overrides.pop(get_session_factory, None)
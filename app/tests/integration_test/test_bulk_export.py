@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from enum import Enum
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.models import City, Commodity, District, MandiPrice, State, StateType, Subdistrict
+from app.models.enums import ExportFormat
+from app.repositories.price import MandiPriceRepository
+from app.services.export import DATASETS, BulkExport, ExportFilters
+from app.services.export import bulk_export
+from app.utils.columnar import read_columnar
+
+FIRST_DAY = date(2024, 1, 1)
+
+
+@pytest.fixture
+def regions(session_factory):
+    """Two states, three districts, subdistricts, cities (some without coordinates) and prices."""
+    with session_factory() as session:
+        session.execute(insert(State), [
+            {"id": 1, "name": "Kerala", "type": StateType.STATE},
+            {"id": 2, "name": "Puducherry", "type": StateType.UNION_TERRITORY},
+        ])
+        session.execute(insert(District), [
+            {"id": 1, "name": "Ernakulam", "state_id": 1},
+            {"id": 2, "name": "Idukki", "state_id": 1},
+            {"id": 3, "name": "Karaikal", "state_id": 2},
+        ])
+        session.execute(insert(Subdistrict), [
+            {"id": tehsil, "name": f"Tehsil {tehsil}", "district_id": 1 + tehsil % 3} for tehsil in range(1, 7)
+        ])
+        session.execute(insert(City), [
+            {"id": city, "name": f'City "{city}", Kerala' if city % 4 else f"शहर {city}",
+             "district_id": 1 + city % 3, "subdistrict_id": 1 + city % 6 if city % 5 else None,
+             "lat": 8 + city / 10 if city % 3 else None, "lng": 76 + city / 7 if city % 3 else None}
+            for city in range(1, 26)
+        ])
+        session.execute(insert(Commodity), [{"id": 1, "name": "Onion"}, {"id": 2, "name": "Banana"}])
+        MandiPriceRepository(session).upsert_prices([
+            (commodity, 1 + market % 3, FIRST_DAY + timedelta(days=day), market, variety,
+             1000.0 + day, 1500.25 + market, None if (day + market) % 7 == 0 else 1200.5 + day)
+            for commodity in (1, 2) for market in (1, 2, 3, 4) for day in range(6) for variety in ("", "Local")
+        ])
+        session.commit()
+
+
+def names(dataset: str) -> list:
+    return [column.key for column in DATASETS[dataset].columns]
+
+
+def stored_rows(session, dataset: str, *clauses) -> list:
+    dataset = DATASETS[dataset]
+    return session.execute(select(*dataset.columns).where(*clauses).order_by(*dataset.order_by)).all()
+
+
+def plain(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def parse(data: bytes, export_format: ExportFormat, columns: list) -> list:
+    """Rows of an export, with values as that format represents them."""
+    if export_format is ExportFormat.NDJSON:
+        lines = [json.loads(line) for line in data.decode().splitlines()]
+        assert all(list(line) == columns for line in lines)
+        return [tuple(line.values()) for line in lines]
+    if export_format is ExportFormat.CSV:
+        header, *rows = csv.reader(io.StringIO(data.decode()))
+        assert header == columns
+        return [tuple(row) for row in rows]
+    schema, chunks = read_columnar(io.BytesIO(data))
+    assert [name for name, _ in schema] == columns
+    return [row for chunk in chunks for row in chunk]
+
+
+def expected_in(export_format: ExportFormat, rows) -> list:
+    """`rows` read straight from the database, as `export_format` represents them."""
+    if export_format is ExportFormat.NDJSON:
+        return [tuple(value.isoformat() if isinstance(value, date) else plain(value) for value in row) for row in rows]
+    if export_format is ExportFormat.CSV:
+        return [tuple("" if value is None else str(plain(value)) for value in row) for row in rows]
+    return [tuple(map(plain, row)) for row in rows]
+
+
+@pytest.mark.parametrize("export_format", list(ExportFormat))
+@pytest.mark.parametrize("dataset", list(DATASETS))
+def test_every_dataset_round_trips_in_every_format(regions, engine, session_factory, dataset, export_format):
+    export = BulkExport(dataset, export_format, chunk_size=7, engine=engine)
+    rows = parse(b"".join(export), export_format, names(dataset))
+
+    with session_factory() as session:
+        expected = stored_rows(session, dataset)
+    assert len(expected) > 1
+    assert rows == expected_in(export_format, expected)
+    assert export.rows == len(expected)
+
+
+def test_enum_columns_are_written_as_their_values(regions, engine):
+    data = b"".join(BulkExport("states", ExportFormat.CSV, engine=engine)).decode()
+    assert data == "id,name,type,capital_id\n1,Kerala,state,\n2,Puducherry,union territory,\n"
+
+
+def test_rows_are_fetched_and_encoded_chunk_by_chunk(regions, engine):
+    export = BulkExport("cities", ExportFormat.COLUMNAR, chunk_size=4, engine=engine)
+    stream = iter(export)
+
+    header = next(stream)  # Before any row is read
+    assert export.rows == 0
+    first = next(stream)
+    assert export.rows == 4  # One cursor partition per chunk
+    _, chunks = read_columnar(io.BytesIO(header + first + b"".join(stream)))
+    assert [len(chunk) for chunk in chunks] == [4] * 6 + [1]
+    assert export.rows == 25
+
+
+def test_filters_select_matching_rows(regions, engine, session_factory):
+    filters = ExportFilters(state_id=1, commodity_id=2, start_date=FIRST_DAY + timedelta(days=1),
+                            end_date=FIRST_DAY + timedelta(days=3))
+    export = BulkExport("prices", ExportFormat.COLUMNAR, filters, engine=engine)
+    rows = parse(b"".join(export), ExportFormat.COLUMNAR, names("prices"))
+
+    with session_factory() as session:
+        expected = stored_rows(
+            session, "prices", MandiPrice.district_id.in_([1, 2]), MandiPrice.commodity_id == 2,
+            MandiPrice.price_date.between(filters.start_date, filters.end_date),
+        )
+    assert rows and rows == expected_in(ExportFormat.COLUMNAR, expected)
+
+
+def test_unsupported_filters_and_datasets_are_rejected():
+    with pytest.raises(ValueError, match="'states' cannot be filtered by commodity_id"):
+        BulkExport("states", filters=ExportFilters(commodity_id=1))
+    with pytest.raises(ValueError, match="Unknown dataset 'villages'"):
+        BulkExport("villages")
+
+
+def test_export_endpoint_streams_the_dataset(regions, engine, session_factory, api_client, monkeypatch):
+    monkeypatch.setattr(bulk_export, "get_engine", lambda: engine)
+
+    response = api_client.get("/exports/districts", params={"format": "csv", "state_id": 1})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"] == 'attachment; filename="districts.csv"'
+    assert response.text == "id,name,state_id\n1,Ernakulam,1\n2,Idukki,1\n"
+
+    response = api_client.get("/exports/prices", params={"format": "columnar", "district_id": 3})
+    with session_factory() as session:
+        expected = stored_rows(session, "prices", MandiPrice.district_id == 3)
+    assert response.headers["content-type"] == "application/vnd.agridatahub.columnar"
+    assert parse(response.content, ExportFormat.COLUMNAR, names("prices")) == expected_in(
+        ExportFormat.COLUMNAR, expected
+    )
+
+    assert api_client.get("/exports/states", params={"commodity_id": 1}).status_code == 400
+    assert api_client.get("/exports/villages").status_code == 404
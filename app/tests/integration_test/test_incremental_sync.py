@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from app.models import City, District, MandiPrice, State, StateType
+from app.services.price.mandi_price_sync import mandi_price_sync
+from app.services.region import PlaceNameResolver
+from app.services.region.region_index import RegionIndex
+from app.services.sync import IncrementalCsvSync, SyncStatus
+
+FEED_URL = "https://feeds.example/prices.csv"
+FEED = (
+    "State,District,Market,Commodity,Variety,Arrival_Date,Min_x0020_Price,Max_x0020_Price,Modal_x0020_Price\n"
+    "Kerala,Ernakulam,Aluva Mandi,Banana,Nendran,01/03/2024,3000,3400,3200\n"
+    "Kerala,Ernakulam,Kalady Mandi,Banana,Nendran,01/03/2024,3100,3500,3300\n"
+)
+
+
+def feed_client(body: str, etag: str = '"v1"') -> type:
+    """API client class serving `body` at every URL, honouring If-None-Match."""
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, text=body, headers={"ETag": etag})
+
+    class FeedClient:
+        @classmethod
+        @asynccontextmanager
+        async def open_stream(cls, url, headers=None):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(respond)) as client:
+                async with client.stream("GET", url, headers=headers) as response:
+                    yield response
+
+    return FeedClient
+
+
+def seed_places(session_factory, markets):
+    with session_factory() as session:
+        session.execute(insert(State), [{"id": 1, "name": "Kerala", "type": StateType.STATE}])
+        session.execute(insert(District), [{"id": 1, "name": "Ernakulam", "state_id": 1}])
+        session.execute(insert(City), [
+            {"id": city_id, "name": name, "district_id": 1, "state_id": 1} for city_id, name in markets
+        ])
+        session.commit()
+
+
+def resolver(session_factory) -> PlaceNameResolver:
+    with session_factory() as session:
+        return PlaceNameResolver(RegionIndex.load(session))
+
+
+def stored_prices(session_factory) -> int:
+    with session_factory() as session:
+        return session.scalar(select(func.count()).select_from(MandiPrice))
+
+
+def test_unchanged_rows_are_not_rewritten(session_factory):
+    written = []
+    sync = IncrementalCsvSync(
+        FEED_URL, ["Market"], lambda session, batch: written.extend(batch.column("Market")),
+        session_factory=session_factory, client=feed_client(FEED),
+    )
+
+    first = asyncio.run(sync.run())
+    second = asyncio.run(sync.run())
+    forced = asyncio.run(sync.run(force=True))
+
+    assert first.status == SyncStatus.UPDATED and first.rows_changed == 2
+    assert second.status == SyncStatus.NOT_MODIFIED
+    assert forced.status == SyncStatus.UNCHANGED and forced.rows_seen == 2
+    assert written == ["Aluva Mandi", "Kalady Mandi"]
+
+
+def test_rows_the_writer_skips_are_retried(session_factory):
+    seed_places(session_factory, [(1, "Aluva Mandi")])
+    client = feed_client(FEED)
+
+    first = asyncio.run(mandi_price_sync(
+        FEED_URL, resolver(session_factory), session_factory=session_factory, client=client
+    ).run())
+    assert (first.rows_changed, first.rows_skipped) == (1, 1)
+    assert stored_prices(session_factory) == 1
+
+    # The unknown market is added; no validators were kept, so the feed is downloaded again
+    with session_factory() as session:
+        session.execute(insert(City), [{"id": 2, "name": "Kalady Mandi", "district_id": 1, "state_id": 1}])
+        session.commit()
+    sync = mandi_price_sync(FEED_URL, resolver(session_factory), session_factory=session_factory, client=client)
+    second = asyncio.run(sync.run())
+    assert second.status == SyncStatus.UPDATED
+    assert (second.rows_changed, second.rows_skipped) == (1, 0)
+    assert stored_prices(session_factory) == 2
+
+    assert asyncio.run(sync.run()).status == SyncStatus.NOT_MODIFIED
+
+
+def test_markets_that_only_resemble_a_known_market_are_not_written(session_factory):
+    seed_places(session_factory, [(1, "Aluva Mandi"), (2, "Rajpur")])
+    feed = FEED.replace("Kalady Mandi", "Rampur")
+    places = resolver(session_factory)
+    lookalike = places.resolve_hierarchy("Kerala", "Ernakulam", "Rampur")
+    assert lookalike.city_id == 2 and lookalike.score < 1.0  # The fuzzy match the writer must not trust
+
+    sync = mandi_price_sync(FEED_URL, places, session_factory=session_factory, client=feed_client(feed))
+    first = asyncio.run(sync.run(force=True))
+    second = asyncio.run(sync.run(force=True))
+
+    assert (first.rows_changed, first.rows_skipped) == (1, 1)
+    assert (second.rows_changed, second.rows_skipped) == (0, 1)  # Still unsynced, so offered again
+    with session_factory() as session:
+        assert session.scalars(select(MandiPrice.market_id)).all() == [1]
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import insert, select
+
+from app.configuration.database import DatabaseSettings
+from app.models import City, District, MandiPrice, PriceRollup, State, StateType
+from app.repositories.price import PriceRollupRepository
+from app.services.region import PlaceNameResolver
+from app.services.region.region_index import RegionIndex
+from app.setup import ingest_pipeline
+
+HEADER = "State,District,Market,Commodity,Variety,Arrival_Date,Min_x0020_Price,Max_x0020_Price,Modal_x0020_Price\n"
+
+
+@pytest.fixture
+def ingest(database_url, session_factory, monkeypatch):
+    """`ingest_prices` writing to the test database, resolving against its regions."""
+    with session_factory() as session:
+        session.execute(insert(State), [{"id": 1, "name": "Kerala", "type": StateType.STATE}])
+        session.execute(insert(District), [{"id": 1, "name": "Ernakulam", "state_id": 1}])
+        session.execute(insert(City), [
+            {"id": 1, "name": "Aluva Mandi", "district_id": 1, "state_id": 1},
+            {"id": 2, "name": "Rajpur", "district_id": 1, "state_id": 1},
+        ])
+        session.commit()
+        resolver = PlaceNameResolver(RegionIndex.load(session))
+    monkeypatch.setattr(ingest_pipeline, "get_db_settings", lambda: DatabaseSettings(database_url=database_url))
+    monkeypatch.setattr(ingest_pipeline, "get_place_name_resolver", lambda: resolver)
+
+    def run(tmp_path, body: str, **kwargs):
+        path = tmp_path / "prices.csv"
+        path.write_text(HEADER + body)
+        return ingest_pipeline.ingest_prices([path], workers=0, **kwargs)
+
+    return run
+
+
+def test_fuzzy_and_unresolved_places_are_counted_not_written(ingest, session_factory, tmp_path):
+    stats = ingest(tmp_path, (
+        "Kerala,Ernakulam,Aluva Mandi,Banana,Nendran,01/03/2024,3000,3400,3200\n"
+        "Kerala,Ernakulam,Rampur,Banana,Nendran,01/03/2024,3100,3500,3300\n"  # Looks like Rajpur
+        "Kerala,Ernakulam,Xylophone Bazar,Banana,Nendran,01/03/2024,3100,3500,3300\n"
+    ))
+
+    assert (stats.rows_read, stats.rows_written, stats.rows_unresolved, stats.rows_low_confidence) == (3, 1, 1, 1)
+    with session_factory() as session:
+        assert session.scalars(select(MandiPrice.market_id)).all() == [1]
+
+
+def rollups(session) -> list:
+    columns = list(PriceRollup.__table__.columns)
+    return session.execute(select(*columns).order_by(*columns[:5])).all()
+
+
+@pytest.mark.parametrize("backfill", [False, True])
+def test_ingest_leaves_rollups_matching_a_rebuild(ingest, session_factory, tmp_path, backfill):
+    days = [f"{day:02d}/03/2024" for day in range(1, 11)]
+    # An earlier load whose cells a later file overwrites and extends
+    ingest(tmp_path, "".join(
+        f"Kerala,Ernakulam,Aluva Mandi,Banana,Nendran,{day},3000,3400,{3100 + i}\n" for i, day in enumerate(days[:6])
+    ))
+    stats = ingest(tmp_path, "".join(
+        f"Kerala,Ernakulam,Rajpur,Onion,Local,{day},1000,1400,{1200 + i}\n"
+        f"Kerala,Ernakulam,Aluva Mandi,Banana,Nendran,{day},2000,4400,{2500 + i}\n"
+        for i, day in enumerate(days[4:])
+    ), backfill=backfill)
+
+    assert stats.rows_written == 12
+    with session_factory() as session:
+        loaded = rollups(session)
+        PriceRollupRepository(session).rebuild()
+        assert loaded and loaded == rollups(session)
+
+
+def test_ingest_without_rollups_leaves_them_untouched(ingest, session_factory, tmp_path):
+    ingest(tmp_path, "Kerala,Ernakulam,Aluva Mandi,Banana,Nendran,01/03/2024,3000,3400,3200\n", refresh_rollups=False)
+
+    with session_factory() as session:
+        assert rollups(session) == []
@@ -0,0 +1,181 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.dialects import sqlite
+
+from app.models import City, Commodity, District, State, StateType, Subdistrict
+from app.repositories.price import MandiPriceRepository
+from app.repositories.region import RegionRepository
+from app.repositories.region import region_repository
+from app.utils.pagination import MAX_PAGE_SIZE, InvalidCursor
+
+# Few distinct names, so sort keys tie and the id tie-breaker matters
+NAMES = ["Aluva", "Kalady", "Munnar", "Ponmudi", "Ãlappuzha"]
+
+
+@pytest.fixture
+def regions(session_factory):
+    """Two states, five districts, ten subdistricts and 120 cities with repeated names."""
+    rng = random.Random(19)
+    with session_factory() as session:
+        session.execute(insert(State), [
+            {"id": 1, "name": "Kerala", "type": StateType.STATE},
+            {"id": 2, "name": "Goa", "type": StateType.STATE},
+        ])
+        session.execute(insert(District), [
+            {"id": district, "name": f"District {6 - district}", "state_id": 1 + district % 2}
+            for district in range(1, 6)
+        ])
+        session.execute(insert(Subdistrict), [
+            {"id": tehsil, "name": f"Tehsil {tehsil}", "district_id": 1 + tehsil % 5,
+             "state_id": 1 + (1 + tehsil % 5) % 2}
+            for tehsil in range(1, 11)
+        ])
+        cities = []
+        for city in rng.sample(range(1, 1000), 120):  # Ids out of insertion order
+            tehsil = rng.randint(1, 10)
+            district = 1 + tehsil % 5
+            cities.append({
+                "id": city, "name": rng.choice(NAMES), "district_id": district,
+                "subdistrict_id": tehsil if rng.random() < 0.8 else None, "state_id": 1 + district % 2,
+            })
+        rng.shuffle(cities)
+        session.execute(insert(City), cities)
+        session.commit()
+
+
+def walk(fetch_page, limit: int) -> list:
+    """Every row of a listing, following `next_cursor` page by page."""
+    rows, cursor = [], None
+    while True:
+        page = fetch_page(cursor, limit)
+        assert len(page.items) <= limit
+        rows.extend(page.items)
+        if page.next_cursor is None:
+            return rows
+        assert len(page.items) == limit
+        assert page.next_cursor != cursor  # A cursor that does not advance would loop forever
+        cursor = page.next_cursor
+
+
+def all_cities(session):
+    return RegionRepository(session).cities_page(None, MAX_PAGE_SIZE).items
+
+
+@pytest.mark.parametrize("limit", [1, 7, 120, 500])
+def test_city_listings_walk_every_row_once_in_key_order(regions, session_factory, limit):
+    with session_factory() as session:
+        repository = RegionRepository(session)
+        cities = all_cities(session)
+        assert len(cities) == 120
+        listings = [
+            ({}, lambda city: city.id, cities),
+            *(({"state_id": state}, lambda city: (city.district_id, city.name, city.id),
+               [city for city in cities if city.state_id == state]) for state in (1, 2)),
+            *(({"district_id": district}, lambda city: (city.name, city.id),
+               [city for city in cities if city.district_id == district]) for district in range(1, 6)),
+            *(({"subdistrict_id": tehsil}, lambda city: (city.name, city.id),
+               [city for city in cities if city.subdistrict_id == tehsil]) for tehsil in range(1, 11)),
+        ]
+        for filters, key, expected in listings:
+            rows = walk(lambda cursor, size: repository.cities_page(cursor, size, **filters), limit)
+            assert rows == sorted(expected, key=key), filters
+
+
+@pytest.mark.parametrize("limit", [1, 2, 10])
+def test_district_listings_walk_every_row_once_in_key_order(regions, session_factory, limit):
+    with session_factory() as session:
+        repository = RegionRepository(session)
+        districts = walk(repository.districts_page, limit)
+        assert [district.id for district in districts] == [1, 2, 3, 4, 5]
+        for state in (1, 2):
+            rows = walk(lambda cursor, size: repository.districts_page(cursor, size, state_id=state), limit)
+            assert rows == sorted((d for d in districts if d.state_id == state), key=lambda d: (d.name, d.id))
+
+
+def test_rows_added_before_the_cursor_do_not_shift_later_pages(regions, session_factory):
+    with session_factory() as session:
+        repository = RegionRepository(session)
+        first = repository.cities_page(None, 10, district_id=1)
+        # Sorts before every listed name; offset pagination would repeat a row
+        session.execute(insert(City), [{"id": 5000, "name": "Aaa", "district_id": 1, "state_id": 2}])
+        rest = walk(lambda cursor, size: repository.cities_page(cursor or first.next_cursor, size, district_id=1), 10)
+
+        expected = [city for city in all_cities(session) if city.district_id == 1 and city.id != 5000]
+        assert first.items + rest == sorted(expected, key=lambda city: (city.name, city.id))
+
+
+def test_price_listings_walk_every_row_once_in_key_order(regions, session_factory):
+    rng = random.Random(5)
+    prices = [
+        (1, 2, date(2024, 1, 1) + timedelta(days=day), market, variety, 100.0, 200.0, 150.0)
+        for market in (2001, 2002, 2003)
+        for day in rng.sample(range(60), 25)
+        for variety in rng.sample(["", "Local", "Nasik"], rng.randint(1, 3))
+    ]
+    with session_factory() as session:
+        session.execute(insert(Commodity), [{"id": 1, "name": "Onion"}])
+        session.execute(insert(City), [
+            {"id": market, "name": f"Mandi {market}", "district_id": 2, "state_id": 1} for market in (2001, 2002, 2003)
+        ])
+        repository = MandiPriceRepository(session)
+        repository.upsert_prices(prices, refresh_rollups=False)
+
+        district_rows = walk(lambda cursor, size: repository.district_prices_page(1, 2, cursor, size), 8)
+        market_rows = walk(lambda cursor, size: repository.market_prices_page(1, 2002, cursor, size), 8)
+
+    assert [row[:5] for row in district_rows] == sorted(
+        (price[:5] for price in prices), key=lambda price: (price[2], price[3], price[4])
+    )
+    assert [row[:5] for row in market_rows] == sorted(
+        (price[:5] for price in prices if price[3] == 2002), key=lambda price: (price[2], price[1], price[4])
+    )
+
+
+def test_foreign_or_malformed_cursors_are_rejected(regions, session_factory):
+    with session_factory() as session:
+        repository = RegionRepository(session)
+        district_cursor = repository.districts_page(None, 1).next_cursor
+        with pytest.raises(InvalidCursor, match="listing 'cities'"):
+            repository.cities_page(district_cursor, 10)
+        for cursor in ("not base64!", "bm90IGpzb24", district_cursor[:-3]):
+            with pytest.raises(InvalidCursor):
+                repository.districts_page(cursor, 10)
+
+
+def test_city_listing_endpoint_pages_through_the_api(regions, session_factory, api_client):
+    with session_factory() as session:
+        expected = sorted(
+            (city for city in all_cities(session) if city.district_id == 3), key=lambda city: (city.name, city.id)
+        )
+
+    ids, cursor = [], None
+    while True:
+        params = {"district_id": 3, "limit": 5, **({"cursor": cursor} if cursor else {})}
+        body = api_client.get("/regions/cities", params=params).json()
+        ids.extend(city["id"] for city in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert ids == [city.id for city in expected]
+    assert api_client.get("/regions/cities", params={"cursor": "garbage"}).status_code == 400
+    assert api_client.get("/regions/cities", params={"state_id": 1, "district_id": 3}).status_code == 400
+    assert api_client.get("/regions/districts", params={"limit": MAX_PAGE_SIZE + 1}).status_code == 422
+
+
+@pytest.mark.parametrize("listing", [
+    "DISTRICTS", "DISTRICTS_BY_STATE", "CITIES", "CITIES_BY_STATE", "CITIES_BY_DISTRICT", "CITIES_BY_SUBDISTRICT",
+])
+def test_listings_read_pages_in_index_order(engine, listing):
+    query = getattr(region_repository, listing)
+    with engine.connect() as connection:
+        for statement in (query.first_page, query.next_page):
+            sql = str(statement.compile(dialect=sqlite.dialect()))
+            plan = [row[3] for row in connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + sql, (1,) * sql.count("?")
+            )]
+            # A sort step would read every row matching the filter on every page
+            assert not any("TEMP B-TREE" in step for step in plan), plan
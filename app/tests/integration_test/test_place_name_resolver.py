@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import IntegrityError
+
+from app.models import City, District, RegionAlias, State, StateType
+from app.services.region import PlaceNameResolver
+from app.services.region.region_index import RegionIndex, RegionLevel
+
+
+@pytest.fixture
+def regions(session_factory):
+    with session_factory() as session:
+        session.execute(insert(State), [{"id": 1, "name": "Kerala", "type": StateType.STATE}])
+        session.execute(insert(District), [{"id": 1, "name": "Ernakulam", "state_id": 1}])
+        session.execute(insert(City), [
+            {"id": 1, "name": "Aluva", "district_id": 1, "state_id": 1},
+            {"id": 2, "name": "Kalady", "district_id": 1, "state_id": 1},
+        ])
+        session.commit()
+
+
+def test_names_resolve_through_stored_aliases(regions, session_factory):
+    with session_factory() as session:
+        session.add_all([
+            RegionAlias(level="city", region_id=1, alias="Alwaye"),
+            RegionAlias(level="district", region_id=1, alias="Cochin Rural"),
+        ])
+        session.commit()
+        ids = session.scalars(select(RegionAlias.id).order_by(RegionAlias.id)).all()
+        resolver = PlaceNameResolver.from_session(session, RegionIndex.load(session))
+
+    assert ids == [1, 2]  # Assigned by SQLite
+    assert resolver.resolve("Alwaye", RegionLevel.CITY, 1)[1:] == (1, "Aluva", 1.0)
+    assert resolver.resolve_hierarchy("Kerala", "Cochin Rural", "Alwaye") == (1, 1, 1, 1.0)
+
+
+def test_alias_levels_are_validated(regions, session_factory):
+    with session_factory() as session:
+        session.add(RegionAlias(level="town", region_id=1, alias="Alwaye"))
+        with pytest.raises(IntegrityError):
+            session.commit()
+        session.rollback()
+
+        # A row written before the constraint existed is skipped, not fatal
+        session.execute(text("PRAGMA ignore_check_constraints = ON"))
+        session.add_all([
+            RegionAlias(level="town", region_id=1, alias="Alwaye"),
+            RegionAlias(level="city", region_id=2, alias="Kaladi Bazar"),
+        ])
+        session.commit()
+        resolver = PlaceNameResolver.from_session(session, RegionIndex.load(session))
+
+    assert resolver.aliases == {(RegionLevel.CITY, 2): ["Kaladi Bazar"]}
@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from app.models import City, Commodity, District, State, StateType
+from app.repositories.price import MandiPriceRepository
+
+FIRST_DAY = date(2024, 1, 1)
+
+
+def test_anomalies_compare_each_variety_with_itself(session_factory, api_client):
+    # Market 1 sells two varieties at very different prices; market 2 one of them
+    prices = [
+        (1, 1, FIRST_DAY + timedelta(days=day), market, variety, price, price, price)
+        for day in range(20)
+        for market, variety, price in ((1, "Local", 1000.0), (1, "Premium", 3000.0), (2, "Local", 1050.0))
+    ]
+    with session_factory() as session:
+        session.execute(insert(State), [{"id": 1, "name": "Kerala", "type": StateType.STATE}])
+        session.execute(insert(District), [{"id": 1, "name": "Ernakulam", "state_id": 1}])
+        session.execute(insert(City), [
+            {"id": market, "name": f"Mandi {market}", "district_id": 1, "state_id": 1} for market in (1, 2)
+        ])
+        session.execute(insert(Commodity), [{"id": 1, "name": "Rice"}])
+        MandiPriceRepository(session).upsert_prices(prices)
+        session.commit()
+
+    response = api_client.get("/prices/analytics/districts/1/anomalies", params={
+        "commodity_id": 1, "start": "2024-01-01", "end": "2024-01-20", "spike_ratio": 0.1,
+    })
+    assert response.status_code == 200
+    assert response.json() == []  # Mixing varieties would flag every Premium and Local price
+
+    response = api_client.get("/prices/analytics/districts/1/anomalies", params={
+        "commodity_id": 1, "start": "2024-01-20", "end": "2024-01-20", "spike_ratio": 0.04,
+    })
+    assert [(row["market_id"], row["variety"]) for row in response.json()] == [(1, "Local"), (2, "Local")]
@@ -0,0 +1,161 @@
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.models import City, Commodity, District, PriceRollup, State, StateType
+from app.models.enums import RollupGrain, RollupLevel
+from app.repositories.price import MandiPriceRepository, PriceRollupRepository
+from app.repositories.price.price_rollup_repository import period_start
+
+FIRST_DAY = date(2024, 1, 1)
+DAYS = 100  # Into April, so months, weeks and week/month overlaps all occur
+DISTRICT_STATES = {1: 1, 2: 1, 3: 2}  # Two districts in state 1, one in state 2
+MARKETS = {1: 1, 2: 1, 3: 2, 4: 2, 5: 3, 6: 3}  # market -> district
+
+
+@pytest.fixture
+def regions(session_factory):
+    with session_factory() as session:
+        session.execute(insert(State), [
+            {"id": 1, "name": "Kerala", "type": StateType.STATE},
+            {"id": 2, "name": "Goa", "type": StateType.STATE},
+        ])
+        session.execute(insert(District), [
+            {"id": district, "name": f"District {district}", "state_id": state}
+            for district, state in DISTRICT_STATES.items()
+        ])
+        session.execute(insert(City), [
+            {"id": market, "name": f"Mandi {market}", "district_id": district, "state_id": DISTRICT_STATES[district]}
+            for market, district in MARKETS.items()
+        ])
+        session.execute(insert(Commodity), [{"id": 1, "name": "Onion"}, {"id": 2, "name": "Banana"}])
+        session.commit()
+
+
+def random_prices(rng: random.Random, share: float = 0.6) -> list:
+    """Rows in `PRICE_COLUMNS` order for a random subset of market days, some with missing prices."""
+    rows = []
+    for commodity in (1, 2):
+        for market, district in MARKETS.items():
+            for offset in range(DAYS):
+                if rng.random() > share:
+                    continue
+                low = rng.uniform(1000, 3000)
+                high = low + rng.uniform(0, 800)
+                modal = None if rng.random() < 0.1 else rng.uniform(low, high)
+                rows.append((commodity, district, FIRST_DAY + timedelta(days=offset), market, "", low, high, modal))
+    return rows
+
+
+def brute_force(prices: dict, commodity: int, level: RollupLevel, region: int, days) -> tuple:
+    """(row_count, avg_modal_price, min_price, max_price) of the prices in `days`, straight from the rows."""
+    rows = [
+        row for key, row in prices.items()
+        if key[0] == commodity and key[2] in days
+        and (key[1] if level is RollupLevel.DISTRICT else DISTRICT_STATES[key[1]]) == region
+    ]
+    modal = [row[7] for row in rows if row[7] is not None]
+    return (
+        len(rows),
+        sum(modal) / len(modal) if modal else None,
+        min(row[5] for row in rows) if rows else None,
+        max(row[6] for row in rows) if rows else None,
+    )
+
+
+def regions_of(level: RollupLevel):
+    return sorted(set(DISTRICT_STATES) if level is RollupLevel.DISTRICT else set(DISTRICT_STATES.values()))
+
+
+@pytest.fixture
+def prices(regions, session_factory) -> dict:
+    """Prices written in batches, then partly overwritten, with incremental rollup refreshes."""
+    rng = random.Random(22)
+    stored = {}
+    with session_factory() as session:
+        repository = MandiPriceRepository(session)
+        rows = random_prices(rng)
+        rng.shuffle(rows)
+        # Overwrites can lower a max or raise a min, which deltas would get wrong
+        overwrites = [row[:5] + (row[5] + 500, row[6] - 100, row[7]) for row in rng.sample(rows, 200)]
+        for batch in (rows[:700], rows[700:1500], rows[1500:], overwrites, random_prices(rng, share=0.05)):
+            repository.upsert_prices(batch)
+            session.commit()
+            stored.update({row[:5]: row for row in batch})
+    return stored
+
+
+def test_rollup_series_match_the_raw_prices(prices, session_factory):
+    start, end = FIRST_DAY + timedelta(days=10), FIRST_DAY + timedelta(days=80)
+    with session_factory() as session:
+        repository = PriceRollupRepository(session)
+        for commodity in (1, 2):
+            for level in RollupLevel:
+                for region in regions_of(level):
+                    for grain in RollupGrain:
+                        series = repository.series(commodity, level, region, grain, start, end)
+                        # Whole periods overlapping the range, including days past either end
+                        periods = defaultdict(set)
+                        for key in prices:
+                            first = period_start(grain, key[2])
+                            if period_start(grain, start) <= first <= end:
+                                periods[first].add(key[2])
+                        expected = {
+                            first: brute_force(prices, commodity, level, region, days)
+                            for first, days in periods.items()
+                        }
+                        expected = {first: values for first, values in expected.items() if values[0]}
+
+                        assert [row.period_start for row in series] == sorted(expected)
+                        for row in series:
+                            assert tuple(row[1:]) == pytest.approx(expected[row.period_start])
+
+
+def test_rollup_summaries_match_the_raw_prices(prices, session_factory):
+    rng = random.Random(7)
+    ranges = [(FIRST_DAY, FIRST_DAY + timedelta(days=DAYS - 1))] + [
+        tuple(sorted(FIRST_DAY + timedelta(days=rng.randrange(DAYS)) for _ in range(2))) for _ in range(40)
+    ]
+    with session_factory() as session:
+        repository = PriceRollupRepository(session)
+        for start, end in ranges:
+            days = {start + timedelta(days=offset) for offset in range((end - start).days + 1)}
+            for level in RollupLevel:
+                for region in regions_of(level):
+                    summary = repository.summary(1, level, region, start, end)
+                    expected = brute_force(prices, 1, level, region, days)
+                    if not expected[0]:
+                        assert summary is None
+                    else:
+                        assert tuple(summary[:4]) == pytest.approx(expected)
+
+
+def test_incremental_refresh_matches_a_rebuild(prices, session_factory):
+    columns = list(PriceRollup.__table__.columns)
+    with session_factory() as session:
+        incremental = session.execute(select(*columns).order_by(*columns[:5])).all()
+        PriceRollupRepository(session).rebuild()
+        rebuilt = session.execute(select(*columns).order_by(*columns[:5])).all()
+
+    assert len(incremental) == len(rebuilt)
+    for refreshed, expected in zip(incremental, rebuilt):
+        assert refreshed[:6] == expected[:6]
+        assert refreshed[6:] == pytest.approx(expected[6:])
+
+
+def test_series_endpoint_serves_the_rollups(prices, api_client):
+    response = api_client.get(
+        "/prices/rollups/state/1/series",
+        params={"commodity_id": 2, "start": "2024-02-01", "end": "2024-02-29", "grain": "month"},
+    )
+
+    assert response.status_code == 200
+    [period] = response.json()
+    february = {date(2024, 2, 1) + timedelta(days=offset) for offset in range(29)}
+    assert period["period_start"] == "2024-02-01"
+    assert (period["row_count"], period["avg_modal_price"], period["min_price"], period["max_price"]) == (
+        pytest.approx(brute_force(prices, 2, RollupLevel.STATE, 1, february))
+    )
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.models import City, District, State, StateType, Subdistrict
+from app.services.region import STATE_TREE_QUERIES
+from app.utils.query_counter import QueryCounter
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+@pytest.fixture
+def state_tree(engine):
+    """State 1 with 3 districts, 6 subdistricts and 30 cities; state 2 is empty."""
+    with engine.begin() as connection:
+        connection.execute(insert(State), [
+            {"id": 1, "name": "Kerala", "type": StateType.STATE},
+            {"id": 2, "name": "Goa", "type": StateType.STATE},
+        ])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": 1} for d in range(1, 4)
+        ])
+        connection.execute(insert(Subdistrict), [
+            {"id": t, "name": f"Tehsil {t}", "district_id": 1 + t % 3, "state_id": 1} for t in range(1, 7)
+        ])
+        connection.execute(insert(City), [
+            {"id": c, "name": f"Village {c}", "district_id": 1 + (c % 6 + 1) % 3, "subdistrict_id": c % 6 + 1,
+             "state_id": 1, "lat": 10.0, "lng": 76.0}
+            for c in range(1, 31)
+        ])
+        connection.execute(update(State).where(State.id == 1).values(capital_id=1))
+
+
+@pytest.mark.parametrize("include_cities", [True, False])
+def test_state_tree_is_served_in_a_fixed_number_of_queries(api_client, engine, state_tree, include_cities):
+    with QueryCounter(max_queries=STATE_TREE_QUERIES, engine=engine):
+        response = api_client.get("/regions/states/1/tree", params={"include_cities": include_cities})
+
+    assert response.status_code == 200
+    tree = response.json()
+    assert tree["capital"]["id"] == 1
+    assert len(tree["districts"]) == 3
+    assert sum(len(district["subdistricts"]) for district in tree["districts"]) == 6
+    assert sum(len(district["cities"]) for district in tree["districts"]) == (30 if include_cities else 0)
+
+
+def test_state_tree_is_cached_with_an_etag(api_client, engine, state_tree):
+    first = api_client.get("/regions/states/1/tree")
+    assert first.headers["X-Cache"] == "MISS"
+
+    with QueryCounter(max_queries=0, engine=engine):
+        second = api_client.get("/regions/states/1/tree")
+        not_modified = api_client.get("/regions/states/1/tree", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.content == first.content
+    assert not_modified.status_code == 304
+    # Query parameters are part of the key
+    assert api_client.get("/regions/states/1/tree", params={"include_cities": False}).headers["X-Cache"] == "MISS"
+
+
+def test_unknown_state_tree_is_404(api_client, state_tree):
+    assert api_client.get("/regions/states/99/tree").status_code == 404
+
+
+def test_app_import_does_not_load_sqlalchemy():
+    code = "import sys, app.main; print(any(name.startswith('sqlalchemy') for name in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
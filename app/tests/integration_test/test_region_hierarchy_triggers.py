@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import insert, select, update
+
+from app.models import City, District, State, StateType, Subdistrict
+
+
+@pytest.fixture
+def regions(session_factory):
+    """Two states with one district each."""
+    with session_factory() as session:
+        session.execute(insert(State), [
+            {"id": 1, "name": "Kerala", "type": StateType.STATE},
+            {"id": 2, "name": "Goa", "type": StateType.STATE},
+        ])
+        session.execute(insert(District), [
+            {"id": 10, "name": "Ernakulam", "state_id": 1},
+            {"id": 20, "name": "North Goa", "state_id": 2},
+        ])
+        session.commit()
+
+
+def state_ids(session, model) -> dict:
+    return dict(session.execute(select(model.id, model.state_id).order_by(model.id)).all())
+
+
+@pytest.mark.parametrize("model", [Subdistrict, City])
+def test_inserts_with_a_wrong_or_missing_state_id_are_corrected(regions, session_factory, model):
+    with session_factory() as session:
+        session.execute(insert(model), [
+            {"id": 1, "name": "Aluva", "district_id": 10, "state_id": 1},  # Already right
+            {"id": 2, "name": "Kalady", "district_id": 10, "state_id": 2},
+            {"id": 3, "name": "Mapusa", "district_id": 20},
+        ])
+        session.add(model(id=4, name="Bicholim", district_id=20, state_id=1))
+        session.commit()
+
+        assert state_ids(session, model) == {1: 1, 2: 1, 3: 2, 4: 2}
+        assert session.get(model, 4).state_id == 2  # Fetched back into the ORM object
+
+
+@pytest.mark.parametrize("model", [Subdistrict, City])
+def test_updates_keep_state_id_in_line_with_the_district(regions, session_factory, model):
+    with session_factory() as session:
+        session.execute(insert(model), [
+            {"id": 1, "name": "Aluva", "district_id": 10},
+            {"id": 2, "name": "Kalady", "district_id": 10},
+        ])
+        session.execute(update(model).where(model.id == 1).values(district_id=20))
+        session.execute(update(model).where(model.id == 2).values(state_id=2))
+        session.commit()
+
+        assert state_ids(session, model) == {1: 2, 2: 1}
+
+
+def test_moving_a_district_cascades_to_its_subdistricts_and_cities(regions, session_factory):
+    with session_factory() as session:
+        session.execute(insert(Subdistrict), [
+            {"id": 1, "name": "Aluva", "district_id": 10},
+            {"id": 2, "name": "Bardez", "district_id": 20},
+        ])
+        session.execute(insert(City), [
+            {"id": 1, "name": "Aluva", "district_id": 10, "subdistrict_id": 1},
+            {"id": 2, "name": "Kalady", "district_id": 10},
+            {"id": 3, "name": "Mapusa", "district_id": 20, "subdistrict_id": 2},
+        ])
+        session.commit()
+
+        session.execute(update(District).where(District.id == 10).values(state_id=2))
+        session.commit()
+        assert state_ids(session, Subdistrict) == {1: 2, 2: 2}
+        assert state_ids(session, City) == {1: 2, 2: 2, 3: 2}
+
+        session.execute(update(District).where(District.id == 20).values(state_id=1))
+        session.commit()
+        assert state_ids(session, Subdistrict) == {1: 2, 2: 1}
+        assert state_ids(session, City) == {1: 2, 2: 2, 3: 1}
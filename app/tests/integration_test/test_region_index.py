@@ -0,0 +1,140 @@
+import random
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete, insert, select, update
+
+from app.models import City, District, State, StateType, Subdistrict
+from app.services.region import region_index as region_index_module
+from app.services.region.region_index import RegionIndex, RegionIndexCache, RegionLevel
+
+LONG_AGO = datetime(2024, 1, 1)
+NAMES = ["Rampur", "Aluva", "Kalady", "Munnar", "Sirsa"]
+
+
+@pytest.fixture(params=["dense", "sparse"])
+def regions(request, session_factory):
+    """A random hierarchy with repeated names; sparse ids exercise the dict-backed position map."""
+    rng = random.Random(7)
+    scale = 1 if request.param == "dense" else 1_000_003
+    stamp = {"created_at": LONG_AGO, "updated_at": LONG_AGO}
+    with session_factory() as session:
+        session.execute(insert(State), [
+            {"id": state * scale, "name": f"State {state}", "type": StateType.STATE, **stamp} for state in (1, 2, 3)
+        ])
+        districts = [{"id": district * scale, "name": rng.choice(NAMES), "state_id": rng.randint(1, 3) * scale,
+                      **stamp} for district in range(1, 13)]
+        session.execute(insert(District), districts)
+        subdistricts = []
+        for subdistrict in range(1, 31):
+            district = rng.choice(districts)
+            subdistricts.append({"id": subdistrict * scale, "name": f"Tehsil {subdistrict % 9}",
+                                 "district_id": district["id"], **stamp})
+        session.execute(insert(Subdistrict), subdistricts)
+        cities = []
+        for city in rng.sample(range(1, 5000), 400):
+            subdistrict = rng.choice(subdistricts)
+            has_point = rng.random() < 0.7
+            cities.append({
+                "id": city * scale, "name": rng.choice(NAMES) + rng.choice(["", " ", "  Mandi"]),
+                "district_id": subdistrict["district_id"],
+                "subdistrict_id": subdistrict["id"] if rng.random() < 0.8 else None,
+                "lat": rng.uniform(8, 35) if has_point else None, "lng": rng.uniform(68, 97) if has_point else None,
+                **stamp,
+            })
+        session.execute(insert(City), cities)
+        session.commit()
+
+
+def load(session_factory) -> RegionIndex:
+    with session_factory() as session:
+        return RegionIndex.load(session)
+
+
+def test_lookups_match_the_database(regions, session_factory):
+    index = load(session_factory)
+    with session_factory() as session:
+        states = session.execute(select(State.id, State.name)).all()
+        districts = session.execute(select(District.id, District.name, District.state_id)).all()
+        subdistricts = session.execute(select(Subdistrict.id, Subdistrict.name, Subdistrict.district_id)).all()
+        cities = session.execute(
+            select(City.id, City.name, City.district_id, City.subdistrict_id, City.lat, City.lng)
+        ).all()
+
+    assert len(index) == len(states) + len(districts) + len(subdistricts) + len(cities)
+    for state_id, name in states:
+        assert index.state(state_id) == (RegionLevel.STATE, state_id, name, None)
+        assert index.ancestors(RegionLevel.STATE, state_id) == []
+    district_states = {district_id: state_id for district_id, _, state_id in districts}
+    for level, rows in ((RegionLevel.DISTRICT, districts), (RegionLevel.SUBDISTRICT, subdistricts)):
+        for region_id, name, parent_id in rows:
+            assert index.get(level, region_id) == (level, region_id, name, parent_id)
+            assert index.find_id(level, f"  {name.upper()} ", parent_id) is not None
+            assert sorted(index.children(level, parent_id)) == sorted(row[0] for row in rows if row[2] == parent_id)
+    for city_id, name, district_id, subdistrict_id, lat, lng in cities:
+        assert index.city(city_id) == (RegionLevel.CITY, city_id, name, district_id)
+        assert index.city_subdistrict_id(city_id) == subdistrict_id
+        assert index.city_coordinates(city_id) == (None if lat is None else (lat, lng))
+        chain = [(node.level, node.id) for node in index.ancestors(RegionLevel.CITY, city_id)]
+        expected = [(RegionLevel.SUBDISTRICT, subdistrict_id)] if subdistrict_id else []
+        expected += [(RegionLevel.DISTRICT, district_id), (RegionLevel.STATE, district_states[district_id])]
+        assert chain == expected
+        assert index.state_id_of(RegionLevel.CITY, city_id) == district_states[district_id]
+    assert sorted(index.city_points()) == sorted((row[0], row[4], row[5]) for row in cities if row[4] is not None)
+
+    missing = max(row[0] for row in cities) + 1
+    assert index.city(missing) is None and index.city(-1) is None
+    assert index.ancestors(RegionLevel.CITY, missing) == []
+    assert index.find_id(RegionLevel.CITY, "Nowhere", cities[0][2]) is None
+
+
+@pytest.mark.parametrize("colliding_hashes", [False, True])
+def test_duplicate_names_under_one_parent_resolve_to_the_first_loaded_id(
+    regions, session_factory, monkeypatch, colliding_hashes
+):
+    if colliding_hashes:
+        # Every key lands in the same slot, so lookups go through the overflow dict
+        monkeypatch.setattr(region_index_module, "hash", lambda value: 0, raising=False)
+    index = load(session_factory)
+
+    first = {}
+    with session_factory() as session:
+        # The loader's own columns: a narrower select could be served in name
+        # order by a covering index instead of in table order
+        statement = select(City.id, City.name, City.district_id, City.subdistrict_id, City.lat, City.lng)
+        for city_id, name, district_id, *_ in session.execute(statement):
+            key = (district_id, " ".join(name.split()).casefold())
+            first.setdefault(key, city_id)
+    assert len(first) < index.count(RegionLevel.CITY)  # The fixture does repeat names
+    for (district_id, name), city_id in first.items():
+        assert index.find_id(RegionLevel.CITY, name, district_id) == city_id
+
+
+def test_cache_reloads_when_a_region_row_changes(regions, session_factory):
+    cache = RegionIndexCache(session_factory, check_interval=0)
+    index = cache.get()
+    assert cache.get() is index  # Unchanged tables keep the snapshot
+
+    city_id = index.ids(RegionLevel.CITY)[0]
+    with session_factory() as session:
+        session.execute(update(City).where(City.id == city_id).values(name="Renamed"))
+        session.commit()
+    renamed = cache.get()
+    assert renamed is not index and renamed.city(city_id).name == "Renamed"
+
+    with session_factory() as session:
+        session.execute(delete(City).where(City.id == city_id))
+        session.commit()
+    assert cache.get().city(city_id) is None
+
+
+def test_cache_checks_at_most_once_per_interval(regions, session_factory):
+    cache = RegionIndexCache(session_factory, check_interval=3600)
+    index = cache.get()
+    city_id = index.ids(RegionLevel.CITY)[0]
+    with session_factory() as session:
+        session.execute(update(City).where(City.id == city_id).values(name="Renamed"))
+        session.commit()
+
+    assert cache.get() is index
+    assert cache.refresh().city(city_id).name == "Renamed"
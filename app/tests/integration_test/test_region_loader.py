@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import func, inspect, select
+
+from app.models import City, RegionLoad
+from app.setup import region_loader
+from app.setup.region_loader import load_regions
+
+CSV = (
+    "state,state_type,district,subdistrict,city,lat,lng\n"
+    "Kerala,STATE,Ernakulam,Aluva,Aluva,10.1,76.3\n"
+    "Kerala,STATE,Ernakulam,Aluva,Kalady,10.2,76.4\n"
+    "Kerala,STATE,Idukki,,Munnar,10.1,77.1\n"
+    "Goa,STATE,North Goa,,Panaji,15.5,73.8\n"
+    "Goa,STATE,South Goa,,Margao,15.3,74.0\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path, engine, monkeypatch):
+    monkeypatch.setattr(region_loader, "get_engine", lambda: engine)
+    path = tmp_path / "regions.csv"
+    path.write_text(CSV)
+    return path
+
+
+def city_names(engine):
+    with engine.connect() as connection:
+        return sorted(connection.scalars(select(City.name)))
+
+
+def test_completed_load_is_not_repeated(csv_path, engine):
+    assert load_regions(csv_path, batch_size=2) == 5
+    assert load_regions(csv_path, batch_size=2) == 0
+    assert city_names(engine) == ["Aluva", "Kalady", "Margao", "Munnar", "Panaji"]
+
+
+def test_failed_load_resumes_after_last_chunk_and_keeps_indexes(csv_path, engine, monkeypatch):
+    load_chunk = region_loader._load_chunk
+    calls = []
+
+    def failing_load_chunk(connection, maps, batch):
+        calls.append(len(batch))
+        if len(calls) == 2:
+            load_chunk(connection, maps, batch)  # Written, then rolled back
+            raise RuntimeError("disk full")
+        return load_chunk(connection, maps, batch)
+
+    monkeypatch.setattr(region_loader, "_load_chunk", failing_load_chunk)
+    assert load_regions(csv_path, batch_size=2) is None
+    assert len(city_names(engine)) == 2
+    assert "ix_cities_name" in {index["name"] for index in inspect(engine).get_indexes("cities")}
+
+    monkeypatch.setattr(region_loader, "_load_chunk", load_chunk)
+    # The original batch size is kept, so chunk boundaries still line up
+    assert load_regions(csv_path, batch_size=1000) == 3
+    assert city_names(engine) == ["Aluva", "Kalady", "Margao", "Munnar", "Panaji"]
+    with engine.connect() as connection:
+        load = connection.execute(select(RegionLoad)).one()
+        assert (load.chunks_done, load.cities_loaded) == (3, 5)
+        assert load.completed_at is not None
+
+
+def test_restart_loads_the_file_again(csv_path, engine):
+    load_regions(csv_path, batch_size=2)
+    assert load_regions(csv_path, batch_size=2, restart=True) == 5
+    with engine.connect() as connection:
+        assert connection.scalar(select(func.count()).select_from(City)) == 10
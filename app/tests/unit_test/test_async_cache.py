@@ -0,0 +1,162 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from loguru import logger
+
+from app.configuration.cache import CacheSettings
+from app.utils import cache as cache_module
+from app.utils.cache import AsyncCache, CacheStatus
+
+
+@pytest.fixture
+def make_cache():
+    """Factory for caches that are unregistered from `cache_metrics()` afterwards."""
+    names = []
+
+    def make(max_entries: int = 100, **kwargs) -> AsyncCache:
+        names.append(f"test-{len(names)}")
+        return AsyncCache(names[-1], settings=CacheSettings(max_entries=max_entries), **kwargs)
+
+    yield make
+    for name in names:
+        cache_module._caches.pop(name, None)
+
+
+class Loader:
+    """Counting loader that returns successive values, optionally waiting for `release`."""
+
+    def __init__(self, blocked: bool = False, error: Optional[Exception] = None):
+        self.calls = 0
+        self.error = error
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return f"value {self.calls}"
+
+
+def test_concurrent_misses_share_one_load(make_cache):
+    cache = make_cache()
+
+    async def scenario():
+        loader = Loader(blocked=True)
+        waiting = [asyncio.ensure_future(cache.fetch("key", loader)) for _ in range(20)]
+        await asyncio.sleep(0)
+        loader.release.set()
+        return loader, await asyncio.gather(*waiting)
+
+    loader, results = asyncio.run(scenario())
+
+    assert loader.calls == 1
+    assert {(result.entry.value, result.status) for result in results} == {("value 1", CacheStatus.MISS)}
+    assert (cache.metrics.misses, cache.metrics.coalesced, cache.metrics.loads) == (20, 19, 1)
+
+
+def test_stale_entries_are_served_while_one_refresh_runs(make_cache):
+    cache = make_cache()
+
+    async def scenario():
+        await cache.fetch("key", Loader(), ttl=0, stale_ttl=60)  # Expires at once
+        refresh = Loader(blocked=True)
+        stale = await asyncio.gather(*(cache.fetch("key", refresh, ttl=60) for _ in range(5)))
+        assert refresh.calls == 1
+        refresh.release.set()
+        await cache._inflight["key"]
+        return stale, await cache.fetch("key", Loader())
+
+    stale, fresh = asyncio.run(scenario())
+
+    assert {(result.entry.value, result.status) for result in stale} == {("value 1", CacheStatus.STALE)}
+    assert (fresh.entry.value, fresh.status) == ("value 1", CacheStatus.HIT)  # The refreshed value
+    assert fresh.entry is not stale[0].entry
+    assert (cache.metrics.stale_hits, cache.metrics.loads) == (5, 2)
+
+
+def test_entries_past_the_stale_window_are_reloaded(make_cache):
+    cache = make_cache()
+
+    async def scenario():
+        await cache.fetch("key", Loader(), ttl=0, stale_ttl=0)
+        return await cache.fetch("key", Loader())
+
+    assert asyncio.run(scenario()).status == CacheStatus.MISS
+    assert cache.metrics.stale_hits == 0
+
+
+def test_least_recently_used_entries_are_evicted_at_capacity(make_cache):
+    cache = make_cache(max_entries=3)
+
+    async def scenario():
+        for key in (1, 2, 3):
+            await cache.fetch(key, Loader())
+        await cache.fetch(1, Loader())  # Now the most recently used
+        for key in (4, 5):
+            await cache.fetch(key, Loader())
+        return [(await cache.fetch(key, Loader())).status for key in (1, 4, 5)]
+
+    assert asyncio.run(scenario()) == [CacheStatus.HIT] * 3
+    assert len(cache) == 3
+    assert cache.metrics.evictions == 2
+    assert not cache.invalidate(2) and not cache.invalidate(3)
+
+
+def test_failed_loads_reach_every_waiter_and_are_not_cached(make_cache):
+    cache = make_cache()
+
+    async def scenario():
+        loader = Loader(blocked=True, error=RuntimeError("upstream down"))
+        waiting = [asyncio.ensure_future(cache.fetch("key", loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        loader.release.set()
+        results = await asyncio.gather(*waiting, return_exceptions=True)
+        return loader, results, await cache.fetch("key", Loader())
+
+    loader, results, retried = asyncio.run(scenario())
+
+    assert loader.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert (retried.entry.value, retried.status) == ("value 1", CacheStatus.MISS)
+    assert cache.metrics.load_errors == 1
+
+
+def test_failed_background_refreshes_are_logged_and_the_stale_entry_kept(make_cache):
+    cache = make_cache()
+    messages = []
+    sink = logger.add(messages.append, level="WARNING", format="{message}")
+
+    async def scenario():
+        await cache.fetch("key", Loader(), ttl=0, stale_ttl=60)
+        failing = Loader(error=RuntimeError("upstream down"))
+        first = await cache.fetch("key", failing)
+        with pytest.raises(RuntimeError):
+            await cache._inflight["key"]
+        await asyncio.sleep(0)  # Let the done callback run
+        return first, await cache.fetch("key", Loader())
+
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        logger.remove(sink)
+
+    assert [result.status for result in (first, second)] == [CacheStatus.STALE] * 2
+    assert second.entry.value == "value 1"
+    assert cache.metrics.load_errors == 1
+    assert any("Background cache refresh failed" in message and "upstream down" in message for message in messages)
+
+
+def test_disabled_cache_calls_the_loader_every_time(make_cache):
+    cache = make_cache()
+    cache.enabled = False
+    loader = Loader()
+
+    async def scenario():
+        return [await cache.fetch("key", loader) for _ in range(2)]
+
+    assert [result.status for result in asyncio.run(scenario())] == [CacheStatus.BYPASS] * 2
+    assert loader.calls == 2 and len(cache) == 0
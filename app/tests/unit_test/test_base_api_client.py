@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.dal.api_clients.base_api_client import BaseAPIClient
+
+
+def test_each_event_loop_gets_its_own_transport_and_semaphores():
+    async def resources():
+        client = BaseAPIClient.get_client()
+        semaphore = BaseAPIClient.host_semaphore("https://feeds.example/a.csv")
+        assert BaseAPIClient.get_client() is client
+        assert BaseAPIClient.host_semaphore("https://feeds.example/b.csv") is semaphore
+        await BaseAPIClient.shutdown()
+        return client, semaphore
+
+    first_client, first_semaphore = asyncio.run(resources())
+    second_client, second_semaphore = asyncio.run(resources())
+
+    assert first_client is not second_client
+    assert first_semaphore is not second_semaphore
+
+
+def test_shutdown_closes_a_lazily_created_transport():
+    async def lazy_client():
+        client = BaseAPIClient.get_client()
+        await BaseAPIClient.shutdown()
+        return client
+
+    assert asyncio.run(lazy_client()).is_closed
+
+
+def test_failing_sink_does_not_leak_the_download():
+    body = "id\n" + "".join(f"{row}\n" for row in range(1000))
+
+    class FeedClient(BaseAPIClient):
+        @classmethod
+        def get_client(cls) -> httpx.AsyncClient:
+            return httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body)))
+
+    def sink(batch):
+        raise RuntimeError("disk full")
+
+    async def run():
+        with pytest.raises(RuntimeError, match="disk full"):
+            await FeedClient.stream_csv("https://feeds.example/a.csv", sink, batch_size=10, max_pending_batches=1)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(run()) == set()
@@ -0,0 +1,74 @@
+import io
+import struct
+import zlib
+from datetime import date, datetime
+
+import pytest
+
+from app.models.enums import StateType
+from app.utils.columnar import MAGIC, ColumnarFormatError, ColumnarWriter, column_type, read_columnar
+
+COLUMNS = [("id", int), ("name", str), ("type", StateType), ("price", float), ("active", bool), ("day", date)]
+ROWS = [
+    (1, "Kochi", StateType.STATE, 2500.5, True, date(2024, 3, 1)),
+    (2, None, None, None, None, None),
+    (-3, "पुदुच्चेरी", StateType.UNION_TERRITORY, -0.25, False, date(1969, 12, 31)),
+    (2 ** 40, "", StateType.STATE, 1e300, True, date(1970, 1, 1)),
+]
+
+
+def encode(chunks, compress: bool = True) -> bytes:
+    writer = ColumnarWriter(COLUMNS, compress=compress)
+    return writer.header() + b"".join(map(writer.chunk, chunks)) + writer.footer()
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_chunks_round_trip(compress):
+    chunks = [ROWS[:1], [], ROWS[1:]]
+    columns, decoded = read_columnar(io.BytesIO(encode(chunks, compress)))
+
+    assert columns == [("id", "int"), ("name", "str"), ("type", "str"), ("price", "float"),
+                       ("active", "bool"), ("day", "date")]
+    expected = [tuple(value.value if isinstance(value, StateType) else value for value in row) for row in ROWS]
+    assert list(decoded) == [expected[:1], expected[1:]]  # The empty chunk writes no block
+
+
+def test_layout_of_an_uncompressed_stream():
+    writer = ColumnarWriter([("id", int), ("name", str)], compress=False)
+    data = writer.header() + writer.chunk([(7, "ab"), (8, None)]) + writer.footer()
+
+    assert data.startswith(MAGIC)
+    position = len(MAGIC)
+    (schema_size,) = struct.unpack_from("<I", data, position)
+    position += 4 + schema_size
+    assert data[len(MAGIC) + 4:position] == b'{"columns": [["id", "int"], ["name", "str"]], "compression": null}'
+
+    (chunk_size,) = struct.unpack_from("<I", data, position)
+    chunk = data[position + 4:position + 4 + chunk_size]
+    assert chunk == (
+        struct.pack("<I", 2)
+        + b"\x00" + struct.pack("<2q", 7, 8)  # No nulls: flag 0, values only
+        + b"\x01" + b"\x00\x01" + struct.pack("<3I", 0, 2, 2) + b"ab"  # Null mask, offsets, UTF-8 data
+    )
+    assert data[position + 4 + chunk_size:] == b"\x00\x00\x00\x00"
+
+
+def test_compressed_chunks_are_zlib_blocks():
+    writer = ColumnarWriter(COLUMNS)
+    plain = ColumnarWriter(COLUMNS, compress=False).chunk(ROWS)
+    block = writer.chunk(ROWS)
+    assert zlib.decompress(block[4:]) == plain[4:]
+
+
+def test_invalid_streams_are_rejected():
+    with pytest.raises(ColumnarFormatError, match="Not a columnar"):
+        read_columnar(io.BytesIO(b'{"id": 1}\n'))
+    _, chunks = read_columnar(io.BytesIO(encode([ROWS])[:-10]))
+    with pytest.raises(ColumnarFormatError, match="Truncated"):
+        list(chunks)
+
+
+def test_unsupported_column_types():
+    assert column_type(bool) == "bool"  # Checked before int, its base class
+    with pytest.raises(TypeError, match="datetime"):
+        column_type(datetime)
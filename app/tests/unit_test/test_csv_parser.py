@@ -0,0 +1,151 @@
+import csv
+from datetime import date
+from io import StringIO
+
+import pytest
+
+from app.helpers.csv_parser import (
+    CsvColumn,
+    CsvStreamParser,
+    date_converter,
+    enum_converter,
+    iter_csv_batches,
+    iter_csv_file,
+    iter_csv_shard,
+    shard_csv_file,
+)
+from app.models.enums import StateType
+
+CSV = (
+    '\ufeffid,name,state_type,arrival_date\n'
+    '1,Kochi,STATE,01/02/2024\n'
+    '2,"Thiruvananthapuram, South",state,02/02/2024\n'
+    '3,"Line one\nline two",union territory,\n'
+    '4,"He said ""hello""",STATE,03/02/2024\n'
+    '5,Pondichéry — पुदुच्चेरी,UNION_TERRITORY,04/02/2024\n'
+    '\n'
+    '6,Short\n'
+)
+
+
+def expected_rows():
+    return [list(row.values()) for row in csv.DictReader(StringIO(CSV.lstrip("\ufeff")))]
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def parse(chunks, **kwargs):
+    return [row for batch in iter_csv_batches(chunks, **kwargs) for row in batch.rows()]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+def test_any_chunking_matches_csv_module(chunk_size):
+    rows = parse(chunked(CSV.encode("utf-8"), chunk_size))
+    # DictReader fills missing trailing cells with None; the parser pads with ""
+    assert [list(row) for row in rows] == [[cell or "" for cell in row] for row in expected_rows()]
+
+
+def test_batches_have_batch_size_rows_and_keep_the_header_names():
+    batches = list(iter_csv_batches([CSV.encode("utf-8")], batch_size=4))
+    assert [len(batch) for batch in batches] == [4, 2]
+    assert batches[0].names == ("id", "name", "state_type", "arrival_date")
+    assert batches[1].to_dicts()[1] == {"id": "6", "name": "Short", "state_type": "", "arrival_date": ""}
+
+
+def test_schema_selects_renames_and_converts_columns():
+    schema = [
+        CsvColumn("arrival", date_converter(), source="arrival_date"),
+        CsvColumn("id", int),
+        CsvColumn("type", enum_converter(StateType), source="state_type"),
+    ]
+    parser = CsvStreamParser(schema, batch_size=100)
+    batches = parser.feed(CSV.encode("utf-8")) + parser.close()
+
+    assert len(batches) == 1
+    batch = batches[0]
+    assert batch.names == ("arrival", "id", "type")
+    assert batch.column("id") == [1, 2, 3, 4, 5, 6]
+    assert batch.column("arrival")[:3] == [date(2024, 2, 1), date(2024, 2, 2), None]
+    assert batch.column("type") == [
+        StateType.STATE, StateType.STATE, StateType.UNION_TERRITORY,
+        StateType.STATE, StateType.UNION_TERRITORY, None,
+    ]
+    assert parser.rows_parsed == 6
+
+
+def test_missing_schema_columns_are_reported():
+    with pytest.raises(ValueError, match="missing columns: price"):
+        list(iter_csv_batches([CSV.encode("utf-8")], schema=[CsvColumn("id"), CsvColumn("price")]))
+
+
+def test_file_reader_matches_in_memory_parse(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_bytes(CSV.encode("utf-8"))
+    rows = [row for batch in iter_csv_file(path, batch_size=2, chunk_size=5) for row in batch.rows()]
+    assert rows == parse([CSV.encode("utf-8")])
+
+
+@pytest.mark.parametrize("shard_size", [1, 5, 16, 40, 1 << 20])
+def test_shards_partition_the_file_on_record_boundaries(tmp_path, shard_size):
+    path = tmp_path / "feed.csv"
+    # A quoted newline in the header and a record longer than most shard sizes
+    data = ('id,"multi\nline header"\n' + CSV.split("\n", 1)[1] + '7,"' + "x\n" * 30 + '"\n').encode("utf-8")
+    path.write_bytes(data)
+
+    shards = shard_csv_file(path, shard_size=shard_size)
+
+    assert shards[0].start == shards[0].header_end == data.index(b"\n", data.index(b"\n") + 1) + 1
+    assert all(left.end == right.start for left, right in zip(shards, shards[1:]))
+    assert shards[-1].end == len(data)
+    rows = [row for shard in shards for batch in iter_csv_shard(shard, batch_size=3) for row in batch.rows()]
+    assert rows == parse([data])
+    assert len(rows) == 7
+
+
+def test_empty_body_has_no_shards(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_bytes(b"id,name\n")
+    assert shard_csv_file(path, shard_size=4) == []
+
+
+# Double quotes are plain text here; a newline inside '...' does not end the record
+SINGLE_QUOTED = (
+    "id,name\n"
+    "1,'Kochi, \"the port\"\nline two'\n"
+    "2,O\"Brien\n"
+    "3,'It''s ''quoted'''\n"
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 20])
+def test_streaming_uses_the_dialect_quotechar(chunk_size):
+    rows = parse(chunked(SINGLE_QUOTED.encode("utf-8"), chunk_size), quotechar="'")
+    assert [list(row) for row in rows] == list(csv.reader(StringIO(SINGLE_QUOTED), quotechar="'"))[1:]
+    assert len(rows) == 3
+
+
+@pytest.mark.parametrize("shard_size", [1, 5, 16, 1 << 20])
+def test_shards_use_the_dialect_quotechar(tmp_path, shard_size):
+    path = tmp_path / "feed.csv"
+    data = ("'multi\nline',header\n" + SINGLE_QUOTED.split("\n", 1)[1]).encode("utf-8")
+    path.write_bytes(data)
+
+    shards = shard_csv_file(path, shard_size=shard_size, quotechar="'")
+
+    assert shards[0].header_end == data.index(b"\n", data.index(b"\n") + 1) + 1
+    rows = [row for shard in shards for batch in iter_csv_shard(shard, quotechar="'") for row in batch.rows()]
+    assert rows == parse([data], quotechar="'")
+    assert len(rows) == 3
+
+
+def test_unquoted_dialect_ends_records_at_every_newline():
+    data = 'id,name\n1,"Kochi\n2,Goa"\n'
+    rows = parse(chunked(data.encode("utf-8"), 4), quoting=csv.QUOTE_NONE)
+    assert [list(row) for row in rows] == [["1", '"Kochi'], ["2", 'Goa"']]
+
+
+def test_escapechar_is_rejected():
+    with pytest.raises(ValueError, match="escapechar"):
+        CsvStreamParser(escapechar="\\")
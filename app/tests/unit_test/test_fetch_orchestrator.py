@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+
+from app.dal.api_clients.base_api_client import BaseAPIClient
+from app.dal.api_clients.fetch_orchestrator import FetchOrchestrator, RetryPolicy
+from app.utils import metrics
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+
+
+def mock_client(handler) -> type:
+    """API client class whose transport answers every request with `handler`."""
+    transport = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    class MockClient(BaseAPIClient):
+        @classmethod
+        def get_client(cls) -> httpx.AsyncClient:
+            return transport
+
+    return MockClient
+
+
+def fetch_all(orchestrator: FetchOrchestrator, urls):
+    async def collect():
+        return {result.url: result async for result in orchestrator.fetch_all(urls)}
+
+    return asyncio.run(collect())
+
+
+def test_transient_failures_are_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(503 if len(calls) < 3 else 200, text="ok")
+
+    orchestrator = FetchOrchestrator(concurrency=1, retry=NO_WAIT, client=mock_client(handler))
+    results = fetch_all(orchestrator, ["https://feeds.example/a"])
+
+    result = results["https://feeds.example/a"]
+    assert result.ok and result.text == "ok" and result.attempts == 3
+    assert orchestrator.host_report()["feeds.example"]["retries"] == 2
+
+
+def test_permanent_failures_are_returned_without_aborting_the_batch():
+    def handler(request):
+        if request.url.path == "/unsupported":
+            raise httpx.UnsupportedProtocol("unsupported scheme", request=request)
+        if request.url.path == "/loop":
+            raise httpx.TooManyRedirects("redirect loop", request=request)
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, text="ok")
+
+    urls = [
+        "https://feeds.example/unsupported",
+        "https://feeds.example/loop",
+        "https://feeds.example/missing",
+        "https://feeds.ex\x00ample/invalid",
+        "https://feeds.example/good",
+    ]
+    orchestrator = FetchOrchestrator(concurrency=2, retry=NO_WAIT, client=mock_client(handler))
+    results = fetch_all(orchestrator, urls)
+
+    assert set(results) == set(urls)
+    assert results["https://feeds.example/good"].ok
+    for url in urls[:4]:
+        assert not results[url].ok
+    assert isinstance(results["https://feeds.example/unsupported"].error, httpx.UnsupportedProtocol)
+    assert isinstance(results["https://feeds.ex\x00ample/invalid"].error, httpx.InvalidURL)
+    # Not transient: one attempt each
+    assert results["https://feeds.example/loop"].attempts == 1
+    assert results["https://feeds.example/missing"].status_code == 404
+
+
+def test_failed_fetches_reach_upstream_metrics(monkeypatch):
+    def handler(request):
+        raise httpx.UnsupportedProtocol("unsupported scheme", request=request)
+
+    registry = metrics.MetricsRegistry()
+    registry.enabled = True
+    monkeypatch.setattr(metrics, "registry", registry)
+    orchestrator = FetchOrchestrator(concurrency=1, retry=NO_WAIT, client=mock_client(handler))
+    fetch_all(orchestrator, ["https://feeds.example/a"])
+
+    assert 'upstream_request_duration_seconds_count{host="feeds.example",status="error"} 1' in registry.render()
@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.configuration.metrics import MetricsSettings
+from app.setup import instrumentation
+from app.setup.instrumentation import InstrumentationMiddleware
+from app.utils.metrics import MetricsRegistry
+
+LOCAL = ("127.0.0.1", 50000)
+REMOTE = ("203.0.113.7", 50000)
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(instrumentation, "registry", MetricsRegistry())
+
+
+def get(settings: MetricsSettings, client, path="/ping", headers=None) -> httpx.Response:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    async def request():
+        transport = httpx.ASGITransport(app=InstrumentationMiddleware(app, settings=settings), client=client)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await http.get(path, headers=headers)
+
+    return asyncio.run(request())
+
+
+def test_profiling_is_off_by_default():
+    response = get(MetricsSettings(enabled=True), LOCAL, headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert "server-timing" in response.headers
+
+
+def test_local_clients_can_request_a_profile():
+    settings = MetricsSettings(enabled=True, profiling_enabled=True)
+    assert "x-profile-id" in get(settings, LOCAL, headers={"X-Profile": "1"}).headers
+    assert "x-profile-id" in get(settings, LOCAL, path="/ping?_profile=1").headers
+
+
+def test_remote_clients_are_not_profiled_unless_allowed():
+    settings = MetricsSettings(enabled=True, profiling_enabled=True)
+    assert "x-profile-id" not in get(settings, REMOTE, headers={"X-Profile": "1"}).headers
+    assert "x-profile-id" not in get(settings, REMOTE, path="/missing", headers={"X-Profile": "1"}).headers
+
+    settings = MetricsSettings(enabled=True, profiling_enabled=True, allow_remote=True)
+    assert "x-profile-id" in get(settings, REMOTE, headers={"X-Profile": "1"}).headers
@@ -0,0 +1,172 @@
+import numpy as np
+import pytest
+
+from app.helpers.price_analytics import (
+    PriceFrame,
+    district_day_aggregates,
+    frame_trailing_stats,
+    neighbour_deviation,
+    trailing_stats,
+    zscore_anomalies,
+)
+
+
+def random_series(rng: np.random.Generator, lengths, level: float = 2500.0, spread: float = 300.0):
+    """Concatenated series of the given lengths with about 15% missing values, plus their start indices."""
+    values = rng.normal(level, spread, sum(lengths))
+    values[rng.random(len(values)) < 0.15] = np.nan
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    return values, starts
+
+
+def brute_force(values, starts, window, include_current=True, min_periods=1):
+    """The window of every row sliced out and summarized on its own."""
+    lag = 0 if include_current else 1
+    ends = list(starts[1:]) + [len(values)]
+    count, mean, std = [], [], []
+    for start, end in zip(starts, ends):
+        for row in range(start, end):
+            window_values = values[max(start, row + 1 - lag - window): row + 1 - lag]
+            present = window_values[~np.isnan(window_values)]
+            count.append(len(present))
+            enough = len(present) >= max(min_periods, 1)
+            mean.append(present.mean() if enough else np.nan)
+            std.append(present.std(ddof=1) if enough and len(present) >= 2 else np.nan)
+    return np.array(count, dtype=np.int64), np.array(mean), np.array(std)
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 30])
+@pytest.mark.parametrize("include_current", [True, False])
+@pytest.mark.parametrize("min_periods", [1, 3])
+def test_trailing_stats_match_brute_force(window, include_current, min_periods):
+    rng = np.random.default_rng(window * 10 + min_periods)
+    values, starts = random_series(rng, [1, 2, 7, 40, 3, 120, 31])
+
+    stats = trailing_stats(values, starts, window, include_current=include_current, min_periods=min_periods)
+    count, mean, std = brute_force(values, starts, window, include_current, min_periods)
+
+    np.testing.assert_array_equal(stats.count, count)
+    np.testing.assert_allclose(stats.mean, mean, rtol=1e-12, equal_nan=True)
+    # Windows are differences of prefix sums, so the error of a near-zero std
+    # is bounded at the scale of the series (micro-rupees), not relative to it
+    np.testing.assert_allclose(stats.std, std, rtol=1e-9, atol=1e-6, equal_nan=True)
+
+
+def test_trailing_stats_stay_exact_for_large_prices_with_small_moves():
+    # Earlier series with huge values must not leak rounding error into later ones
+    rng = np.random.default_rng(3)
+    values, starts = random_series(rng, [500, 500, 500], level=1e7, spread=0.5)
+    values[:500] *= 1e3
+
+    stats = trailing_stats(values, starts, 20)
+    _, mean, std = brute_force(values, starts, 20)
+
+    np.testing.assert_allclose(stats.mean, mean, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(stats.std, std, rtol=1e-6, equal_nan=True)
+
+
+def test_trailing_stats_of_an_empty_frame():
+    stats = trailing_stats(np.zeros(0), np.zeros(0, dtype=np.int64), 5)
+    assert len(stats.count) == len(stats.mean) == len(stats.std) == 0
+
+
+def test_window_must_be_positive():
+    with pytest.raises(ValueError, match="window"):
+        trailing_stats(np.ones(3), np.zeros(1, dtype=np.int64), 0)
+
+
+def unsorted_frame(rng: np.random.Generator, rows: int = 400) -> PriceFrame:
+    commodity = rng.choice([7, 3], rows)
+    market = rng.choice([1001, 12, 40], rows)
+    variety = rng.choice(["Local", "", "Desi", None], rows)
+    district = market % 2  # Markets 12 and 40 share a district
+    day = rng.permutation(rows)  # Distinct days, so each series has a strict order
+    low = rng.uniform(1000, 2000, rows)
+    modal = low + rng.uniform(0, 500, rows)
+    modal[rng.random(rows) < 0.1] = np.nan
+    return PriceFrame.from_columns(commodity, district, market, day, low, low + 600, modal, variety)
+
+
+def test_frame_series_are_sorted_runs_per_commodity_market_and_variety():
+    frame = unsorted_frame(np.random.default_rng(5))
+    keys = list(zip(frame.commodity_id, frame.market_id, frame.variety, frame.price_date))
+
+    assert keys == sorted(keys)
+    assert set(frame.variety) == {"", "Desi", "Local"}  # None is the unnamed variety
+    assert len(frame.series_starts) == len(set(key[:3] for key in keys))
+    stats = frame_trailing_stats(frame, 10)
+    np.testing.assert_allclose(
+        stats.mean, brute_force(frame.modal_price, frame.series_starts, 10)[1], rtol=1e-12, equal_nan=True
+    )
+
+
+def test_district_day_aggregates_and_neighbour_deviation_match_brute_force():
+    rng = np.random.default_rng(9)
+    # Every (market, variety, day) at most once, as in mandi_prices
+    keys = [(market, variety, day) for market in (1, 2, 3, 4) for variety in ("A", "B") for day in range(20)]
+    keys = [keys[i] for i in rng.choice(len(keys), 100, replace=False)]
+    market, variety, day = (np.array(column) for column in zip(*keys))
+    rows = len(keys)
+    district = np.where(market <= 3, 10, 20)
+    modal = rng.uniform(1000, 2000, rows)
+    modal[rng.random(rows) < 0.1] = np.nan
+    frame = PriceFrame.from_columns(np.ones(rows), district, market, day, modal - 100, modal + 100, modal, variety)
+
+    aggregates = district_day_aggregates(frame)
+    deviation = neighbour_deviation(frame)
+
+    for group, (district_id, price_date) in enumerate(zip(aggregates.district_id, aggregates.price_date)):
+        members = np.flatnonzero((frame.district_id == district_id) & (frame.price_date == price_date))
+        np.testing.assert_array_equal(aggregates.row_group[members], group)
+        prices = frame.modal_price[members]
+        present = prices[~np.isnan(prices)]
+        assert aggregates.price_count[group] == len(present)
+        assert aggregates.min_price[group] == np.nanmin(frame.min_price[members])
+        assert aggregates.max_price[group] == np.nanmax(frame.max_price[members])
+        for row in members:
+            neighbours = (frame.market_id[members] != frame.market_id[row]) & (
+                frame.variety[members] == frame.variety[row]
+            )
+            others = frame.modal_price[members[neighbours & ~np.isnan(frame.modal_price[members])]]
+            if np.isnan(frame.modal_price[row]) or not len(others):
+                assert np.isnan(deviation[row])
+            else:
+                assert deviation[row] == pytest.approx(frame.modal_price[row] / others.mean() - 1)
+
+
+def test_varieties_at_one_market_are_separate_series_and_not_neighbours():
+    # Market 1 sells a cheap and a premium variety; market 2 only the cheap one
+    days = 40
+    day = np.concatenate([np.arange(days)] * 3)
+    market = np.repeat([1, 1, 2], days)
+    variety = np.repeat(["Local", "Premium", "Local"], days)
+    modal = np.repeat([1000.0, 3000.0, 1100.0], days)
+    modal[days + 35] = 4500  # A spike of the premium variety only
+    frame = PriceFrame.from_columns(np.ones(3 * days), np.ones(3 * days), market, day, modal, modal, modal, variety)
+
+    local = (frame.market_id == 1) & (frame.variety == "Local")
+    premium = (frame.market_id == 1) & (frame.variety == "Premium")
+    deviation = neighbour_deviation(frame)
+    np.testing.assert_allclose(deviation[local], 1000 / 1100 - 1)
+    assert np.isnan(deviation[premium]).all()  # No other market sells it
+    np.testing.assert_allclose(deviation[frame.market_id == 2], 1100 / 1000 - 1)
+
+    assert len(frame.series_starts) == 3
+    np.testing.assert_allclose(frame_trailing_stats(frame, 10).mean[local], 1000)
+    scores = zscore_anomalies(frame, window=30, threshold=3.0)
+    assert frame.variety[scores.flagged].tolist() == ["Premium"]
+    assert frame.price_date[scores.flagged].astype(int).tolist() == [35]
+
+
+def test_zscore_flags_a_spike_against_its_own_history():
+    days = 60
+    modal = 2000 + 20 * np.sin(np.arange(days))
+    modal[45] = 2600
+    frame = PriceFrame.from_columns(
+        np.ones(days), np.ones(days), np.ones(days), np.arange(days), modal, modal, modal
+    )
+
+    scores = zscore_anomalies(frame, window=30, threshold=3.0)
+
+    assert np.flatnonzero(scores.flagged).tolist() == [45]
+    assert np.isnan(scores.zscore[:7]).all()  # Not enough history yet
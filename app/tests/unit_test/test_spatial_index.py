@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from app.helpers.geo import haversine_km
+from app.services.region.spatial_index import CitySpatialIndex
+
+CELL_SIZE = 0.5
+
+
+def random_points(rng: random.Random, count: int) -> list:
+    """Points spread over a wide band, dense near the poles, some exactly on cell edges."""
+    points = []
+    for city_id in range(1, count + 1):
+        roll = rng.random()
+        if roll < 0.3:
+            lat = rng.choice([-1, 1]) * rng.uniform(80, 89.99)
+        elif roll < 0.5:
+            lat = rng.randint(-170, 170) * CELL_SIZE / 2  # On a cell edge or centre line
+        else:
+            lat = rng.uniform(-85, 85)
+        lng = rng.randint(-120, 120) * CELL_SIZE if rng.random() < 0.2 else rng.uniform(-60, 60)
+        points.append((city_id, lat, lng))
+    return points
+
+
+def queries(rng: random.Random, points: list, count: int) -> list:
+    """Random points, points on cell edges, points at high latitudes and copies of indexed points."""
+    result = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.25:
+            result.append((rng.randint(-179, 179) * CELL_SIZE / 2, rng.randint(-120, 120) * CELL_SIZE))
+        elif roll < 0.5:
+            result.append((rng.choice([-1, 1]) * rng.uniform(84, 89.999), rng.uniform(-60, 60)))
+        elif roll < 0.6:
+            result.append(rng.choice(points)[1:])
+        else:
+            result.append((rng.uniform(-89, 89), rng.uniform(-60, 60)))
+    return result
+
+
+def by_distance(points: list, lat: float, lng: float) -> list:
+    return sorted((haversine_km(lat, lng, point_lat, point_lng), city_id) for city_id, point_lat, point_lng in points)
+
+
+@pytest.fixture(scope="module")
+def indexed():
+    """The index, its points, and (lat, lng, every point by distance) per query."""
+    rng = random.Random(9)
+    points = random_points(rng, 2500)
+    index = CitySpatialIndex(cell_size_deg=CELL_SIZE)
+    index.add_many(points[:1000])
+    for point in points[1000:]:
+        index.add(*point)
+    targets = [(lat, lng, by_distance(points, lat, lng)) for lat, lng in queries(rng, points, 120)]
+    return index, points, targets
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_nearest_matches_brute_force(indexed, k):
+    index, points, targets = indexed
+    for lat, lng, ranked in targets:
+        expected = ranked[:k]
+        found = index.nearest(lat, lng, k=k)
+        assert [city.distance_km for city in found] == pytest.approx([distance for distance, _ in expected])
+        # Ids agree unless the k-th distance is tied
+        assert {city.city_id for city in found[:-1]} <= {city_id for _, city_id in expected}
+
+
+@pytest.mark.parametrize("radius_km", [0.1, 30, 250, 1500])
+def test_radius_search_matches_brute_force(indexed, radius_km):
+    index, points, targets = indexed
+    for lat, lng, ranked in targets:
+        expected = [(distance, city_id) for distance, city_id in ranked if distance <= radius_km]
+        found = index.within_radius(lat, lng, radius_km)
+        assert sorted(city.city_id for city in found) == sorted(city_id for _, city_id in expected)
+        assert [city.distance_km for city in found] == sorted(city.distance_km for city in found)
+
+
+def test_max_km_bounds_nearest(indexed):
+    index, points, targets = indexed
+    for lat, lng, ranked in targets:
+        expected = [city_id for distance, city_id in ranked[:10] if distance <= 200]
+        assert [city.city_id for city in index.nearest(lat, lng, k=10, max_km=200)] == expected
+
+
+def test_bounding_box_matches_brute_force(indexed):
+    index, points, _ = indexed
+    rng = random.Random(3)
+    for _ in range(100):
+        min_lat, max_lat = sorted(rng.randint(-180, 180) * CELL_SIZE / 2 for _ in range(2))
+        min_lng, max_lng = sorted(rng.uniform(-70, 70) for _ in range(2))
+        expected = [city_id for city_id, lat, lng in points
+                    if min_lat <= lat <= max_lat and min_lng <= lng <= max_lng]
+        assert sorted(index.within_bbox(min_lat, min_lng, max_lat, max_lng)) == expected
+
+
+def test_empty_index_and_missing_coordinates():
+    index = CitySpatialIndex()
+    assert index.nearest(10.0, 76.0) == [] and index.within_radius(10.0, 76.0, 50) == []
+    assert index.add_many([(1, None, 76.0), (2, 10.0, None), (3, 10.0, 76.0)]) == 1
+    assert len(index) == 1
+    assert index.nearest(10.0, 76.0, k=0) == []
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.setup.sql_script import SqlScriptError, iter_sql_statements, run_sql_statements
+
+
+def statements(script: str):
+    return [(statement.text, statement.line) for statement in iter_sql_statements(script.splitlines(True))]
+
+
+def run(engine, script: str, batch_size: int):
+    with engine.connect() as connection:
+        return run_sql_statements(connection, iter_sql_statements(script.splitlines(True)), batch_size=batch_size)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'script.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_semicolons_in_literals_and_comments_do_not_split():
+    script = (
+        "INSERT INTO t VALUES ('a;b', \"c;d\", [e;f]); -- trailing; comment\n"
+        "/* block;\n"
+        "   comment */ INSERT INTO t VALUES ('it''s; fine');\n"
+    )
+    assert statements(script) == [
+        ("INSERT INTO t VALUES ('a;b', \"c;d\", [e;f])", 1),
+        ("INSERT INTO t VALUES ('it''s; fine')", 3),
+    ]
+
+
+def test_trigger_body_is_one_statement():
+    script = (
+        "CREATE TRIGGER t_ins AFTER INSERT ON t BEGIN\n"
+        "  UPDATE t SET n = CASE WHEN n > 0 THEN n ELSE 0 END;\n"
+        "  DELETE FROM u;\n"
+        "END;\n"
+        "SELECT 1;\n"
+    )
+    parsed = statements(script)
+    assert len(parsed) == 2
+    assert parsed[0][0].endswith("END") and parsed[1] == ("SELECT 1", 5)
+
+
+def test_unterminated_string_reports_its_line():
+    with pytest.raises(SqlScriptError) as error:
+        statements("SELECT 1;\nSELECT 'open;\n")
+    assert error.value.line == 2
+
+
+def test_failing_single_batch_script_rolls_back_ddl(engine):
+    script = "CREATE TABLE a (id INTEGER);\nINSERT INTO a VALUES (1);\nINSERT INTO missing VALUES (1);\n"
+
+    with pytest.raises(SqlScriptError) as error:
+        run(engine, script, batch_size=0)
+
+    assert error.value.line == 3
+    assert not inspect(engine).has_table("a")
+
+
+def test_failure_keeps_earlier_batches_only(engine):
+    script = (
+        "BEGIN TRANSACTION;\n"
+        "CREATE TABLE a (id INTEGER);\n"
+        "INSERT INTO a VALUES (1);\n"
+        "CREATE TABLE b (id INTEGER);\n"
+        "INSERT INTO missing VALUES (1);\n"
+        "COMMIT;\n"
+    )
+
+    with pytest.raises(SqlScriptError):
+        run(engine, script, batch_size=2)
+
+    assert inspect(engine).has_table("a")
+    assert not inspect(engine).has_table("b")
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT count(*) FROM a")) == 1
+
+
+def test_script_control_statements_are_skipped(engine):
+    script = "BEGIN;\nCREATE TABLE a (id INTEGER);\nINSERT INTO a VALUES (1);\nCOMMIT;\n"
+
+    assert run(engine, script, batch_size=1) == 2
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT count(*) FROM a")) == 1
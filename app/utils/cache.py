@@ -0,0 +1,418 @@
+"""
+In-process caching for services and FastAPI endpoints.
+
+`AsyncCache` stores values in a pluggable `CacheBackend` (by default the
+LRU + TTL `MemoryCacheBackend`) and adds three behaviours on top:
+
+- Request coalescing: concurrent misses for the same key share one in-flight
+  load instead of each calling the upstream API or database.
+- Stale-while-revalidate: for `stale_ttl` seconds after an entry expires it is
+  still served immediately while a single background task refreshes it.
+- Metrics: hits, stale hits, misses, coalesced waits, loads, errors and
+  evictions per cache, exposed through `cache_metrics()`.
+
+Services call `AsyncCache.get_or_load` directly; routes use `cache_response`,
+which also emits `ETag` / `Cache-Control` headers and answers matching
+`If-None-Match` requests with `304 Not Modified`.
+
+Usage:
+    from app.utils.cache import cache_response
+
+    @router.get("/prices/rollups/{level}/{region_id}/series")
+    @cache_response()
+    def get_rollup_series(..., sessions=Depends(get_session_factory)): ...
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from enum import Enum
+from hashlib import blake2b
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+
+from app.configuration.cache import CacheSettings, cache_settings
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+class CacheEntry:
+    """A cached value with its freshness deadlines (monotonic seconds)."""
+    __slots__ = ("value", "created_at", "expires_at", "stale_until")
+
+    def __init__(self, value: Any, created_at: float, expires_at: float, stale_until: float):
+        self.value = value
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def is_servable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+class CacheStatus(str, Enum):
+    HIT = "HIT"
+    STALE = "STALE"  # Served past expiry while a refresh runs
+    MISS = "MISS"
+    BYPASS = "BYPASS"  # Caching disabled
+
+
+class CacheResult(NamedTuple):
+    entry: CacheEntry
+    status: CacheStatus
+
+
+class CacheMetrics:
+    """Counters for one cache. Plain ints; updated from the event loop."""
+    __slots__ = ("hits", "stale_hits", "misses", "coalesced", "loads", "load_errors", "evictions")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.hits = self.stale_hits = self.misses = 0
+        self.coalesced = self.loads = self.load_errors = self.evictions = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        served = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / served if served else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values["hit_ratio"] = round(self.hit_ratio, 4)
+        return values
+
+
+class CacheBackend(ABC):
+    """Storage interface for `AsyncCache`; implement to plug in e.g. a shared store."""
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the entry for `key`, or None. Entries past `stale_until` may be dropped."""
+
+    @abstractmethod
+    def set(self, key: Hashable, entry: CacheEntry) -> None:
+        """Store or replace the entry for `key`."""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> bool:
+        """Remove `key`; return whether it was present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Bounded LRU map of cache entries.
+
+    Args:
+        max_entries: Capacity; the least recently used entry is evicted beyond it.
+        on_evict: Called once per capacity eviction (used for metrics).
+    """
+
+    def __init__(self, max_entries: int = 10_000, on_evict: Optional[Callable[[], None]] = None):
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()  # Invalidation may come from worker threads
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not entry.is_servable(time.monotonic()):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                if self.on_evict is not None:
+                    self.on_evict()
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_caches: Dict[str, "AsyncCache"] = {}
+
+
+class AsyncCache:
+    """
+    Coalescing, stale-while-revalidate cache for async loaders.
+
+    Args:
+        name: Name reported by `cache_metrics()`.
+        backend: Storage; a `MemoryCacheBackend` sized from settings by default.
+        ttl: Default seconds an entry stays fresh.
+        stale_ttl: Default seconds an expired entry may still be served.
+        settings: Source of the defaults above.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+        settings: CacheSettings = cache_settings,
+    ):
+        self.name = name
+        self.metrics = CacheMetrics()
+        if backend is None:
+            backend = MemoryCacheBackend(settings.max_entries, on_evict=self._count_eviction)
+        self.backend = backend
+        self.ttl = settings.default_ttl if ttl is None else ttl
+        self.stale_ttl = settings.stale_while_revalidate if stale_ttl is None else stale_ttl
+        self.enabled = settings.enabled
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        _caches[name] = self
+
+    def _count_eviction(self) -> None:
+        self.metrics.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    async def _load(self, key: Hashable, loader: Loader, ttl: float, stale_ttl: float) -> CacheEntry:
+        self.metrics.loads += 1
+        try:
+            value = await loader()
+        except BaseException:
+            self.metrics.load_errors += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        now = time.monotonic()
+        entry = CacheEntry(value, now, now + ttl, now + ttl + stale_ttl)
+        self.backend.set(key, entry)
+        return entry
+
+    def _start_load(self, key: Hashable, loader: Loader, ttl: float, stale_ttl: float) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, ttl, stale_ttl))
+            self._inflight[key] = task
+        return task
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background cache refresh failed: {task.exception()!r}")
+
+    async def fetch(
+        self,
+        key: Hashable,
+        loader: Loader,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+    ) -> CacheResult:
+        """
+        Return the entry for `key`, loading it with `loader` on a miss.
+
+        Args:
+            key: Hashable cache key.
+            loader: Zero-argument coroutine function producing the value.
+            ttl: Fresh lifetime in seconds; the cache default when omitted.
+            stale_ttl: Stale-while-revalidate window; the cache default when omitted.
+
+        Returns:
+            A `CacheResult` with the entry and whether it was a hit, stale hit or miss.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        if not self.enabled:
+            now = time.monotonic()
+            return CacheResult(CacheEntry(await loader(), now, now, now), CacheStatus.BYPASS)
+
+        entry = self.backend.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if entry.is_fresh(now):
+                self.metrics.hits += 1
+                return CacheResult(entry, CacheStatus.HIT)
+            # Stale but servable: answer now, refresh once in the background
+            self.metrics.stale_hits += 1
+            if key not in self._inflight:
+                self._start_load(key, loader, ttl, stale_ttl).add_done_callback(self._log_refresh_failure)
+            return CacheResult(entry, CacheStatus.STALE)
+
+        self.metrics.misses += 1
+        if key in self._inflight:
+            self.metrics.coalesced += 1
+        # Shielded so a cancelled caller (e.g. a dropped client) does not abort the shared load
+        entry = await asyncio.shield(self._start_load(key, loader, ttl, stale_ttl))
+        return CacheResult(entry, CacheStatus.MISS)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Loader,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+    ) -> Any:
+        """Like `fetch`, returning only the value."""
+        return (await self.fetch(key, loader, ttl, stale_ttl)).entry.value
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop one key; return whether it was cached."""
+        return self.backend.delete(key)
+
+    def clear(self) -> None:
+        """Drop every entry (in-flight loads still complete and store their result)."""
+        self.backend.clear()
+
+
+def cache_metrics() -> Dict[str, Dict[str, float]]:
+    """Metrics of every cache created in this process, keyed by cache name."""
+    return {name: {**cache.metrics.as_dict(), "entries": len(cache)} for name, cache in _caches.items()}
+
+
+# Shared cache used by `cache_response` unless another is passed
+response_cache = AsyncCache("responses")
+
+
+class CachedBody(NamedTuple):
+    """A rendered JSON response body and its strong validator."""
+    body: bytes
+    etag: str
+
+
+def render_json(content: Any) -> CachedBody:
+    """
+    Serialize an endpoint result once and derive its ETag from the bytes.
+
+    A returned `Response` (e.g. a `FastJSONResponse`) is already rendered, so
+    its body is kept as it is.
+    """
+    if isinstance(content, Response):
+        body = bytes(content.body)
+    else:
+        body = json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+    return CachedBody(body, f'"{blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def cached_json_response(request: Request, result: CacheResult, stale_ttl: float, private: bool = False) -> Response:
+    """Build the HTTP response (200 or 304) for a cached `CachedBody`."""
+    cached_body: CachedBody = result.entry.value
+    max_age = max(0, int(result.entry.expires_at - time.monotonic()))
+    cache_control = f"{'private' if private else 'public'}, max-age={max_age}"
+    if stale_ttl:
+        cache_control += f", stale-while-revalidate={int(stale_ttl)}"
+    headers = {"ETag": cached_body.etag, "Cache-Control": cache_control, "X-Cache": result.status.value}
+    if _etag_matches(request.headers.get("if-none-match"), cached_body.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached_body.body, media_type="application/json", headers=headers)
+
+
+def _request_key(request: Request) -> Hashable:
+    return request.method, request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+
+def cache_response(
+    cache: Optional[AsyncCache] = None,
+    ttl: Optional[float] = None,
+    stale_ttl: Optional[float] = None,
+    key_builder: Optional[Callable[[Request], Hashable]] = None,
+    private: bool = False,
+):
+    """
+    Cache a JSON route's rendered response.
+
+    Place it below the router decorator. The endpoint's return value is
+    JSON-encoded once per load; hits are served from the cached bytes with
+    `ETag`, `Cache-Control` and `X-Cache` headers, and a matching
+    `If-None-Match` yields `304 Not Modified`. Cached endpoints return
+    JSON-serializable values or a JSON `Response` such as `FastJSONResponse`;
+    its status and headers are not cached. A stale refresh runs after the
+    triggering request has finished, so with `stale_ttl` the endpoint should
+    open its own resources (`get_session_factory`) rather than rely on
+    request-scoped ones.
+
+    Args:
+        cache: Cache to use; `response_cache` when omitted.
+        ttl: Fresh lifetime in seconds (also the `max-age` upper bound).
+        stale_ttl: Stale-while-revalidate window in seconds.
+        key_builder: Builds the key from the request. By default method, path
+            and sorted query parameters.
+        private: Emit `Cache-Control: private` instead of `public`.
+    """
+
+    def decorator(endpoint: Callable[..., Any]):
+        signature = inspect.signature(endpoint)
+        request_param = next(
+            (name for name, param in signature.parameters.items() if param.annotation is Request), None
+        )
+        injected = request_param is None
+        if injected:
+            request_param = "cache_request"
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(request_param, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+        is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs.pop(request_param) if injected else kwargs[request_param]
+            active_cache = cache if cache is not None else response_cache
+            effective_stale = active_cache.stale_ttl if stale_ttl is None else stale_ttl
+
+            async def load() -> CachedBody:
+                if is_coroutine:
+                    content = await endpoint(*args, **kwargs)
+                else:
+                    content = await run_in_threadpool(endpoint, *args, **kwargs)
+                return render_json(content)
+
+            result = await active_cache.fetch(
+                key_builder(request) if key_builder else _request_key(request), load, ttl, effective_stale
+            )
+            return cached_json_response(request, result, effective_stale, private)
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
@@ -0,0 +1,222 @@
+"""
+Compact binary columnar encoding for bulk exports.
+
+A stream is a sequence of length-prefixed blocks, written and read one chunk of
+rows at a time so neither side holds the whole table:
+
+    b"ADHC1\\n"
+    [u32 length][schema: JSON {"columns": [[name, type], ...], "compression": ...}]
+    [u32 length][chunk]  ... repeated
+    [u32 0]                                   end of stream
+
+A chunk (zlib-compressed when the schema says so) is a u32 row count followed
+by each column in turn: a null flag byte, a one-byte-per-row null mask when the
+flag is set, then the values (nulls stored as zero / empty):
+
+    int    int64 little-endian          float  float64 little-endian
+    bool   int8                          date   int32 days since 1970-01-01
+    str    (rows + 1) uint32 offsets into the UTF-8 data that follows
+
+Enum columns are written as `str` columns of the enum values. About half the
+size of NDJSON before compression and a few times smaller after it.
+
+Usage:
+    writer = ColumnarWriter([("id", int), ("name", str)])
+    stream.write(writer.header())
+    for rows in chunks:
+        stream.write(writer.chunk(rows))
+    stream.write(writer.footer())
+
+    columns, chunks = read_columnar(stream)  # chunks yields lists of row tuples
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date
+from enum import Enum
+from itertools import accumulate
+from typing import BinaryIO, Iterator, List, Sequence, Tuple
+
+MAGIC = b"ADHC1\n"
+MEDIA_TYPE = "application/vnd.agridatahub.columnar"
+
+_U32 = struct.Struct("<I")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# Column type name -> array typecode of its fixed-width values
+_TYPECODES = {"int": "q", "float": "d", "bool": "b", "date": "i"}
+
+
+class ColumnarFormatError(ValueError):
+    """The stream is not valid columnar data."""
+
+
+def column_type(python_type: type) -> str:
+    """Map a column's Python type to its columnar type name."""
+    if issubclass(python_type, bool):
+        return "bool"
+    if issubclass(python_type, int):
+        return "int"
+    if issubclass(python_type, float):
+        return "float"
+    if issubclass(python_type, (str, Enum)):
+        return "str"
+    if python_type is date:  # datetime (a date subclass) is not supported
+        return "date"
+    raise TypeError(f"Unsupported column type for columnar encoding: {python_type.__name__}")
+
+
+def _block(payload: bytes) -> bytes:
+    return _U32.pack(len(payload)) + payload
+
+
+def _to_little_endian(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_column(kind: str, values: Sequence) -> bytes:
+    has_nulls = None in values
+    parts = [b"\x01" if has_nulls else b"\x00"]
+    if has_nulls:
+        parts.append(bytes(value is None for value in values))
+
+    if kind == "str":
+        encoded = [b"" if value is None else (value.value if isinstance(value, Enum) else value).encode()
+                   for value in values]
+        offsets = array("I", [0])
+        offsets.extend(accumulate(map(len, encoded)))
+        parts.append(_to_little_endian(offsets))
+        parts.append(b"".join(encoded))
+        return b"".join(parts)
+
+    if kind == "date":
+        values = [None if value is None else value.toordinal() - _EPOCH_ORDINAL for value in values]
+    if has_nulls:
+        values = [0 if value is None else value for value in values]
+    parts.append(_to_little_endian(array(_TYPECODES[kind], values)))
+    return b"".join(parts)
+
+
+class ColumnarWriter:
+    """
+    Encodes rows of a fixed schema into columnar blocks.
+
+    Args:
+        columns: `(name, python_type)` pairs in row order.
+        compress: zlib-compress every chunk (level 1, fast).
+    """
+
+    def __init__(self, columns: Sequence[Tuple[str, type]], compress: bool = True):
+        self.names = [name for name, _ in columns]
+        self.types = [column_type(python_type) for _, python_type in columns]
+        self.compress = compress
+
+    def header(self) -> bytes:
+        schema = {"columns": list(map(list, zip(self.names, self.types))),
+                  "compression": "zlib" if self.compress else None}
+        return MAGIC + _block(json.dumps(schema).encode())
+
+    def chunk(self, rows: Sequence[Sequence]) -> bytes:
+        """Encode a chunk of rows; an empty chunk encodes to nothing."""
+        if not rows:
+            return b""
+        payload = _U32.pack(len(rows)) + b"".join(
+            _encode_column(kind, values) for kind, values in zip(self.types, zip(*rows))
+        )
+        return _block(zlib.compress(payload, 1) if self.compress else payload)
+
+    @staticmethod
+    def footer() -> bytes:
+        return _U32.pack(0)
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ColumnarFormatError("Truncated columnar stream")
+    return data
+
+
+def _read_block(stream: BinaryIO) -> bytes:
+    (size,) = _U32.unpack(_read_exactly(stream, _U32.size))
+    return _read_exactly(stream, size) if size else b""
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def _decode_chunk(types: List[str], payload: bytes) -> List[tuple]:
+    (count,) = _U32.unpack_from(payload)
+    position = _U32.size
+    columns = []
+    for kind in types:
+        has_nulls = payload[position]
+        position += 1
+        nulls = None
+        if has_nulls:
+            nulls = payload[position:position + count]
+            position += count
+
+        if kind == "str":
+            size = (count + 1) * 4
+            offsets = _from_little_endian("I", payload[position:position + size])
+            position += size
+            data = payload[position:position + offsets[-1]]
+            position += offsets[-1]
+            values = [data[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+        else:
+            typecode = _TYPECODES[kind]
+            size = count * array(typecode).itemsize
+            values = _from_little_endian(typecode, payload[position:position + size]).tolist()
+            position += size
+            if kind == "bool":
+                values = [bool(value) for value in values]
+            elif kind == "date":
+                values = [date.fromordinal(value + _EPOCH_ORDINAL) for value in values]
+
+        if nulls is not None:
+            values = [None if null else value for null, value in zip(nulls, values)]
+        columns.append(values)
+    return list(zip(*columns))
+
+
+def read_columnar(stream: BinaryIO) -> Tuple[List[Tuple[str, str]], Iterator[List[tuple]]]:
+    """
+    Read a columnar stream.
+
+    Args:
+        stream: Binary file object positioned at the start of the stream.
+
+    Returns:
+        The `(name, type)` columns, and an iterator over the chunks as lists of
+        row tuples (read lazily from `stream`).
+
+    Raises:
+        ColumnarFormatError: If the stream is not columnar data or is truncated.
+    """
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ColumnarFormatError("Not a columnar stream")
+    schema = json.loads(_read_block(stream))
+    columns = [tuple(column) for column in schema["columns"]]
+    types = [kind for _, kind in columns]
+    compressed = schema.get("compression") == "zlib"
+
+    def chunks() -> Iterator[List[tuple]]:
+        while True:
+            payload = _read_block(stream)
+            if not payload:
+                return
+            yield _decode_chunk(types, zlib.decompress(payload) if compressed else payload)
+
+    return columns, chunks()
@@ -0,0 +1,137 @@
+"""
+Fast JSON rendering for bulk responses.
+
+With a `response_model`, FastAPI validates every returned row against the
+Pydantic schema before encoding it. For thousands of rows that come straight
+from our own prepared queries, that validation is pure overhead. Endpoints
+that list many rows instead return one of the responses below. FastAPI passes
+`Response` objects through untouched, so the `response_model` still documents
+the shape in OpenAPI but is not applied per row.
+
+- `FastJSONResponse`: encodes with orjson (stdlib `json` if it is missing);
+  dates, datetimes and enums are handled natively.
+- `page_response` renders a keyset `Page` as the `PageResponse` envelope.
+- `project_rows` turns NamedTuple rows into dicts with the same keys the
+  response schema would produce; `columnar` keeps the tuples as they are
+  (`{"columns": [...], "rows": [[...], ...]}`), the cheapest layout to encode
+  and to transfer.
+- `NDJSONResponse` / `ndjson_chunks` stream one JSON object per line, for
+  results too large to build in memory.
+
+Only use these for trusted, already-typed data; request input still goes
+through Pydantic.
+"""
+
+import json
+import time
+from datetime import date, datetime
+from enum import Enum
+from functools import partial
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from starlette.responses import Response, StreamingResponse
+
+from app.utils import metrics
+from app.utils.pagination import Page
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows encoded per NDJSON chunk; large enough to amortize the per-chunk send
+NDJSON_ROWS_PER_CHUNK = 1_000
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode `content` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def project_rows(rows: Iterable[Sequence], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Map row tuples to dicts.
+
+    Args:
+        rows: NamedTuple (or plain tuple) rows.
+        fields: Keys, in row order; defaults to the NamedTuple's `_fields`.
+            Pass a prefix of the fields to drop trailing columns.
+    """
+    rows = rows if isinstance(rows, list) else list(rows)
+    if not rows:
+        return []
+    keys = tuple(fields) if fields is not None else rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def columnar(rows: Sequence[Sequence], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Column names plus the rows as arrays, without building a dict per row."""
+    if fields is None:
+        fields = rows[0]._fields if rows else ()
+    # orjson encodes plain tuples natively but rejects tuple subclasses such as NamedTuple rows
+    return {"columns": list(fields), "rows": list(map(tuple, rows))}
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with `dumps`, skipping FastAPI's response validation."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if not metrics.registry.enabled:
+            return dumps(content)
+        started = time.perf_counter()
+        body = dumps(content)
+        metrics.observe_serialization(time.perf_counter() - started)
+        return body
+
+
+def page_response(page: Page, fields: Optional[Sequence[str]] = None) -> FastJSONResponse:
+    """Render a keyset page of rows as a `PageResponse` body."""
+    return FastJSONResponse({"items": project_rows(page.items, fields), "next_cursor": page.next_cursor})
+
+
+def _ndjson_line(content: Any) -> bytes:
+    return dumps(content) + b"\n"
+
+
+def ndjson_chunks(
+    rows: Iterable[Sequence],
+    fields: Optional[Sequence[str]] = None,
+    rows_per_chunk: int = NDJSON_ROWS_PER_CHUNK,
+) -> Iterator[bytes]:
+    """
+    Encode rows as NDJSON, one object per line, in chunks of `rows_per_chunk` lines.
+
+    Rows are consumed lazily, so `rows` may be a streaming database result.
+    """
+    if orjson is not None:
+        line = partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    else:
+        line = _ndjson_line
+    keys = tuple(fields) if fields is not None else None
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, rows_per_chunk))
+        if not batch:
+            return
+        if keys is None:
+            keys = batch[0]._fields
+        yield b"".join([line(dict(zip(keys, row))) for row in batch])
+
+
+class NDJSONResponse(StreamingResponse):
+    """Streaming response of newline-delimited JSON (see `ndjson_chunks`)."""
+    media_type = NDJSON_MEDIA_TYPE
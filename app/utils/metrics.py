@@ -0,0 +1,291 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+`registry` holds a few fixed histograms and counters, filled by the hooks
+below and rendered by `GET /metrics`:
+
+- requests: latency per method, route template and status, and SQL statements
+  per request (`observe_request`, called by the instrumentation middleware);
+- SQL: every statement's duration by operation (`install_query_metrics`, hooked
+  into engines by `build_engine` / `build_async_engine`);
+- upstream HTTP: latency by host and status (`observe_upstream`, called by
+  `BaseAPIClient`);
+- caches: the counters of `cache_metrics()`, read when rendering.
+
+Hooks also add to the `RequestStats` of the request in progress (a context
+variable), so a request's own time can be split into database, upstream and
+serialization time; the middleware reports that split in a `Server-Timing`
+header.
+
+Nothing is recorded until `enable_metrics` is called: the hooks are only
+installed when `registry.enabled` is set, so a disabled process pays one
+attribute check per upstream call and per fast JSON response.
+"""
+
+import ipaddress
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from app.configuration.metrics import MetricsSettings, metrics_settings
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed label set."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in sorted(self._series.items())]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = 'le="' + (bound if bound == "+Inf" else _format_number(bound)) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_number(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}"
+
+
+class Counter:
+    """Monotonic counter with a fixed label set."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labels, labels)} {_format_number(value)}"
+
+
+class RequestStats:
+    """Database, upstream and serialization time spent by one request."""
+    __slots__ = ("queries", "query_seconds", "upstream_requests", "upstream_seconds", "serialize_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.upstream_requests = 0
+        self.upstream_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+    def server_timing(self, total_seconds: float) -> str:
+        """`Server-Timing` header value (durations in milliseconds)."""
+        return (
+            f'db;dur={self.query_seconds * 1000:.2f};desc="{self.queries} queries", '
+            f'upstream;dur={self.upstream_seconds * 1000:.2f};desc="{self.upstream_requests} requests", '
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}, "
+            f"total;dur={total_seconds * 1000:.2f}"
+        )
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being handled in this context, if it is instrumented."""
+    return _request_stats.get()
+
+
+def start_request() -> Tuple[RequestStats, object]:
+    """Attach fresh `RequestStats` to the current context; return them and the reset token."""
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token) -> None:
+    _request_stats.reset(token)
+
+
+class MetricsRegistry:
+    """The metrics of this process."""
+
+    def __init__(self, settings: MetricsSettings = metrics_settings):
+        self.enabled = False
+        self.settings = settings
+        self._build(settings.latency_buckets)
+
+    def _build(self, buckets: Sequence[float]) -> None:
+        self.request_seconds = Histogram(
+            "http_request_duration_seconds", "Time to handle a request, until the last body chunk is sent.",
+            ("method", "route", "status"), buckets,
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries", "SQL statements executed per request.", ("method", "route"), QUERY_COUNT_BUCKETS,
+        )
+        self.request_phase_seconds = Counter(
+            "http_request_phase_seconds_total", "Request time spent on the database, upstream APIs and serialization.",
+            ("method", "route", "phase"),
+        )
+        self.query_seconds = Histogram(
+            "db_query_duration_seconds", "SQL statement execution time.", ("operation",), buckets,
+        )
+        self.upstream_seconds = Histogram(
+            "upstream_request_duration_seconds", "Upstream API latency until the response is available.",
+            ("host", "status"), buckets,
+        )
+        self.histograms: List[Histogram] = [
+            self.request_seconds, self.request_queries, self.query_seconds, self.upstream_seconds
+        ]
+        self.counters: List[Counter] = [self.request_phase_seconds]
+
+    def configure(self, settings: MetricsSettings) -> None:
+        """Apply `settings` and drop everything recorded so far."""
+        self.settings = settings
+        self._build(settings.latency_buckets)
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        self.request_seconds.observe((method, route, str(status)), seconds)
+        self.request_queries.observe((method, route), stats.queries)
+        for phase, phase_seconds in (
+            ("db", stats.query_seconds), ("upstream", stats.upstream_seconds), ("serialize", stats.serialize_seconds)
+        ):
+            if phase_seconds:
+                self.request_phase_seconds.inc((method, route, phase), phase_seconds)
+
+    def render(self) -> str:
+        """All metrics, in the Prometheus text format."""
+        lines: List[str] = []
+        for metric in (*self.histograms, *self.counters):
+            lines.extend(metric.render())
+        lines.extend(_render_cache_metrics())
+        return "\n".join(lines) + "\n"
+
+
+def _render_cache_metrics() -> Iterable[str]:
+    # Imported here: the cache module pulls in FastAPI request handling
+    from app.utils.cache import cache_metrics
+
+    caches = cache_metrics()
+    if not caches:
+        return
+    counters = ("hits", "stale_hits", "misses", "coalesced", "loads", "load_errors", "evictions")
+    for counter in counters:
+        name = f"cache_{counter}_total"
+        yield f"# HELP {name} Cache {counter.replace('_', ' ')} since startup."
+        yield f"# TYPE {name} counter"
+        for cache, values in sorted(caches.items()):
+            yield f"{name}{_format_labels(('cache',), (cache,))} {_format_number(values[counter])}"
+    yield "# HELP cache_entries Entries currently held per cache."
+    yield "# TYPE cache_entries gauge"
+    for cache, values in sorted(caches.items()):
+        yield f"cache_entries{_format_labels(('cache',), (cache,))} {values['entries']}"
+
+
+# Metrics of this process, rendered by GET /metrics
+registry = MetricsRegistry()
+
+
+def is_local_client(host: Optional[str]) -> bool:
+    """Whether a request from `host` comes from this machine (loopback)."""
+    if not host:
+        return False
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+def enable_metrics(settings: MetricsSettings = metrics_settings) -> None:
+    """Start recording (see `app.setup.instrumentation.install_instrumentation`)."""
+    registry.configure(settings)
+    registry.enabled = True
+
+
+def _operation(statement: str) -> str:
+    head = statement[:16].lstrip()
+    return head.split(None, 1)[0].upper() if head else "OTHER"
+
+
+def install_query_metrics(sync_engine) -> None:
+    """Time every statement `sync_engine` executes (no-op unless metrics are enabled)."""
+    if not registry.enabled:
+        return
+    from sqlalchemy import event
+
+    slow_query_seconds = registry.settings.slow_query_seconds
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context._metrics_started
+        registry.query_seconds.observe((_operation(statement),), seconds)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_seconds += seconds
+        if slow_query_seconds is not None and seconds >= slow_query_seconds:
+            logger.warning(f"Slow query ({seconds * 1000:.1f} ms): {statement[:500]}")
+
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+def observe_upstream(host: str, status: Optional[int], seconds: float) -> None:
+    """Record one upstream call; `status` None means it failed without a response."""
+    registry.upstream_seconds.observe((host, "error" if status is None else str(status)), seconds)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.upstream_requests += 1
+        stats.upstream_seconds += seconds
+
+
+def observe_serialization(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.serialize_seconds += seconds
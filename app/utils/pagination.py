@@ -0,0 +1,155 @@
+"""
+Keyset (cursor) pagination.
+
+OFFSET pagination reads and discards every row before the page, so page N
+costs O(N * page size). Keyset pagination instead remembers the sort key of
+the last row served and asks for rows strictly after it:
+
+    WHERE <filters> AND (name, id) > (:last_name, :last_id) ORDER BY name, id LIMIT :limit
+
+With an index holding the filter columns followed by the whole sort key (e.g.
+`ix_cities_district_name` on `(district_id, name, id)` for cities of a district
+by name), SQLite seeks straight to the cursor, so every page costs the same.
+
+The sort key must be unique, so it ends in a tie-breaker such as `id`. The
+cursor handed to clients is the key of the last row, base64url-encoded JSON
+tagged with the listing name, and is opaque to them.
+
+Usage:
+    CITIES_BY_DISTRICT = KeysetQuery(
+        "cities_by_district",
+        select(*CITY_COLUMNS).where(City.district_id == bindparam("district_id")),
+        City.name, City.id,
+    )
+    page = repository.fetch_page(CITIES_BY_DISTRICT, CityRow, cursor, limit=100, district_id=7)
+    page.items, page.next_cursor
+
+Endpoints take `cursor` / `limit` through the `page_params` dependency and
+return `PageResponse[...]`.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, Generic, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import Query
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement, Select
+
+T = TypeVar("T")
+
+# Page size bounds for API listings
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1_000
+
+
+class InvalidCursor(ValueError):
+    """A cursor could not be decoded or belongs to a different listing."""
+
+
+class Page(NamedTuple):
+    """One page of a keyset listing; `next_cursor` is None on the last page."""
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+class PageResponse(BaseModel, Generic[T]):
+    """Response envelope for paginated listings."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class PageParams(NamedTuple):
+    cursor: Optional[str]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> PageParams:
+    """FastAPI dependency for the common pagination query parameters."""
+    return PageParams(cursor, limit)
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class KeysetQuery:
+    """
+    A listing statement paginated by a unique sort key, prepared once.
+
+    Args:
+        name: Listing name embedded in cursors, so a cursor from one listing
+            is rejected by another.
+        statement: Select with the listing's filters (as `bindparam`s). It
+            must select every key column under the column's own name.
+        *key: NOT NULL sort key columns, most significant first, ending in a
+            unique tie-breaker.
+    """
+
+    def __init__(self, name: str, statement: "Select", *key: "ColumnElement"):
+        # Imported here: endpoints import this module at startup for `page_params`
+        from sqlalchemy import bindparam, tuple_
+
+        if not key:
+            raise ValueError("KeysetQuery needs at least one key column")
+        self.name = name
+        self.key = key
+        self.key_names = tuple(column.key for column in key)
+        self._after_names = tuple(f"after_{column_name}" for column_name in self.key_names)
+        self._python_types = tuple(column.type.python_type for column in key)
+
+        limit = bindparam("limit")
+        self.first_page = statement.order_by(*key).limit(limit)
+        after = tuple_(*(bindparam(name, type_=column.type) for name, column in zip(self._after_names, key)))
+        self.next_page = statement.where(tuple_(*key) > after).order_by(*key).limit(limit)
+
+    def encode_cursor(self, row: Any) -> str:
+        """Cursor pointing just after `row` (any object with the key columns as attributes)."""
+        payload = [self.name, *(_to_json(getattr(row, name)) for name in self.key_names)]
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def decode_cursor(self, cursor: str) -> Dict[str, Any]:
+        """Bind parameters for the page after `cursor`."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+        except (binascii.Error, ValueError) as e:
+            raise InvalidCursor("Malformed cursor") from e
+        if not isinstance(payload, list) or len(payload) != len(self.key) + 1 or payload[0] != self.name:
+            raise InvalidCursor(f"Cursor does not belong to listing '{self.name}'")
+
+        params = {}
+        for name, python_type, value in zip(self._after_names, self._python_types, payload[1:]):
+            try:
+                if value is not None and not isinstance(value, python_type):
+                    value = python_type.fromisoformat(value) if python_type in (date, datetime) else python_type(value)
+            except (TypeError, ValueError) as e:
+                raise InvalidCursor("Malformed cursor") from e
+            params[name] = value
+        return params
+
+    def statement_for(self, cursor: Optional[str]) -> Tuple["Select", Dict[str, Any]]:
+        """The statement and cursor parameters for the page after `cursor` (first page if None)."""
+        if cursor is None:
+            return self.first_page, {}
+        return self.next_page, self.decode_cursor(cursor)
+
+    def page(self, rows: Sequence[Any], limit: int) -> Page:
+        """Build a page from up to `limit + 1` fetched rows (the extra row flags a next page)."""
+        if len(rows) > limit:
+            items = list(rows[:limit])
+            return Page(items, self.encode_cursor(items[-1]))
+        return Page(list(rows), None)
@@ -0,0 +1,153 @@
+"""
+On-demand sampling profiler for single requests.
+
+`SamplingProfiler` runs a background thread that reads the Python stack of
+every other thread each `interval` seconds (`sys._current_frames`) and counts
+identical stacks. The profiled code is not traced, so it runs at full speed;
+only the sampler thread costs CPU, and only while a profile is being taken.
+
+Threads that are idle (waiting on a lock, a queue or the event loop selector)
+are skipped, so a profile shows where the process was busy: the request's own
+handler, the thread-pool worker running a sync endpoint, and anything else
+running concurrently at the time.
+
+Profiles are kept in `profile_store` and exported in the collapsed-stack format
+("frame;frame;frame count" per line) read by flamegraph.pl and speedscope.
+"""
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+# Innermost frames in these stdlib files mean the thread is blocked, not working
+_IDLE_FILES = tuple(os.sep + name for name in ("threading.py", "selectors.py", "queue.py"))
+
+MAX_STACK_DEPTH = 128
+
+
+class Profile(NamedTuple):
+    id: int
+    method: str
+    path: str
+    route: str
+    status: int
+    seconds: float
+    samples: int
+    stacks: Dict[str, int]
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format, most frequent first."""
+        lines = [f"{stack} {count}" for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1])]
+        return "\n".join(lines) + "\n"
+
+    def top_functions(self, limit: int = 10) -> List[Dict[str, object]]:
+        """Functions by self samples (innermost frame), with their share of all busy-thread samples."""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = max(sum(leaves.values()), 1)
+        return [
+            {"function": function, "samples": count, "share": round(count / total, 4)}
+            for function, count in leaves.most_common(limit)
+        ]
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "seconds": round(self.seconds, 6),
+            "samples": self.samples,
+            "top_functions": self.top_functions(),
+        }
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}".replace(";", ":")
+
+
+def _is_idle(frame) -> bool:
+    return frame.f_code.co_filename.endswith(_IDLE_FILES)
+
+
+class SamplingProfiler:
+    """
+    Sample the stacks of all busy threads until `stop` is called.
+
+    Args:
+        interval: Seconds between samples.
+        max_seconds: Stop sampling after this long even if `stop` is not called.
+    """
+
+    def __init__(self, interval: float = 0.005, max_seconds: float = 30.0):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._started = 0.0
+
+    def start(self) -> "SamplingProfiler":
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> float:
+        """Stop sampling; return the seconds profiled."""
+        self._stopped.set()
+        self._thread.join()
+        return time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        deadline = self._started + self.max_seconds
+        while not self._stopped.wait(self.interval) and time.perf_counter() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or _is_idle(frame):
+                    continue
+                names = []
+                while frame is not None and len(names) < MAX_STACK_DEPTH:
+                    names.append(_frame_name(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+
+class ProfileStore:
+    """The most recent profiles, by id."""
+
+    def __init__(self, capacity: int = 20):
+        self._profiles: Deque[Profile] = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def resize(self, capacity: int) -> None:
+        with self._lock:
+            self._profiles = deque(self._profiles, maxlen=capacity)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile.id == profile_id), None)
+
+    def list(self) -> List[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+
+# Profiles captured in this process, served by /metrics/profiles
+profile_store = ProfileStore()
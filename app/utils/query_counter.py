@@ -0,0 +1,58 @@
+"""
+Count the SQL statements executed while a block of code runs.
+
+Used to catch N+1 query patterns: wrap a call (or a test client request) and
+assert an upper bound on the number of round trips it makes.
+
+Usage:
+    with QueryCounter(max_queries=4) as queries:
+        client.get("/regions/states/1/tree")
+    print(queries.count, queries.statements)
+
+Leaving the block with more than `max_queries` statements raises
+`QueryBudgetExceeded`, listing the statements that ran.
+"""
+
+from typing import List, Optional, Union
+
+from sqlalchemy import Engine, event
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More statements were executed than the block allowed."""
+
+
+class QueryCounter:
+    """
+    Context manager recording every statement sent to the database.
+
+    Args:
+        max_queries: Upper bound checked on exit; None only counts.
+        engine: Engine to watch. Defaults to every `Engine`, which also covers
+            the sync engine behind an `AsyncEngine`.
+    """
+
+    def __init__(self, max_queries: Optional[int] = None, engine: Optional[Engine] = None):
+        self.max_queries = max_queries
+        self.target: Union[Engine, type] = engine if engine is not None else Engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, connection, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        event.listen(self.target, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        event.remove(self.target, "before_cursor_execute", self._record)
+        if exc_type is None and self.max_queries is not None and self.count > self.max_queries:
+            listing = "\n".join(f"  {i}. {statement}" for i, statement in enumerate(self.statements, 1))
+            raise QueryBudgetExceeded(
+                f"{self.count} queries executed, at most {self.max_queries} allowed:\n{listing}"
+            )
@@ -0,0 +1,93 @@
+"""
+Benchmark: streaming CSV ingestion vs. `parse_csv`.
+
+Generates a synthetic mandi price file and parses it both ways, each in a fresh
+subprocess so peak RSS is measured independently.
+
+Usage:
+    python benchmarks/bench_csv_parser.py --rows 5000000
+"""
+
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+HEADER = "State,District,Market,Commodity,Variety,Grade,Arrival_Date,Min_x0020_Price,Max_x0020_Price,Modal_x0020_Price\n"
+STATES = ["Maharashtra", "Karnataka", "Uttar Pradesh", "Punjab", "Gujarat", "Tamil Nadu"]
+COMMODITIES = ["Onion", "Potato", "Tomato", "Wheat", "Paddy(Dhan)(Common)", "Cotton"]
+
+
+def generate(path: Path, rows: int) -> None:
+    rng = random.Random(42)
+    with open(path, "w", newline="") as file:
+        file.write(HEADER)
+        lines = []
+        for i in range(rows):
+            low = rng.randint(500, 4000)
+            lines.append(
+                f"{rng.choice(STATES)},District {i % 700},Market {i % 3000},{rng.choice(COMMODITIES)},"
+                f"Other,FAQ,{1 + i % 28:02d}/{1 + i % 12:02d}/2024,{low},{low + 800},{low + 350}\n"
+            )
+            if len(lines) == 100_000:
+                file.writelines(lines)
+                lines.clear()
+        file.writelines(lines)
+
+
+def run_legacy(path: Path) -> int:
+    from app.helpers.csv_parser import parse_csv
+
+    return len(parse_csv(path.read_bytes().decode("utf-8")))
+
+
+def run_streaming(path: Path) -> int:
+    from app.helpers.csv_parser import CsvColumn, date_converter, iter_csv_file
+
+    schema = [
+        CsvColumn("state", source="State"),
+        CsvColumn("district", source="District"),
+        CsvColumn("market", source="Market"),
+        CsvColumn("commodity", source="Commodity"),
+        CsvColumn("arrival_date", date_converter(), source="Arrival_Date"),
+        CsvColumn("min_price", float, source="Min_x0020_Price"),
+        CsvColumn("max_price", float, source="Max_x0020_Price"),
+        CsvColumn("modal_price", float, source="Modal_x0020_Price"),
+    ]
+    return sum(len(batch) for batch in iter_csv_file(path, schema, batch_size=50_000))
+
+
+def measure(mode: str, path: Path) -> None:
+    started = time.perf_counter()
+    rows = run_legacy(path) if mode == "legacy" else run_streaming(path)
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<10} rows={rows:>10,} time={elapsed:7.2f}s rows/s={rows / elapsed:>12,.0f} peak_rss={peak_mb:8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--file", type=Path, default=Path("/tmp/agridatahub_bench_prices.csv"))
+    parser.add_argument("--mode", choices=["legacy", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        measure(args.mode, args.file)
+        return
+
+    if not args.file.exists():
+        print(f"Generating {args.rows:,} rows at {args.file} ...")
+        generate(args.file, args.rows)
+    print(f"File size: {args.file.stat().st_size / 2**20:.1f} MiB")
+    for mode in ("streaming", "legacy"):
+        subprocess.run([sys.executable, __file__, "--mode", mode, "--file", str(args.file)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Load test: sync `Session` vs. `AsyncSession` for a region lookup endpoint.
+
+Seeds a temporary SQLite database, serves two equivalent routes with a local
+uvicorn worker and hammers each with concurrent httpx requests, reporting req/s
+and p50/p99/p99.9 latency.
+
+Usage:
+    python benchmarks/bench_db_sessions.py --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+DB_FILE = Path(tempfile.gettempdir()) / "agridatahub_bench_sessions.db"
+os.environ.setdefault("DB_DATABASE_URL", f"sqlite:///{DB_FILE}")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.configuration.database import engine, get_async_database_session, get_database_session  # noqa: E402
+from app.models.region import Base, District, State, StateType  # noqa: E402
+
+PORT = 8765
+DISTRICTS = 5000
+
+app = FastAPI()
+
+
+def lookup_statement(district_id: int):
+    return (
+        select(District.id, District.name, State.name.label("state"))
+        .join(State, State.id == District.state_id)
+        .where(District.id == district_id)
+    )
+
+
+@app.get("/sync/districts/{district_id}")
+def sync_lookup(district_id: int, db: Session = Depends(get_database_session)):
+    row = db.execute(lookup_statement(district_id)).one()
+    return {"id": row.id, "name": row.name, "state": row.state}
+
+
+@app.get("/async/districts/{district_id}")
+async def async_lookup(district_id: int, db: AsyncSession = Depends(get_async_database_session)):
+    row = (await db.execute(lookup_statement(district_id))).one()
+    return {"id": row.id, "name": row.name, "state": row.state}
+
+
+def seed() -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(1, 37)
+        ])
+        connection.execute(insert(District), [
+            {"id": i, "name": f"District {i}", "state_id": 1 + i % 36} for i in range(1, DISTRICTS + 1)
+        ])
+
+
+async def load(prefix: str, total: int, concurrency: int) -> None:
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits) as client:
+        async def one(i: int) -> None:
+            async with gate:
+                started = time.perf_counter()
+                response = await client.get(f"/{prefix}/districts/{1 + i % DISTRICTS}")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(one(i) for i in range(200)))  # warm-up
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    q = statistics.quantiles(latencies, n=1000)
+    print(
+        f"{prefix:<6} req/s={total / elapsed:>8,.0f} p50={q[499] * 1000:7.2f}ms "
+        f"p99={q[989] * 1000:7.2f}ms p99.9={q[998] * 1000:7.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    seed()
+    server = uvicorn.Server(uvicorn.Config(app, port=PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        for prefix in ("sync", "async"):
+            asyncio.run(load(prefix, args.requests, args.concurrency))
+    finally:
+        server.should_exit = True
+        thread.join()
+        DB_FILE.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Benchmark: streaming bulk export throughput and memory.
+
+Seeds `--cities` cities and a year of daily prices (`--commodities` x
+`--markets` per day), then runs `manage_db.py export` in a subprocess for
+each dataset and format and reports wall time, rows/s, output MB/s and the
+child's peak RSS.
+
+For reference it also reports:
+
+- the raw read: the same query iterated on a bare sqlite3 cursor, with no
+  encoding or output (the floor for any export);
+- a naive export that fetches every row and dumps one JSON document, whose
+  memory grows with the table.
+
+Streaming exports should keep peak RSS flat from a filtered slice to the
+whole table.
+
+Usage:
+    python benchmarks/bench_export.py --cities 600000 --commodities 20 --markets 150
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.configuration.database import DatabaseSettings, build_engine  # noqa: E402
+from app.models.price import Commodity  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+from app.repositories.price import MandiPriceRepository  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+STATES, DISTRICTS = 36, 720
+
+# Runs a script and reports its own peak RSS (VmHWM) on stderr. The child's
+# ru_maxrss would include the parent's RSS at fork time.
+PEAK_RSS = """
+import atexit, runpy, sys
+
+def report():
+    for line in open("/proc/self/status"):
+        if line.startswith("VmHWM:"):
+            sys.stderr.write("peak-rss-kb " + line.split()[1] + "\\n")
+
+atexit.register(report)
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+NAIVE_EXPORT = """
+import json, sqlite3, sys
+rows = sqlite3.connect(sys.argv[1]).execute(sys.argv[2]).fetchall()
+open(sys.argv[3], "w").write(json.dumps(rows))
+"""
+
+RAW_READ = """
+import sqlite3, sys
+for _ in sqlite3.connect(sys.argv[1]).execute(sys.argv[2]):
+    pass
+"""
+
+
+def seed(engine, cities: int, commodities: int, markets: int) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        connection = session.connection()
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(1, STATES + 1)])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": 1 + d % STATES} for d in range(1, DISTRICTS + 1)])
+        for start in range(1, cities + 1, 100_000):
+            connection.execute(insert(City), [
+                {"id": i, "name": f"Village {i}", "district_id": 1 + i % DISTRICTS,
+                 "state_id": 1 + (1 + i % DISTRICTS) % STATES, "lat": 8 + (i % 2_900) / 100, "lng": 68 + (i % 2_900) / 100}
+                for i in range(start, min(start + 100_000, cities + 1))])
+        connection.execute(insert(Commodity), [{"id": c, "name": f"Commodity {c}"} for c in range(1, commodities + 1)])
+        repository = MandiPriceRepository(session)
+        for day in range(365):
+            price_date = date(2024, 1, 1) + timedelta(days=day)
+            repository.upsert_prices([
+                (commodity, 1 + market % DISTRICTS, price_date, market, "", 900.0, 1100.0, 1000.0 + day)
+                for commodity in range(1, commodities + 1) for market in range(1, markets + 1)
+            ])
+        session.commit()
+
+
+def run_child(script: Path, arguments, env) -> tuple:
+    """Run a Python script; return (seconds, peak RSS in MB)."""
+    started = time.perf_counter()
+    process = subprocess.run([sys.executable, "-c", PEAK_RSS, str(script), *map(str, arguments)],
+                             env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - started
+    if process.returncode != 0:
+        raise RuntimeError(f"{script.name} {' '.join(map(str, arguments))} failed: {process.stderr}")
+    peak_kb = next(int(line.split()[1]) for line in process.stderr.splitlines() if line.startswith("peak-rss-kb"))
+    return elapsed, peak_kb / 1024
+
+
+def report(label: str, rows: int, elapsed: float, rss_mb: float, output: Path = None) -> None:
+    size = f"{output.stat().st_size / 1e6:>8.1f} MB {output.stat().st_size / 1e6 / elapsed:>7.1f} MB/s" if output else " " * 28
+    print(f"  {label:<34} {rows:>10,} {elapsed:>7.2f} s {rows / elapsed:>11,.0f} rows/s {size} {rss_mb:>7.0f} MB RSS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, default=600_000)
+    parser.add_argument("--commodities", type=int, default=20)
+    parser.add_argument("--markets", type=int, default=150)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp())
+    database = workdir / "export.db"
+    seed(build_engine(DatabaseSettings(database_url=f"sqlite:///{database}")), args.cities, args.commodities, args.markets)
+    # Memory-mapped pages of the database file would count towards RSS; measure the process heap
+    env = {**os.environ, "DB_DATABASE_URL": f"sqlite:///{database}", "DB_SQLITE_MMAP_SIZE": "0"}
+    raw_read, naive_export = workdir / "raw_read.py", workdir / "naive_export.py"
+    raw_read.write_text(RAW_READ)
+    naive_export.write_text(NAIVE_EXPORT)
+    manage_db = ROOT / "manage_db.py"
+    prices = 365 * args.commodities * args.markets
+    queries = {
+        "cities": ("SELECT id, name, district_id, subdistrict_id, state_id, lat, lng FROM cities ORDER BY id", args.cities),
+        "prices": ("SELECT * FROM mandi_prices ORDER BY commodity_id, district_id, price_date, market_id, variety", prices),
+    }
+
+    print(f"{'':<36} {'rows':>10} {'time':>9} {'throughput':>18} {'output':>11} {'rate':>12} {'peak':>14}")
+    for dataset, (query, rows) in queries.items():
+        print(f"{dataset}:")
+        elapsed, rss = run_child(raw_read, [database, query], env)
+        report("raw sqlite3 read (no output)", rows, elapsed, rss)
+        output = workdir / f"{dataset}.naive.json"
+        elapsed, rss = run_child(naive_export, [database, query, output], env)
+        report("naive fetchall + json.dumps", rows, elapsed, rss, output)
+        for export_format in ("ndjson", "csv", "columnar"):
+            output = workdir / f"{dataset}.{export_format}"
+            elapsed, rss = run_child(manage_db, ["export", dataset, "--format", export_format, "-o", output], env)
+            report(f"export --format {export_format}", rows, elapsed, rss, output)
+
+    print("Peak RSS by export size (ndjson):")
+    for label, extra, rows in (
+        ("cities of one state", ["cities", "--state-id", "1"], args.cities // STATES),
+        ("all cities", ["cities"], args.cities),
+        ("one month of prices", ["prices", "--start-date", "2024-01-01", "--end-date", "2024-01-31"],
+         31 * args.commodities * args.markets),
+        ("a year of prices", ["prices"], prices),
+    ):
+        output = workdir / "slice.ndjson"
+        elapsed, rss = run_child(manage_db, ["export", *extra, "-o", output], env)
+        report(label, rows, elapsed, rss, output)
+
+
+if __name__ == "__main__":
+    main()
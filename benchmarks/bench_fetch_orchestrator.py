@@ -0,0 +1,120 @@
+"""
+Benchmark: 5,000-URL refresh through `FetchOrchestrator` vs. sequential `fetch_csv`.
+
+A local stub server answers every URL after `--latency-ms` (plus jitter).
+`--error-rate` of responses are transient 503s and `--stall-rate` of requests
+hang past the client read timeout. URLs alternate between the `127.0.0.1` and
+`localhost` host names, so the per-host report shows two hosts.
+
+The headline number is the total wall-clock time of the orchestrated refresh.
+The sequential baseline runs `--sequential-sample` URLs and is extrapolated.
+Client and stub share one process, so on few cores the run becomes CPU-bound
+(httpcore's pool bookkeeping grows with the connection count); raise
+`--concurrency` / `--per-host` only when cores are available.
+
+Usage:
+    python benchmarks/bench_fetch_orchestrator.py --urls 5000 --concurrency 32 --per-host 16
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.configuration.http_client import HttpClientSettings  # noqa: E402
+from app.dal.api_clients.base_api_client import BaseAPIClient  # noqa: E402
+from app.dal.api_clients.fetch_orchestrator import FetchOrchestrator, RetryPolicy  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+BODY = ("State,District,Market,Commodity,Variety,Arrival_Date,Modal_x0020_Price\n"
+        + "Maharashtra,Nashik,Lasalgaon,Onion,Red,17/10/2024,2150\n" * 50).encode()
+
+
+def make_handler(args):
+    rng = random.Random(5)
+
+    async def handler(method, path, headers):
+        roll = rng.random()
+        if roll < args.stall_rate:
+            await asyncio.sleep(args.read_timeout * 3)
+        await asyncio.sleep(args.latency_ms / 1000 * rng.uniform(0.5, 1.5))
+        if roll < args.stall_rate + args.error_rate:
+            return 503, {"Content-Type": "text/plain"}, b"busy"
+        return 200, {"Content-Type": "text/csv"}, BODY
+
+    return handler
+
+
+def build_urls(port: int, count: int) -> list:
+    hosts = [f"http://127.0.0.1:{port}", f"http://localhost:{port}"]
+    return [f"{hosts[i % 2]}/prices/state-{i % 36}/commodity-{i}.csv" for i in range(count)]
+
+
+async def run(args) -> None:
+    async with StubServer(make_handler(args), host="0.0.0.0") as server:
+        await BaseAPIClient.startup(HttpClientSettings(
+            max_connections=args.concurrency,
+            max_keepalive_connections=args.concurrency,
+            per_host_concurrency=args.per_host,
+            read_timeout=args.read_timeout,
+        ))
+        urls = build_urls(server.port, args.urls)
+
+        sample = urls[: args.sequential_sample]
+        failures = 0
+        started = time.perf_counter()
+        for url in sample:
+            try:
+                await BaseAPIClient.fetch_csv(url)
+            except Exception:
+                failures += 1
+        per_url = (time.perf_counter() - started) / len(sample)
+        print(f"Sequential fetch_csv: {per_url * 1000:.1f} ms/url, {failures}/{len(sample)} failed "
+              f"-> ~{per_url * len(urls):,.0f}s for {len(urls):,} urls")
+
+        orchestrator = FetchOrchestrator(
+            concurrency=args.concurrency,
+            rate_per_second=args.rate or None,
+            retry=RetryPolicy(max_attempts=args.attempts, base_delay=0.1, max_delay=2.0),
+        )
+        started = time.perf_counter()
+        first_result = None
+        ok = attempts = 0
+        async for result in orchestrator.fetch_all(urls):
+            if first_result is None:
+                first_result = time.perf_counter() - started
+            ok += result.ok
+            attempts += result.attempts
+        elapsed = time.perf_counter() - started
+        print(f"FetchOrchestrator:    {elapsed:.2f}s wall for {len(urls):,} urls "
+              f"({len(urls) / elapsed:,.0f} urls/s), first result after {first_result * 1000:.0f} ms")
+        print(f"  succeeded {ok:,}/{len(urls):,}, {attempts - len(urls):,} retries")
+        print(f"  {server.connections:,} TCP connections accepted for {server.requests:,} requests")
+        print(json.dumps(orchestrator.host_report(), indent=2))
+        await BaseAPIClient.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--per-host", type=int, default=16, help="Per-host concurrency of the client")
+    parser.add_argument("--rate", type=float, default=0, help="Per-host requests/second (0 = unlimited)")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--stall-rate", type=float, default=0.005)
+    parser.add_argument("--read-timeout", type=float, default=1.0)
+    parser.add_argument("--attempts", type=int, default=4)
+    parser.add_argument("--sequential-sample", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: per-call `httpx.AsyncClient` vs. the pooled `BaseAPIClient` transport.
+
+Fans out requests against a local stub server and reports TCP connections
+(handshakes) per request and p50/p99 latency for both strategies.
+
+Usage:
+    python benchmarks/bench_http_transport.py --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.configuration.http_client import HttpClientSettings  # noqa: E402
+from app.dal.api_clients.base_api_client import BaseAPIClient  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+BODY = b"State,District,Market,Commodity,Modal_x0020_Price\n" + b"Maharashtra,Nashik,Lasalgaon,Onion,1800\n" * 50
+
+
+async def handler(method, path, headers):
+    await asyncio.sleep(0.002)
+    return 200, {"Content-Type": "text/csv"}, BODY
+
+
+async def legacy_fetch_csv(url: str) -> str:
+    # The pre-pooling implementation: a fresh client (and connection) per call
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.text
+
+
+async def run(name, fetch, server, total, concurrency):
+    server.connections = 0
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with gate:
+            started = time.perf_counter()
+            await fetch(f"{server.url}/prices/{i % 500}")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<8} req/s={total / elapsed:>8,.0f} handshakes/req={server.connections / total:6.3f} "
+        f"p50={quantiles[49] * 1000:7.2f}ms p99={quantiles[98] * 1000:7.2f}ms"
+    )
+
+
+async def main(args):
+    async with StubServer(handler) as server:
+        await run("legacy", legacy_fetch_csv, server, args.requests, args.concurrency)
+        await BaseAPIClient.startup(HttpClientSettings(per_host_concurrency=args.concurrency))
+        try:
+            await run("pooled", BaseAPIClient.fetch_csv, server, args.requests, args.concurrency)
+        finally:
+            await BaseAPIClient.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,167 @@
+"""
+Harness: incremental mandi price sync against a stub server with evolving snapshots.
+
+The stub server publishes a mandi price CSV of `--rows` rows under an ETag and
+answers `If-None-Match` with 304. Each round it can publish a new snapshot in
+which `--change-pct` percent of prices moved and a few rows were added or
+dropped; `--no-etag` makes it behave like a server without validators. The
+harness syncs with `mandi_price_sync`, checks that `mandi_prices` matches the
+published snapshot after every round and prints bytes, changed rows and time.
+
+Usage:
+    python benchmarks/bench_incremental_sync.py --rows 200000 --rounds 3 --change-pct 1
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+DB_FILE = Path(tempfile.gettempdir()) / "agridatahub_bench_sync.db"
+os.environ.setdefault("DB_DATABASE_URL", f"sqlite:///{DB_FILE}")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app.configuration.database import SessionLocal, engine  # noqa: E402
+from app.dal.api_clients.base_api_client import BaseAPIClient  # noqa: E402
+from app.models.price import Commodity, MandiPrice  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+from app.services.price.mandi_price_sync import mandi_price_sync  # noqa: E402
+from app.services.region import PlaceNameResolver, RegionIndex  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+HEADER = "State,District,Market,Commodity,Variety,Arrival_Date,Min_x0020_Price,Max_x0020_Price,Modal_x0020_Price\n"
+DISTRICTS, MARKETS_PER_DISTRICT = 36, 10
+COMMODITIES = ["Onion", "Potato", "Tomato", "Wheat", "Paddy", "Maize", "Gram", "Tur", "Garlic", "Banana"]
+
+
+def seed() -> None:
+    DB_FILE.unlink(missing_ok=True)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(State), [{"id": 1, "name": "Maharashtra", "type": StateType.STATE}])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": 1} for d in range(1, DISTRICTS + 1)])
+        connection.execute(insert(City), [
+            {"id": (d - 1) * MARKETS_PER_DISTRICT + m, "name": f"Mandi {(d - 1) * MARKETS_PER_DISTRICT + m}",
+             "district_id": d, "state_id": 1}
+            for d in range(1, DISTRICTS + 1) for m in range(1, MARKETS_PER_DISTRICT + 1)])
+
+
+class Feed:
+    """Evolving snapshot: key -> modal price, keyed by (market, commodity, day)."""
+
+    def __init__(self, rows: int, use_etag: bool):
+        self.rng = random.Random(12)
+        self.use_etag = use_etag
+        self.version = 1
+        self.next_day = 0
+        self.prices = {}
+        markets = DISTRICTS * MARKETS_PER_DISTRICT
+        while len(self.prices) < rows:
+            for market in range(1, markets + 1):
+                for commodity in COMMODITIES:
+                    self.prices[(market, commodity, self.next_day)] = self._price()
+                    if len(self.prices) == rows:
+                        break
+                if len(self.prices) == rows:
+                    break
+            self.next_day += 1
+        self.body = self._render()
+
+    def _price(self) -> float:
+        return float(self.rng.randrange(800, 6000))
+
+    def _render(self) -> bytes:
+        lines = [HEADER]
+        for (market, commodity, day), modal in self.prices.items():
+            district = (market - 1) // MARKETS_PER_DISTRICT + 1
+            arrival = (date(2024, 1, 1) + timedelta(days=day)).strftime("%d/%m/%Y")
+            lines.append(f"Maharashtra,District {district},Mandi {market},{commodity},Other,{arrival},"
+                         f"{modal - 100},{modal + 100},{modal}\n")
+        return "".join(lines).encode()
+
+    def evolve(self, change_pct: float) -> None:
+        keys = list(self.prices)
+        for key in self.rng.sample(keys, int(len(keys) * change_pct / 100)):
+            self.prices[key] = self._price()
+        for key in keys[:10]:
+            del self.prices[key]
+        for market in range(1, 11):
+            self.prices[(market, "Onion", self.next_day)] = self._price()
+        self.next_day += 1
+        self.version += 1
+        self.body = self._render()
+
+    async def handler(self, method, path, headers):
+        etag = f'"v{self.version}"'
+        if self.use_etag and headers.get("if-none-match") == etag:
+            return 304, {"ETag": etag}, b""
+        response_headers = {"Content-Type": "text/csv"}
+        if self.use_etag:
+            response_headers["ETag"] = etag
+        return 200, response_headers, self.body
+
+
+def verify(feed: Feed) -> bool:
+    """Every published price is stored; history of dropped rows is kept."""
+    with SessionLocal() as session:
+        stored = {
+            (market, commodity, (price_date - date(2024, 1, 1)).days): modal
+            for market, commodity, price_date, modal in session.execute(
+                select(MandiPrice.market_id, Commodity.name, MandiPrice.price_date, MandiPrice.modal_price)
+                .join(Commodity, Commodity.id == MandiPrice.commodity_id)
+            )
+        }
+    return all(stored.get(key) == modal for key, modal in feed.prices.items())
+
+
+async def run(args) -> None:
+    seed()
+    with SessionLocal() as session:
+        resolver = PlaceNameResolver.from_session(session, RegionIndex.load(session))
+    feed = Feed(args.rows, use_etag=not args.no_etag)
+
+    async with StubServer(feed.handler) as server:
+        sync = mandi_price_sync(f"{server.url}/prices.csv", resolver=resolver)
+
+        def report(label, result, elapsed):
+            with SessionLocal() as session:
+                stored = session.scalar(select(func.count()).select_from(MandiPrice))
+            print(f"  {label:<22} {result.status.value:<13} {result.bytes_received:>12,} B "
+                  f"{result.rows_changed:>9,}/{result.rows_seen:<9,} changed {result.rows_removed:>4} removed "
+                  f"{elapsed:7.2f}s  stored={stored:,}  verified={verify(feed)}")
+
+        started = time.perf_counter()
+        report("initial load", await sync.run(), time.perf_counter() - started)
+        for round_number in range(1, args.rounds + 1):
+            started = time.perf_counter()
+            report(f"round {round_number}: unchanged", await sync.run(), time.perf_counter() - started)
+            feed.evolve(args.change_pct)
+            started = time.perf_counter()
+            report(f"round {round_number}: evolved", await sync.run(), time.perf_counter() - started)
+
+    await BaseAPIClient.shutdown()
+    engine.dispose()
+    DB_FILE.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--change-pct", type=float, default=1.0)
+    parser.add_argument("--no-etag", action="store_true", help="Serve snapshots without validators")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
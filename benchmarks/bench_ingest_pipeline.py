@@ -0,0 +1,162 @@
+"""
+Benchmark: `manage_db.py ingest` throughput by number of worker processes.
+
+Seeds a region hierarchy (`--states` states x `--districts` districts x
+`--markets` mandis each) and writes a mandi price CSV in the upstream feed
+format: `--rows` rows over 10 commodities, with place names in varying case and
+spacing, and ~1% of rows naming unknown mandis (these are skipped).
+
+Each `--workers` setting loads the file into a fresh copy of the seeded
+database in a subprocess; the script prints wall time, rows/sec, speedup over
+`--workers 0` (everything in one process) and the per-stage report of the run,
+and checks the number of stored rows. Speedup is bounded by the CPU count and
+by the single writer: once "writer waiting" approaches zero, more workers only
+add contention.
+
+Usage:
+    python benchmarks/bench_ingest_pipeline.py --rows 2000000 --workers 0,1,2,4,8
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.configuration.database import DatabaseSettings, build_engine  # noqa: E402
+from app.models import Base, City, District, State, StateType  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+HEADER = "State,District,Market,Commodity,Variety,Arrival_Date,Min_x0020_Price,Max_x0020_Price,Modal_x0020_Price\n"
+COMMODITIES = ["Onion", "Potato", "Tomato", "Wheat", "Paddy", "Maize", "Gram", "Tur", "Garlic", "Banana"]
+STATE_NAMES = ["Maharashtra", "Karnataka", "Gujarat", "Rajasthan", "Punjab", "Bihar", "Kerala", "Odisha",
+               "Haryana", "Assam", "Telangana", "Tamil Nadu", "Uttar Pradesh", "West Bengal", "Madhya Pradesh"]
+SYLLABLES = ["ka", "ra", "pur", "na", "ga", "bad", "li", "ko", "ta", "ser", "man", "di", "vi", "hal", "wa", "jan"]
+
+
+def place_name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def seed(database: Path, states: int, districts: int, markets: int):
+    """Create the region hierarchy; return (state, district, mandi) names of every market."""
+    rng = random.Random(5)
+    engine = build_engine(DatabaseSettings(database_url=f"sqlite:///{database}"))
+    Base.metadata.create_all(engine)
+    places, state_rows, district_rows, city_rows = [], [], [], []
+    for s in range(1, states + 1):
+        state = STATE_NAMES[(s - 1) % len(STATE_NAMES)] + ("" if s <= len(STATE_NAMES) else f" {s}")
+        state_rows.append({"id": s, "name": state, "type": StateType.STATE})
+        used_districts = set()
+        for d in range(districts):
+            district_id = (s - 1) * districts + d + 1
+            district = place_name(rng)
+            while district in used_districts:
+                district = place_name(rng)
+            used_districts.add(district)
+            district_rows.append({"id": district_id, "name": district, "state_id": s})
+            used_markets = set()
+            for m in range(markets):
+                market = place_name(rng) + " Mandi"
+                while market in used_markets:
+                    market = place_name(rng) + " Mandi"
+                used_markets.add(market)
+                city_rows.append({"id": len(city_rows) + 1, "name": market, "district_id": district_id, "state_id": s})
+                places.append((state, district, market))
+    with engine.begin() as connection:
+        connection.execute(insert(State), state_rows)
+        connection.execute(insert(District), district_rows)
+        connection.execute(insert(City), city_rows)
+    engine.dispose()
+    return places
+
+
+def spelling(rng: random.Random, name: str) -> str:
+    variant = rng.random()
+    if variant < 0.2:
+        return name.upper()
+    if variant < 0.3:
+        return f" {name.lower()} "
+    return name
+
+
+def write_csv(path: Path, places, rows: int) -> int:
+    """Write the feed CSV; return the number of rows that name a known mandi."""
+    rng = random.Random(9)
+    known = 0
+    first_day = date(2023, 1, 1)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(HEADER)
+        written, day = 0, 0
+        while written < rows:
+            arrival = (first_day + timedelta(days=day)).strftime("%d/%m/%Y")
+            for state, district, market in places:
+                for commodity in COMMODITIES:
+                    if written == rows:
+                        break
+                    unknown = rng.random() < 0.01
+                    known += not unknown
+                    modal = rng.randrange(800, 6000)
+                    file.write(
+                        f"{spelling(rng, state)},{spelling(rng, district)},"
+                        f"{'Nowhere Market ' + str(written) if unknown else spelling(rng, market)},"
+                        f"{commodity},Other,{arrival},{modal - 100},{modal + 100},{modal}\n"
+                    )
+                    written += 1
+            day += 1
+    return known
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--states", type=int, default=15)
+    parser.add_argument("--districts", type=int, default=20)
+    parser.add_argument("--markets", type=int, default=10)
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({0, 1, 2, 4, os.cpu_count() or 1})),
+                        help="Comma-separated worker counts to compare")
+    parser.add_argument("--shard-size-mb", type=float, default=4)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp())
+    template, csv_path = workdir / "template.db", workdir / "prices.csv"
+    places = seed(template, args.states, args.districts, args.markets)
+    known = write_csv(csv_path, places, args.rows)
+    print(f"{args.rows:,} rows ({csv_path.stat().st_size / 1e6:.0f} MB) over {len(places):,} mandis; "
+          f"{os.cpu_count()} CPU(s)")
+
+    baseline = None
+    for workers in (int(value) for value in args.workers.split(",")):
+        database = workdir / f"ingest_{workers}.db"
+        shutil.copy(template, database)
+        env = {**os.environ, "DB_DATABASE_URL": f"sqlite:///{database}"}
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, str(ROOT / "manage_db.py"), "ingest", str(csv_path), "--workers", str(workers),
+             "--shard-size-mb", str(args.shard_size_mb), "--no-rollups"],
+            env=env, capture_output=True, text=True,
+        )
+        elapsed = time.perf_counter() - started
+        if process.returncode != 0:
+            raise RuntimeError(f"ingest --workers {workers} failed:\n{process.stdout}{process.stderr}")
+        stored = sqlite3.connect(database).execute("SELECT count(*) FROM mandi_prices").fetchone()[0]
+        baseline = baseline or elapsed
+        print(f"\n--workers {workers}: {elapsed:.1f} s wall, {args.rows / elapsed:,.0f} rows/sec, "
+              f"{baseline / elapsed:.2f}x; {stored:,} rows stored ({'ok' if stored == known else f'expected {known:,}'})")
+        report = process.stdout[process.stdout.index("Stage"):].splitlines()
+        print("\n".join(f"    {line}" for line in report if not line.startswith("✅")))
+        database.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark: request overhead of the instrumentation (`METRICS_ENABLED`).
+
+Seeds `--states` states with `--districts` districts each and sends `--requests`
+sequential requests per endpoint through the ASGI app (httpx ASGITransport, no
+network), in three modes, each in a fresh interpreter because instrumentation
+is installed when `app.main` is imported:
+
+- `disabled`: default settings, no middleware and no SQL hooks;
+- `enabled`: metrics middleware, SQL and serialization timing;
+- `profiled`: enabled, and every request sampled by the profiler.
+
+Modes are run `--repeat` times in turn and the run with the lowest p50 is kept
+per endpoint. Prints requests/sec and p50/p99 latency per endpoint and mode,
+the p50 overhead against `disabled`, and in the enabled run the `Server-Timing` header of one
+request and an excerpt of `/metrics`.
+
+Usage:
+    python benchmarks/bench_instrumentation.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.configuration.database import DatabaseSettings, build_engine  # noqa: E402
+from app.models.region import Base, District, State, StateType  # noqa: E402
+
+MODES = {
+    "disabled": {"METRICS_ENABLED": "0"},
+    "enabled": {"METRICS_ENABLED": "1"},
+    "profiled": {"METRICS_ENABLED": "1", "METRICS_PROFILING_ENABLED": "1"},
+}
+ENDPOINTS = ["/regions/districts?limit=50", "/regions/states/1/tree"]
+
+
+def seed(database: Path, states: int, districts: int) -> None:
+    engine = build_engine(DatabaseSettings(database_url=f"sqlite:///{database}"))
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(State), [
+            {"id": s, "name": f"State {s}", "type": StateType.STATE} for s in range(1, states + 1)
+        ])
+        connection.execute(insert(District), [
+            {"id": (s - 1) * districts + d, "name": f"District {s}-{d}", "state_id": s}
+            for s in range(1, states + 1) for d in range(1, districts + 1)
+        ])
+    engine.dispose()
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def drive(mode: str, requests: int) -> dict:
+    import httpx
+
+    from app.main import app
+
+    headers = {"X-Profile": "1"} if mode == "profiled" else {}
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for endpoint in ENDPOINTS:
+                for _ in range(50):  # Warm up engines, caches and code paths
+                    (await client.get(endpoint)).raise_for_status()
+                latencies = []
+                started = time.perf_counter()
+                for _ in range(requests):
+                    sent = time.perf_counter()
+                    response = await client.get(endpoint, headers=headers)
+                    latencies.append(time.perf_counter() - sent)
+                    response.raise_for_status()
+                elapsed = time.perf_counter() - started
+                results[endpoint] = {
+                    "rps": requests / elapsed,
+                    "p50": percentile(latencies, 0.5),
+                    "p99": percentile(latencies, 0.99),
+                    "server_timing": response.headers.get("server-timing"),
+                }
+            if mode == "enabled":
+                metrics = (await client.get("/metrics")).text.splitlines()
+                results["metrics"] = [line for line in metrics if "_count" in line or "_total" in line][:12]
+    return results
+
+
+def run_mode(mode: str, database: Path, requests: int) -> dict:
+    env = {**os.environ, **MODES[mode], "DB_DATABASE_URL": f"sqlite:///{database}"}
+    process = subprocess.run(
+        [sys.executable, __file__, "--run", mode, "--requests", str(requests)],
+        env=env, capture_output=True, text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{mode} run failed:\n{process.stdout}{process.stderr}")
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--states", type=int, default=36)
+    parser.add_argument("--districts", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--run", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(asyncio.run(drive(args.run, args.requests))))
+        return
+
+    database = Path(tempfile.mkdtemp()) / "instrumentation.db"
+    seed(database, args.states, args.districts)
+    runs = {mode: {} for mode in MODES}
+    for _ in range(args.repeat):
+        for mode in MODES:
+            for key, result in run_mode(mode, database, args.requests).items():
+                best = runs[mode].get(key)
+                if key == "metrics" or best is None or result["p50"] < best["p50"]:
+                    runs[mode][key] = result
+
+    print(f"{args.requests:,} sequential requests per endpoint, best of {args.repeat}\n")
+    print(f"{'endpoint':<30} {'mode':<10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'overhead':>16}")
+    for endpoint in ENDPOINTS:
+        baseline = runs["disabled"][endpoint]["p50"]
+        for mode, results in runs.items():
+            result = results[endpoint]
+            overhead = result["p50"] - baseline
+            print(f"{endpoint:<30} {mode:<10} {result['rps']:>8,.0f} {result['p50'] * 1000:>8.2f} "
+                  f"{result['p99'] * 1000:>8.2f} {overhead * 1e6:>+7.0f} us {overhead / baseline:>+6.1%}")
+
+    enabled = runs["enabled"]
+    print(f"\nServer-Timing ({ENDPOINTS[1]}): {enabled[ENDPOINTS[1]]['server_timing']}")
+    print("/metrics excerpt:")
+    print("\n".join(f"  {line}" for line in enabled["metrics"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: encoding bulk responses, Pydantic models vs. the fast JSON path.
+
+Seeds `--cities` cities, then times each step of turning them into a JSON
+body:
+
+- fetch: ORM `City` entities vs. projected `CityRow` tuples;
+- encode, FastAPI's response path: validate each row against
+  `CityDetailResponse` (from attributes), then `jsonable_encoder` +
+  `json.dumps` as in the pinned FastAPI, or the Rust JSON dump used by newer
+  releases;
+- encode, `app.utils.fast_json`: row dicts, columnar arrays and NDJSON chunks,
+  rendered with orjson (or stdlib `json` if orjson is not installed).
+
+Usage:
+    python benchmarks/bench_json_serialization.py --cities 100000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.configuration.database import DatabaseSettings, build_engine  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+from app.models.schema.response.region_response import CityDetailResponse  # noqa: E402
+from app.repositories.region import CityRow, RegionRepository  # noqa: E402
+from app.repositories.region.region_repository import CITIES  # noqa: E402
+from app.utils import fast_json  # noqa: E402
+
+STATES, DISTRICTS = 36, 720
+
+
+def seed(engine, cities: int) -> None:
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(1, STATES + 1)])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": 1 + d % STATES} for d in range(1, DISTRICTS + 1)])
+        connection.execute(insert(City), [
+            {"id": i, "name": f"Village {i}", "district_id": 1 + i % DISTRICTS, "state_id": 1 + i % STATES,
+             "lat": 8 + (i % 2_900) / 100, "lng": 68 + (i % 2_900) / 100}
+            for i in range(1, cities + 1)])
+
+
+def best_ms(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = build_engine(DatabaseSettings(database_url=f"sqlite:///{Path(tempfile.mkdtemp()) / 'json.db'}"))
+    seed(engine, args.cities)
+    encoder = "orjson" if fast_json.orjson is not None else "json"
+
+    with Session(engine) as session:
+        repository = RegionRepository(session)
+        print(f"Fetch {args.cities:,} cities (best of {args.repeat}):")
+        orm_ms, entities = best_ms(
+            lambda: (session.expunge_all(), session.scalars(select(City).order_by(City.id)).all())[1], args.repeat)
+        rows_ms, rows = best_ms(
+            lambda: repository.fetch_all(CITIES.first_page, CityRow, limit=args.cities), args.repeat)
+        print(f"  {'ORM City entities':<42} {orm_ms:>9.1f} ms")
+        print(f"  {'CityRow projection':<42} {rows_ms:>9.1f} ms")
+
+    adapter = TypeAdapter(List[CityDetailResponse])
+    cases = {
+        "pydantic validate + jsonable_encoder": lambda source: json.dumps(
+            jsonable_encoder(adapter.validate_python(source, from_attributes=True))).encode(),
+        "pydantic validate + dump_json": lambda source: adapter.dump_json(
+            adapter.validate_python(source, from_attributes=True)),
+        f"fast_json row dicts ({encoder})": lambda source: fast_json.dumps(fast_json.project_rows(source)),
+        f"fast_json columnar ({encoder})": lambda source: fast_json.dumps(fast_json.columnar(source)),
+        f"fast_json NDJSON chunks ({encoder})": lambda source: b"".join(fast_json.ndjson_chunks(source)),
+    }
+
+    print(f"Encode {args.cities:,} CityRow rows (best of {args.repeat}):")
+    baseline = None
+    for name, encode in cases.items():
+        elapsed, body = best_ms(lambda: encode(rows), args.repeat)
+        baseline = baseline or elapsed
+        print(f"  {name:<42} {elapsed:>9.1f} ms {len(body) / 1e6:>7.1f} MB {baseline / elapsed:>6.1f}x")
+
+    expected = json.loads(adapter.dump_json(adapter.validate_python(rows[:100], from_attributes=True)))
+    assert json.loads(fast_json.dumps(fast_json.project_rows(rows[:100]))) == expected
+    assert [json.loads(line) for line in b"".join(fast_json.ndjson_chunks(rows[:100])).splitlines()] == expected
+    del entities
+
+
+if __name__ == "__main__":
+    main()
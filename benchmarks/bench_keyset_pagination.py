@@ -0,0 +1,116 @@
+"""
+Benchmark: cost of deep pages, OFFSET/LIMIT vs. keyset cursors.
+
+Seeds `--cities` cities (36 states, 720 districts) and a long price history,
+then fetches page 1, 10, 100, ... of three listings with both strategies:
+
+- all cities by id (`RegionRepository.cities_page`);
+- one state's cities by district and name (`ix_cities_state_district`);
+- one commodity's price history in a district (clustered primary key).
+
+OFFSET pages read and discard every earlier row; keyset pages seek to the
+cursor, so their cost should be flat across page numbers. The cursor for
+page N is taken from the last row of page N - 1 (untimed).
+
+Usage:
+    python benchmarks/bench_keyset_pagination.py --cities 600000 --page-size 50
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import bindparam, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.configuration.database import DatabaseSettings, build_engine  # noqa: E402
+from app.models.price import Commodity  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+from app.repositories.price import MandiPriceRepository, PriceRow  # noqa: E402
+from app.repositories.price.mandi_price_repository import DISTRICT_PRICES  # noqa: E402
+from app.repositories.region import CityRow, RegionRepository  # noqa: E402
+from app.repositories.region.region_repository import CITIES, CITIES_BY_STATE  # noqa: E402
+
+STATES, DISTRICTS, MARKETS, DAYS = 36, 720, 12, 3_000
+
+
+def seed(engine, cities: int) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        connection = session.connection()
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(1, STATES + 1)])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": 1 + d % STATES} for d in range(1, DISTRICTS + 1)])
+        for start in range(1, cities + 1, 100_000):
+            connection.execute(insert(City), [
+                {"id": i, "name": f"Village {i * 7919 % cities}", "district_id": 1 + i % DISTRICTS,
+                 "state_id": 1 + (1 + i % DISTRICTS) % STATES}
+                for i in range(start, min(start + 100_000, cities + 1))])
+        connection.execute(insert(Commodity), [{"id": 1, "name": "Onion"}])
+        first_day = date(2015, 1, 1)
+        MandiPriceRepository(session).upsert_prices([
+            (1, 1, first_day + timedelta(days=day), market, "", 900.0, 1100.0, 1000.0)
+            for market in range(1, MARKETS + 1) for day in range(DAYS)
+        ])
+        session.commit()
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+
+def average_ms(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def bench_listing(session, title, query, row_type, fetch_page, filters, total, args) -> None:
+    repository = RegionRepository(session)
+    offset_statement = query.first_page.offset(bindparam("offset"))
+    pages = [p for p in (1, 10, 100, 1_000, 10_000) if (p - 1) * args.page_size < total]
+    print(f"  {title} ({total:,} rows)")
+    print(f"    {'page':>7} {'offset ms':>10} {'keyset ms':>10}")
+    for page in pages:
+        offset = (page - 1) * args.page_size
+        cursor = None
+        if offset:
+            last = repository.fetch_one(offset_statement, row_type, limit=1, offset=offset - 1, **filters)
+            cursor = query.encode_cursor(last)
+        offset_ms = average_ms(lambda: repository.fetch_all(
+            offset_statement, row_type, limit=args.page_size, offset=offset, **filters), args.repeat)
+        keyset_ms = average_ms(lambda: fetch_page(cursor, args.page_size), args.repeat)
+        print(f"    {page:>7,} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, default=600_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = build_engine(DatabaseSettings(database_url=f"sqlite:///{Path(tempfile.mkdtemp()) / 'pages.db'}"))
+    seed(engine, args.cities)
+
+    print(f"Page cost by depth (page size {args.page_size}, mean of {args.repeat}):")
+    with Session(engine) as session:
+        regions, prices = RegionRepository(session), MandiPriceRepository(session)
+        state_cities = len(regions.city_ids_in_state(1))
+        bench_listing(session, "all cities by id", CITIES, CityRow,
+                      lambda cursor, limit: regions.cities_page(cursor, limit), {}, args.cities, args)
+        bench_listing(session, "cities of state 1 by district, name", CITIES_BY_STATE, CityRow,
+                      lambda cursor, limit: regions.cities_page(cursor, limit, state_id=1),
+                      {"state_id": 1}, state_cities, args)
+        bench_listing(session, "price history of one district", DISTRICT_PRICES, PriceRow,
+                      lambda cursor, limit: prices.district_prices_page(1, 1, cursor, limit),
+                      {"commodity_id": 1, "district_id": 1}, MARKETS * DAYS, args)
+
+
+if __name__ == "__main__":
+    main()
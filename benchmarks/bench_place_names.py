@@ -0,0 +1,128 @@
+"""
+Benchmark: accuracy and throughput of `PlaceNameResolver` on synthetic misspellings.
+
+Seeds a hierarchy with generated Indian-style village names, then queries
+mutated spellings (typos, transliteration variants, administrative suffixes)
+scoped by district. Reports top-1/top-5 accuracy, per-query latency and the
+batch API throughput on a file-like stream with repeated names.
+
+Usage:
+    python benchmarks/bench_place_names.py --cities 200000 --queries 20000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DB_FILE = Path(tempfile.gettempdir()) / "agridatahub_bench_place_names.db"
+os.environ.setdefault("DB_DATABASE_URL", f"sqlite:///{DB_FILE}")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.configuration.database import SessionLocal, engine  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+from app.services.region.place_name_resolver import PlaceNameResolver  # noqa: E402
+from app.services.region.region_index import RegionIndex, RegionLevel  # noqa: E402
+
+PREFIXES = ["Ra", "Ja", "Ma", "Ko", "Shi", "Bha", "Gho", "Kha", "Va", "Dha", "Su", "Ha", "Na", "Pa", "Tha", "Be"]
+MIDDLES = ["nd", "la", "ri", "ma", "va", "sa", "ka", "de", "gu", "ro", "ni", "bi", "ta", "le"]
+SUFFIXES = ["pur", "gaon", "wadi", "khed", "nagar", "palli", "halli", "ganj", "abad", "kot", "garh", "wala", ""]
+TRANSLITERATIONS = [("w", "v"), ("v", "w"), ("sh", "s"), ("aa", "a"), ("a", "aa"), ("ee", "i"), ("i", "ee"), ("oo", "u")]
+ADMIN_SUFFIXES = [" Tehsil", " (Rural)", " Taluka", " Village"]
+DISTRICTS = 700
+
+
+def make_name(rng: random.Random) -> str:
+    return rng.choice(PREFIXES) + rng.choice(MIDDLES) + rng.choice(MIDDLES[:6]) + rng.choice(SUFFIXES)
+
+
+def mutate(name: str, rng: random.Random) -> str:
+    kind = rng.randrange(6)
+    if kind == 0 and len(name) > 4:  # drop a character
+        i = rng.randrange(1, len(name))
+        return name[:i] + name[i + 1:]
+    if kind == 1 and len(name) > 4:  # swap adjacent characters
+        i = rng.randrange(1, len(name) - 1)
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    if kind == 2:  # double a character
+        i = rng.randrange(len(name))
+        return name[:i] + name[i] + name[i:]
+    if kind == 3:  # transliteration variant
+        for source, target in rng.sample(TRANSLITERATIONS, len(TRANSLITERATIONS)):
+            if source in name.lower():
+                return name.lower().replace(source, target, 1).title()
+    if kind == 4:
+        return name + rng.choice(ADMIN_SUFFIXES)
+    return name.upper()
+
+
+def seed(cities: int, rng: random.Random) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(1, 37)])
+        connection.execute(insert(District), [
+            {"id": i, "name": f"District {i}", "state_id": 1 + i % 36} for i in range(1, DISTRICTS + 1)])
+        connection.execute(insert(City), [
+            {"id": i, "name": make_name(rng), "district_id": 1 + i % DISTRICTS} for i in range(1, cities + 1)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    seed(args.cities, rng)
+    with SessionLocal() as session:
+        index = RegionIndex.load(session)
+        resolver = PlaceNameResolver.from_session(session, index)
+
+    queries = []
+    for _ in range(args.queries):
+        city = index.city(rng.randint(1, args.cities))
+        queries.append((mutate(city.name, rng), city.parent_id, city.id, city.name))
+
+    # Warm the per-district scope indexes, as a long-running worker would be
+    started = time.perf_counter()
+    for district_id in range(1, DISTRICTS + 1):
+        resolver.candidates("x", RegionLevel.CITY, district_id)
+    print(f"Built {DISTRICTS} district scopes in {time.perf_counter() - started:.2f}s")
+
+    top1 = top5 = 0
+    latencies = []
+    for query, district_id, city_id, true_name in queries:
+        started = time.perf_counter()
+        matches = resolver.candidates(query, RegionLevel.CITY, district_id, limit=5)
+        latencies.append(time.perf_counter() - started)
+        # Duplicate names inside a district are indistinguishable; count by name
+        names = [match.name for match in matches]
+        top1 += bool(names) and names[0] == true_name
+        top5 += true_name in names
+
+    q = statistics.quantiles(latencies, n=100)
+    print(f"Accuracy: top-1={top1 / len(queries):.1%} top-5={top5 / len(queries):.1%}")
+    print(f"Scoped query latency: p50={q[49] * 1e6:.0f}us p99={q[98] * 1e6:.0f}us "
+          f"({len(queries) / sum(latencies):,.0f} queries/s)")
+
+    # A file-like stream: every market appears many times
+    rows = [queries[rng.randrange(min(len(queries), 2000))] for _ in range(200_000)]
+    started = time.perf_counter()
+    resolver.resolve_batch([row[0] for row in rows], RegionLevel.CITY, [row[1] for row in rows])
+    elapsed = time.perf_counter() - started
+    print(f"Batch: {len(rows):,} rows resolved in {elapsed:.2f}s ({len(rows) / elapsed:,.0f} rows/s)")
+
+    engine.dispose()
+    DB_FILE.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
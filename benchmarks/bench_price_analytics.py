@@ -0,0 +1,208 @@
+"""
+Benchmark: vectorized price analytics vs. a pure-Python reference.
+
+Generates `--days` of daily prices for `--commodities` commodities at
+`--markets` markets (spread over 720 districts; ~3% of market-days missing,
+~1% of modal prices null, occasional spikes), in the column layout returned by
+`MandiPriceRepository.analytics_columns`. Defaults give 10M rows.
+
+Both implementations compute, for every price:
+
+- the moving average and volatility of the market's last `--window` prices;
+- the z-score against the market's previous `--window` prices, and the flag;
+- per commodity, district and day: count, mean, min and max;
+- the deviation from the other markets of the district that day;
+
+the NumPy path through `app.helpers.price_analytics`, the reference with
+dicts, lists and running sums over deques. Results are checked against each
+other.
+
+Usage:
+    python benchmarks/bench_price_analytics.py --days 730 --commodities 5 --markets 2825
+"""
+
+import argparse
+import gc
+import math
+import sys
+import time
+from array import array
+from collections import defaultdict, deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from app.helpers.price_analytics import (  # noqa: E402
+    MIN_RELATIVE_STD,
+    PriceFrame,
+    district_day_aggregates,
+    frame_trailing_stats,
+    neighbour_deviation,
+    zscore_anomalies,
+)
+
+DISTRICTS = 720
+FIRST_DAY = 19_723  # 2024-01-01, in days since 1970-01-01
+MIN_PERIODS = 7
+
+
+def generate(days: int, commodities: int, markets: int, seed: int = 7):
+    """Columns in `analytics_columns` order, rows in mandi_prices key order."""
+    rng = np.random.default_rng(seed)
+    commodity = np.repeat(np.arange(1, commodities + 1), days * markets)
+    day = np.tile(np.repeat(np.arange(FIRST_DAY, FIRST_DAY + days), markets), commodities)
+    market = np.tile(np.arange(1, markets + 1), days * commodities)
+    district = 1 + market % DISTRICTS
+    trend = 1_000 + 200 * np.sin((day - FIRST_DAY) / 58.0 + market % 13)
+    modal = np.round(trend + commodity * 150 + rng.normal(0, 25, len(day)))
+    spikes = rng.random(len(day)) < 0.0005
+    modal[spikes] *= rng.choice([0.6, 1.5], spikes.sum())
+    modal[rng.random(len(day)) < 0.01] = np.nan
+    kept = rng.random(len(day)) >= 0.03
+    order = np.lexsort((market[kept], day[kept], district[kept], commodity[kept]))
+    modal = modal[kept][order]
+    return (commodity[kept][order], district[kept][order], market[kept][order], day[kept][order],
+            modal - 100, modal + 100, modal)
+
+
+def numpy_analytics(columns, window: int, threshold: float):
+    frame = PriceFrame.from_columns(*columns)
+    moving = frame_trailing_stats(frame, window)
+    scores = zscore_anomalies(frame, window=window, threshold=threshold, min_periods=MIN_PERIODS)
+    days = district_day_aggregates(frame)
+    deviation = neighbour_deviation(frame)
+    return frame, moving, scores, days, deviation
+
+
+def python_analytics(columns, window: int, threshold: float):
+    """Pure-Python reference; outputs are arrays in input row order."""
+    commodity, district, market, day, min_price, max_price, modal = columns
+    size = len(modal)
+    nan = math.nan
+    moving_mean, moving_std = array("d", [nan]) * size, array("d", [nan]) * size
+    zscore, flagged = array("d", [nan]) * size, bytearray(size)
+
+    series = defaultdict(list)
+    for row, key in enumerate(zip(commodity, market)):
+        series[key].append(row)
+    for rows in series.values():
+        rows.sort(key=day.__getitem__)
+        recent, total, squares, count = deque(), 0.0, 0.0, 0
+        for row in rows:
+            value = modal[row]
+            # Score against the previous `window` prices before adding this one
+            if count >= MIN_PERIODS:
+                mean = total / count
+                std = math.sqrt(max(squares - total * mean, 0.0) / (count - 1))
+                std = max(std, abs(mean) * MIN_RELATIVE_STD)
+                if value == value and std > 0:
+                    zscore[row] = (value - mean) / std
+                    flagged[row] = abs(zscore[row]) >= threshold
+            recent.append(value)
+            if value == value:
+                total += value
+                squares += value * value
+                count += 1
+            if len(recent) > window:
+                dropped = recent.popleft()
+                if dropped == dropped:
+                    total -= dropped
+                    squares -= dropped * dropped
+                    count -= 1
+            if count:
+                mean = total / count
+                moving_mean[row] = mean
+                if count >= 2:
+                    moving_std[row] = math.sqrt(max(squares - total * mean, 0.0) / (count - 1))
+
+    groups = {}
+    for row, key in enumerate(zip(commodity, district, day)):
+        value = modal[row]
+        group = groups.get(key)
+        if group is None:
+            groups[key] = group = [0, 0.0, min_price[row], max_price[row]]
+        if value == value:
+            group[0] += 1
+            group[1] += value
+        group[2] = min(group[2], min_price[row])
+        group[3] = max(group[3], max_price[row])
+
+    deviation = array("d", [nan]) * size
+    for row, key in enumerate(zip(commodity, district, day)):
+        value = modal[row]
+        count, total = groups[key][0], groups[key][1]
+        if value == value and count > 1:
+            deviation[row] = value / ((total - value) / (count - 1)) - 1.0
+    return moving_mean, moving_std, zscore, flagged, groups, deviation
+
+
+def close(expected: np.ndarray, actual: np.ndarray) -> bool:
+    return bool(np.allclose(expected, actual, rtol=1e-6, atol=1e-4, equal_nan=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--commodities", type=int, default=5)
+    parser.add_argument("--markets", type=int, default=2_825)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--threshold", type=float, default=3.0)
+    args = parser.parse_args()
+
+    columns = generate(args.days, args.commodities, args.markets)
+    rows = len(columns[0])
+    print(f"{rows:,} price rows, window {args.window}")
+
+    timings = {}
+    started = time.perf_counter()
+    frame = PriceFrame.from_columns(*columns)
+    timings["encode + sort"] = time.perf_counter() - started
+    started = time.perf_counter()
+    frame_trailing_stats(frame, args.window)
+    timings["moving average + volatility"] = time.perf_counter() - started
+    started = time.perf_counter()
+    zscore_anomalies(frame, window=args.window, threshold=args.threshold, min_periods=MIN_PERIODS)
+    timings["z-score anomalies"] = time.perf_counter() - started
+    started = time.perf_counter()
+    district_day_aggregates(frame)
+    timings["district-day aggregates"] = time.perf_counter() - started
+    started = time.perf_counter()
+    neighbour_deviation(frame)
+    timings["neighbour deviation"] = time.perf_counter() - started
+    numpy_seconds = sum(timings.values())
+    for label, seconds in timings.items():
+        print(f"  numpy {label:<30} {seconds * 1000:>9.0f} ms")
+    print(f"  numpy total {'':<24} {numpy_seconds * 1000:>9.0f} ms  ({rows / numpy_seconds:,.0f} rows/s)")
+
+    frame, moving, scores, days, deviation = numpy_analytics(columns, args.window, args.threshold)
+    # Input order -> frame order, for comparing with the reference
+    order = np.lexsort((columns[3], columns[2], columns[0]))
+
+    python_columns = tuple(column.tolist() for column in columns)
+    del columns
+    gc.collect()
+    started = time.perf_counter()
+    reference = python_analytics(python_columns, args.window, args.threshold)
+    python_seconds = time.perf_counter() - started
+    print(f"  pure Python {'':<24} {python_seconds * 1000:>9.0f} ms  ({rows / python_seconds:,.0f} rows/s)")
+    print(f"  speedup {python_seconds / numpy_seconds:.0f}x")
+
+    moving_mean, moving_std, zscore, flagged, groups, reference_deviation = reference
+    group_keys = sorted(groups)
+    checks = {
+        "moving average": close(np.frombuffer(moving_mean)[order], moving.mean),
+        "volatility": close(np.frombuffer(moving_std)[order], moving.std),
+        "z-scores": close(np.frombuffer(zscore)[order], scores.zscore),
+        "flags": bool((np.frombuffer(flagged, dtype=np.uint8)[order].astype(bool) == scores.flagged).all()),
+        "district-day groups": len(group_keys) == len(days.price_count) and all(
+            days.price_count[i] == groups[key][0] for i, key in enumerate(group_keys[:100_000])),
+        "neighbour deviation": close(np.frombuffer(reference_deviation)[order], deviation),
+    }
+    print(f"  {int(scores.flagged.sum()):,} anomalies flagged; results match: "
+          + ", ".join(f"{name} {'ok' if ok else 'MISMATCH'}" for name, ok in checks.items()))
+
+
+if __name__ == "__main__":
+    main()
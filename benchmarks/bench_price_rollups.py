@@ -0,0 +1,184 @@
+"""
+Benchmark: dashboard price queries, raw scans vs. pre-aggregated rollups.
+
+Seeds `--days` of daily prices for `--commodities` commodities at `--markets`
+markets (spread over 36 states and 720 districts), builds the rollups, then
+times:
+
+- a state's weekly average modal price and min/max spread over a year;
+- a state's summary over an arbitrary ~300-day range;
+- a district's monthly series over the whole history;
+
+each answered from `mandi_prices` (joined through districts) and from
+`price_rollups`, with the results checked against each other. Finally it
+measures what incremental rollup maintenance adds to ingest: one new day of
+prices, and a batch overwriting existing prices, with and without refresh.
+
+Usage:
+    python benchmarks/bench_price_rollups.py --days 730 --commodities 2 --markets 2400
+"""
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.configuration.database import DatabaseSettings, build_engine  # noqa: E402
+from app.models.price import Commodity, RollupGrain, RollupLevel  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+from app.repositories.price import MandiPriceRepository, PriceRollupRepository  # noqa: E402
+
+STATES, DISTRICTS = 36, 720
+FIRST_DAY = date(2023, 1, 1)
+
+RAW_SERIES_SQL = {
+    RollupGrain.WEEK: "date(p.price_date, 'weekday 0', '-6 days')",
+    RollupGrain.MONTH: "date(p.price_date, 'start of month')",
+}
+
+
+def raw_sql(period: str, region_filter: str) -> str:
+    return (
+        f"SELECT {period} AS period, count(*), avg(p.modal_price), min(p.min_price), max(p.max_price) "
+        "FROM mandi_prices p JOIN districts d ON d.id = p.district_id "
+        f"WHERE p.commodity_id = ? AND {region_filter} AND p.price_date BETWEEN ? AND ? "
+        "GROUP BY period ORDER BY period"
+    )
+
+
+def day_of_prices(day: date, commodities: int, markets: int, offset: float = 0.0):
+    return [
+        (commodity, 1 + market % DISTRICTS, day, market, "",
+         800.0 + market % 97 + offset, 1200.0 + day.toordinal() % 31 + offset, 1000.0 + (market * day.day) % 113 + offset)
+        for commodity in range(1, commodities + 1) for market in range(1, markets + 1)
+    ]
+
+
+def seed(engine, days: int, commodities: int, markets: int) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        connection = session.connection()
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(STATES)])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": d % STATES} for d in range(1, DISTRICTS + 1)])
+        connection.execute(insert(City), [
+            {"id": m, "name": f"Market {m}", "district_id": 1 + m % DISTRICTS, "state_id": (1 + m % DISTRICTS) % STATES}
+            for m in range(1, markets + 1)])
+        connection.execute(insert(Commodity), [{"id": c, "name": f"Commodity {c}"} for c in range(1, commodities + 1)])
+        repository = MandiPriceRepository(session)
+        for day in range(days):
+            repository.upsert_prices(day_of_prices(FIRST_DAY + timedelta(days=day), commodities, markets),
+                                     refresh_rollups=False)
+        session.commit()
+
+
+def best_ms(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def same(raw_rows, rollup_rows) -> bool:
+    if len(raw_rows) != len(rollup_rows):
+        return False
+    return all(
+        a[1] == b[1] and all(math.isclose(x, y, rel_tol=1e-9) for x, y in zip(a[2:], b[2:]))
+        for a, b in zip(raw_rows, rollup_rows)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--commodities", type=int, default=2)
+    parser.add_argument("--markets", type=int, default=2_400)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = build_engine(DatabaseSettings(database_url=f"sqlite:///{Path(tempfile.mkdtemp()) / 'rollups.db'}"))
+    started = time.perf_counter()
+    seed(engine, args.days, args.commodities, args.markets)
+    rows = args.days * args.commodities * args.markets
+    print(f"Seeded {rows:,} price rows in {time.perf_counter() - started:.1f}s")
+
+    with Session(engine) as session:
+        rollups = PriceRollupRepository(session)
+        started = time.perf_counter()
+        cells = rollups.rebuild()
+        session.commit()
+        print(f"Rebuilt {cells:,} rollup cells in {time.perf_counter() - started:.1f}s")
+
+        connection = session.connection()
+        last_day = FIRST_DAY + timedelta(days=args.days - 1)
+        year_start = last_day - timedelta(days=364)
+        state_id, district_id = 7, 7 + STATES
+
+        def raw(sql, *params):
+            return connection.exec_driver_sql(sql, params).all()
+
+        cases = [
+            (
+                f"state weekly series, {year_start} .. {last_day}",
+                lambda: raw(raw_sql(RAW_SERIES_SQL[RollupGrain.WEEK], "d.state_id = ?"),
+                            1, state_id, year_start.isoformat(), last_day.isoformat()),
+                lambda: rollups.series(1, RollupLevel.STATE, state_id, RollupGrain.WEEK, year_start, last_day),
+            ),
+            (
+                f"district monthly series, {FIRST_DAY} .. {last_day}",
+                lambda: raw(raw_sql(RAW_SERIES_SQL[RollupGrain.MONTH], "p.district_id = ?"),
+                            1, district_id, FIRST_DAY.isoformat(), last_day.isoformat()),
+                lambda: rollups.series(1, RollupLevel.DISTRICT, district_id, RollupGrain.MONTH, FIRST_DAY, last_day),
+            ),
+        ]
+        print(f"{'query':<52} {'raw ms':>9} {'rollup ms':>10} {'speedup':>8}  match")
+        for label, raw_query, rollup_query in cases:
+            raw_ms, raw_rows = best_ms(raw_query, args.repeat)
+            rollup_ms, rollup_rows = best_ms(rollup_query, args.repeat)
+            match = same([(r[0], *r[1:]) for r in raw_rows], list(rollup_rows))
+            print(f"{label:<52} {raw_ms:>9.2f} {rollup_ms:>10.2f} {raw_ms / rollup_ms:>7.0f}x  {match}")
+
+        start, end = FIRST_DAY + timedelta(days=40), FIRST_DAY + timedelta(days=340)
+        raw_ms, raw_row = best_ms(lambda: raw(
+            "SELECT 0, count(*), avg(p.modal_price), min(p.min_price), max(p.max_price) "
+            "FROM mandi_prices p JOIN districts d ON d.id = p.district_id "
+            "WHERE p.commodity_id = ? AND d.state_id = ? AND p.price_date BETWEEN ? AND ?",
+            1, state_id, start.isoformat(), end.isoformat()), args.repeat)
+        rollup_ms, summary = best_ms(
+            lambda: rollups.summary(1, RollupLevel.STATE, state_id, start, end), args.repeat)
+        match = same(raw_row, [(0, *summary[:4])])
+        print(f"{f'state summary, {start} .. {end}':<52} {raw_ms:>9.2f} {rollup_ms:>10.2f} "
+              f"{raw_ms / rollup_ms:>7.0f}x  {match} ({summary.cells} cells)")
+
+        print("Ingest cost of incremental maintenance:")
+        repository = MandiPriceRepository(session)
+        batches = [
+            ("one new day", lambda offset: day_of_prices(last_day + timedelta(days=1), args.commodities, args.markets, offset)),
+            ("overwrite a past day", lambda offset: day_of_prices(last_day - timedelta(days=100), args.commodities,
+                                                                  args.markets, offset)),
+        ]
+        for label, make_batch in batches:
+            timings = {}
+            for refresh in (False, True):
+                batch = make_batch(1.0 if refresh else 2.0)
+                started = time.perf_counter()
+                repository.upsert_prices(batch, refresh_rollups=refresh)
+                timings[refresh] = (time.perf_counter() - started) * 1000
+                session.rollback()
+            print(f"  {label} ({len(batch):,} rows): {timings[False]:.1f} ms without refresh, "
+                  f"{timings[True]:.1f} ms with refresh")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: ingest and range-query throughput of the `mandi_prices` store.
+
+Seeds a small region hierarchy (`--districts` districts with 5 markets each),
+then appends `--rows` synthetic daily prices through
+`MandiPriceRepository.upsert_prices` in `--batch-size` batches under the
+`ingest_heavy` SQLite profile. It then times "last 90 days of a commodity in a
+district" and "latest price at a market" queries.
+
+Usage:
+    python benchmarks/bench_price_store.py --rows 100000000
+    python benchmarks/bench_price_store.py --rows 2000000 --queries 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+DB_FILE = Path(tempfile.gettempdir()) / "agridatahub_bench_prices.db"
+os.environ.setdefault("DB_DATABASE_URL", f"sqlite:///{DB_FILE}")
+os.environ.setdefault("DB_SQLITE_PROFILE", "ingest_heavy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.configuration.database import SessionLocal, engine  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+from app.repositories.price import MandiPriceRepository  # noqa: E402
+
+MARKETS_PER_DISTRICT = 5
+COMMODITIES = [
+    "Onion", "Potato", "Tomato", "Wheat", "Paddy", "Maize", "Soyabean", "Cotton",
+    "Groundnut", "Mustard", "Gram", "Tur", "Moong", "Urad", "Garlic", "Ginger",
+    "Banana", "Apple", "Cabbage", "Cauliflower",
+]
+FIRST_DAY = date(2015, 1, 1)
+
+
+def seed(districts: int) -> list:
+    DB_FILE.unlink(missing_ok=True)
+    Base.metadata.create_all(engine)
+    markets = []
+    with engine.begin() as connection:
+        connection.execute(insert(State), [{"id": 1, "name": "Maharashtra", "type": StateType.STATE}])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": 1} for d in range(1, districts + 1)])
+        cities = []
+        for d in range(1, districts + 1):
+            for m in range(MARKETS_PER_DISTRICT):
+                city_id = (d - 1) * MARKETS_PER_DISTRICT + m + 1
+                cities.append({"id": city_id, "name": f"Mandi {city_id}", "district_id": d, "state_id": 1})
+                markets.append((d, city_id))
+        connection.execute(insert(City), cities)
+    return markets
+
+
+def generate(rows: int, markets: list, commodity_ids: list):
+    """Yield rows day by day, each day covering every (market, commodity) pair, as an API feed would."""
+    rng = random.Random(11)
+    day = 0
+    produced = 0
+    while produced < rows:
+        price_date = (FIRST_DAY + timedelta(days=day)).isoformat()
+        for district_id, market_id in markets:
+            for commodity_id in commodity_ids:
+                modal = 1000 + rng.random() * 4000
+                yield (commodity_id, district_id, price_date, market_id, "", modal * 0.9, modal * 1.1, modal)
+                produced += 1
+                if produced == rows:
+                    return
+        day += 1
+
+
+def ingest(rows: int, batch_size: int, markets: list) -> list:
+    with SessionLocal() as session:
+        repository = MandiPriceRepository(session)
+        commodity_ids = sorted(repository.commodity_ids(COMMODITIES).values())
+        session.commit()
+
+        started = time.perf_counter()
+        batch = []
+        written = 0
+        for row in generate(rows, markets, commodity_ids):
+            batch.append(row)
+            if len(batch) == batch_size:
+                written += repository.upsert_prices(batch)
+                session.commit()
+                batch = []
+                if written % (batch_size * 20) == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"  {written:>13,} rows  {written / elapsed:>10,.0f} rows/s")
+        written += repository.upsert_prices(batch)
+        session.commit()
+        elapsed = time.perf_counter() - started
+        print(f"Ingested {written:,} rows in {elapsed:.1f}s ({written / elapsed:,.0f} rows/s)")
+        return commodity_ids
+
+
+def query(queries: int, markets: list, commodity_ids: list, rows: int) -> None:
+    days = max(1, rows // (len(markets) * len(commodity_ids)))
+    last_day = FIRST_DAY + timedelta(days=days - 1)
+    rng = random.Random(7)
+    with SessionLocal() as session:
+        repository = MandiPriceRepository(session)
+
+        started = time.perf_counter()
+        returned = 0
+        for _ in range(queries):
+            district_id, _market = rng.choice(markets)
+            returned += len(repository.district_series(
+                rng.choice(commodity_ids), district_id, last_day - timedelta(days=89), last_day))
+        elapsed = time.perf_counter() - started
+        print(f"  last 90 days in a district       {elapsed / queries * 1000:8.3f} ms/query "
+              f"({returned / queries:,.0f} rows each)")
+
+        started = time.perf_counter()
+        for _ in range(queries):
+            repository.latest_modal_price(rng.choice(commodity_ids), rng.choice(markets)[1])
+        elapsed = time.perf_counter() - started
+        print(f"  latest price at a market         {elapsed / queries * 1000:8.3f} ms/query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000_000)
+    parser.add_argument("--districts", type=int, default=36)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="Keep the database file afterwards")
+    args = parser.parse_args()
+
+    markets = seed(args.districts)
+    commodity_ids = ingest(args.rows, args.batch_size, markets)
+    print(f"Database size: {DB_FILE.stat().st_size / 1024 ** 2:,.1f} MiB")
+    print("Queries:")
+    query(args.queries, markets, commodity_ids, args.rows)
+
+    engine.dispose()
+    if not args.keep:
+        DB_FILE.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
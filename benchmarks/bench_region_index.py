@@ -0,0 +1,116 @@
+"""
+Benchmark: `RegionIndex` lookups vs. the equivalent ORM queries.
+
+Seeds a synthetic hierarchy (36 states, 700 districts, 6k subdistricts and
+`--cities` villages), then times id -> node, (district, name) -> id and
+city -> state ancestor-chain lookups both ways. Also reports index load time
+and memory per region.
+
+Usage:
+    python benchmarks/bench_region_index.py --cities 650000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+DB_FILE = Path(tempfile.gettempdir()) / "agridatahub_bench_region_index.db"
+os.environ.setdefault("DB_DATABASE_URL", f"sqlite:///{DB_FILE}")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.configuration.database import SessionLocal, engine  # noqa: E402
+from app.models.region import Base, City, District, State, StateType, Subdistrict  # noqa: E402
+from app.services.region.region_index import RegionIndex, RegionLevel  # noqa: E402
+
+STATES, DISTRICTS, SUBDISTRICTS = 36, 700, 6000
+
+
+def seed(cities: int) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(1, STATES + 1)])
+        connection.execute(insert(District), [
+            {"id": i, "name": f"District {i}", "state_id": 1 + i % STATES} for i in range(1, DISTRICTS + 1)])
+        connection.execute(insert(Subdistrict), [
+            {"id": i, "name": f"Tehsil {i}", "district_id": 1 + i % DISTRICTS} for i in range(1, SUBDISTRICTS + 1)])
+        for start in range(1, cities + 1, 100_000):
+            connection.execute(insert(City), [
+                {"id": i, "name": f"Village {i}", "district_id": 1 + (i % SUBDISTRICTS) % DISTRICTS,
+                 "subdistrict_id": 1 + i % SUBDISTRICTS if i % 5 else None,
+                 "lat": 8 + (i % 2700) / 100, "lng": 68 + (i % 2900) / 100}
+                for i in range(start, min(start + 100_000, cities + 1))
+            ])
+
+
+def timed(label: str, fn, keys) -> None:
+    started = time.perf_counter()
+    for key in keys:
+        fn(key)
+    per_call = (time.perf_counter() - started) / len(keys)
+    print(f"  {label:<42} {per_call * 1e6:10.2f} us/lookup")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, default=650_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    seed(args.cities)
+    rng = random.Random(7)
+    city_ids = [rng.randint(1, args.cities) for _ in range(args.lookups)]
+
+    with SessionLocal() as session:
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        index = RegionIndex.load(session)
+        load_seconds = time.perf_counter() - started
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+    print(f"Loaded {len(index):,} regions in {load_seconds:.2f}s, "
+          f"{used / 2**20:.1f} MiB ({used / len(index):.0f} bytes/region)")
+
+    city_keys = [(index.city(i).parent_id, index.city(i).name) for i in city_ids]
+
+    print("RegionIndex:")
+    timed("city by id", index.city, city_ids)
+    timed("city id by (district_id, name)", lambda k: index.find_id(RegionLevel.CITY, k[1], k[0]), city_keys)
+    timed("city -> state ancestor chain", lambda i: index.ancestors(RegionLevel.CITY, i), city_ids)
+
+    print("ORM:")
+    with SessionLocal() as session:
+        def orm_city(city_id):
+            session.get(City, city_id)
+            session.expunge_all()
+
+        def orm_find(key):
+            session.scalar(select(City.id).where(City.district_id == key[0], City.name == key[1]))
+
+        def orm_chain(city_id):
+            city = session.get(City, city_id)
+            _ = (city.subdistrict, city.district.state.name)
+            session.expunge_all()
+
+        timed("city by id", orm_city, city_ids)
+        timed("city id by (district_id, name)", orm_find, city_keys)
+        timed("city -> state ancestor chain", orm_chain, city_ids)
+
+    engine.dispose()
+    DB_FILE.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
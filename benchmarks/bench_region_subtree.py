@@ -0,0 +1,95 @@
+"""
+Benchmark: subtree aggregation with joins vs. the denormalized `state_id` column.
+
+Seeds a full-India-sized hierarchy (36 states, ~750 districts, ~6k subdistricts,
+`--cities` villages) and times, per state, "all city ids in the state" and
+"villages per district", first joining cities -> districts -> states and then
+using `RegionRepository` over `cities.state_id`.
+
+Usage:
+    python benchmarks/bench_region_subtree.py --cities 650000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DB_FILE = Path(tempfile.gettempdir()) / "agridatahub_bench_subtree.db"
+os.environ.setdefault("DB_DATABASE_URL", f"sqlite:///{DB_FILE}")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app.configuration.database import SessionLocal, engine  # noqa: E402
+from app.models.region import Base, City, District, State, StateType, Subdistrict  # noqa: E402
+from app.repositories.region import RegionRepository  # noqa: E402
+
+STATES, DISTRICTS, SUBDISTRICTS = 36, 750, 6000
+
+
+def seed(cities: int) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    state_of = {d: 1 + d % STATES for d in range(1, DISTRICTS + 1)}
+    with engine.begin() as connection:
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(1, STATES + 1)])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": s} for d, s in state_of.items()])
+        connection.execute(insert(Subdistrict), [
+            {"id": i, "name": f"Tehsil {i}", "district_id": 1 + i % DISTRICTS,
+             "state_id": state_of[1 + i % DISTRICTS]} for i in range(1, SUBDISTRICTS + 1)])
+        for start in range(1, cities + 1, 100_000):
+            rows = []
+            for i in range(start, min(start + 100_000, cities + 1)):
+                subdistrict = 1 + i % SUBDISTRICTS
+                district = 1 + subdistrict % DISTRICTS
+                rows.append({"id": i, "name": f"Village {i}", "district_id": district,
+                             "subdistrict_id": subdistrict if i % 7 else None, "state_id": state_of[district]})
+            connection.execute(insert(City), rows)
+        connection.exec_driver_sql("ANALYZE")
+
+
+def timed(label: str, fn) -> None:
+    started = time.perf_counter()
+    for state_id in range(1, STATES + 1):
+        fn(state_id)
+    print(f"  {label:<34} {(time.perf_counter() - started) / STATES * 1000:9.2f} ms/state")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cities", type=int, default=650_000)
+    args = parser.parse_args()
+    seed(args.cities)
+
+    with SessionLocal() as session:
+        def joined_ids(state_id):
+            return session.scalars(
+                select(City.id).join(District, City.district_id == District.id)
+                .join(State, District.state_id == State.id).where(State.id == state_id)
+            ).all()
+
+        def joined_rollup(state_id):
+            return session.execute(
+                select(District.id, func.count(City.id)).join(City, City.district_id == District.id)
+                .where(District.state_id == state_id).group_by(District.id)
+            ).all()
+
+        repository = RegionRepository(session)
+        print("Joined through districts:")
+        timed("all cities in state", joined_ids)
+        timed("villages per district", joined_rollup)
+        print("Denormalized state_id:")
+        timed("all cities in state", repository.city_ids_in_state)
+        timed("villages per district", repository.count_cities_by_district)
+
+    engine.dispose()
+    DB_FILE.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: per-call overhead of hot repository lookups.
+
+Seeds a temporary database and times `--calls` lookups per variant:
+
+- orm: ORM entities through the session (`session.get`, `select(Entity)`);
+- ad hoc: Core `select()` of the needed columns built on every call (how the
+  repositories queried before prepared statements);
+- prepared: the repository methods (statements built once with `bindparam`,
+  results as NamedTuple rows).
+
+Lookups are city by id, district by (state_id, name) and latest price by
+(commodity, market). Every call hits an indexed row, so the numbers are
+dominated by Python-side statement and result handling.
+
+Usage:
+    python benchmarks/bench_repository_queries.py --calls 20000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.configuration.database import DatabaseSettings, build_engine  # noqa: E402
+from app.models.price import Commodity, MandiPrice  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+from app.repositories.price import MandiPriceRepository  # noqa: E402
+from app.repositories.price.mandi_price_repository import PRICE_COLUMNS, PriceRow  # noqa: E402
+from app.repositories.region import RegionRepository  # noqa: E402
+
+STATES, DISTRICTS, CITIES, MARKETS, COMMODITIES, DAYS = 36, 750, 200_000, 400, 20, 30
+
+
+def seed(engine) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        connection = session.connection()
+        connection.execute(insert(State), [
+            {"id": i, "name": f"State {i}", "type": StateType.STATE} for i in range(1, STATES + 1)])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": 1 + d % STATES} for d in range(1, DISTRICTS + 1)])
+        connection.execute(insert(City), [
+            {"id": i, "name": f"Village {i}", "district_id": 1 + i % DISTRICTS, "state_id": 1 + (1 + i % DISTRICTS) % STATES}
+            for i in range(1, CITIES + 1)])
+        connection.execute(insert(Commodity), [{"id": c, "name": f"Commodity {c}"} for c in range(1, COMMODITIES + 1)])
+        start = date(2024, 1, 1)
+        MandiPriceRepository(session).upsert_prices([
+            (commodity, 1 + market % DISTRICTS, start + timedelta(days=day), market, "", 900.0, 1100.0, 1000.0)
+            for market in range(1, MARKETS + 1)
+            for commodity in range(1, COMMODITIES + 1)
+            for day in range(DAYS)
+        ])
+        session.commit()
+
+
+def timed(label: str, calls: list, fn) -> float:
+    started = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    per_call = (time.perf_counter() - started) / len(calls) * 1e6
+    print(f"    {label:<10} {per_call:8.1f} us/call")
+    return per_call
+
+
+def compare(title: str, calls: list, variants: list) -> None:
+    print(f"  {title}")
+    results = [timed(label, calls, fn) for label, fn in variants]
+    print(f"    prepared is {results[0] / results[-1]:.1f}x faster than orm, {results[1] / results[-1]:.1f}x than ad hoc")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    engine = build_engine(DatabaseSettings(database_url=f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"))
+    seed(engine)
+    rng = random.Random(7)
+    city_calls = [(rng.randint(1, CITIES),) for _ in range(args.calls)]
+    district_calls = [(1 + d % STATES, f"District {d}") for d in (rng.randint(1, DISTRICTS) for _ in range(args.calls))]
+    price_calls = [(rng.randint(1, COMMODITIES), rng.randint(1, MARKETS)) for _ in range(args.calls)]
+    city_columns = (City.id, City.name, City.district_id, City.subdistrict_id, City.state_id, City.lat, City.lng)
+    price_columns = [getattr(MandiPrice, column) for column in PRICE_COLUMNS]
+
+    print(f"Per-call overhead ({args.calls:,} calls each):")
+    with Session(engine) as session:
+        regions, prices = RegionRepository(session), MandiPriceRepository(session)
+        connection = session.connection()
+
+        def orm_city(city_id):
+            session.expunge_all()  # Measure a lookup, not an identity-map hit
+            return session.get(City, city_id)
+
+        compare("city by id", city_calls, [
+            ("orm", orm_city),
+            ("ad hoc", lambda city_id: connection.execute(select(*city_columns).where(City.id == city_id)).first()),
+            ("prepared", regions.city),
+        ])
+        compare("district by (state_id, name)", district_calls, [
+            ("orm", lambda state_id, name: session.scalars(
+                select(District).where(District.state_id == state_id, District.name == name)).first()),
+            ("ad hoc", lambda state_id, name: connection.execute(
+                select(District.id, District.name, District.state_id)
+                .where(District.state_id == state_id, District.name == name)).first()),
+            ("prepared", regions.district_by_name),
+        ])
+
+        def adhoc_latest(commodity_id, market_id):
+            row = connection.execute(
+                select(*price_columns)
+                .where(MandiPrice.market_id == market_id, MandiPrice.commodity_id == commodity_id)
+                .order_by(MandiPrice.price_date.desc()).limit(1)
+            ).first()
+            return PriceRow(*row) if row else None
+
+        compare("latest price by (commodity, market)", price_calls, [
+            ("orm", lambda commodity_id, market_id: session.scalars(
+                select(MandiPrice)
+                .where(MandiPrice.market_id == market_id, MandiPrice.commodity_id == commodity_id)
+                .order_by(MandiPrice.price_date.desc()).limit(1)).first()),
+            ("ad hoc", adhoc_latest),
+            ("prepared", prices.latest_modal_price),
+        ])
+
+
+if __name__ == "__main__":
+    main()
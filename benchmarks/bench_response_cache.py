@@ -0,0 +1,132 @@
+"""
+Benchmark: throughput of `AsyncCache` / `cache_response` under Zipfian load.
+
+Keys are drawn from a Zipf distribution (`--keys` distinct keys, exponent
+`--zipf-s`), mimicking a few hot commodities/markets and a long tail. The
+simulated loader sleeps `--latency-ms` (an upstream or DB round trip).
+
+Two layers are measured, each uncached and cached:
+
+- service: `--concurrency` workers calling `AsyncCache.get_or_load` directly;
+- endpoint: the same workers calling a FastAPI route through the ASGI
+  transport, with and without `cache_response`.
+
+Usage:
+    python benchmarks/bench_response_cache.py --requests 200000 --keys 5000
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.utils.cache import AsyncCache, cache_response  # noqa: E402
+
+
+def zipf_keys(count: int, keys: int, s: float, seed: int = 13) -> list:
+    weights = list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, keys + 1)))
+    return random.Random(seed).choices(range(keys), cum_weights=weights, k=count)
+
+
+async def drive(workload: list, concurrency: int, call) -> float:
+    position = iter(workload)
+
+    async def worker():
+        for key in position:
+            await call(key)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+def report(label: str, requests: int, elapsed: float, loads: int, cache: AsyncCache = None) -> None:
+    line = f"  {label:<26} {requests / elapsed:>11,.0f} req/s  loads={loads:>8,}"
+    if cache is not None:
+        metrics = cache.metrics
+        line += f"  hit_ratio={metrics.hit_ratio:6.2%}  coalesced={metrics.coalesced:,}  evictions={metrics.evictions:,}"
+    print(line)
+
+
+async def bench_service(args, workload) -> None:
+    loads = 0
+
+    async def load_price(key):
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(args.latency_ms / 1000)
+        return {"key": key, "modal_price": 1000 + key}
+
+    print("Service layer:")
+    elapsed = await drive(workload, args.concurrency, load_price)
+    report("uncached", len(workload), elapsed, loads)
+
+    cache = AsyncCache("bench-service", ttl=args.ttl, stale_ttl=args.stale_ttl)
+    cache.backend.max_entries = args.capacity
+
+    async def cached_price(key):
+        return await cache.get_or_load(key, lambda: load_price(key))
+
+    loads = 0
+    elapsed = await drive(workload, args.concurrency, cached_price)
+    report(f"cached (capacity {args.capacity:,})", len(workload), elapsed, loads, cache)
+
+
+async def bench_endpoint(args, workload) -> None:
+    loads = 0
+    cache = AsyncCache("bench-endpoint", ttl=args.ttl, stale_ttl=args.stale_ttl)
+    cache.backend.max_entries = args.capacity
+    app = FastAPI()
+
+    @app.get("/uncached/{key}")
+    async def uncached_price(key: int):
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(args.latency_ms / 1000)
+        return {"key": key, "modal_price": 1000 + key}
+
+    @app.get("/cached/{key}")
+    @cache_response(cache=cache)
+    async def cached_price(key: int):
+        return await uncached_price(key)
+
+    workload = workload[: args.endpoint_requests]
+    print(f"Endpoint layer ({len(workload):,} requests through ASGI):")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for label, prefix in (("uncached", "/uncached"), ("cache_response", "/cached")):
+            loads = 0
+            elapsed = await drive(workload, args.concurrency, lambda key: client.get(f"{prefix}/{key}"))
+            report(label, len(workload), elapsed, loads, cache if prefix == "/cached" else None)
+
+
+async def run(args) -> None:
+    workload = zipf_keys(args.requests, args.keys, args.zipf_s)
+    await bench_service(args, workload)
+    await bench_endpoint(args, workload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--endpoint-requests", type=int, default=20_000)
+    parser.add_argument("--keys", type=int, default=5_000)
+    parser.add_argument("--zipf-s", type=float, default=1.1)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--capacity", type=int, default=1_000, help="LRU capacity of the cache")
+    parser.add_argument("--ttl", type=float, default=60.0)
+    parser.add_argument("--stale-ttl", type=float, default=30.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
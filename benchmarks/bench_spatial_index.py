@@ -0,0 +1,78 @@
+"""
+Benchmark: `CitySpatialIndex` vs. a naive full scan over city coordinates.
+
+Generates `--points` random points over India's bounding box and times
+k-nearest, 25 km radius and bounding-box queries both ways.
+
+Usage:
+    python benchmarks/bench_spatial_index.py --points 600000 --queries 200
+"""
+
+import argparse
+import heapq
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.helpers.geo import haversine_km  # noqa: E402
+from app.services.region.spatial_index import CitySpatialIndex  # noqa: E402
+
+LAT_RANGE, LNG_RANGE = (8.0, 35.0), (68.0, 97.0)
+
+
+def naive_nearest(points, lat, lng, k):
+    return heapq.nsmallest(k, ((haversine_km(lat, lng, p_lat, p_lng), city_id) for city_id, p_lat, p_lng in points))
+
+
+def naive_radius(points, lat, lng, km):
+    return [city_id for city_id, p_lat, p_lng in points if haversine_km(lat, lng, p_lat, p_lng) <= km]
+
+
+def naive_bbox(points, min_lat, min_lng, max_lat, max_lng):
+    return [city_id for city_id, p_lat, p_lng in points
+            if min_lat <= p_lat <= max_lat and min_lng <= p_lng <= max_lng]
+
+
+def timed(label, fn, queries):
+    started = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    per_query = (time.perf_counter() - started) / len(queries)
+    print(f"  {label:<28} {per_query * 1000:10.3f} ms/query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=600_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    points = [(i, rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for i in range(1, args.points + 1)]
+    started = time.perf_counter()
+    index = CitySpatialIndex()
+    index.add_many(points)
+    print(f"Indexed {len(index):,} points in {time.perf_counter() - started:.2f}s")
+
+    centers = [(rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for _ in range(args.queries)]
+    knn = [(lat, lng, 10) for lat, lng in centers]
+    radius = [(lat, lng, 25.0) for lat, lng in centers]
+    boxes = [(lat, lng, lat + 0.3, lng + 0.3) for lat, lng in centers]
+
+    print("Grid index:")
+    timed("10 nearest", index.nearest, knn)
+    timed("within 25 km", index.within_radius, radius)
+    timed("0.3 deg bounding box", index.within_bbox, boxes)
+
+    naive_queries = max(1, args.queries // 20)
+    print(f"Full scan ({naive_queries} queries):")
+    timed("10 nearest", lambda *q: naive_nearest(points, *q), knn[:naive_queries])
+    timed("within 25 km", lambda *q: naive_radius(points, *q), radius[:naive_queries])
+    timed("0.3 deg bounding box", lambda *q: naive_bbox(points, *q), boxes[:naive_queries])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: loading a large seed dump with `manage_db.py sql`.
+
+Generates a `sqlite3 .dump`-style script (`--statements` INSERTs whose string
+literals contain ';', a trigger with a BEGIN ... END body, comments and the
+dump's own BEGIN TRANSACTION / COMMIT) and loads it into a fresh database:
+
+- legacy: the previous executor (whole file read, split on ';', `text()` and
+  one commit per statement), run on `--legacy-sample` statements and
+  extrapolated; it mis-splits the trigger and literals, so it is only timed on
+  the plain INSERTs;
+- streaming: `iter_sql_statements` + `run_sql_statements` per `--batch-size`.
+
+Usage:
+    python benchmarks/bench_sql_script.py --statements 200000 --batch-size 1000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.configuration.database import SQLITE_PROFILES, DatabaseSettings, build_engine  # noqa: E402
+from app.setup.sql_script import iter_sql_statements, run_sql_statements  # noqa: E402
+
+SCHEMA = """PRAGMA foreign_keys=OFF;
+BEGIN TRANSACTION;
+CREATE TABLE markets (id INTEGER PRIMARY KEY, name TEXT NOT NULL, note TEXT);
+CREATE TABLE market_log (market_id INTEGER, logged TEXT);
+-- keep an audit row per market; the body holds ';' inside BEGIN ... END
+CREATE TRIGGER markets_audit AFTER INSERT ON markets
+BEGIN
+    INSERT INTO market_log VALUES (new.id, CASE WHEN new.note IS NULL THEN 'none;' ELSE new.note END);
+END;
+"""
+
+
+def write_dump(path: Path, statements: int) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(SCHEMA)
+        for i in range(1, statements + 1):
+            file.write(f"INSERT INTO markets VALUES({i},'Market {i}; Yard ''{i % 97}''','opens 06:30 /* daily */');\n")
+        file.write("COMMIT;\n")
+
+
+def fresh_engine(directory: Path, name: str, profile: str):
+    return build_engine(DatabaseSettings(database_url=f"sqlite:///{directory / name}", sqlite_profile=profile))
+
+
+def bench_legacy(directory: Path, profile: str, sample: int) -> float:
+    engine = fresh_engine(directory, "legacy.db", profile)
+    inserts = [f"INSERT INTO markets VALUES({i},'Market {i}','opens daily')" for i in range(1, sample + 1)]
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE markets (id INTEGER PRIMARY KEY, name TEXT NOT NULL, note TEXT)"))
+        connection.commit()
+        started = time.perf_counter()
+        for statement in inserts:
+            connection.execute(text(statement))
+            connection.commit()
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed / sample
+
+
+def bench_streaming(directory: Path, dump: Path, profile: str, batch_size: int) -> None:
+    engine = fresh_engine(directory, f"streaming-{batch_size}.db", profile)
+    started = time.perf_counter()
+    with open(dump, encoding="utf-8") as file, engine.connect() as connection:
+        executed = run_sql_statements(connection, iter_sql_statements(file), batch_size, progress_every=0)
+    elapsed = time.perf_counter() - started
+    with engine.connect() as connection:
+        markets = connection.exec_driver_sql("SELECT count(*) FROM markets").scalar()
+        logged = connection.exec_driver_sql("SELECT count(*) FROM market_log").scalar()
+    engine.dispose()
+    print(f"  streaming, batch {batch_size:>6,}: {elapsed:6.2f}s  {executed / elapsed:>9,.0f} stmt/s  "
+          f"(markets={markets:,}, trigger rows={logged:,})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 100, 1_000, 10_000])
+    parser.add_argument("--legacy-sample", type=int, default=2_000)
+    parser.add_argument("--profile", choices=sorted(SQLITE_PROFILES), default="read_heavy")
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp())
+    dump = directory / "seed.sql"
+    write_dump(dump, args.statements)
+    print(f"Seed dump: {args.statements:,} INSERTs, {dump.stat().st_size / 1e6:.1f} MB, profile {args.profile}")
+
+    per_statement = bench_legacy(directory, args.profile, args.legacy_sample)
+    print(f"  legacy (commit per statement): {1 / per_statement:,.0f} stmt/s "
+          f"-> ~{per_statement * args.statements:,.0f}s for the dump")
+    for batch_size in args.batch_size:
+        bench_streaming(directory, dump, args.profile, batch_size)
+
+
+if __name__ == "__main__":
+    main()
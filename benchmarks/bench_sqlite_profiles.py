@@ -0,0 +1,108 @@
+"""
+Benchmark: concurrent read throughput while an ingest is running, per SQLite profile.
+
+For each profile a fresh database is seeded, then one writer thread keeps
+inserting city batches while reader threads run district lookups. Reports read
+queries/sec, reader p99 latency, lock errors and writer rows/sec.
+
+Usage:
+    python benchmarks/bench_sqlite_profiles.py --seconds 10 --readers 8
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.configuration.database import SQLITE_PROFILES, DatabaseSettings, build_engine  # noqa: E402
+from app.models.region import Base, City, District, State, StateType  # noqa: E402
+
+DISTRICTS = 700
+SEED_CITIES = 200_000
+WRITE_BATCH = 5_000
+
+
+def seed(engine) -> None:
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(State), [{"id": 1, "name": "State", "type": StateType.STATE}])
+        connection.execute(insert(District), [
+            {"id": i, "name": f"District {i}", "state_id": 1} for i in range(1, DISTRICTS + 1)
+        ])
+        connection.execute(insert(City), [
+            {"id": i + 1, "name": f"Village {i}", "district_id": 1 + i % DISTRICTS} for i in range(SEED_CITIES)
+        ])
+
+
+def run_profile(profile: str, seconds: float, readers: int) -> None:
+    db_file = Path(tempfile.mkdtemp()) / f"{profile}.db"
+    engine = build_engine(DatabaseSettings(database_url=f"sqlite:///{db_file}", sqlite_profile=profile))
+    seed(engine)
+
+    stop = threading.Event()
+    latencies, errors, written = [], [0], [0]
+
+    def writer():
+        next_id = SEED_CITIES + 1
+        while not stop.is_set():
+            rows = [{"id": next_id + i, "name": f"New {next_id + i}", "district_id": 1 + i % DISTRICTS}
+                    for i in range(WRITE_BATCH)]
+            try:
+                with engine.begin() as connection:
+                    connection.execute(insert(City), rows)
+                next_id += WRITE_BATCH
+                written[0] += WRITE_BATCH
+            except OperationalError:
+                errors[0] += 1
+
+    def reader(seed_value: int):
+        local, district = [], seed_value
+        statement = select(City.id, City.name).where(City.district_id == 0).limit(50)
+        with engine.connect() as connection:
+            while not stop.is_set():
+                district = 1 + (district * 7919) % DISTRICTS
+                started = time.perf_counter()
+                try:
+                    connection.execute(statement.where(City.district_id == district)).all()
+                    connection.rollback()
+                    local.append(time.perf_counter() - started)
+                except OperationalError:
+                    errors[0] += 1
+                    connection.rollback()
+        latencies.extend(local)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000 if len(latencies) > 1 else float("nan")
+    print(
+        f"{profile:<13} reads/s={len(latencies) / seconds:>9,.0f} read_p99={p99:8.2f}ms "
+        f"lock_errors={errors[0]:>4} writer_rows/s={written[0] / seconds:>9,.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+    for profile in SQLITE_PROFILES:
+        run_profile(profile, args.seconds, args.readers)
+
+
+if __name__ == "__main__":
+    main()
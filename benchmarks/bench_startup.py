@@ -0,0 +1,126 @@
+"""
+Benchmark: process startup cost of the API and the management CLI.
+
+Three measurements, each in fresh interpreters so nothing is warm in-process:
+
+- `import app.main`: wall time (best of `--repeat`) plus the heaviest modules
+  by cumulative time from `python -X importtime`;
+- `manage_db.py --help`: CLI start without touching the database;
+- cold worker boot: `uvicorn app.main:app` spawned until `/openapi.json`
+  answers (import, lifespan startup, first request).
+
+Each figure is checked against a budget; the script exits non-zero when any
+budget is exceeded, so it can gate CI.
+
+Usage:
+    python benchmarks/bench_startup.py --import-budget-ms 600 --boot-budget-ms 1500
+"""
+
+import argparse
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def best_wall_ms(args: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_python(*args)
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def import_profile(module: str, top: int) -> list:
+    """(cumulative_ms, module) for the `top` heaviest first-level imports of `module`."""
+    stderr = run_python("-X", "importtime", "-c", f"import {module}").stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            rows.append((int(cumulative) / 1000, len(indent), name))
+    # Shallow entries only: nested modules are already counted in their parents
+    depth_limit = min(depth for _, depth, _ in rows) + 2 if rows else 0
+    shallow = [(ms, name) for ms, depth, name in rows if depth <= depth_limit]
+    return sorted(shallow, reverse=True)[:top]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def cold_boot_ms(timeout: float) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/openapi.json"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited early:\n{process.stderr.read().decode()}")
+            try:
+                with urllib.request.urlopen(url, timeout=0.5) as response:
+                    response.read()
+                return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"worker did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def check(label: str, value_ms: float, budget_ms: float) -> bool:
+    within = value_ms <= budget_ms
+    print(f"  {label:<28} {value_ms:8.0f} ms   budget {budget_ms:6.0f} ms   {'ok' if within else 'OVER BUDGET'}")
+    return within
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is reported")
+    parser.add_argument("--top", type=int, default=12, help="Heaviest imports to list")
+    parser.add_argument("--import-budget-ms", type=float, default=600.0)
+    parser.add_argument("--cli-budget-ms", type=float, default=300.0)
+    parser.add_argument("--boot-budget-ms", type=float, default=1500.0)
+    parser.add_argument("--boot-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print("Heaviest imports of app.main (cumulative, -X importtime):")
+    for ms, name in import_profile("app.main", args.top):
+        print(f"  {ms:8.1f} ms  {name}")
+
+    import_ms = best_wall_ms(["-c", "import app.main"], args.repeat)
+    cli_ms = best_wall_ms(["manage_db.py", "--help"], args.repeat)
+    boot_ms = min(cold_boot_ms(args.boot_timeout) for _ in range(args.repeat))
+
+    print(f"\nStartup (best of {args.repeat}, including interpreter start):")
+    results = [
+        check("python -c 'import app.main'", import_ms, args.import_budget_ms),
+        check("manage_db.py --help", cli_ms, args.cli_budget_ms),
+        check("cold uvicorn worker boot", boot_ms, args.boot_budget_ms),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
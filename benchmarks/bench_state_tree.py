@@ -0,0 +1,119 @@
+"""
+Benchmark: serializing a full state tree with lazy vs. batched relationship loading.
+
+Seeds one large state (`--districts` districts, `--subdistricts` subdistricts
+per district, `--cities` cities) and walks State -> capital, districts ->
+subdistricts / cities:
+
+- lazy: the models' default lazy loading, one query per parent (N+1);
+- selectin: `RegionRepository.state_tree`, ORM entities loaded per level;
+- rows: `build_state_tree`, flat Core rows per level assembled into dicts;
+- endpoint: `GET /regions/states/{id}/tree` through the ASGI app, wrapped in
+  `QueryCounter(max_queries=STATE_TREE_QUERIES)` so the run fails if the
+  query count grows.
+
+Usage:
+    python benchmarks/bench_state_tree.py --districts 75 --cities 40000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert, update  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app.configuration.database import DatabaseSettings, build_engine  # noqa: E402
+from app.endpoints.dependencies import get_database_session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.region import Base, City, District, State, StateType, Subdistrict  # noqa: E402
+from app.models.schema.response.region_response import StateTreeResponse  # noqa: E402
+from app.repositories.region import RegionRepository  # noqa: E402
+from app.services.region import STATE_TREE_QUERIES, build_state_tree  # noqa: E402
+from app.utils.query_counter import QueryCounter  # noqa: E402
+
+STATE_ID = 1
+
+
+def seed(engine, districts: int, subdistricts: int, cities: int) -> None:
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(State), [{"id": STATE_ID, "name": "Large State", "type": StateType.STATE}])
+        connection.execute(insert(District), [
+            {"id": d, "name": f"District {d}", "state_id": STATE_ID} for d in range(1, districts + 1)])
+        tehsils = districts * subdistricts
+        connection.execute(insert(Subdistrict), [
+            {"id": t, "name": f"Tehsil {t}", "district_id": 1 + t % districts, "state_id": STATE_ID}
+            for t in range(1, tehsils + 1)])
+        connection.execute(insert(City), [
+            {"id": c, "name": f"Village {c}", "district_id": 1 + (c % tehsils + 1) % districts,
+             "subdistrict_id": c % tehsils + 1, "state_id": STATE_ID, "lat": 20.0, "lng": 78.0}
+            for c in range(1, cities + 1)])
+        connection.execute(update(State).where(State.id == STATE_ID).values(capital_id=1))
+
+
+def walk(state: State) -> int:
+    """Touch every relationship the tree endpoint serializes; returns the node count."""
+    nodes = 1 + (state.capital is not None)
+    for district in state.districts:
+        nodes += 1 + len(district.subdistricts) + len(district.cities)
+    return nodes
+
+
+def walk_dict(tree: dict) -> int:
+    nodes = 1 + (tree["capital"] is not None)
+    for district in tree["districts"]:
+        nodes += 1 + len(district["subdistricts"]) + len(district["cities"])
+    return nodes
+
+
+def measure(label: str, engine, load, count=walk) -> None:
+    with Session(engine) as session, QueryCounter(engine=engine) as queries:
+        started = time.perf_counter()
+        nodes = count(load(session))
+        elapsed = time.perf_counter() - started
+    print(f"  {label:<10} {queries.count:>6,} queries  {elapsed * 1000:9.1f} ms  ({nodes:,} nodes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--districts", type=int, default=75)
+    parser.add_argument("--subdistricts", type=int, default=8, help="Subdistricts per district")
+    parser.add_argument("--cities", type=int, default=40_000)
+    args = parser.parse_args()
+
+    engine = build_engine(DatabaseSettings(database_url=f"sqlite:///{Path(tempfile.mkdtemp()) / 'tree.db'}"))
+    seed(engine, args.districts, args.subdistricts, args.cities)
+
+    print("Loading the state tree:")
+    measure("lazy", engine, lambda session: session.get(State, STATE_ID))
+    measure("selectin", engine, lambda session: RegionRepository(session).state_tree(STATE_ID))
+    measure("rows", engine, lambda session: build_state_tree(session, STATE_ID), count=walk_dict)
+
+    make_session = sessionmaker(bind=engine)
+
+    def override_session():
+        with make_session() as session:
+            yield session
+
+    app.dependency_overrides[get_database_session] = override_session
+    with TestClient(app) as client:
+        for include_cities in (True, False):
+            with QueryCounter(max_queries=STATE_TREE_QUERIES, engine=engine) as queries:
+                started = time.perf_counter()
+                response = client.get(f"/regions/states/{STATE_ID}/tree", params={"include_cities": include_cities})
+                elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            tree = StateTreeResponse.model_validate_json(response.content)
+            cities = sum(len(district.cities) for district in tree.districts)
+            print(f"  endpoint   {queries.count:>6,} queries  {elapsed * 1000:9.1f} ms  "
+                  f"(include_cities={include_cities}, {len(response.content) / 1e6:.1f} MB, {cities:,} cities)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: buffered `fetch_csv` + `parse_csv` vs. streaming `stream_csv`.
+
+A local stub server trickles a large CSV in chunks. Each mode persists rows into
+an in-memory SQLite table and reports time-to-first-row, total time and peak
+RSS (each mode runs in its own subprocess).
+
+Usage:
+    python benchmarks/bench_stream_pipeline.py --rows 1000000
+"""
+
+import argparse
+import asyncio
+import resource
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.dal.api_clients.base_api_client import BaseAPIClient  # noqa: E402
+from app.helpers.csv_parser import CsvColumn, date_converter, parse_csv  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+HEADER = b"Market,Commodity,Arrival_Date,Modal_x0020_Price\n"
+SCHEMA = [
+    CsvColumn("market", source="Market"),
+    CsvColumn("commodity", source="Commodity"),
+    CsvColumn("arrival_date", date_converter(), source="Arrival_Date"),
+    CsvColumn("modal_price", float, source="Modal_x0020_Price"),
+]
+
+
+def make_handler(rows: int, chunk_rows: int = 20_000, delay: float = 0.005):
+    async def body():
+        yield HEADER
+        for start in range(0, rows, chunk_rows):
+            lines = [
+                f"Market {i % 3000},Onion,{1 + i % 28:02d}/{1 + i % 12:02d}/2024,{1000 + i % 900}\n"
+                for i in range(start, min(start + chunk_rows, rows))
+            ]
+            yield "".join(lines).encode()
+            await asyncio.sleep(delay)
+
+    async def handler(method, path, headers):
+        return 200, {"Content-Type": "text/csv"}, body()
+
+    return handler
+
+
+def open_store() -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.execute("CREATE TABLE prices (market TEXT, commodity TEXT, arrival_date TEXT, modal_price REAL)")
+    return connection
+
+
+async def run_buffered(url: str, marks: dict) -> int:
+    store = open_store()
+    rows = parse_csv(await BaseAPIClient.fetch_csv(url))
+    marks["first_row"] = time.perf_counter()
+    store.executemany(
+        "INSERT INTO prices VALUES (?, ?, ?, ?)",
+        ((r["Market"], r["Commodity"], r["Arrival_Date"], float(r["Modal_x0020_Price"])) for r in rows),
+    )
+    store.commit()
+    return len(rows)
+
+
+async def run_streaming(url: str, marks: dict) -> int:
+    store = open_store()
+
+    def write(batch):
+        marks.setdefault("first_row", time.perf_counter())
+        store.executemany("INSERT INTO prices VALUES (?, ?, ?, ?)", batch.rows())
+        store.commit()
+
+    return await BaseAPIClient.stream_csv(url, write, SCHEMA, batch_size=20_000)
+
+
+async def measure(mode: str, rows: int) -> None:
+    async with StubServer(make_handler(rows)) as server:
+        marks = {}
+        started = time.perf_counter()
+        runner = run_buffered if mode == "buffered" else run_streaming
+        count = await runner(f"{server.url}/prices.csv", marks)
+        elapsed = time.perf_counter() - started
+        await BaseAPIClient.shutdown()
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{mode:<10} rows={count:>9,} first_row={(marks['first_row'] - started) * 1000:9.1f}ms "
+        f"total={elapsed:6.2f}s peak_rss={peak_mb:7.1f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=["buffered", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        asyncio.run(measure(args.mode, args.rows))
+        return
+    for mode in ("streaming", "buffered"):
+        subprocess.run([sys.executable, __file__, "--mode", mode, "--rows", str(args.rows)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Minimal asyncio HTTP/1.1 stub server used by the benchmark scripts.
+
+Supports keep-alive, counts accepted TCP connections (i.e. handshakes) and lets
+a handler return either a full body or an async iterator of chunks, which is
+sent with chunked transfer encoding.
+"""
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, Tuple, Union
+
+Body = Union[bytes, AsyncIterator[bytes]]
+Handler = Callable[[str, str, Dict[str, str]], Awaitable[Tuple[int, Dict[str, str], Body]]]
+
+REASONS = {200: "OK", 304: "Not Modified", 404: "Not Found", 429: "Too Many Requests",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class StubServer:
+    def __init__(self, handler: Handler, host: str = "127.0.0.1", port: int = 0):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "StubServer":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "StubServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                self.requests += 1
+                status, response_headers, body = await self.handler(method, path, headers)
+                await self._respond(writer, status, response_headers, body)
+                if headers.get("connection", "").lower() == "close":
+                    return
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: Body) -> None:
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Status')}"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        if isinstance(body, bytes):
+            head.append(f"Content-Length: {len(body)}")
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            return
+
+        head.append("Transfer-Encoding: chunked")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        async for chunk in body:
+            if chunk:
+                writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
@@ -7,19 +7,15 @@ A simple command-line interface for managing the SQLite database.
 
 import argparse
 import sys
+from datetime import date
 from pathlib import Path
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.setup.database_setup import (
-    create_all_tables,
-    reset_database,
-    check_database_status,
-    execute_sql_script,
-    discover_models
-)
+# Command implementations are imported inside each branch so that `--help`
+# and light commands don't pay for SQLAlchemy/model imports they never use.
 
 
 def main():
@@ -38,11 +34,58 @@ def main():
     subparsers.add_parser("status", help="Check database status")
 
     # Discover command
-    subparsers.add_parser("discover", help="Discover all models in the project")
+    discover_parser = subparsers.add_parser("discover", help="List registered models")
+    discover_parser.add_argument("--scan", action="store_true",
+                                 help="Also scan app/models and report models missing from the registry")
 
     # Execute SQL script command
     sql_parser = subparsers.add_parser("sql", help="Execute a SQL script file")
     sql_parser.add_argument("script", help="Path to SQL script file")
+    sql_parser.add_argument("--batch-size", type=int, default=1_000,
+                            help="Statements per transaction; 0 = whole script in one transaction (default: 1000)")
+    sql_parser.add_argument("--progress-every", type=int, default=10_000,
+                            help="Report progress every N statements; 0 disables (default: 10000)")
+
+    # Bulk load region hierarchy command
+    regions_parser = subparsers.add_parser("load-regions", help="Bulk load states/districts/subdistricts/cities from a CSV")
+    regions_parser.add_argument("csv", help="Path to census CSV file")
+    regions_parser.add_argument("--batch-size", type=int, default=50_000,
+                                help="Rows per chunk/transaction (default: 50000)")
+    regions_parser.add_argument("--restart", action="store_true",
+                                help="Ignore saved progress and load the file again from the beginning")
+
+    # Parallel price ingestion command
+    ingest_parser = subparsers.add_parser("ingest", help="Load mandi price CSV files using all CPU cores")
+    ingest_parser.add_argument("csv", nargs="+", help="Price CSV files in the upstream feed format")
+    ingest_parser.add_argument("--workers", type=int,
+                               help="Parse/resolve processes; 0 parses in the writer (default: CPUs - 1)")
+    ingest_parser.add_argument("--shard-size-mb", type=float, default=16,
+                               help="Approximate MiB of CSV per shard (default: 16)")
+    rollups_group = ingest_parser.add_mutually_exclusive_group()
+    rollups_group.add_argument("--backfill", action="store_true",
+                               help="Rebuild all price rollups once at the end instead of refreshing "
+                                    "the loaded cells after each shard (for multi-year loads)")
+    rollups_group.add_argument("--no-rollups", action="store_true",
+                               help="Leave price rollups stale; run rebuild-rollups later")
+
+    # Rebuild price rollups command
+    subparsers.add_parser("rebuild-rollups", help="Recompute all price rollups from the raw price rows")
+
+    # Export command
+    export_parser = subparsers.add_parser("export", help="Stream a region or price table to a file")
+    export_parser.add_argument("dataset", choices=["states", "districts", "subdistricts", "cities", "prices"],
+                               help="Table to export")
+    export_parser.add_argument("-o", "--output",
+                               help="Output file; '-' for stdout (default: <dataset>.<format suffix>)")
+    export_parser.add_argument("--format", choices=["ndjson", "csv", "columnar"], default="ndjson",
+                               help="Output format (default: ndjson)")
+    export_parser.add_argument("--state-id", type=int, help="Only rows of this state")
+    export_parser.add_argument("--district-id", type=int, help="Only rows of this district")
+    export_parser.add_argument("--commodity-id", type=int, help="Only prices of this commodity")
+    export_parser.add_argument("--start-date", type=date.fromisoformat, help="Only prices on or after YYYY-MM-DD")
+    export_parser.add_argument("--end-date", type=date.fromisoformat, help="Only prices on or before YYYY-MM-DD")
+    export_parser.add_argument("--chunk-size", type=int, default=10_000,
+                               help="Rows fetched and written per chunk (default: 10000)")
 
     args = parser.parse_args()
 
@@ -52,6 +95,7 @@ def main():
 
     try:
         if args.command == "create":
+            from app.setup.database_setup import create_all_tables
             success = create_all_tables(drop_existing=args.drop)
             if success:
                 print("✅ Database tables created successfully!")
@@ -63,6 +107,7 @@ def main():
             print("⚠️  This will delete all existing data!")
             confirm = input("Are you sure? (y/N): ")
             if confirm.lower() == 'y':
+                from app.setup.database_setup import reset_database
                 success = reset_database()
                 if success:
                     print("✅ Database reset successfully!")
@@ -73,20 +118,80 @@ def main():
                 print("Operation cancelled.")
 
         elif args.command == "status":
+            from app.setup.database_setup import check_database_status
             check_database_status()
 
         elif args.command == "discover":
+            from app.setup.database_setup import discover_models, scan_models
             models = discover_models()
             print(f"Found {len(models)} model(s):")
             for model in models:
                 print(f"  📋 {model.__name__} -> {getattr(model, '__tablename__', 'N/A')}")
+            if args.scan:
+                missing = [model for model in scan_models() if model not in models]
+                for model in missing:
+                    print(f"  ⚠️  {model.__module__}.{model.__name__} is not in app.models.MODELS")
+                if missing:
+                    sys.exit(1)
 
         elif args.command == "sql":
             script_path = Path(args.script)
             if not script_path.exists():
                 print(f"❌ Script file not found: {script_path}")
                 sys.exit(1)
-            execute_sql_script(script_path)
+            from app.setup.database_setup import execute_sql_script
+            executed = execute_sql_script(script_path, batch_size=args.batch_size,
+                                          progress_every=args.progress_every)
+            if executed is None:
+                print("❌ Failed to execute SQL script")
+                sys.exit(1)
+
+        elif args.command == "load-regions":
+            csv_path = Path(args.csv)
+            if not csv_path.exists():
+                print(f"❌ CSV file not found: {csv_path}")
+                sys.exit(1)
+            from app.setup.region_loader import load_regions
+            inserted = load_regions(csv_path, batch_size=args.batch_size, restart=args.restart)
+            if inserted is None:
+                print("❌ Failed to load regions")
+                sys.exit(1)
+            print("✅ Regions loaded successfully!")
+
+        elif args.command == "ingest":
+            csv_paths = [Path(path) for path in args.csv]
+            missing = [path for path in csv_paths if not path.exists()]
+            if missing:
+                print(f"❌ CSV file not found: {missing[0]}")
+                sys.exit(1)
+            from app.setup.ingest_pipeline import ingest_prices
+            stats = ingest_prices(csv_paths, workers=args.workers, shard_size=int(args.shard_size_mb * (1 << 20)),
+                                  refresh_rollups=not args.no_rollups, backfill=args.backfill)
+            if stats is None:
+                print("❌ Failed to ingest prices")
+                sys.exit(1)
+            print("✅ Prices ingested successfully!")
+
+        elif args.command == "rebuild-rollups":
+            from app.setup.database_setup import rebuild_price_rollups
+            if rebuild_price_rollups() is None:
+                print("❌ Failed to rebuild price rollups")
+                sys.exit(1)
+
+        elif args.command == "export":
+            from app.services.export import ExportFilters, ExportFormat, FILE_SUFFIXES
+            from app.setup.data_export import export_to_file
+            export_format = ExportFormat(args.format)
+            if args.output == "-":
+                output = None
+            else:
+                output = Path(args.output or args.dataset + FILE_SUFFIXES[export_format])
+            filters = ExportFilters(args.state_id, args.district_id, args.commodity_id,
+                                    args.start_date, args.end_date)
+            exported = export_to_file(args.dataset, output, export_format, filters, chunk_size=args.chunk_size)
+            if exported is None:
+                print("❌ Failed to export data", file=sys.stderr)
+                sys.exit(1)
 
     except KeyboardInterrupt:
         print("\n⚠️  Operation cancelled by user")